@@ -0,0 +1,86 @@
+import argparse
+import random
+import struct
+import time
+import zlib
+from Domain.Entities.DataView.DataView import DataView
+from Infrastructure.Parser.FBXArrayDecoder import FBXArrayDecoder, numpy
+from Infrastructure.Parser.FBXPropertyParser import FBXPropertyParser
+
+
+def encodeArray(typeCode: str, values: list, compressed: bool) -> bytes:
+    """
+    Encode an array property payload (without its type code).
+
+    Args:
+        typeCode (str): The FBX array type code.
+        values (list): The array values.
+        compressed (bool): Whether to zlib compress the content.
+
+    Returns:
+        bytes: The encoded property payload.
+
+    """
+    content = struct.pack(f"<{len(values)}{FBXArrayDecoder.ARRAY_FORMATS[typeCode][0]}", *values)
+    if compressed:
+        content = zlib.compress(content)
+    return struct.pack("<III", len(values), int(compressed), len(content)) + content
+
+
+def decodePerElement(payload: bytes, typeCode: str) -> list:
+    """
+    Decode an array payload one element at a time, the way the parser used to.
+
+    Args:
+        payload (bytes): The encoded property payload.
+        typeCode (str): The FBX array type code.
+
+    Returns:
+        list: The decoded values.
+
+    """
+    arrayLength, encoding, compressedLength = struct.unpack_from("<III", payload)
+    content = payload[12:12 + compressedLength]
+    view = DataView(zlib.decompress(content) if encoding else content)
+    reader = {"f": view.readFloat, "d": view.readDouble, "l": view.readInt64, "i": view.readInt32, "b": view.readBool}[typeCode]
+
+    output, offset = [], 0
+    for _ in range(arrayLength):
+        current = reader(offset)
+        offset = current.endOffset
+        output.append(current.value)
+    return output
+
+
+def timeIt(callback) -> float:
+    start = time.perf_counter()
+    callback()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Per-element against bulk array property decoding.")
+    arguments.add_argument("--vertices", type=int, default=1_000_000)
+    options = arguments.parse_args()
+
+    generator = random.Random(0)
+    meshArrays = {
+        "Vertices (d)": ("d", [generator.uniform(-100, 100) for _ in range(options.vertices * 3)]),
+        "PolygonVertexIndex (i)": ("i", [generator.randrange(options.vertices) for _ in range(options.vertices * 4)]),
+        "UV (f)": ("f", [generator.random() for _ in range(options.vertices * 2)]),
+    }
+
+    modes = [FBXPropertyParser.ARRAY_OUTPUT_LIST, FBXPropertyParser.ARRAY_OUTPUT_ARRAY]
+    if numpy is not None:
+        modes.append(FBXPropertyParser.ARRAY_OUTPUT_NUMPY)
+
+    print(f"{'array':<24} {'zlib':<6} {'per-element':>12} " + " ".join(f"{mode:>10}" for mode in modes))
+    for label, (typeCode, values) in meshArrays.items():
+        for compressed in (False, True):
+            payload = encodeArray(typeCode, values, compressed)
+            timings = [timeIt(lambda: decodePerElement(payload, typeCode))]
+            for mode in modes:
+                parser = FBXPropertyParser(payload, mode)
+                timings.append(timeIt(lambda: parser.readByTypeCode(0, typeCode)))
+
+            print(f"{label:<24} {str(compressed):<6} " + " ".join(f"{timing:>10.3f}s" for timing in timings))
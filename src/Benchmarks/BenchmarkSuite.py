@@ -0,0 +1,191 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Serializers.FBXDocumentSerializer import FBXDocumentSerializer
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "baseline.json")
+
+# metric: True when higher is better
+METRICS = {
+    "parseMBps": True,
+    "nodesPerSecond": True,
+    "parsePeakMB": False,
+    "serializeMBps": True,
+    "serializePeakMB": False,
+}
+
+
+def bestOf(repeat: int, action: Callable[[], Any]) -> Tuple[float, Any]:
+    """
+    Time an action a number of times.
+
+    Args:
+        repeat (int): The number of runs.
+        action (Callable[[], Any]): The action to time.
+
+    Returns:
+        Tuple[float, Any]: The fastest run in seconds and the result of the last run.
+
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = action()
+        best = min(best, time.perf_counter() - start)
+
+    return best, result
+
+
+def peakMemory(action: Callable[[], Any]) -> Tuple[float, Any]:
+    """
+    Measure the peak of the memory allocated by an action, traced with tracemalloc.
+
+    Args:
+        action (Callable[[], Any]): The action to measure.
+
+    Returns:
+        Tuple[float, Any]: The peak in MB and the result of the action.
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = action()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak / 2**20, result
+
+
+def countNodes(document) -> int:
+    """
+    Count the nodes of a document.
+
+    Args:
+        document (FBXDocument): The parsed document.
+
+    Returns:
+        int: The number of nodes, the nameless root excluded.
+
+    """
+    count, stack = 0, [document.topLevelDocument]
+    while stack:
+        children = stack.pop().children
+        count += len(children)
+        stack.extend(children)
+    return count
+
+
+def measure(buffer: bytes, repeat: int) -> Dict[str, float]:
+    """
+    Measure parse and serialize throughput and peak memory of a file.
+
+    Timings and memory are measured in separate runs, tracing allocations slows the code down.
+
+    Args:
+        buffer (bytes): The FBX file.
+        repeat (int): The number of timed runs, the fastest counts.
+
+    Returns:
+        Dict[str, float]: The metrics.
+
+    """
+    megabytes = len(buffer) / 2**20
+    parseSeconds, document = bestOf(repeat, lambda: FBXDocumentParser.fromBuffer(buffer))
+    nodes = countNodes(document)
+    serializeSeconds, output = bestOf(repeat, lambda: FBXDocumentSerializer.serialize(document))
+    outputMegabytes = len(output) / 2**20
+    del output, document
+
+    parsePeak, document = peakMemory(lambda: FBXDocumentParser.fromBuffer(buffer))
+    serializePeak, _ = peakMemory(lambda: len(FBXDocumentSerializer.serialize(document)))
+
+    return {
+        "sizeMB": round(megabytes, 3),
+        "nodes": nodes,
+        "parseSeconds": round(parseSeconds, 4),
+        "parseMBps": round(megabytes / parseSeconds, 3),
+        "nodesPerSecond": round(nodes / parseSeconds),
+        "parsePeakMB": round(parsePeak, 2),
+        "serializeSeconds": round(serializeSeconds, 4),
+        "serializeMBps": round(outputMegabytes / serializeSeconds, 3),
+        "serializePeakMB": round(serializePeak, 2),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> Tuple[List[str], int]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results (Dict[str, Dict[str, float]]): The metrics per profile.
+        baseline (Dict[str, Dict[str, float]]): The baseline metrics per profile.
+        tolerance (float): The relative change past which a metric counts as regressed (ie: 0.15).
+
+    Returns:
+        Tuple[List[str], int]: The report lines and the number of regressed metrics.
+
+    """
+    lines, regressions = [], 0
+    for profile, metrics in results.items():
+        reference = baseline.get(profile)
+        if reference is None:
+            lines.append(f"{profile}: no baseline")
+            continue
+
+        for metric, higherIsBetter in METRICS.items():
+            if not reference.get(metric):
+                continue
+
+            change = metrics[metric] / reference[metric] - 1
+            regressed = -change > tolerance if higherIsBetter else change > tolerance
+            regressions += regressed
+            lines.append(f"{profile:<12} {metric:<16} {reference[metric]:>14} -> {metrics[metric]:>14} {change:>+8.1%}{'  REGRESSION' if regressed else ''}")
+
+    return lines, regressions
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Parse and serialize throughput and peak memory on synthetic files, compared with a stored baseline.")
+    arguments.add_argument("--profiles", nargs="+", choices=sorted(SyntheticFBXGenerator.PROFILES), default=list(SyntheticFBXGenerator.PROFILES))
+    arguments.add_argument("--repeat", type=int, default=3, help="timed runs per measurement, the fastest counts")
+    arguments.add_argument("--baseline", default=BASELINE_PATH, help="the baseline to compare with")
+    arguments.add_argument("--save", metavar="PATH", help="store the results as a baseline")
+    arguments.add_argument("--tolerance", type=float, default=0.15, help="relative change reported as a regression (default: 0.15)")
+    arguments.add_argument("--check", action="store_true", help="exit with status 1 when a metric regressed")
+    options = arguments.parse_args()
+
+    results = {}
+    print(f"{'profile':<12} {'MB':>8} {'nodes':>9} {'parse MB/s':>11} {'nodes/s':>10} {'peak MB':>8} {'ser. MB/s':>10} {'peak MB':>8}")
+    for name in options.profiles:
+        metrics = measure(SyntheticFBXGenerator.generateProfile(SyntheticFBXGenerator.PROFILES[name]), options.repeat)
+        results[name] = metrics
+        print(f"{name:<12} {metrics['sizeMB']:>8.2f} {metrics['nodes']:>9} {metrics['parseMBps']:>11.2f} {metrics['nodesPerSecond']:>10} {metrics['parsePeakMB']:>8.1f} {metrics['serializeMBps']:>10.2f} {metrics['serializePeakMB']:>8.1f}")
+
+    regressions = 0
+    if os.path.exists(options.baseline):
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+        print(f"\ncompared with {options.baseline} ({baseline['python']}, {baseline['platform']}):")
+        lines, regressions = compare(results, baseline["results"], options.tolerance)
+        print("\n".join(lines))
+
+    if options.save:
+        os.makedirs(os.path.dirname(os.path.abspath(options.save)), exist_ok=True)
+        with open(options.save, "w") as file:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(), "results": results}, file, indent=1)
+        print(f"\nresults stored in {options.save}")
+
+    if options.check and regressions:
+        sys.exit(1)
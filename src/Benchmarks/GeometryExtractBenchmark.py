@@ -0,0 +1,85 @@
+import argparse
+import time
+from typing import Any, Dict
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Geometry.FBXGeometryExtractor import FBXGeometryExtractor
+from Infrastructure.Parser.FBXArrayDecoder import numpy
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+
+def extractLooping(geometry: FBXDocumentNode) -> Dict[str, Any]:
+    """
+    Post-process a Geometry the way downstream tools did: Python loops over the property lists.
+
+    Only handles ByPolygonVertex layers (Direct or IndexToDirect), like the benchmark mesh.
+
+    Args:
+        geometry (FBXDocumentNode): The Geometry node.
+
+    Returns:
+        Dict[str, Any]: The per corner positions, normals and uvs (lists of tuples) and the triangles.
+
+    """
+    children = {child.name: child for child in geometry.children}
+    vertices = list(children["Vertices"].properties[0])
+    points = [(vertices[i], vertices[i + 1], vertices[i + 2]) for i in range(0, len(vertices), 3)]
+
+    layers = {}
+    for name, valuesName, indexName, components in (("LayerElementNormal", "Normals", "NormalsIndex", 3), ("LayerElementUV", "UV", "UVIndex", 2)):
+        element = {child.name: child.properties[0] for child in children[name].children}
+        values = list(element[valuesName])
+        tuples = [tuple(values[i:i + components]) for i in range(0, len(values), components)]
+        index = list(element[indexName]) if element["ReferenceInformationType"] == "IndexToDirect" else None
+        layers[name] = (tuples, index)
+
+    positions, normals, uvs, triangles, polygon = [], [], [], [], []
+    for corner, value in enumerate(children["PolygonVertexIndex"].properties[0]):
+        controlPoint = value if value >= 0 else -value - 1
+        positions.append(points[controlPoint])
+        for name, output in (("LayerElementNormal", normals), ("LayerElementUV", uvs)):
+            tuples, index = layers[name]
+            output.append(tuples[index[corner] if index is not None else corner])
+
+        polygon.append(corner)
+        if value < 0:
+            for i in range(1, len(polygon) - 1):
+                triangles.append((polygon[0], polygon[i], polygon[i + 1]))
+            polygon = []
+
+    return {"positions": positions, "normals": normals, "uvs": uvs, "triangles": triangles}
+
+
+def bestOf(repeat: int, action) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Geometry extraction throughput on a grid mesh of quads.")
+    arguments.add_argument("--polygons", type=int, default=1_000_000, help="The number of quads, rounded to a square grid.")
+    arguments.add_argument("--repeat", type=int, default=3)
+    options = arguments.parse_args()
+
+    side = max(int(options.polygons ** 0.5), 1)
+    buffer = SyntheticFBXGenerator.generateGridMesh(side, side)
+    geometry = FBXDocumentParser.fromBuffer(buffer).find("Objects/Geometry")[0]
+    polygons = side * side
+
+    print(f"{polygons} quads, {len(buffer) / 2**20:.1f} MB")
+    print(f"{'extractor':<28} {'seconds':>9} {'Mpolygons/s':>12} {'speedup':>8}")
+    candidates = [("python loops", lambda: extractLooping(geometry))]
+    for precision in (FBXGeometryExtractor.PRECISION_FLOAT32, FBXGeometryExtractor.PRECISION_FLOAT64):
+        candidates.append((f"array, {precision}", lambda extractor=FBXGeometryExtractor(precision, useNumpy=False): extractor.extract(geometry)))
+        if numpy is not None:
+            candidates.append((f"numpy, {precision}", lambda extractor=FBXGeometryExtractor(precision, useNumpy=True): extractor.extract(geometry)))
+
+    reference = None
+    for name, action in candidates:
+        seconds = bestOf(options.repeat, action)
+        reference = reference or seconds
+        print(f"{name:<28} {seconds:>9.3f} {polygons / seconds / 1e6:>12.2f} {reference / seconds:>7.2f}x")
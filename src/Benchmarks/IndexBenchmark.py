@@ -0,0 +1,52 @@
+import argparse
+import random
+import time
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+
+def findLinear(root, objectId: int):
+    """Find an object by ID walking the whole tree, the way lookups worked before the index."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.properties and node.properties[0] == objectId and node.parent is not None and node.parent.name == "Objects":
+            return node
+        stack.extend(node.children)
+    return None
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Object lookups by ID, linear walk against the document index.")
+    arguments.add_argument("--objects", type=int, default=50_000)
+    arguments.add_argument("--lookups", type=int, default=200)
+    options = arguments.parse_args()
+
+    generator = SyntheticFBXGenerator()
+    generator.beginNode("Objects")
+    for objectId in range(options.objects):
+        generator.beginNode("Model", [("L", 10**9 + objectId), ("S", f"Model{objectId}\x00\x01Model"), ("S", "Mesh")])
+        generator.beginNode("Version", [("I", 232)])
+        generator.endNode()
+        generator.endNode()
+    generator.endNode()
+    document = FBXDocumentParser.fromBuffer(generator.build())
+
+    start = time.perf_counter()
+    objectIds = [node.properties[0] for node in document.find("Objects/Model")]
+    build = time.perf_counter() - start
+    lookups = random.Random(0).choices(objectIds, k=options.lookups)
+
+    start = time.perf_counter()
+    for objectId in lookups:
+        findLinear(document.topLevelDocument, objectId)
+    linear = (time.perf_counter() - start) / options.lookups
+
+    start = time.perf_counter()
+    for objectId in lookups:
+        document.byId(objectId)
+    indexed = (time.perf_counter() - start) / options.lookups
+
+    print(f"index build: {build * 1e3:.1f}ms")
+    print(f"linear walk: {linear * 1e6:,.1f}us per lookup")
+    print(f"index:       {indexed * 1e6:,.3f}us per lookup")
@@ -0,0 +1,28 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser, NODE_STORAGE_OBJECTS, NODE_STORAGE_TABLE
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Memory held by the parsed nodes, per node storage backend.")
+    arguments.add_argument("--nodes", type=int, default=1_000_000)
+    options = arguments.parse_args()
+
+    buffer = SyntheticFBXGenerator.generate(options.nodes)
+    print(f"{options.nodes} nodes, {len(buffer) / 2**20:.1f} MB\n")
+    print(f"{'storage':<8} {'held (MB)':>10} {'bytes/node':>11} {'peak (MB)':>10} {'parse (s)':>10}")
+
+    for nodeStorage in (NODE_STORAGE_OBJECTS, NODE_STORAGE_TABLE):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        document = FBXDocumentParser.fromBuffer(buffer, nodeStorage=nodeStorage)
+        elapsed = time.perf_counter() - start
+        held, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{nodeStorage:<8} {held / 2**20:>10.1f} {held / options.nodes:>11.0f} {peak / 2**20:>10.1f} {elapsed:>10.2f}")
+        del document
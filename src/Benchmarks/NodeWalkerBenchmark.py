@@ -0,0 +1,83 @@
+import argparse
+import sys
+import time
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+
+def measureStackDepth(buffer: bytes) -> int:
+    """
+    Parse a buffer with a profiler attached and track the deepest Python call stack.
+
+    Args:
+        buffer (bytes): The FBX file buffer.
+
+    Returns:
+        int: The maximum stack depth reached, relative to the caller.
+
+    """
+    depth = maxDepth = 0
+
+    def profile(frame, event, arg):
+        nonlocal depth, maxDepth
+        if event == "call":
+            depth += 1
+            maxDepth = max(maxDepth, depth)
+        elif event == "return":
+            depth -= 1
+
+    sys.setprofile(profile)
+    try:
+        FBXDocumentParser.fromBuffer(buffer)
+    finally:
+        sys.setprofile(None)
+
+    return maxDepth
+
+
+def measureThroughput(buffer: bytes) -> tuple[int, float]:
+    """
+    Parse a buffer and count the parsed nodes.
+
+    Args:
+        buffer (bytes): The FBX file buffer.
+
+    Returns:
+        tuple[int, float]: The node count and the parse time in seconds.
+
+    """
+    start = time.perf_counter()
+    document = FBXDocumentParser.fromBuffer(buffer)
+    elapsed = time.perf_counter() - start
+
+    count, stack = 0, [document.topLevelDocument]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+
+    return count - 1, elapsed
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Stack depth and throughput of the node walker.")
+    arguments.add_argument("--nodes", type=int, default=1_000_000)
+    arguments.add_argument("--depth", type=int, default=4)
+    arguments.add_argument("--versions", type=int, nargs="+", default=[7400, 7500])
+    options = arguments.parse_args()
+
+    print("nodes      depth  max stack depth")
+    for nodeCount in (1_000, 10_000, 100_000):
+        for depth in (options.depth, 64):
+            print(f"{nodeCount:<10} {depth:<6} {measureStackDepth(SyntheticFBXGenerator.generate(nodeCount, depth))}")
+
+    print()
+    previousLimit = sys.getrecursionlimit()
+    sys.setrecursionlimit(200)
+    try:
+        for versionNumber in options.versions:
+            buffer = SyntheticFBXGenerator.generate(options.nodes, options.depth, versionNumber)
+            count, elapsed = measureThroughput(buffer)
+            print(f"v{versionNumber}: {count} nodes ({len(buffer) / 2**20:.1f} MB) in {elapsed:.2f}s: {count / elapsed:,.0f} nodes/s (recursion limit 200)")
+    finally:
+        sys.setrecursionlimit(previousLimit)
@@ -0,0 +1,27 @@
+import argparse
+import os
+import time
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Parse time of a multi-mesh file with arrays inflated on 1 to N threads.")
+    arguments.add_argument("--meshes", type=int, default=32)
+    arguments.add_argument("--vertices", type=int, default=100_000)
+    arguments.add_argument("--threads", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    options = arguments.parse_args()
+
+    buffer = SyntheticFBXGenerator.generateMeshes(options.meshes, options.vertices)
+    print(f"{options.meshes} meshes of {options.vertices} vertices, {len(buffer) / 2**20:.1f} MB\n")
+
+    start = time.perf_counter()
+    FBXDocumentParser.fromBuffer(buffer)
+    sequential = time.perf_counter() - start
+    print(f"{'sequential':>10} {sequential:>8.3f}s")
+
+    for threads in options.threads:
+        start = time.perf_counter()
+        FBXDocumentParser.fromBuffer(buffer, inflateThreads=threads)
+        elapsed = time.perf_counter() - start
+        print(f"{threads:>10} {elapsed:>8.3f}s  x{sequential / elapsed:.2f}")
@@ -0,0 +1,56 @@
+import argparse
+import os
+import time
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.DataView.DataView import DataView
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser, NODE_HEADER_32
+
+EXAMPLE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "assets", "example.fbx")
+
+
+def timeNodeHeaderReads(buffer: bytes, count: int) -> tuple[float, float]:
+    """
+    Time reading the same node record header field by field and as a single record.
+
+    Args:
+        buffer (bytes): The FBX file buffer.
+        count (int): The number of reads.
+
+    Returns:
+        tuple[float, float]: The per field and the single record timings in seconds.
+
+    """
+    view = DataView(buffer)
+
+    start = time.perf_counter()
+    for _ in range(count):
+        endOffset, numProperties, propertyListLen = [view.readUInt32(27 + (i * 4)) for i in range(3)]
+        view.readUChar(propertyListLen.endOffset)
+    perField = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(count):
+        view.readStruct(NODE_HEADER_32, 27)
+    record = time.perf_counter() - start
+
+    return perField, record
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Parse time of assets/example.fbx, scaled up synthetically.")
+    arguments.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000])
+    options = arguments.parse_args()
+
+    with open(EXAMPLE_PATH, "rb") as file:
+        example = file.read()
+
+    perField, record = timeNodeHeaderReads(example, 200_000)
+    print(f"node header reads: {perField / 200_000 * 1e9:.0f}ns per field, {record / 200_000 * 1e9:.0f}ns as one record\n")
+
+    print(f"{'scale':>6} {'size (MB)':>10} {'parse (s)':>10} {'MB/s':>8}")
+    for times in options.scales:
+        buffer = SyntheticFBXGenerator.scale(example, times)
+        start = time.perf_counter()
+        FBXDocumentParser.fromBuffer(buffer)
+        elapsed = time.perf_counter() - start
+        print(f"{times:>6} {len(buffer) / 2**20:>10.2f} {elapsed:>10.3f} {len(buffer) / 2**20 / elapsed:>8.2f}")
@@ -0,0 +1,43 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from Benchmarks.ParseBenchmark import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Cache.FBXParseCache import FBXParseCache
+
+
+def timeLoad(cache: FBXParseCache, path: str) -> float:
+    start = time.perf_counter()
+    cache.load(path)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Cold (parse and store) against warm (cached) load times.")
+    arguments.add_argument("--scale", type=int, default=200, help="how often assets/example.fbx is repeated")
+    arguments.add_argument("--meshes", type=int, default=16)
+    arguments.add_argument("--vertices", type=int, default=100_000)
+    options = arguments.parse_args()
+
+    with open(EXAMPLE_PATH, "rb") as file:
+        files = {
+            f"example x{options.scale}": SyntheticFBXGenerator.scale(file.read(), options.scale),
+            f"{options.meshes} meshes": SyntheticFBXGenerator.generateMeshes(options.meshes, options.vertices),
+        }
+
+    directory = tempfile.mkdtemp()
+    try:
+        cache = FBXParseCache(os.path.join(directory, "cache"))
+        print(f"{'file':<20} {'size (MB)':>10} {'cold (s)':>9} {'warm (s)':>9} {'speedup':>8}")
+        for label, buffer in files.items():
+            path = os.path.join(directory, label.replace(" ", "_") + ".fbx")
+            with open(path, "wb") as file:
+                file.write(buffer)
+
+            cold = timeLoad(cache, path)
+            warm = min(timeLoad(cache, path) for _ in range(3))
+            print(f"{label:<20} {len(buffer) / 2**20:>10.1f} {cold:>9.3f} {warm:>9.3f} {cold / warm:>7.1f}x")
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,136 @@
+import argparse
+import time
+from typing import Callable, List, Tuple
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.DataView.DataView import DataView
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Parser.FBXPropertyParser import FBXPropertyParser
+
+
+def readPropertiesChained(view: DataView, offset: int, count: int) -> Tuple[list, int]:
+    """
+    Read a property list the way the parser used to: list membership checks and an if/elif chain per property.
+
+    Args:
+        view (DataView): The view over the file.
+        offset (int): The offset of the property list.
+        count (int): The number of properties.
+
+    Returns:
+        Tuple[list, int]: The properties and the offset after the list.
+
+    """
+    properties = []
+    for _ in range(count):
+        typeCode = view.readChar(offset)
+        offset = typeCode.endOffset
+        typeCode = typeCode.value
+        if ["Y", "C", "I", "F", "D", "L", "B"].count(typeCode) > 0:
+            if typeCode == "Y":
+                result = view.readShort(offset)
+            elif typeCode == "C":
+                result = view.readBool(offset)
+            elif typeCode == "I":
+                result = view.readInt32(offset)
+            elif typeCode == "F":
+                result = view.readFloat(offset)
+            elif typeCode == "D":
+                result = view.readDouble(offset)
+            elif typeCode == "L":
+                result = view.readInt64(offset)
+            else:
+                result = view.readUShort(offset)
+        elif ["S", "R"].count(typeCode) > 0:
+            length = view.readUInt32(offset)
+            result = view.readString(length.endOffset, length.value)
+        else:
+            raise ValueError(f"Unsupported type code in this benchmark: {typeCode}")
+
+        properties.append(result.value)
+        offset = result.endOffset
+
+    return properties, offset
+
+
+def readPropertiesDispatched(parser: FBXPropertyParser, offset: int, count: int) -> Tuple[list, int]:
+    """
+    Read a property list one property at a time through the dispatch table, without fusing runs.
+
+    Args:
+        parser (FBXPropertyParser): The parser over the file.
+        offset (int): The offset of the property list.
+        count (int): The number of properties.
+
+    Returns:
+        Tuple[list, int]: The properties and the offset after the list.
+
+    """
+    buffer, properties = parser.targetBuffer, []
+    for _ in range(count):
+        result = parser.readByTypeCode(offset + 1, chr(buffer[offset]))
+        properties.append(result.value)
+        offset = result.endOffset
+
+    return properties, offset
+
+
+def propertyLists(buffer: bytes) -> List[Tuple[int, int]]:
+    """
+    Locate the property lists of the nodes holding primitives.
+
+    Args:
+        buffer (bytes): The FBX file.
+
+    Returns:
+        List[Tuple[int, int]]: The offset and the number of properties of every list.
+
+    """
+    document = FBXDocumentParser.fromBuffer(buffer)
+    headerSize = FBXDocumentParser.nodeHeaderLayout(document.header.versionNumber).size
+    found, stack = [], list(document.topLevelDocument.children)
+    while stack:
+        node = stack.pop()
+        if node.propertiesCount and set(node.propertyTypes) <= set("YCIFDLBS"):
+            found.append((node.startOffset + headerSize + len(node.name), node.propertiesCount))
+        stack.extend(node.children)
+
+    return found
+
+
+def bestOf(repeat: int, action: Callable[[], None]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Property list decoding on a property dense (Properties70 like) document.")
+    arguments.add_argument("--profile", choices=sorted(SyntheticFBXGenerator.PROFILES), default="properties")
+    arguments.add_argument("--repeat", type=int, default=5)
+    options = arguments.parse_args()
+
+    buffer = SyntheticFBXGenerator.generateProfile(SyntheticFBXGenerator.PROFILES[options.profile])
+    lists = propertyLists(buffer)
+    total = sum(count for _, count in lists)
+    view, parser = DataView(buffer), FBXPropertyParser(buffer)
+
+    def run(read: Callable[[int, int], tuple]) -> Callable[[], None]:
+        return lambda: [read(offset, count) for offset, count in lists]
+
+    print(f"{options.profile}: {len(buffer) / 2**20:.1f} MB, {len(lists)} property lists, {total} properties")
+    print(f"{'decoder':<28} {'ns/property':>12} {'speedup':>8}")
+    reference = None
+    for name, read in (
+        ("if/elif chain", lambda offset, count: readPropertiesChained(view, offset, count)),
+        ("dispatch table", lambda offset, count: readPropertiesDispatched(parser, offset, count)),
+        ("dispatch table, fused runs", parser.readProperties),
+    ):
+        seconds = bestOf(options.repeat, run(read))
+        reference = reference or seconds
+        print(f"{name:<28} {seconds / total * 1e9:>12.0f} {reference / seconds:>7.2f}x")
+
+    seconds = bestOf(options.repeat, lambda: FBXDocumentParser.fromBuffer(buffer))
+    print(f"\nfull parse: {len(buffer) / 2**20 / seconds:.2f} MB/s")
@@ -0,0 +1,57 @@
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXOffsetIndex import FBXOffsetIndex
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+
+def latencies(lookups, action) -> list:
+    """Time an action per lookup, in milliseconds."""
+    found = []
+    for objectId in lookups:
+        start = time.perf_counter()
+        action(objectId)
+        found.append((time.perf_counter() - start) * 1000)
+    return found
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Single mesh lookups: offset index and readNodeAt against a full parse.")
+    arguments.add_argument("--meshes", type=int, default=400)
+    arguments.add_argument("--vertices", type=int, default=5_000)
+    arguments.add_argument("--lookups", type=int, default=200)
+    arguments.add_argument("--full-parses", type=int, default=3)
+    options = arguments.parse_args()
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "meshes.fbx")
+    with open(path, "wb") as file:
+        file.write(SyntheticFBXGenerator.generateMeshes(options.meshes, options.vertices))
+
+    start = time.perf_counter()
+    index = FBXDocumentParser.offsetIndexFromFile(path)
+    build = time.perf_counter() - start
+    index.save(f"{path}.idx")
+
+    start = time.perf_counter()
+    index = FBXOffsetIndex.load(f"{path}.idx")
+    load = time.perf_counter() - start
+
+    lookups = random.Random(0).choices(list(index.objectIds), k=options.lookups)
+    indexed = latencies(lookups, lambda objectId: FBXDocumentParser.readNodeAt(path, index.offsetOf(objectId), index.versionNumber))
+    parsed = latencies(lookups[:options.full_parses], lambda objectId: FBXDocumentParser.fromFile(path).index.byId(objectId))
+
+    print(f"{os.path.getsize(path) / 2**20:.1f} MB, {options.meshes} meshes of {options.vertices} vertices")
+    print(f"index: built in {build * 1000:.1f} ms, {os.path.getsize(f'{path}.idx') / 1024:.1f} KB, loaded in {load * 1000:.2f} ms")
+    print(f"{'lookup':<32} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for name, found in (("offset index + readNodeAt", indexed), ("full parse + byId", parsed)):
+        ordered = sorted(found)
+        print(f"{name:<32} {statistics.median(ordered):>9.2f} {ordered[int(len(ordered) * 0.99)]:>9.2f} {statistics.fmean(ordered):>9.2f}")
+
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
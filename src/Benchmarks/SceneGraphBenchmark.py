@@ -0,0 +1,88 @@
+import argparse
+import time
+from typing import Callable, List, Tuple
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+
+def connectionRecords(document) -> List[list]:
+    """
+    Get the property lists of the "C" records, the way consumers used to read them.
+
+    Args:
+        document (FBXDocument): The parsed document.
+
+    Returns:
+        List[list]: The properties of every connection.
+
+    """
+    return [node.properties for node in document.find("Connections/C")]
+
+
+def descendantsScanning(document, records: List[list], objectId: int, name: str) -> List[FBXDocumentNode]:
+    """
+    Find the objects below an object by scanning all connections for every visited object.
+
+    Args:
+        document (FBXDocument): The parsed document.
+        records (List[list]): The connection property lists.
+        objectId (int): The object to start from.
+        name (str): The node name of the objects to return.
+
+    Returns:
+        List[FBXDocumentNode]: The matching objects.
+
+    """
+    found, queue, seen = [], [objectId], {objectId}
+    for parent in queue:
+        for properties in records:
+            if properties[2] == parent and properties[1] not in seen:
+                seen.add(properties[1])
+                queue.append(properties[1])
+                node = document.byId(properties[1])
+                if node is not None and node.name == name:
+                    found.append(node)
+
+    return found
+
+
+def timeIt(action: Callable[[], object]) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = action()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Build and query time of the scene graph compared with scanning the connection records.")
+    arguments.add_argument("--connections", type=int, default=100_000)
+    arguments.add_argument("--queries", type=int, default=200)
+    options = arguments.parse_args()
+
+    buffer = SyntheticFBXGenerator.generateScene(options.connections)
+    document = FBXDocumentParser.fromBuffer(buffer)
+    document.index
+
+    seconds, graph = timeIt(lambda: document.sceneGraph)
+    print(f"{len(graph)} objects, {graph.connectionCount} connections: built in {seconds * 1000:.1f} ms ({graph.connectionCount / seconds:,.0f} connections/s)")
+
+    models = [node.properties[0] for node in document.find("Objects/Model")]
+    step = max(len(models) // options.queries, 1)
+    # deep subtrees are expensive to scan, query Models spread over the tree
+    queried = models[::step][:options.queries]
+
+    seconds, found = timeIt(lambda: [graph.descendants(objectId, "Geometry") for objectId in queried])
+    print(f"descendants Geometry: {seconds / len(queried) * 1e6:,.1f} us/query ({sum(map(len, found))} found)")
+
+    seconds, found = timeIt(lambda: [graph.deformers(objectId) for objectId in models])
+    print(f"deformers per Model:  {seconds / len(models) * 1e6:,.1f} us/query ({sum(map(len, found))} found)")
+
+    seconds, found = timeIt(lambda: [graph.children(objectId, "Geometry") for objectId in models])
+    print(f"children Geometry:    {seconds / len(models) * 1e6:,.1f} us/query")
+
+    records = connectionRecords(document)
+    sample = queried[-min(len(queried), 5):]
+    scanSeconds, scanned = timeIt(lambda: [descendantsScanning(document, records, objectId, "Geometry") for objectId in sample])
+    graphSeconds, found = timeIt(lambda: [graph.descendants(objectId, "Geometry") for objectId in sample])
+    assert [[node.properties[0] for node in nodes] for nodes in scanned] == [[node.properties[0] for node in nodes] for nodes in found]
+    print(f"\ndescendants Geometry of {len(sample)} Models: scanning connections {scanSeconds / len(sample) * 1e6:,.1f} us/query, scene graph {graphSeconds / len(sample) * 1e6:,.1f} us/query ({scanSeconds / graphSeconds:,.0f}x)")
@@ -0,0 +1,69 @@
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Serializers.FBXDocumentSerializer import FBXDocumentSerializer
+from Infrastructure.Serializers.FBXDocumentStreamSerializer import FBXDocumentStreamSerializer
+
+
+def peakRSS() -> int:
+    """
+    Get the peak resident set size of this process in MB.
+
+    Returns:
+        int: The peak resident set size in MB.
+
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 2**20 if sys.platform == "darwin" else peak // 2**10
+
+
+def serializeInProcess(mode: str, source: str) -> None:
+    """
+    Parse and serialize a file in this process, printing the peak RSS after each step.
+
+    Args:
+        mode (str): "dumps" for the in-memory string, "stream" for the streaming serializer.
+        source (str): The path of the FBX file.
+
+    """
+    document = FBXDocumentParser.fromFile(source)
+    parsed = peakRSS()
+
+    with open(os.devnull, "w") as file:
+        if mode == "dumps":
+            file.write(FBXDocumentSerializer.serialize(document))
+        else:
+            FBXDocumentStreamSerializer.serialize(document, file)
+
+    print(parsed, peakRSS())
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Peak RSS of the in-memory and the streaming JSON serializer.")
+    arguments.add_argument("--meshes", type=int, default=8)
+    arguments.add_argument("--vertices", type=int, default=250_000)
+    arguments.add_argument("--child", nargs=2, metavar=("MODE", "SOURCE"), help=argparse.SUPPRESS)
+    options = arguments.parse_args()
+
+    if options.child:
+        serializeInProcess(*options.child)
+        sys.exit(0)
+
+    with tempfile.NamedTemporaryFile(suffix=".fbx", delete=False) as file:
+        file.write(SyntheticFBXGenerator.generateMeshes(options.meshes, options.vertices))
+        source = file.name
+
+    try:
+        print(f"source: {os.path.getsize(source) / 2**20:.1f} MB")
+        print(f"{'mode':<8} {'after parse (MB)':>17} {'peak (MB)':>10} {'serialize (MB)':>15}")
+        for mode in ("dumps", "stream"):
+            result = subprocess.run([sys.executable, "-m", "Benchmarks.SerializeMemoryBenchmark", "--child", mode, source], capture_output=True, text=True, check=True)
+            parsed, peak = map(int, result.stdout.split())
+            print(f"{mode:<8} {parsed:>17} {peak:>10} {peak - parsed:>15}")
+    finally:
+        os.remove(source)
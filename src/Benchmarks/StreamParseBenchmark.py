@@ -0,0 +1,77 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Parser.FBXStreamParser import FBXStreamParser
+
+
+def parseDocument(source: str) -> int:
+    """
+    Parse a file into a document, reading it as a whole.
+
+    Args:
+        source (str): The path of the FBX file.
+
+    Returns:
+        int: The number of nodes.
+
+    """
+    with open(source, "rb") as file:
+        document = FBXDocumentParser.fromBuffer(file.read())
+
+    count, stack = 0, [document.topLevelDocument]
+    while stack:
+        children = stack.pop().children
+        count += len(children)
+        stack.extend(children)
+    return count
+
+
+def parseStream(source: str, chunkSize: int) -> int:
+    """
+    Parse a file as a stream of events, dropping every node once its event has been seen.
+
+    Args:
+        source (str): The path of the FBX file.
+        chunkSize (int): The read-ahead size in bytes.
+
+    Returns:
+        int: The number of nodes.
+
+    """
+    return sum(event.kind == FBXStreamParser.START for event in FBXStreamParser.parse(source, chunkSize))
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Throughput and traced peak memory of the streaming parser compared with a whole file parse.")
+    arguments.add_argument("--profile", choices=sorted(SyntheticFBXGenerator.PROFILES), default="mixed-7500")
+    arguments.add_argument("--chunk-sizes", dest="chunkSizes", type=int, nargs="+", default=[4096, 65536, 1048576])
+    options = arguments.parse_args()
+
+    with tempfile.NamedTemporaryFile(suffix=".fbx", delete=False) as file:
+        file.write(SyntheticFBXGenerator.generateProfile(SyntheticFBXGenerator.PROFILES[options.profile]))
+        source = file.name
+
+    try:
+        megabytes = os.path.getsize(source) / 2**20
+        print(f"source: {options.profile}, {megabytes:.1f} MB")
+        print(f"{'parser':<16} {'nodes':>9} {'MB/s':>8} {'peak (MB)':>10}")
+
+        runs = [("document", lambda: parseDocument(source))]
+        runs += [(f"stream {chunkSize // 1024}K", lambda chunkSize=chunkSize: parseStream(source, chunkSize)) for chunkSize in options.chunkSizes]
+        for name, run in runs:
+            start = time.perf_counter()
+            nodes = run()
+            seconds = time.perf_counter() - start
+
+            tracemalloc.start()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{name:<16} {nodes:>9} {megabytes / seconds:>8.2f} {peak / 2**20:>10.2f}")
+    finally:
+        os.remove(source)
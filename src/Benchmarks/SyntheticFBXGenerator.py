@@ -0,0 +1,444 @@
+import random
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+# Common Properties70 "P" records: name, type and label
+PROPERTIES70 = [
+    ("Lcl Translation", "Lcl Translation", ""),
+    ("Lcl Rotation", "Lcl Rotation", ""),
+    ("Lcl Scaling", "Lcl Scaling", ""),
+    ("DiffuseColor", "Color", ""),
+    ("AmbientColor", "Color", ""),
+    ("RotationOrder", "enum", ""),
+    ("DefaultAttributeIndex", "int", "Integer"),
+    ("InheritType", "enum", ""),
+    ("Visibility Inheritance", "bool", ""),
+]
+
+
+class SyntheticFBXProfile(NamedTuple):
+    """
+    The size and shape of a generated file, see SyntheticFBXGenerator.generateProfile.
+
+    Every node gets one kind of property list, picked at random by weight: primitives
+    (an id, a double and an int), a string, a blob, a numeric array or a Properties70 "P"
+    record (four strings followed by three doubles, or by an int).
+
+    Attributes:
+        nodeCount (int): The number of nodes.
+        depth (int): The nesting depth of a chain of nodes.
+        arrayLength (int): The number of elements of array properties.
+        stringLength (int): The length of string properties.
+        blobLength (int): The length in bytes of blob ("R") properties.
+        weights (Tuple[int, ...]): The weights of primitive, string, blob, array and "P" record property lists, missing weights are 0.
+        compressArrays (bool): Whether array properties are zlib compressed.
+        versionNumber (int): The FBX version, 7500 and up write 64-bit node records.
+        seed (int): The random seed, equal profiles generate equal files.
+    """
+
+    nodeCount: int
+    depth: int = 4
+    arrayLength: int = 1024
+    stringLength: int = 32
+    blobLength: int = 4096
+    weights: Tuple[int, ...] = (1, 0, 0, 0)
+    compressArrays: bool = True
+    versionNumber: int = 7400
+    seed: int = 0
+
+
+class SyntheticFBXGenerator:
+    """
+    Writer for deterministic synthetic binary FBX files, used to feed the benchmarks.
+
+    Properties are passed as (typeCode, value) tuples using the FBX type codes,
+    array type codes take a list of values (or an array.array, written as is).
+
+    Args:
+        versionNumber (int): The FBX version number written to the header.
+        compressArrays (bool): Whether array properties are zlib compressed.
+
+    """
+
+    __buffer: bytearray
+    __versionNumber: int
+    __compressArrays: bool
+    __openNodes: List[List[int]]
+
+    # Named benchmark profiles
+    PROFILES: Dict[str, SyntheticFBXProfile] = {
+        "nodes": SyntheticFBXProfile(200_000, depth=8),
+        "nodes-7500": SyntheticFBXProfile(200_000, depth=8, versionNumber=7500),
+        "strings": SyntheticFBXProfile(100_000, stringLength=64, weights=(1, 4, 0, 0)),
+        "blobs": SyntheticFBXProfile(2_000, blobLength=16_384, weights=(1, 0, 4, 0)),
+        "arrays": SyntheticFBXProfile(400, depth=2, arrayLength=20_000, weights=(1, 0, 0, 4)),
+        "arrays-raw": SyntheticFBXProfile(400, depth=2, arrayLength=20_000, weights=(1, 0, 0, 4), compressArrays=False),
+        "mixed-7500": SyntheticFBXProfile(20_000, arrayLength=1_024, weights=(8, 4, 1, 2), versionNumber=7500),
+        "properties": SyntheticFBXProfile(100_000, weights=(1, 0, 0, 0, 8)),
+    }
+
+    __PRIMITIVE_FORMATS = {"Y": "<h", "C": "<?", "I": "<i", "F": "<f", "D": "<d", "L": "<q", "B": "<H"}
+    __ARRAY_FORMATS = {"f": "f", "d": "d", "l": "q", "i": "i", "b": "?"}
+
+    def __init__(self: 'SyntheticFBXGenerator', versionNumber: int = 7400, compressArrays: bool = False) -> None:
+        self.__versionNumber = versionNumber
+        self.__compressArrays = compressArrays
+        self.__openNodes = [[0, 0]]
+        self.__buffer = bytearray(b"Kaydara FBX Binary  \x00\x1a\x00")
+        self.__buffer += struct.pack("<I", versionNumber)
+
+    @property
+    def __recordFormat(self: 'SyntheticFBXGenerator') -> str:
+        """Get the struct format of the fixed node record header."""
+        return "<QQQ" if self.__versionNumber >= 7500 else "<III"
+
+    def __encodeProperty(self: 'SyntheticFBXGenerator', typeCode: str, value: Any) -> bytes:
+        """
+        Encode a single property including its type code.
+
+        Args:
+            typeCode (str): The FBX type code of the property.
+            value (Any): The value to encode.
+
+        Returns:
+            bytes: The encoded property.
+
+        """
+        if typeCode in self.__PRIMITIVE_FORMATS:
+            return typeCode.encode() + struct.pack(self.__PRIMITIVE_FORMATS[typeCode], value)
+        elif typeCode in self.__ARRAY_FORMATS:
+            if isinstance(value, array) and value.typecode == self.__ARRAY_FORMATS[typeCode] and sys.byteorder == "little":
+                content = value.tobytes()
+            else:
+                content = struct.pack(f"<{len(value)}{self.__ARRAY_FORMATS[typeCode]}", *value)
+            encoding = 0
+            if self.__compressArrays:
+                content, encoding = zlib.compress(content), 1
+            return typeCode.encode() + struct.pack("<III", len(value), encoding, len(content)) + content
+        elif typeCode in ("S", "R"):
+            content = value.encode("latin-1") if typeCode == "S" else bytes(value)
+            return typeCode.encode() + struct.pack("<I", len(content)) + content
+
+        raise ValueError(f"Unknown type code: {typeCode}")
+
+    def beginNode(self: 'SyntheticFBXGenerator', name: str, properties: List[Tuple[str, Any]] = []) -> None:
+        """
+        Open a node nested in the currently open node.
+
+        Args:
+            name (str): The name of the node.
+            properties (List[Tuple[str, Any]]): The (typeCode, value) properties of the node.
+
+        """
+        encoded = b"".join(self.__encodeProperty(typeCode, value) for typeCode, value in properties)
+        encodedName = name.encode("latin-1")
+
+        self.__openNodes[-1][1] += 1
+        self.__openNodes.append([len(self.__buffer), 0])
+        self.__buffer += struct.pack(self.__recordFormat, 0, len(properties), len(encoded))
+        self.__buffer += struct.pack("<B", len(encodedName)) + encodedName + encoded
+
+    def endNode(self: 'SyntheticFBXGenerator') -> None:
+        """
+        Close the currently open node, nodes with children get terminated by a null record.
+        """
+        startOffset, childCount = self.__openNodes.pop()
+        if childCount:
+            self.__buffer += bytes(struct.calcsize(self.__recordFormat) + 1)
+
+        self.__buffer[startOffset:startOffset + struct.calcsize(self.__recordFormat[:2])] = struct.pack(self.__recordFormat[:2], len(self.__buffer))
+
+    def build(self: 'SyntheticFBXGenerator') -> bytes:
+        """
+        Close the top level node list and return the file contents.
+
+        Returns:
+            bytes: The synthetic FBX file.
+
+        """
+        assert len(self.__openNodes) == 1, "Unclosed nodes left"
+
+        return bytes(self.__buffer + bytes(struct.calcsize(self.__recordFormat) + 1))
+
+    @staticmethod
+    def generate(nodeCount: int, depth: int = 4, versionNumber: int = 7400) -> bytes:
+        """
+        Generate a file with roughly nodeCount nodes, grouped in nested chains.
+
+        Every chain nests depth "Model" nodes, each holding a leaf "P" node
+        with a small Properties70-like property list.
+
+        Args:
+            nodeCount (int): The number of nodes to generate.
+            depth (int): The nesting depth of a single chain.
+            versionNumber (int): The FBX version number written to the header.
+
+        Returns:
+            bytes: The synthetic FBX file.
+
+        """
+        generator = SyntheticFBXGenerator(versionNumber)
+        generator.beginNode("Objects")
+        written = 1
+
+        while written < nodeCount:
+            levels = 0
+            while levels < depth and written < nodeCount:
+                generator.beginNode("Model", [("L", written), ("S", f"Model{written}")])
+                generator.beginNode("P", [("S", "Lcl Translation"), ("D", 1.0)])
+                generator.endNode()
+                levels, written = levels + 1, written + 2
+
+            for _ in range(levels):
+                generator.endNode()
+
+        generator.endNode()
+
+        return generator.build()
+
+    @staticmethod
+    def generateMeshes(meshCount: int, vertexCount: int, versionNumber: int = 7400, compressArrays: bool = True) -> bytes:
+        """
+        Generate a file holding meshCount Geometry nodes with vertexCount vertices each.
+
+        Every Geometry holds a "d" Vertices array and an "i" PolygonVertexIndex array of quads.
+
+        Args:
+            meshCount (int): The number of Geometry nodes.
+            vertexCount (int): The number of vertices per Geometry node.
+            versionNumber (int): The FBX version number written to the header.
+            compressArrays (bool): Whether the arrays are zlib compressed.
+
+        Returns:
+            bytes: The synthetic FBX file.
+
+        """
+        generator = SyntheticFBXGenerator(versionNumber, compressArrays)
+        vertices = [index * 0.5 for index in range(vertexCount * 3)]
+        polygonVertexIndex = [index if index % 4 != 3 else -index - 1 for index in range(vertexCount * 4)]
+
+        generator.beginNode("Objects")
+        for mesh in range(meshCount):
+            generator.beginNode("Geometry", [("L", mesh), ("S", f"Mesh{mesh}\x00\x01Geometry"), ("S", "Mesh")])
+            generator.beginNode("Vertices", [("d", vertices)])
+            generator.endNode()
+            generator.beginNode("PolygonVertexIndex", [("i", polygonVertexIndex)])
+            generator.endNode()
+            generator.endNode()
+        generator.endNode()
+
+        return generator.build()
+
+    @staticmethod
+    def generateScene(connectionCount: int, fanout: int = 4, versionNumber: int = 7400) -> bytes:
+        """
+        Generate a scene graph of roughly connectionCount connections.
+
+        Models form a tree (fanout children per Model, the first one below the scene root 0), every
+        Model holds a Geometry and a Material with a Texture on its "DiffuseColor", every other Geometry
+        is skinned: a Skin deformer with two Clusters, each bound to a bone Model.
+
+        Args:
+            connectionCount (int): The approximate number of "C" records.
+            fanout (int): The number of child Models per Model.
+            versionNumber (int): The FBX version number written to the header.
+
+        Returns:
+            bytes: The synthetic FBX file.
+
+        """
+        modelCount = max(connectionCount * 2 // 13, 1)
+        generator = SyntheticFBXGenerator(versionNumber)
+        connections = []
+
+        generator.beginNode("Objects")
+        for model in range(modelCount):
+            modelId, geometryId, materialId, textureId = 1_000_000 + model, 2_000_000 + model, 3_000_000 + model, 4_000_000 + model
+            for objectId, name, subclass in ((modelId, "Model", "Mesh"), (geometryId, "Geometry", "Mesh"), (materialId, "Material", ""), (textureId, "Texture", "")):
+                generator.beginNode(name, [("L", objectId), ("S", f"{name}{model}\x00\x01{name}"), ("S", subclass)])
+                generator.endNode()
+
+            connections.append(("OO", modelId, 1_000_000 + (model - 1) // fanout if model else 0))
+            connections.append(("OO", geometryId, modelId))
+            connections.append(("OO", materialId, modelId))
+            connections.append(("OP", textureId, materialId, "DiffuseColor"))
+
+            if model % 2:
+                skinId = 5_000_000 + model
+                generator.beginNode("Deformer", [("L", skinId), ("S", f"Skin{model}\x00\x01Deformer"), ("S", "Skin")])
+                generator.endNode()
+                connections.append(("OO", skinId, geometryId))
+                for cluster in range(2):
+                    clusterId = 6_000_000 + model * 2 + cluster
+                    generator.beginNode("Deformer", [("L", clusterId), ("S", f"Cluster{model}_{cluster}\x00\x01SubDeformer"), ("S", "Cluster")])
+                    generator.endNode()
+                    connections.append(("OO", clusterId, skinId))
+                    connections.append(("OO", 1_000_000 + (model + cluster) % modelCount, clusterId))
+        generator.endNode()
+
+        generator.beginNode("Connections")
+        for connection in connections:
+            typeCodes = ("S", "L", "L", "S")
+            generator.beginNode("C", list(zip(typeCodes, connection)))
+            generator.endNode()
+        generator.endNode()
+
+        return generator.build()
+
+    @staticmethod
+    def generateGridMesh(columns: int, rows: int, versionNumber: int = 7400, compressArrays: bool = False) -> bytes:
+        """
+        Generate a file holding a single Geometry: a grid of columns x rows quads.
+
+        The Geometry holds Vertices (one per grid point), PolygonVertexIndex, a LayerElementNormal mapped
+        ByPolygonVertex / Direct and a LayerElementUV mapped ByPolygonVertex / IndexToDirect, the way
+        modelling tools export meshes.
+
+        Args:
+            columns (int): The number of quads along x.
+            rows (int): The number of quads along y.
+            versionNumber (int): The FBX version number written to the header.
+            compressArrays (bool): Whether the arrays are zlib compressed.
+
+        Returns:
+            bytes: The synthetic FBX file.
+
+        """
+        stride = columns + 1
+        vertices, uv = array("d"), array("d")
+        for y in range(rows + 1):
+            for x in range(stride):
+                vertices.extend((float(x), float(y), 0.0))
+                uv.extend((x / columns, y / rows))
+
+        polygonVertexIndex = array("i")
+        for y in range(rows):
+            for x in range(columns):
+                corner = y * stride + x
+                polygonVertexIndex.extend((corner, corner + 1, corner + stride + 1, ~(corner + stride)))
+
+        uvIndex = array("i", [value if value >= 0 else ~value for value in polygonVertexIndex])
+        normals = array("d", (0.0, 0.0, 1.0)) * len(polygonVertexIndex)
+
+        generator = SyntheticFBXGenerator(versionNumber, compressArrays)
+        generator.beginNode("Objects")
+        generator.beginNode("Geometry", [("L", 1), ("S", "Grid\x00\x01Geometry"), ("S", "Mesh")])
+        for name, properties in (("Vertices", [("d", vertices)]), ("PolygonVertexIndex", [("i", polygonVertexIndex)])):
+            generator.beginNode(name, properties)
+            generator.endNode()
+
+        for element, children in (
+            ("LayerElementNormal", [("Name", [("S", "")]), ("MappingInformationType", [("S", "ByPolygonVertex")]), ("ReferenceInformationType", [("S", "Direct")]), ("Normals", [("d", normals)])]),
+            ("LayerElementUV", [("Name", [("S", "map1")]), ("MappingInformationType", [("S", "ByPolygonVertex")]), ("ReferenceInformationType", [("S", "IndexToDirect")]), ("UV", [("d", uv)]), ("UVIndex", [("i", uvIndex)])]),
+        ):
+            generator.beginNode(element, [("I", 0)])
+            for name, properties in children:
+                generator.beginNode(name, properties)
+                generator.endNode()
+            generator.endNode()
+
+        generator.endNode()
+        generator.endNode()
+
+        return generator.build()
+
+    @staticmethod
+    def generateProfile(profile: SyntheticFBXProfile) -> bytes:
+        """
+        Generate a file of the size and shape of a profile, deterministically from its seed.
+
+        Nodes are nested in chains of profile.depth "Model" nodes below a top level "Objects" node.
+
+        Args:
+            profile (SyntheticFBXProfile): The size and shape of the file.
+
+        Returns:
+            bytes: The synthetic FBX file.
+
+        """
+        rng = random.Random(profile.seed)
+        generator = SyntheticFBXGenerator(profile.versionNumber, profile.compressArrays)
+        alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 |"
+
+        # a few arrays and blobs generated upfront and reused, so generating stays fast for large profiles
+        doubles = [[round(rng.uniform(-100.0, 100.0), 3) for _ in range(profile.arrayLength)] for _ in range(4)]
+        ints = [[rng.randrange(-2**20, 2**20) for _ in range(profile.arrayLength)] for _ in range(4)]
+        blobs = [rng.randbytes(profile.blobLength) for _ in range(4)]
+
+        def properties(index: int) -> List[Tuple[str, Any]]:
+            kind = rng.choices(range(len(profile.weights)), profile.weights)[0]
+            if kind == 1:
+                return [("S", "".join(rng.choices(alphabet, k=profile.stringLength)))]
+            elif kind == 2:
+                return [("R", rng.choice(blobs))]
+            elif kind == 3:
+                return [("d", rng.choice(doubles))] if rng.random() < 0.5 else [("i", rng.choice(ints))]
+            elif kind == 4:
+                name, typeName, label = rng.choice(PROPERTIES70)
+                if typeName in ("int", "enum", "bool"):
+                    return [("S", name), ("S", typeName), ("S", label), ("S", ""), ("I", rng.randrange(8))]
+                return [("S", name), ("S", typeName), ("S", label), ("S", "A"), ("D", rng.random()), ("D", rng.random()), ("D", rng.random())]
+            return [("L", index), ("D", rng.random()), ("I", rng.randrange(2**31))]
+
+        generator.beginNode("Objects")
+        written = 1
+        while written < profile.nodeCount:
+            levels = 0
+            while levels < profile.depth and written < profile.nodeCount:
+                generator.beginNode("Model", properties(written))
+                levels, written = levels + 1, written + 1
+
+            for _ in range(levels):
+                generator.endNode()
+        generator.endNode()
+
+        return generator.build()
+
+    @staticmethod
+    def scale(buffer: bytes, times: int) -> bytes:
+        """
+        Scale up an existing file by repeating its top level node list.
+
+        Records are copied as they are with their endOffsets rebased, properties are
+        position independent so they are copied without being decoded.
+
+        Args:
+            buffer (bytes): The FBX file to scale up.
+            times (int): How often the top level node list gets repeated.
+
+        Returns:
+            bytes: The scaled FBX file.
+
+        """
+        versionNumber = struct.unpack_from("<I", buffer, 23)[0]
+        recordFormat = "<QQQB" if versionNumber >= 7500 else "<IIIB"
+        recordLength = struct.calcsize(recordFormat)
+
+        records, offset, depth = [], 27, 0
+        while depth >= 0:
+            endOffset, _, propertyListLen, nameLen = struct.unpack_from(recordFormat, buffer, offset)
+            if endOffset == 0:
+                records.append((offset, recordLength + nameLen, 0))
+                offset, depth = offset + recordLength, depth - 1
+                continue
+
+            propertiesEnd = offset + recordLength + nameLen + propertyListLen
+            records.append((offset, propertiesEnd - offset, endOffset))
+            if propertiesEnd < endOffset:
+                depth += 1
+            offset = propertiesEnd
+
+        topLevelEnd = records.pop()[0]
+        body, output = topLevelEnd - 27, bytearray(buffer[:27])
+        for copy in range(times):
+            delta = copy * body
+            for start, length, endOffset in records:
+                record = bytearray(buffer[start:start + length])
+                if endOffset:
+                    struct.pack_into(recordFormat[:2], record, 0, endOffset + delta)
+                output += record
+
+        return bytes(output + buffer[topLevelEnd:])
@@ -0,0 +1,39 @@
+import argparse
+import time
+from typing import Callable
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXTableOfContents import FBXTableOfContents
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+
+def bestOf(repeat: int, action: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Outline extraction: table of contents scan against a full parse.")
+    arguments.add_argument("--profiles", nargs="+", choices=sorted(SyntheticFBXGenerator.PROFILES), default=["nodes", "mixed-7500", "arrays", "properties"])
+    arguments.add_argument("--repeat", type=int, default=3)
+    options = arguments.parse_args()
+
+    print(f"{'profile':<12} {'MB':>7} {'nodes':>8} {'full parse s':>13} {'toc scan s':>11} {'speedup':>8} {'toc KB':>8} {'load s':>8} {'seek+decode ms':>15}")
+    for profile in options.profiles:
+        buffer = SyntheticFBXGenerator.generateProfile(SyntheticFBXGenerator.PROFILES[profile])
+
+        parse = bestOf(options.repeat, lambda: FBXDocumentParser.fromBuffer(buffer))
+        scan = bestOf(options.repeat, lambda: FBXDocumentParser.tableOfContents(buffer))
+
+        toc = FBXDocumentParser.tableOfContents(buffer)
+        saved = toc.toBytes()
+        load = bestOf(options.repeat, lambda: FBXTableOfContents.fromBytes(saved))
+
+        # decode the last object on its own, the way a browser opens one entry
+        row = max(row for row, entry in enumerate(toc.entries()) if entry.depth == 2)
+        decode = bestOf(options.repeat, lambda: FBXDocumentParser.readNodeAt(buffer, toc.startOffsets[row], toc.versionNumber))
+
+        print(f"{profile:<12} {len(buffer) / 2**20:>7.1f} {len(toc):>8} {parse:>13.3f} {scan:>11.3f} {parse / scan:>7.1f}x {len(saved) / 1024:>8.0f} {load:>8.4f} {decode * 1000:>15.1f}")
@@ -3,43 +3,55 @@ from typing import Any
 from Domain.Entities.DataView.DataViewResult import DataViewResult
 from Domain.Entities.DataView.DataViewInterface import DataViewInterface
 
+# Precompiled little-endian layouts, compiled once instead of on every read.
+SCHAR = struct.Struct("<b")
+UCHAR = struct.Struct("<B")
+BOOL = struct.Struct("<?")
+SHORT = struct.Struct("<h")
+USHORT = struct.Struct("<H")
+INT32 = struct.Struct("<i")
+UINT32 = struct.Struct("<I")
+INT64 = struct.Struct("<q")
+UINT64 = struct.Struct("<Q")
+FLOAT = struct.Struct("<f")
+DOUBLE = struct.Struct("<d")
+
 
 class DataView:
-    __buffer: bytes
+    __buffer: memoryview
 
     def __init__(self, buffer: bytes) -> None:
         """
         Initialize a DataView object.
 
         Args:
-            buffer (bytes): The buffer containing the data.
+            buffer (bytes): The buffer containing the data, any buffer object (bytes, mmap, memoryview) is read without copying, a memoryview is used as is.
         """
-        self.__buffer = buffer
+        self.__buffer = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
         
 
     @property
-    def targetBuffer(self) -> bytes:
+    def targetBuffer(self) -> memoryview:
         """
         Get the target buffer.
 
         Returns:
-            bytes: The target buffer.
+            memoryview: A view over the target buffer, slices of it do not copy.
         """
         return self.__buffer
 
-    def __readValueFromBuffer(self, typeCode: str, offset: int, byteLength: int) -> list[Any, int, int]:
+    def readStruct(self, layout: struct.Struct, offset: int) -> tuple:
         """
-        Read a value from the buffer based on the given type code.
+        Read a fixed-layout record from the buffer in a single call.
 
         Args:
-            typeCode (str): The type code representing the data type.
+            layout (struct.Struct): The precompiled layout of the record.
             offset (int): The starting offset in the buffer.
-            byteLength (int): The length in bytes of the value to be read.
 
         Returns:
-            list[Any, int, int]: A list containing the value read from the buffer, start offset, and end offset.
+            tuple: The unpacked fields of the record.
         """
-        return struct.unpack(f"<{typeCode}", self.targetBuffer[offset:offset+byteLength])[0], offset, offset+byteLength
+        return layout.unpack_from(self.__buffer, offset)
 
     def readChar(self, offset: int) -> DataViewResult:
         """
@@ -51,7 +63,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        return DataViewResult(chr(self.targetBuffer[offset]), offset, offset+1)
+        return DataViewResult(chr(self.__buffer[offset]), offset, offset+1)
     
     def readSChar(self, offset: int) -> DataViewResult:
         """
@@ -63,8 +75,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("b", offset, 1);
-        return DataViewResult(value, start, end);
+        return DataViewResult(SCHAR.unpack_from(self.__buffer, offset)[0], offset, offset + 1)
     
     def readUChar(self, offset: int) -> DataViewResult:
         """
@@ -76,8 +87,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("B", offset, 1);
-        return DataViewResult(value, start, end);
+        return DataViewResult(UCHAR.unpack_from(self.__buffer, offset)[0], offset, offset + 1)
 
     
     def readBool(self, offset: int) -> DataViewResult:
@@ -90,8 +100,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("?", offset, 1);
-        return DataViewResult(bool(value), start, end);
+        return DataViewResult(BOOL.unpack_from(self.__buffer, offset)[0], offset, offset + 1)
     
     def readShort(self, offset: int) -> DataViewResult: 
         """
@@ -103,11 +112,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("h", offset, 2);
-        
-        assert value >= -32768 and value <= 32767;
-        
-        return DataViewResult(value, start, end);
+        return DataViewResult(SHORT.unpack_from(self.__buffer, offset)[0], offset, offset + 2)
     
     def readUShort(self, offset: int) -> DataViewResult: 
         """
@@ -119,11 +124,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("H", offset, 2);
-        
-        assert value >= 0 and value <= 65535;
-        
-        return DataViewResult(value, start, end);
+        return DataViewResult(USHORT.unpack_from(self.__buffer, offset)[0], offset, offset + 2)
     
 
     def readInt32(self, offset: int) -> DataViewResult:
@@ -136,11 +137,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("i", offset, 4)
-        
-        assert value >= -2147483648 and value <= 2147483647;
-        
-        return DataViewResult(value, start, end)
+        return DataViewResult(INT32.unpack_from(self.__buffer, offset)[0], offset, offset + 4)
 
 
     def readUInt32(self, offset: int) -> DataViewResult:
@@ -153,10 +150,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("I", offset, 4)
-        
-        
-        return DataViewResult(value, start, end)
+        return DataViewResult(UINT32.unpack_from(self.__buffer, offset)[0], offset, offset + 4)
     
     def readLong(self, offset: int) -> DataViewResult:
         """
@@ -168,8 +162,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("l", offset, 4)
-        return DataViewResult(value, start, end)
+        return DataViewResult(INT32.unpack_from(self.__buffer, offset)[0], offset, offset + 4)
         
     def readULong(self, offset: int) -> DataViewResult:
         """
@@ -181,8 +174,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("L", offset, 4)
-        return DataViewResult(value, start, end)
+        return DataViewResult(UINT32.unpack_from(self.__buffer, offset)[0], offset, offset + 4)
         
 
     def readInt64(self, offset: int) -> DataViewResult:
@@ -195,8 +187,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("q", offset, 8)
-        return DataViewResult(value, start, end)
+        return DataViewResult(INT64.unpack_from(self.__buffer, offset)[0], offset, offset + 8)
 
 
     def readUInt64(self, offset: int) -> DataViewResult:
@@ -209,8 +200,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("Q", offset, 8)
-        return DataViewResult(value, start, end)
+        return DataViewResult(UINT64.unpack_from(self.__buffer, offset)[0], offset, offset + 8)
 
 
     def readFloat(self, offset: int) -> DataViewResult:
@@ -223,8 +213,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("f", offset, 4)
-        return DataViewResult(value, start, end)
+        return DataViewResult(FLOAT.unpack_from(self.__buffer, offset)[0], offset, offset + 4)
 
     def readDouble(self, offset: int) -> DataViewResult:
         """
@@ -236,8 +225,7 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        value, start, end = self.__readValueFromBuffer("d", offset, 8)
-        return DataViewResult(value, start, end)
+        return DataViewResult(DOUBLE.unpack_from(self.__buffer, offset)[0], offset, offset + 8)
 
     def readString(self, offset: int, length: int, encoding: str = "latin-1") -> DataViewResult:
         """
@@ -251,5 +239,5 @@ class DataView:
         Returns:
             DataViewResult: The result containing the value, start offset, and end offset.
         """
-        return DataViewResult(self.__buffer[offset:offset+length].decode(encoding), offset, offset+length)
+        return DataViewResult(str(self.__buffer[offset:offset+length], encoding), offset, offset+length)
  
\ No newline at end of file
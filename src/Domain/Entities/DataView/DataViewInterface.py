@@ -1,14 +1,20 @@
 import abc
+import struct
 from typing import Any
 from Domain.Entities.DataView.DataViewResult import DataViewResult
 
 
 class DataViewInterface(abc.ABC):
     @abc.abstractproperty
-    def targetBuffer(self) -> bytes:
+    def targetBuffer(self) -> memoryview:
         """ Get the target buffer. """
         raise NotImplementedError(f"{self.__class__.__name__}: targetBuffer() not implemented.")
 
+    @abc.abstractmethod
+    def readStruct(self, layout: struct.Struct, offset: int) -> tuple:
+        """ Read a fixed-layout record from the buffer. """
+        raise NotImplementedError(f"{self.__class__.__name__}: readStruct() not implemented.")
+
     @abc.abstractmethod
     def readChar(self, offset: int) -> DataViewResult:
         """ Read a character from the buffer. """
@@ -1,21 +1,65 @@
+import mmap
+from typing import List
 from Domain.Entities.Document.FBXDocumentHeader import FBXDocumentHeader
+from Domain.Entities.Document.FBXDocumentIndex import FBXDocumentIndex
 from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Domain.Entities.Document.FBXSceneGraph import FBXSceneGraph
 
 
 class FBXDocument:
     __header: FBXDocumentHeader
     __topLevelDocument: FBXDocumentNode
+    __index: FBXDocumentIndex
+    __sceneGraph: FBXSceneGraph
+    __mapping: mmap.mmap
 
-    def __init__(self: 'FBXDocument', header: FBXDocumentHeader, topLevelDocument: FBXDocumentNode):
+    def __init__(self: 'FBXDocument', header: FBXDocumentHeader, topLevelDocument: FBXDocumentNode, mapping: mmap.mmap = None):
         """
         Initialize an FBXDocument object.
 
         Args:
             header (FBXDocumentHeader): The FBX document header.
             topLevelDocument (FBXDocumentNode): The top-level document node.
+            mapping (mmap.mmap, optional): The memory mapping of the file the properties are views of, closed by close(). Defaults to none.
         """
         self.__header = header
         self.__topLevelDocument = topLevelDocument
+        self.__index = None
+        self.__sceneGraph = None
+        self.__mapping = mapping
+
+    def __enter__(self: 'FBXDocument') -> 'FBXDocument':
+        return self
+
+    def __exit__(self: 'FBXDocument', *exception) -> None:
+        self.close()
+
+    def close(self: 'FBXDocument') -> None:
+        """
+        Close the memory mapping of the file, when the document was read through one (see FBXDocumentParser.fromFile).
+
+        The views into the file held by the document (raw properties, uncompressed and lazy arrays) are
+        released first and can no longer be read, materialize them (ie: bytes(view), view.tolist()) before.
+        Closing twice, or a document without mapping, does nothing.
+
+        Raises:
+            BufferError: If views into the file are still referenced outside of the document.
+        """
+        if self.__mapping is None:
+            return
+
+        stack = [self.__topLevelDocument]
+        while stack:
+            node = stack.pop()
+            for value in node.properties:
+                # memoryviews, and lazy arrays holding one
+                release = getattr(value, "release", None)
+                if release is not None:
+                    release()
+            stack.extend(node.children)
+
+        self.__mapping.close()
+        self.__mapping = None
     
     @property 
     def header(self: 'FBXDocument') -> FBXDocumentHeader:
@@ -37,3 +81,45 @@ class FBXDocument:
             FBXDocumentNode: The top-level document node.
         """
         return self.__topLevelDocument
+
+    @property
+    def index(self: 'FBXDocument') -> FBXDocumentIndex:
+        """
+        Get the name, path and object ID index, built on first use.
+
+        Returns:
+            FBXDocumentIndex: The index over the document nodes.
+        """
+        if self.__index is None:
+            self.__index = FBXDocumentIndex(self.__topLevelDocument)
+        return self.__index
+
+    @property
+    def sceneGraph(self: 'FBXDocument') -> FBXSceneGraph:
+        """
+        Get the object graph built from the Connections node, built on first use.
+
+        Returns:
+            FBXSceneGraph: The connections between the objects of the document.
+        """
+        if self.__sceneGraph is None:
+            self.__sceneGraph = FBXSceneGraph(self.__topLevelDocument)
+        return self.__sceneGraph
+
+    def find(self: 'FBXDocument', path: str) -> List[FBXDocumentNode]:
+        """
+        Get the nodes at a path (ie: "Objects/Model"), see FBXDocumentIndex.find.
+        """
+        return self.index.find(path)
+
+    def byName(self: 'FBXDocument', name: str) -> List[FBXDocumentNode]:
+        """
+        Get the nodes with a name, see FBXDocumentIndex.byName.
+        """
+        return self.index.byName(name)
+
+    def byId(self: 'FBXDocument', objectId: int) -> FBXDocumentNode:
+        """
+        Get the object with an int64 ID, see FBXDocumentIndex.byId.
+        """
+        return self.index.byId(objectId)
@@ -0,0 +1,75 @@
+from typing import Dict, List
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+
+
+class FBXDocumentIndex:
+    """
+    Lookup tables over a node tree, mapping node names, node paths and object IDs to nodes.
+
+    Paths are node names joined by "/" from the top level down (ie: "Objects/Model"), object IDs
+    are the first (int64) property of the children of the top level "Objects" node.
+
+    Args:
+        root (FBXDocumentNode): The nameless document root.
+    """
+
+    __byName: Dict[str, List[FBXDocumentNode]]
+    __byPath: Dict[str, List[FBXDocumentNode]]
+    __byId: Dict[int, FBXDocumentNode]
+
+    def __init__(self: 'FBXDocumentIndex', root: FBXDocumentNode) -> None:
+        self.__byName = {}
+        self.__byPath = {}
+        self.__byId = {}
+
+        stack = [(child, child.name) for child in reversed(root.children)]
+        while stack:
+            node, path = stack.pop()
+            self.__byName.setdefault(node.name, []).append(node)
+            self.__byPath.setdefault(path, []).append(node)
+
+            if path.startswith("Objects/") and path.count("/") == 1 and node.properties and type(node.properties[0]) is int:
+                self.__byId[node.properties[0]] = node
+
+            stack.extend((child, f"{path}/{child.name}") for child in reversed(node.children))
+
+    def find(self: 'FBXDocumentIndex', path: str) -> List[FBXDocumentNode]:
+        """
+        Get the nodes at a path, in document order.
+
+        Args:
+            path (str): The "/" separated node path (ie: "Objects/Geometry").
+
+        Returns:
+            List[FBXDocumentNode]: The nodes at the path, a new list the caller may change.
+        """
+        return list(self.__byPath.get(path.strip("/"), ()))
+
+    def byName(self: 'FBXDocumentIndex', name: str) -> List[FBXDocumentNode]:
+        """
+        Get the nodes with a name, in document order.
+
+        Args:
+            name (str): The node name.
+
+        Returns:
+            List[FBXDocumentNode]: The nodes with the name, a new list the caller may change.
+        """
+        return list(self.__byName.get(name, ()))
+
+    def byId(self: 'FBXDocumentIndex', objectId: int) -> FBXDocumentNode:
+        """
+        Get the object with an ID.
+
+        Args:
+            objectId (int): The int64 object ID.
+
+        Returns:
+            FBXDocumentNode: The object node, None when unknown.
+        """
+        return self.__byId.get(objectId)
+
+    @property
+    def paths(self: 'FBXDocumentIndex') -> List[str]:
+        """Get all indexed node paths."""
+        return list(self.__byPath)
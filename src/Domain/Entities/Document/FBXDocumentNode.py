@@ -1,7 +1,10 @@
 from typing import Any, List, Self
+from Domain.Entities.Document.FBXDocumentNodeInterface import FBXDocumentNodeInterface
 
 
-class FBXDocumentNode: 
+class FBXDocumentNode(FBXDocumentNodeInterface):
+    __slots__ = ("__startOffset", "__endOffset", "__propertiesCount", "__propertiesLength", "__name", "__parent", "__properties", "__propertyTypes", "__children")
+
     __startOffset: int
     __endOffset: int
     __propertiesCount: int
@@ -9,8 +12,10 @@ class FBXDocumentNode:
     __name: str
     __parent: 'FBXDocumentNode'
     __properties: List[Any]
+    __propertyTypes: str
+    __children: List['FBXDocumentNode']
     
-    def __init__(self: 'FBXDocumentNode', startOffset: int, endOffset: int, propertiesCount: int, propertiesLength: int, name: str, properties: List[Any], parent: 'FBXDocumentNode' = None) -> None:
+    def __init__(self: 'FBXDocumentNode', startOffset: int, endOffset: int, propertiesCount: int, propertiesLength: int, name: str, properties: List[Any], parent: 'FBXDocumentNode' = None, propertyTypes: str = "") -> None:
         """
         Initialize an FBXDocumentNode object.
 
@@ -21,7 +26,8 @@ class FBXDocumentNode:
             propertiesLength (int): The length of properties in bytes.
             name (str): The name of the node.
             properties (List[Any]): The list of properties in the node.
-            parent (FBXDocumentNode, optional): The parent node. Defaults to None.
+            parent (FBXDocumentNode, optional): The parent node, the node gets appended to its children. Defaults to None.
+            propertyTypes (str, optional): The type codes of the properties, one character per property (ie: "SSI"). Defaults to unknown.
         """
         self.__startOffset = startOffset
         self.__endOffset = endOffset
@@ -30,6 +36,11 @@ class FBXDocumentNode:
         self.__name = name
         self.__parent = parent
         self.__properties = properties
+        self.__propertyTypes = propertyTypes
+        self.__children = []
+
+        if parent is not None:
+            parent.__children.append(self)
         
     @property
     def startOffset(self: 'FBXDocumentNode') -> int: 
@@ -65,4 +76,13 @@ class FBXDocumentNode:
     def properties(self: 'FBXDocumentNode') -> List[Any]: 
         """Get the list of properties in the node."""
         return self.__properties
-    
\ No newline at end of file
+
+    @property
+    def propertyTypes(self: 'FBXDocumentNode') -> str:
+        """Get the type codes of the properties as read from the file, one character per property ("" when unknown)."""
+        return self.__propertyTypes
+    
+    @property
+    def children(self: 'FBXDocumentNode') -> List['FBXDocumentNode']:
+        """Get the nested child nodes."""
+        return self.__children
@@ -0,0 +1,58 @@
+from typing import Any, List
+
+
+class FBXDocumentNodeInterface:
+    """
+    Read interface shared by the document nodes: FBXDocumentNode objects and FBXNodeView rows of a FBXNodeTable.
+
+    Holds no state (empty __slots__), so implementations only pay for their own slots. It is a plain
+    class rather than an abc.ABC: isinstance checks against an ABCMeta class go through a Python level
+    hook, which the serializers would pay for on every property value.
+    """
+
+    __slots__ = ()
+
+    @property
+    def startOffset(self) -> int:
+        """ Get the starting offset of the node. """
+        raise NotImplementedError(f"{self.__class__.__name__}: startOffset() not implemented.")
+
+    @property
+    def endOffset(self) -> int:
+        """ Get the ending offset of the node. """
+        raise NotImplementedError(f"{self.__class__.__name__}: endOffset() not implemented.")
+
+    @property
+    def propertiesCount(self) -> int:
+        """ Get the count of properties in the node. """
+        raise NotImplementedError(f"{self.__class__.__name__}: propertiesCount() not implemented.")
+
+    @property
+    def propertiesLength(self) -> int:
+        """ Get the length of properties in bytes. """
+        raise NotImplementedError(f"{self.__class__.__name__}: propertiesLength() not implemented.")
+
+    @property
+    def name(self) -> str:
+        """ Get the name of the node. """
+        raise NotImplementedError(f"{self.__class__.__name__}: name() not implemented.")
+
+    @property
+    def parent(self) -> 'FBXDocumentNodeInterface':
+        """ Get the parent node. """
+        raise NotImplementedError(f"{self.__class__.__name__}: parent() not implemented.")
+
+    @property
+    def properties(self) -> List[Any]:
+        """ Get the list of properties in the node. """
+        raise NotImplementedError(f"{self.__class__.__name__}: properties() not implemented.")
+
+    @property
+    def propertyTypes(self) -> str:
+        """ Get the type codes of the properties, one character per property. """
+        raise NotImplementedError(f"{self.__class__.__name__}: propertyTypes() not implemented.")
+
+    @property
+    def children(self) -> List['FBXDocumentNodeInterface']:
+        """ Get the nested child nodes. """
+        raise NotImplementedError(f"{self.__class__.__name__}: children() not implemented.")
@@ -0,0 +1,224 @@
+from array import array
+from typing import Any, Dict, List
+from Domain.Entities.Document.FBXDocumentNodeInterface import FBXDocumentNodeInterface
+
+
+class FBXNodeTable:
+    """
+    Columnar storage of document nodes.
+
+    Every node is a row: offsets, property counts/lengths and the links to the parent, first child
+    and next sibling are kept in parallel array('q') columns and names are interned as indices
+    into a list of unique names. Rows are read through FBXNodeView objects created on demand.
+    """
+
+    __slots__ = ("__names", "__nameIds", "__nameIndex", "__startOffsets", "__endOffsets", "__propertiesCounts", "__propertiesLengths", "__parents", "__firstChildren", "__lastChildren", "__nextSiblings", "__properties", "__propertyTypes")
+
+    __names: List[str]
+    __nameIds: array
+    __nameIndex: Dict[str, int]
+    __startOffsets: array
+    __endOffsets: array
+    __propertiesCounts: array
+    __propertiesLengths: array
+    __parents: array
+    __firstChildren: array
+    __lastChildren: array
+    __nextSiblings: array
+    __properties: List[List[Any]]
+    __propertyTypes: List[str]
+
+    def __init__(self: 'FBXNodeTable') -> None:
+        self.__names = []
+        self.__nameIds = array("q")
+        self.__nameIndex = {}
+        self.__startOffsets = array("q")
+        self.__endOffsets = array("q")
+        self.__propertiesCounts = array("q")
+        self.__propertiesLengths = array("q")
+        self.__parents = array("q")
+        self.__firstChildren = array("q")
+        self.__lastChildren = array("q")
+        self.__nextSiblings = array("q")
+        self.__properties = []
+        self.__propertyTypes = []
+
+    def __len__(self: 'FBXNodeTable') -> int:
+        return len(self.__startOffsets)
+
+    def append(self: 'FBXNodeTable', startOffset: int, endOffset: int, propertiesCount: int, propertiesLength: int, name: str, properties: List[Any], parent: int = -1, propertyTypes: str = "") -> int:
+        """
+        Append a node row, linking it as the last child of its parent.
+
+        Args:
+            startOffset (int): The starting offset of the node in the document.
+            endOffset (int): The ending offset of the node in the document.
+            propertiesCount (int): The count of properties in the node.
+            propertiesLength (int): The length of properties in bytes.
+            name (str): The name of the node.
+            properties (List[Any]): The list of properties in the node.
+            parent (int): The row index of the parent node, -1 for none.
+            propertyTypes (str): The type codes of the properties, one character per property.
+
+        Returns:
+            int: The row index of the node.
+        """
+        index = len(self.__startOffsets)
+        nameId = self.__nameIndex.get(name)
+        if nameId is None:
+            nameId = self.__nameIndex[name] = len(self.__names)
+            self.__names.append(name)
+
+        self.__nameIds.append(nameId)
+        self.__startOffsets.append(startOffset)
+        self.__endOffsets.append(endOffset)
+        self.__propertiesCounts.append(propertiesCount)
+        self.__propertiesLengths.append(propertiesLength)
+        self.__parents.append(parent)
+        self.__firstChildren.append(-1)
+        self.__lastChildren.append(-1)
+        self.__nextSiblings.append(-1)
+        self.__properties.append(properties)
+        self.__propertyTypes.append(propertyTypes)
+
+        if parent >= 0:
+            if self.__lastChildren[parent] < 0:
+                self.__firstChildren[parent] = index
+            else:
+                self.__nextSiblings[self.__lastChildren[parent]] = index
+            self.__lastChildren[parent] = index
+
+        return index
+
+    def node(self: 'FBXNodeTable', index: int) -> 'FBXNodeView':
+        """
+        Get a view over a node row.
+
+        Args:
+            index (int): The row index.
+
+        Returns:
+            FBXNodeView: The node view.
+        """
+        return FBXNodeView(self, index)
+
+    def startOffset(self: 'FBXNodeTable', index: int) -> int:
+        """Get the starting offset of a node row."""
+        return self.__startOffsets[index]
+
+    def endOffset(self: 'FBXNodeTable', index: int) -> int:
+        """Get the ending offset of a node row."""
+        return self.__endOffsets[index]
+
+    def propertiesCount(self: 'FBXNodeTable', index: int) -> int:
+        """Get the count of properties of a node row."""
+        return self.__propertiesCounts[index]
+
+    def propertiesLength(self: 'FBXNodeTable', index: int) -> int:
+        """Get the length of properties in bytes of a node row."""
+        return self.__propertiesLengths[index]
+
+    def name(self: 'FBXNodeTable', index: int) -> str:
+        """Get the name of a node row."""
+        return self.__names[self.__nameIds[index]]
+
+    def parent(self: 'FBXNodeTable', index: int) -> int:
+        """Get the row index of the parent of a node row, -1 for none."""
+        return self.__parents[index]
+
+    def properties(self: 'FBXNodeTable', index: int) -> List[Any]:
+        """Get the list of properties of a node row."""
+        return self.__properties[index]
+
+    def propertyTypes(self: 'FBXNodeTable', index: int) -> str:
+        """Get the type codes of the properties of a node row."""
+        return self.__propertyTypes[index]
+
+    def children(self: 'FBXNodeTable', index: int) -> List[int]:
+        """Get the row indices of the children of a node row."""
+        output, child = [], self.__firstChildren[index]
+        while child >= 0:
+            output.append(child)
+            child = self.__nextSiblings[child]
+        return output
+
+
+class FBXNodeView(FBXDocumentNodeInterface):
+    """
+    Thin view over a row of a FBXNodeTable, read like a FBXDocumentNode.
+
+    Args:
+        table (FBXNodeTable): The table holding the node.
+        index (int): The row index of the node.
+    """
+
+    __slots__ = ("__table", "__index")
+
+    __table: FBXNodeTable
+    __index: int
+
+    def __init__(self: 'FBXNodeView', table: FBXNodeTable, index: int) -> None:
+        self.__table = table
+        self.__index = index
+
+    @property
+    def table(self: 'FBXNodeView') -> FBXNodeTable:
+        """Get the table holding the node."""
+        return self.__table
+
+    @property
+    def index(self: 'FBXNodeView') -> int:
+        """Get the row index of the node."""
+        return self.__index
+
+    @property
+    def startOffset(self: 'FBXNodeView') -> int:
+        """Get the starting offset of the node."""
+        return self.__table.startOffset(self.__index)
+
+    @property
+    def endOffset(self: 'FBXNodeView') -> int:
+        """Get the ending offset of the node (ie: the next byte after the node / start of next entry)."""
+        return self.__table.endOffset(self.__index)
+
+    @property
+    def propertiesCount(self: 'FBXNodeView') -> int:
+        """Get the count of properties in the node."""
+        return self.__table.propertiesCount(self.__index)
+
+    @property
+    def propertiesLength(self: 'FBXNodeView') -> int:
+        """Get the length of properties in bytes."""
+        return self.__table.propertiesLength(self.__index)
+
+    @property
+    def name(self: 'FBXNodeView') -> str:
+        """Get the name of the node."""
+        return self.__table.name(self.__index)
+
+    @property
+    def parent(self: 'FBXNodeView') -> 'FBXNodeView':
+        """Get the parent node."""
+        parent = self.__table.parent(self.__index)
+        return FBXNodeView(self.__table, parent) if parent >= 0 else None
+
+    @property
+    def properties(self: 'FBXNodeView') -> List[Any]:
+        """Get the list of properties in the node."""
+        return self.__table.properties(self.__index)
+
+    @property
+    def propertyTypes(self: 'FBXNodeView') -> str:
+        """Get the type codes of the properties as read from the file, one character per property ("" when unknown)."""
+        return self.__table.propertyTypes(self.__index)
+
+    @property
+    def children(self: 'FBXNodeView') -> List['FBXNodeView']:
+        """Get the nested child nodes."""
+        return [FBXNodeView(self.__table, child) for child in self.__table.children(self.__index)]
+
+    def __eq__(self: 'FBXNodeView', other: object) -> bool:
+        return isinstance(other, FBXNodeView) and other.__table is self.__table and other.__index == self.__index
+
+    def __hash__(self: 'FBXNodeView') -> int:
+        return hash((id(self.__table), self.__index))
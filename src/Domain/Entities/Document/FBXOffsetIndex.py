@@ -0,0 +1,220 @@
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, List
+from Domain.Entities.Document.FBXTableOfContents import FBXTableOfContents
+from Infrastructure.Storage.FBXAtomicFile import FBXAtomicFile
+
+# Saved offset index: magic, format version, source modification time (ns), table of contents length, object count
+INDEX_MAGIC = b"FBXIDX\x00"
+INDEX_FORMAT_VERSION = 1
+INDEX_HEADER = struct.Struct("<7sBqQQ")
+
+
+class FBXOffsetIndex:
+    """
+    Per-file index of node record offsets, keyed by node path and by object ID.
+
+    Built without a full parse (see FBXDocumentParser.offsetIndex) and saved next to its file
+    (ie: "scene.fbx.idx"), it lets a node be decoded straight from its offset with
+    FBXDocumentParser.readNodeAt. Paths are node names joined by "/" from the top level down
+    (ie: "Objects/Geometry"), object IDs are the first (int64) property of the children of the top
+    level "Objects" node. Path lookups share the path table of the table of contents (see
+    FBXTableOfContents.find), the ID table is built on the first ID lookup.
+
+    Args:
+        toc (FBXTableOfContents): The outline of the file.
+        objectIds (array): The object IDs (array("q")).
+        objectRows (array): The table of contents row of every object ID (array("q")).
+        sourceModified (int): The modification time of the source file in nanoseconds, 0 when unknown.
+
+    """
+
+    __toc: FBXTableOfContents
+    __objectIds: array
+    __objectRows: array
+    __sourceModified: int
+    __byId: Dict[int, int]
+
+    def __init__(self: 'FBXOffsetIndex', toc: FBXTableOfContents, objectIds: array, objectRows: array, sourceModified: int = 0) -> None:
+        self.__toc = toc
+        self.__objectIds = objectIds
+        self.__objectRows = objectRows
+        self.__sourceModified = sourceModified
+        self.__byId = None
+
+    def __len__(self: 'FBXOffsetIndex') -> int:
+        return len(self.__objectIds)
+
+    @property
+    def toc(self: 'FBXOffsetIndex') -> FBXTableOfContents:
+        """Get the outline of the file."""
+        return self.__toc
+
+    @property
+    def versionNumber(self: 'FBXOffsetIndex') -> int:
+        """Get the FBX version number of the source file."""
+        return self.__toc.versionNumber
+
+    @property
+    def objectIds(self: 'FBXOffsetIndex') -> array:
+        """Get the indexed object IDs, in document order."""
+        return self.__objectIds
+
+    def isCurrent(self: 'FBXOffsetIndex', path: str) -> bool:
+        """
+        Check whether the index still describes a file, by its length and modification time.
+
+        Args:
+            path (str): The path of the FBX file.
+
+        Returns:
+            bool: True when the file has the indexed length and modification time (when known).
+
+        """
+        try:
+            status = os.stat(path)
+        except OSError:
+            return False
+
+        return status.st_size == self.__toc.sourceLength and self.__sourceModified in (0, status.st_mtime_ns)
+
+    def rowOf(self: 'FBXOffsetIndex', objectId: int) -> int:
+        """
+        Get the table of contents row of an object.
+
+        Args:
+            objectId (int): The int64 object ID.
+
+        Returns:
+            int: The row of the object node, -1 when unknown.
+
+        """
+        if self.__byId is None:
+            self.__byId = dict(zip(self.__objectIds, self.__objectRows))
+        return self.__byId.get(objectId, -1)
+
+    def offsetOf(self: 'FBXOffsetIndex', objectId: int) -> int:
+        """
+        Get the record offset of an object.
+
+        Args:
+            objectId (int): The int64 object ID.
+
+        Returns:
+            int: The start offset of the object node, -1 when unknown.
+
+        """
+        row = self.rowOf(objectId)
+        return self.__toc.startOffsets[row] if row >= 0 else -1
+
+    def rows(self: 'FBXOffsetIndex', path: str) -> List[int]:
+        """
+        Get the table of contents rows of the nodes at a path, in document order.
+
+        Args:
+            path (str): The "/" separated node path (ie: "Objects/Geometry").
+
+        Returns:
+            List[int]: The rows of the nodes at the path.
+
+        """
+        return self.__toc.find(path)
+
+    def offsets(self: 'FBXOffsetIndex', path: str) -> List[int]:
+        """
+        Get the record offsets of the nodes at a path, in document order.
+
+        Args:
+            path (str): The "/" separated node path (ie: "Objects/Geometry").
+
+        Returns:
+            List[int]: The start offsets of the nodes at the path.
+
+        """
+        startOffsets = self.__toc.startOffsets
+        return [startOffsets[row] for row in self.rows(path)]
+
+    def toBytes(self: 'FBXOffsetIndex') -> bytes:
+        """
+        Serialize the index.
+
+        Returns:
+            bytes: The header, the table of contents (see FBXTableOfContents.toBytes) and the object columns (little endian).
+
+        """
+        toc = self.__toc.toBytes()
+        parts = [INDEX_HEADER.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, self.__sourceModified, len(toc), len(self.__objectIds)), toc]
+        for values in (self.__objectIds, self.__objectRows):
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            parts.append(values.tobytes())
+
+        return b"".join(parts)
+
+    @staticmethod
+    def fromBytes(data: bytes) -> 'FBXOffsetIndex':
+        """
+        Deserialize an index.
+
+        Args:
+            data (bytes): The serialized index, see toBytes.
+
+        Returns:
+            FBXOffsetIndex: The index.
+
+        Raises:
+            ValueError: If the data is not an index of a supported format version, or is truncated.
+
+        """
+        if len(data) < INDEX_HEADER.size:
+            raise ValueError("Truncated offset index")
+
+        magic, formatVersion, sourceModified, tocLength, objectCount = INDEX_HEADER.unpack_from(data, 0)
+        if magic != INDEX_MAGIC or formatVersion != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported offset index (format version {formatVersion})")
+
+        offset = INDEX_HEADER.size + tocLength
+        toc = FBXTableOfContents.fromBytes(data[INDEX_HEADER.size:offset])
+
+        columns = []
+        for _ in range(2):
+            values = array("q")
+            end = offset + objectCount * values.itemsize
+            if end > len(data):
+                raise ValueError("Truncated offset index")
+
+            values.frombytes(data[offset:end])
+            if sys.byteorder == "big":
+                values.byteswap()
+            columns.append(values)
+            offset = end
+
+        return FBXOffsetIndex(toc, columns[0], columns[1], sourceModified)
+
+    def save(self: 'FBXOffsetIndex', path: str) -> None:
+        """
+        Write the index to a file, atomically.
+
+        Args:
+            path (str): The path of the index (ie: "scene.fbx.idx").
+
+        """
+        FBXAtomicFile.writeBytes(path, self.toBytes())
+
+    @staticmethod
+    def load(path: str) -> 'FBXOffsetIndex':
+        """
+        Read an index from a file.
+
+        Args:
+            path (str): The path of the index.
+
+        Returns:
+            FBXOffsetIndex: The index.
+
+        """
+        with open(path, "rb") as file:
+            return FBXOffsetIndex.fromBytes(file.read())
@@ -0,0 +1,363 @@
+from array import array
+from typing import Dict, Iterator, List, Tuple
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+
+
+class FBXSceneGraph:
+    """
+    Object graph of a scene, built from the "C" records of the top level "Connections" node.
+
+    Every object (a child of the top level "Objects" node, keyed by its int64 ID) gets a dense index,
+    IDs only found in connections (ie: 0, the scene root) get one as well, without a node. A connection
+    ("OO", childId, parentId) or ("OP", childId, parentId, propertyName) links a child (ie: a Geometry)
+    to its parent (ie: a Model). The links are stored as compressed sparse rows, in both directions:
+    the children of object i are childTargets[childOffsets[i]:childOffsets[i + 1]], its parents are
+    parentTargets[parentOffsets[i]:parentOffsets[i + 1]], both in connection order. The edge arrays map
+    every row entry back to its connection, for its kind and property name.
+
+    The graph is built in linear time: one pass over the objects, one over the connections and a
+    counting sort per direction.
+
+    Args:
+        root (FBXDocumentNode): The nameless document root.
+
+    """
+
+    __ids: array
+    __nodes: List[FBXDocumentNode]
+    __indices: Dict[int, int]
+    __kinds: List[str]
+    __properties: List[str]
+    __childOffsets: array
+    __childTargets: array
+    __childEdges: array
+    __parentOffsets: array
+    __parentTargets: array
+    __parentEdges: array
+
+    def __init__(self: 'FBXSceneGraph', root: FBXDocumentNode) -> None:
+        self.__ids = array("q")
+        self.__nodes = []
+        self.__indices = {}
+        self.__kinds = []
+        self.__properties = []
+
+        for section in root.children:
+            if section.name == "Objects":
+                for node in section.children:
+                    properties = node.properties
+                    if properties and type(properties[0]) is int and properties[0] not in self.__indices:
+                        self.__add(properties[0], node)
+
+        children, parents = array("i"), array("i")
+        for section in root.children:
+            if section.name != "Connections":
+                continue
+
+            for connection in section.children:
+                properties = connection.properties
+                if connection.name != "C" or len(properties) < 3:
+                    continue
+
+                child, parent = self.__indices.get(properties[1]), self.__indices.get(properties[2])
+                if child is None:
+                    child = self.__add(properties[1], None)
+                if parent is None:
+                    parent = self.__add(properties[2], None)
+
+                children.append(child)
+                parents.append(parent)
+                self.__kinds.append(properties[0])
+                self.__properties.append(properties[3] if len(properties) > 3 else None)
+
+        self.__childOffsets, self.__childTargets, self.__childEdges = self.__compress(parents, children, len(self.__ids))
+        self.__parentOffsets, self.__parentTargets, self.__parentEdges = self.__compress(children, parents, len(self.__ids))
+
+    def __add(self: 'FBXSceneGraph', objectId: int, node: FBXDocumentNode) -> int:
+        """
+        Give an object the next index.
+
+        Args:
+            objectId (int): The int64 object ID.
+            node (FBXDocumentNode): The object node, None for IDs only found in connections.
+
+        Returns:
+            int: The index of the object.
+
+        """
+        index = len(self.__ids)
+        self.__indices[objectId] = index
+        self.__ids.append(objectId)
+        self.__nodes.append(node)
+        return index
+
+    @staticmethod
+    def __compress(rows: array, targets: array, count: int) -> Tuple[array, array, array]:
+        """
+        Sort edges into compressed sparse rows with a counting sort, keeping the edge order within a row.
+
+        Args:
+            rows (array): The row (object index) of every edge.
+            targets (array): The target (object index) of every edge.
+            count (int): The number of rows.
+
+        Returns:
+            Tuple[array, array, array]: The row offsets (count + 1), the targets and the edge of every entry.
+
+        """
+        offsets = array("i", bytes(4 * (count + 1)))
+        for row in rows:
+            offsets[row + 1] += 1
+        for row in range(count):
+            offsets[row + 1] += offsets[row]
+
+        positions = offsets[:-1]
+        sortedTargets = array("i", bytes(4 * len(rows)))
+        sortedEdges = array("i", bytes(4 * len(rows)))
+        for edge, (row, target) in enumerate(zip(rows, targets)):
+            position = positions[row]
+            sortedTargets[position] = target
+            sortedEdges[position] = edge
+            positions[row] = position + 1
+
+        return offsets, sortedTargets, sortedEdges
+
+    def __len__(self: 'FBXSceneGraph') -> int:
+        return len(self.__ids)
+
+    @property
+    def connectionCount(self: 'FBXSceneGraph') -> int:
+        """Get the number of connections."""
+        return len(self.__kinds)
+
+    @property
+    def objectIds(self: 'FBXSceneGraph') -> array:
+        """Get the object IDs, by index."""
+        return self.__ids
+
+    @property
+    def childOffsets(self: 'FBXSceneGraph') -> array:
+        """Get the row offsets of the children, by object index (length + 1 entries)."""
+        return self.__childOffsets
+
+    @property
+    def childTargets(self: 'FBXSceneGraph') -> array:
+        """Get the object indices of the children, row by row."""
+        return self.__childTargets
+
+    @property
+    def parentOffsets(self: 'FBXSceneGraph') -> array:
+        """Get the row offsets of the parents, by object index (length + 1 entries)."""
+        return self.__parentOffsets
+
+    @property
+    def parentTargets(self: 'FBXSceneGraph') -> array:
+        """Get the object indices of the parents, row by row."""
+        return self.__parentTargets
+
+    def indexOf(self: 'FBXSceneGraph', objectId: int) -> int:
+        """
+        Get the index of an object.
+
+        Args:
+            objectId (int): The int64 object ID.
+
+        Returns:
+            int: The dense index of the object, -1 when unknown.
+
+        """
+        return self.__indices.get(objectId, -1)
+
+    def node(self: 'FBXSceneGraph', objectId: int) -> FBXDocumentNode:
+        """
+        Get the node of an object.
+
+        Args:
+            objectId (int): The int64 object ID.
+
+        Returns:
+            FBXDocumentNode: The object node, None when unknown or only found in connections.
+
+        """
+        index = self.__indices.get(objectId)
+        return self.__nodes[index] if index is not None else None
+
+    @staticmethod
+    def __matches(node: FBXDocumentNode, name: str, subclass: str) -> bool:
+        """
+        Check whether an object node has a node name and subclass.
+
+        Args:
+            node (FBXDocumentNode): The object node, None never matches.
+            name (str): The node name (ie: "Geometry"), None matches any.
+            subclass (str): The subclass, the third property (ie: "Mesh", "Skin"), None matches any.
+
+        Returns:
+            bool: True when the node matches.
+
+        """
+        if node is None or (name is not None and node.name != name):
+            return False
+        return subclass is None or (len(node.properties) > 2 and node.properties[2] == subclass)
+
+    def __links(self: 'FBXSceneGraph', objectId: int, offsets: array, targets: array, edges: array) -> Iterator[Tuple[int, int]]:
+        """
+        Walk the row of an object.
+
+        Args:
+            objectId (int): The int64 object ID.
+            offsets (array): The row offsets of the direction.
+            targets (array): The targets of the direction.
+            edges (array): The edges of the direction.
+
+        Returns:
+            Iterator[Tuple[int, int]]: The target index and the connection of every link.
+
+        """
+        index = self.__indices.get(objectId)
+        if index is None:
+            return
+
+        for position in range(offsets[index], offsets[index + 1]):
+            yield targets[position], edges[position]
+
+    def connections(self: 'FBXSceneGraph', objectId: int) -> List[Tuple[int, str, str]]:
+        """
+        Get the connections of the children of an object.
+
+        Args:
+            objectId (int): The int64 object ID.
+
+        Returns:
+            List[Tuple[int, str, str]]: The child ID, connection kind ("OO", "OP") and property name (None for "OO") per connection.
+
+        """
+        return [(self.__ids[target], self.__kinds[edge], self.__properties[edge]) for target, edge in self.__links(objectId, self.__childOffsets, self.__childTargets, self.__childEdges)]
+
+    def children(self: 'FBXSceneGraph', objectId: int, name: str = None, subclass: str = None, property: str = None) -> List[FBXDocumentNode]:
+        """
+        Get the objects connected to an object (ie: the Geometry, Materials and child Models of a Model).
+
+        Args:
+            objectId (int): The int64 object ID.
+            name (str, optional): Only objects with this node name (ie: "Geometry").
+            subclass (str, optional): Only objects of this subclass (ie: "Mesh").
+            property (str, optional): Only objects connected to this property (ie: "DiffuseColor").
+
+        Returns:
+            List[FBXDocumentNode]: The child object nodes, in connection order.
+
+        """
+        nodes = self.__nodes
+        return [
+            nodes[target] for target, edge in self.__links(objectId, self.__childOffsets, self.__childTargets, self.__childEdges)
+            if self.__matches(nodes[target], name, subclass) and (property is None or self.__properties[edge] == property)
+        ]
+
+    def parents(self: 'FBXSceneGraph', objectId: int, name: str = None, subclass: str = None) -> List[FBXDocumentNode]:
+        """
+        Get the objects an object is connected to (ie: the Models using a Geometry).
+
+        Args:
+            objectId (int): The int64 object ID.
+            name (str, optional): Only objects with this node name.
+            subclass (str, optional): Only objects of this subclass.
+
+        Returns:
+            List[FBXDocumentNode]: The parent object nodes, in connection order.
+
+        """
+        nodes = self.__nodes
+        return [nodes[target] for target, _ in self.__links(objectId, self.__parentOffsets, self.__parentTargets, self.__parentEdges) if self.__matches(nodes[target], name, subclass)]
+
+    def __walk(self: 'FBXSceneGraph', objectId: int, offsets: array, targets: array, name: str, subclass: str, through: str) -> List[FBXDocumentNode]:
+        """
+        Walk a direction breadth first, visiting every object once.
+
+        Args:
+            objectId (int): The int64 object ID to start from, excluded from the result.
+            offsets (array): The row offsets of the direction.
+            targets (array): The targets of the direction.
+            name (str): Only objects with this node name are returned, None returns all.
+            subclass (str): Only objects of this subclass are returned, None returns all.
+            through (str): Only objects with this node name are walked through, None walks through all.
+
+        Returns:
+            List[FBXDocumentNode]: The matching object nodes, nearest first.
+
+        """
+        start = self.__indices.get(objectId)
+        if start is None:
+            return []
+
+        nodes, found = self.__nodes, []
+        visited = bytearray(len(self.__ids))
+        visited[start] = 1
+        queue = [start]
+        for index in queue:
+            for position in range(offsets[index], offsets[index + 1]):
+                target = targets[position]
+                if visited[target]:
+                    continue
+
+                visited[target] = 1
+                node = nodes[target]
+                if self.__matches(node, name, subclass):
+                    found.append(node)
+                if through is None or (node is not None and node.name == through):
+                    queue.append(target)
+
+        return found
+
+    def descendants(self: 'FBXSceneGraph', objectId: int, name: str = None, subclass: str = None) -> List[FBXDocumentNode]:
+        """
+        Get the objects connected to an object, directly or through others (ie: all Geometry under a Model).
+
+        Args:
+            objectId (int): The int64 object ID.
+            name (str, optional): Only objects with this node name.
+            subclass (str, optional): Only objects of this subclass.
+
+        Returns:
+            List[FBXDocumentNode]: The object nodes, nearest first.
+
+        """
+        return self.__walk(objectId, self.__childOffsets, self.__childTargets, name, subclass, None)
+
+    def ancestors(self: 'FBXSceneGraph', objectId: int, name: str = None, subclass: str = None) -> List[FBXDocumentNode]:
+        """
+        Get the objects an object is connected to, directly or through others (ie: the Models above a Model).
+
+        Args:
+            objectId (int): The int64 object ID.
+            name (str, optional): Only objects with this node name.
+            subclass (str, optional): Only objects of this subclass.
+
+        Returns:
+            List[FBXDocumentNode]: The object nodes, nearest first.
+
+        """
+        return self.__walk(objectId, self.__parentOffsets, self.__parentTargets, name, subclass, None)
+
+    def deformers(self: 'FBXSceneGraph', objectId: int) -> List[FBXDocumentNode]:
+        """
+        Get the deformers of a mesh: its Skin and BlendShape deformers and their sub-deformers (Clusters, BlendShapeChannels).
+
+        Only deformers are walked through, the bones linked to clusters are not followed.
+
+        Args:
+            objectId (int): The int64 ID of a Geometry, or of a Model whose Geometry is used.
+
+        Returns:
+            List[FBXDocumentNode]: The Deformer nodes, nearest first.
+
+        """
+        node = self.node(objectId)
+        geometries = self.children(objectId, "Geometry") if node is not None and node.name == "Model" else [node]
+
+        found = []
+        for geometry in geometries:
+            if geometry is not None:
+                found.extend(self.__walk(geometry.properties[0], self.__childOffsets, self.__childTargets, "Deformer", None, "Deformer"))
+
+        return found
@@ -0,0 +1,324 @@
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+from Infrastructure.Storage.FBXAtomicFile import FBXAtomicFile
+
+# Saved table of contents: magic, format version, FBX version, source length, row count, name count
+TOC_MAGIC = b"FBXTOC\x00"
+TOC_FORMAT_VERSION = 2
+TOC_HEADER = struct.Struct("<7sBIQII")
+TOC_NAME_LENGTH = struct.Struct("<B")
+
+# Array type codes of the columns, in file order: nameIds, depths, parents, startOffsets, endOffsets, propertiesCounts, propertiesLengths
+TOC_COLUMNS = ("I", "I", "q", "q", "q", "q", "q")
+
+
+class FBXTocEntry(NamedTuple):
+    """A node of the table of contents, see FBXTableOfContents.entry."""
+    name: str
+    depth: int
+    parent: int
+    startOffset: int
+    endOffset: int
+    propertiesCount: int
+    propertiesLength: int
+
+
+class FBXTableOfContents:
+    """
+    Outline of a FBX file: the name, depth and byte range of every node, without any property.
+
+    Nodes are rows in document (depth first) order, stored as parallel array columns with names
+    interned as indices into a list of unique names, so a table of contents takes a few dozen bytes
+    per node. Top level nodes have depth 1 and parent -1. The start and end offsets of a row are the
+    byte range of its record in the source file, a node can be decoded on its own from there with
+    FBXDocumentParser.readNodeAt.
+
+    A table of contents is saved next to its file (ie: "scene.fbx.toc") in a compact binary form,
+    its source length is kept to detect a file changed since.
+
+    Args:
+        versionNumber (int): The FBX version number of the source file.
+        sourceLength (int): The length in bytes of the source file.
+
+    """
+
+    __versionNumber: int
+    __sourceLength: int
+    __names: List[str]
+    __nameIds: array
+    __depths: array
+    __parents: array
+    __startOffsets: array
+    __endOffsets: array
+    __propertiesCounts: array
+    __propertiesLengths: array
+    __pathIds: Dict[Tuple[int, str], int]
+    __pathRows: List[List[int]]
+
+    def __init__(self: 'FBXTableOfContents', versionNumber: int, sourceLength: int) -> None:
+        self.__versionNumber = versionNumber
+        self.__sourceLength = sourceLength
+        self.__names = []
+        self.__nameIds = array("I")
+        self.__depths = array("I")
+        self.__parents = array("q")
+        self.__startOffsets = array("q")
+        self.__endOffsets = array("q")
+        self.__propertiesCounts = array("q")
+        self.__propertiesLengths = array("q")
+        self.__pathIds = None
+        self.__pathRows = None
+
+    def __len__(self: 'FBXTableOfContents') -> int:
+        return len(self.__startOffsets)
+
+    @property
+    def versionNumber(self: 'FBXTableOfContents') -> int:
+        """Get the FBX version number of the source file."""
+        return self.__versionNumber
+
+    @property
+    def sourceLength(self: 'FBXTableOfContents') -> int:
+        """Get the length in bytes of the source file."""
+        return self.__sourceLength
+
+    @property
+    def names(self: 'FBXTableOfContents') -> List[str]:
+        """Get the unique node names, indexed by the name IDs."""
+        return self.__names
+
+    @property
+    def startOffsets(self: 'FBXTableOfContents') -> array:
+        """Get the start offsets of the node records, by row."""
+        return self.__startOffsets
+
+    @property
+    def endOffsets(self: 'FBXTableOfContents') -> array:
+        """Get the end offsets of the node records, by row."""
+        return self.__endOffsets
+
+    @staticmethod
+    def fromColumns(versionNumber: int, sourceLength: int, names: List[str], nameIds: array, depths: array, parents: array, startOffsets: array, endOffsets: array, propertiesCounts: array, propertiesLengths: array) -> 'FBXTableOfContents':
+        """
+        Create a table of contents from filled columns, one value per node row in document order.
+
+        Args:
+            versionNumber (int): The FBX version number of the source file.
+            sourceLength (int): The length in bytes of the source file.
+            names (List[str]): The unique node names.
+            nameIds (array): The name of every row, as an index into names (array("I")).
+            depths (array): The depth of every row (array("I")).
+            parents (array): The parent row of every row (array("q")).
+            startOffsets (array): The start offset of every row (array("q")).
+            endOffsets (array): The end offset of every row (array("q")).
+            propertiesCounts (array): The property count of every row (array("q")).
+            propertiesLengths (array): The property list length of every row (array("q")).
+
+        Returns:
+            FBXTableOfContents: The table of contents, owning the columns.
+
+        """
+        toc = FBXTableOfContents(versionNumber, sourceLength)
+        toc.__names = names
+        toc.__nameIds = nameIds
+        toc.__depths = depths
+        toc.__parents = parents
+        toc.__startOffsets = startOffsets
+        toc.__endOffsets = endOffsets
+        toc.__propertiesCounts = propertiesCounts
+        toc.__propertiesLengths = propertiesLengths
+
+        return toc
+
+    def entry(self: 'FBXTableOfContents', row: int) -> FBXTocEntry:
+        """
+        Get a node row.
+
+        Args:
+            row (int): The row of the node.
+
+        Returns:
+            FBXTocEntry: The name, depth, parent row, offsets, property count and property list length of the node.
+
+        """
+        return FBXTocEntry(
+            self.__names[self.__nameIds[row]], self.__depths[row], self.__parents[row],
+            self.__startOffsets[row], self.__endOffsets[row], self.__propertiesCounts[row], self.__propertiesLengths[row]
+        )
+
+    def entries(self: 'FBXTableOfContents') -> Iterator[FBXTocEntry]:
+        """
+        Walk the node rows in document order.
+
+        Returns:
+            Iterator[FBXTocEntry]: The node rows.
+
+        """
+        return (self.entry(row) for row in range(len(self)))
+
+    def byteLength(self: 'FBXTableOfContents', row: int) -> int:
+        """
+        Get the size of a node record, its nested nodes included.
+
+        Args:
+            row (int): The row of the node.
+
+        Returns:
+            int: The size in bytes.
+
+        """
+        return self.__endOffsets[row] - self.__startOffsets[row]
+
+    def path(self: 'FBXTableOfContents', row: int) -> str:
+        """
+        Get the path of a node.
+
+        Args:
+            row (int): The row of the node.
+
+        Returns:
+            str: The node names joined by "/" from the top level down (ie: "Objects/Geometry/Vertices").
+
+        """
+        names = []
+        while row >= 0:
+            names.append(self.__names[self.__nameIds[row]])
+            row = self.__parents[row]
+
+        return "/".join(reversed(names))
+
+    def find(self: 'FBXTableOfContents', path: str) -> List[int]:
+        """
+        Get the rows of the nodes at a path, in document order.
+
+        The rows of every distinct path are listed on the first lookup, later lookups walk the path names only.
+
+        Args:
+            path (str): The "/" separated node path (ie: "Objects/Geometry").
+
+        Returns:
+            List[int]: The rows of the nodes at the path.
+
+        """
+        if self.__pathIds is None:
+            self.__indexPaths()
+
+        pathId = -1
+        for name in path.strip("/").split("/"):
+            pathId = self.__pathIds.get((pathId, name))
+            if pathId is None:
+                return []
+
+        return list(self.__pathRows[pathId])
+
+    def __indexPaths(self: 'FBXTableOfContents') -> None:
+        """
+        Give every distinct path an ID, keyed by the ID of its parent path and its last name, and list its rows.
+        """
+        names, nameIds, parents = self.__names, self.__nameIds, self.__parents
+        pathIds, pathRows = {}, []
+        rowPaths = array("q")
+        for row in range(len(self)):
+            parent = parents[row]
+            key = (rowPaths[parent] if parent >= 0 else -1, names[nameIds[row]])
+            pathId = pathIds.get(key)
+            if pathId is None:
+                pathId = pathIds[key] = len(pathRows)
+                pathRows.append([])
+
+            pathRows[pathId].append(row)
+            rowPaths.append(pathId)
+
+        self.__pathIds, self.__pathRows = pathIds, pathRows
+
+    def toBytes(self: 'FBXTableOfContents') -> bytes:
+        """
+        Serialize the table of contents.
+
+        Returns:
+            bytes: The header, the names (length prefixed, latin-1) and the columns (little endian).
+
+        """
+        parts = [TOC_HEADER.pack(TOC_MAGIC, TOC_FORMAT_VERSION, self.__versionNumber, self.__sourceLength, len(self), len(self.__names))]
+        for name in self.__names:
+            encoded = name.encode("latin-1")
+            parts.append(TOC_NAME_LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+
+        for values in (self.__nameIds, self.__depths, self.__parents, self.__startOffsets, self.__endOffsets, self.__propertiesCounts, self.__propertiesLengths):
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            parts.append(values.tobytes())
+
+        return b"".join(parts)
+
+    @staticmethod
+    def fromBytes(data: bytes) -> 'FBXTableOfContents':
+        """
+        Deserialize a table of contents.
+
+        Args:
+            data (bytes): The serialized table of contents, see toBytes.
+
+        Returns:
+            FBXTableOfContents: The table of contents.
+
+        Raises:
+            ValueError: If the data is not a table of contents of a supported format version, or is truncated.
+
+        """
+        if len(data) < TOC_HEADER.size:
+            raise ValueError("Truncated table of contents")
+
+        magic, formatVersion, versionNumber, sourceLength, rows, nameCount = TOC_HEADER.unpack_from(data, 0)
+        if magic != TOC_MAGIC or formatVersion != TOC_FORMAT_VERSION:
+            raise ValueError(f"Unsupported table of contents (format version {formatVersion})")
+
+        names, offset = [], TOC_HEADER.size
+        for _ in range(nameCount):
+            length = data[offset]
+            names.append(sys.intern(str(data[offset + 1:offset + 1 + length], "latin-1")))
+            offset += 1 + length
+
+        columns = []
+        for typeCode in TOC_COLUMNS:
+            values = array(typeCode)
+            end = offset + rows * values.itemsize
+            if end > len(data):
+                raise ValueError("Truncated table of contents")
+
+            values.frombytes(data[offset:end])
+            if sys.byteorder == "big":
+                values.byteswap()
+            columns.append(values)
+            offset = end
+
+        return FBXTableOfContents.fromColumns(versionNumber, sourceLength, names, *columns)
+
+    def save(self: 'FBXTableOfContents', path: str) -> None:
+        """
+        Write the table of contents to a file, atomically.
+
+        Args:
+            path (str): The path of the table of contents (ie: "scene.fbx.toc").
+
+        """
+        FBXAtomicFile.writeBytes(path, self.toBytes())
+
+    @staticmethod
+    def load(path: str) -> 'FBXTableOfContents':
+        """
+        Read a table of contents from a file.
+
+        Args:
+            path (str): The path of the table of contents.
+
+        Returns:
+            FBXTableOfContents: The table of contents.
+
+        """
+        with open(path, "rb") as file:
+            return FBXTableOfContents.fromBytes(file.read())
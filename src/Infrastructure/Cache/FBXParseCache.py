@@ -0,0 +1,394 @@
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Tuple
+from Domain.Entities.Document.FBXDocument import FBXDocument
+from Domain.Entities.Document.FBXDocumentHeader import FBXDocumentHeader
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Domain.Entities.Document.FBXNodeTable import FBXNodeTable
+from Infrastructure.Parser.FBXArrayDecoder import FBXArrayDecoder
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser, NODE_STORAGE_OBJECTS, NODE_STORAGE_TABLE, PARSER_VERSION
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+from Infrastructure.Parser.FBXPropertyParser import FBXPropertyParser
+from Infrastructure.Serializers.FBXBinarySerializer import FBXBinarySerializer
+from Infrastructure.Storage.FBXAtomicFile import FBXAtomicFile
+
+# Cache entry: magic, format version, FBX version, header null bytes, row count, name count, array count
+ENTRY_MAGIC = b"FBXPCE\x00"
+ENTRY_FORMAT_VERSION = 2
+ENTRY_HEADER = struct.Struct("<7sBI2sQIQ")
+ENTRY_NAME_LENGTH = struct.Struct("<B")
+
+# Node columns (array("q")), in entry order
+ENTRY_COLUMNS = ("nameIds", "parents", "startOffsets", "endOffsets", "propertiesCounts", "propertiesLengths", "valueCounts", "propertyOffsets")
+
+# Indices of the array properties, keyed by the type codes of a node (bounded, type code strings repeat)
+ARRAY_INDICES: Dict[str, Tuple[int, ...]] = {}
+ARRAY_INDICES_LIMIT = 4096
+
+
+class FBXParseCache:
+    """
+    Persistent on-disk cache of parsed FBX documents.
+
+    Entries are keyed by the content hash, size and modification time of the source file, the
+    parser version and the parse options. The content hash of a source is remembered next to the
+    entries (a .fbxstat file per source path), a file with an unchanged size and modification time
+    is not read again to build its key. Documents are stored as a flat node table: the node columns
+    as little endian array bytes, a flag per array telling whether a parse copies it out of the
+    source (see __copyArrays), followed by the property lists in the binary FBX encoding (see
+    FBXBinarySerializer.encodeProperties) with arrays uncompressed. Entries hold data only, so
+    loading one never runs code and a corrupt entry is dropped and parsed again. Entries are written
+    to a temporary file and moved in place, so several processes can share a cache directory, and
+    the least recently used entries are evicted once the directory grows past its size limit.
+
+    Args:
+        directory (str): The cache directory, created when missing.
+        maxBytes (int): The maximum total size in bytes of the cache entries.
+
+    """
+
+    EXTENSION = ".fbxcache"
+    STAT_EXTENSION = ".fbxstat"
+    # parse options which do not change the parsed document
+    NEUTRAL_OPTIONS = ("arrayCache", "inflateThreads", "stats")
+
+    __directory: str
+    __maxBytes: int
+
+    def __init__(self: 'FBXParseCache', directory: str, maxBytes: int = 2**30) -> None:
+        self.__directory = directory
+        self.__maxBytes = maxBytes
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self: 'FBXParseCache') -> str:
+        """Get the cache directory."""
+        return self.__directory
+
+    def key(self: 'FBXParseCache', path: str, **options: Any) -> str:
+        """
+        Build the cache key of a file.
+
+        Args:
+            path (str): The path of the FBX file.
+            **options (Any): The parse options, see FBXDocumentParser.fromFile.
+
+        Returns:
+            str: The hex digest identifying the file contents, size, mtime, parser version and options.
+
+        """
+        status = os.stat(path)
+        contentHash = self.__contentHash(path, status)
+
+        options = sorted((name, value) for name, value in options.items() if name not in self.NEUTRAL_OPTIONS)
+        identity = f"{contentHash}:{status.st_size}:{status.st_mtime_ns}:{PARSER_VERSION}:{options!r}"
+        return hashlib.blake2b(identity.encode(), digest_size=20).hexdigest()
+
+    def __contentHash(self: 'FBXParseCache', path: str, status: os.stat_result) -> str:
+        """
+        Get the content hash of a file, hashing it only when its size or modification time changed since it last was.
+
+        Args:
+            path (str): The path of the FBX file.
+            status (os.stat_result): The status of the file.
+
+        Returns:
+            str: The blake2b hex digest of the file content.
+
+        """
+        statPath = os.path.join(self.__directory, hashlib.blake2b(os.path.abspath(path).encode(), digest_size=20).hexdigest() + self.STAT_EXTENSION)
+        try:
+            with open(statPath, "r") as file:
+                size, modified, contentHash = file.read().split()
+            if int(size) == status.st_size and int(modified) == status.st_mtime_ns:
+                return contentHash
+        except (OSError, ValueError):
+            # missing or unreadable, the file is hashed again
+            pass
+
+        with open(path, "rb") as file:
+            contentHash = hashlib.file_digest(file, "blake2b").hexdigest()
+        FBXAtomicFile.writeBytes(statPath, f"{status.st_size} {status.st_mtime_ns} {contentHash}".encode())
+
+        return contentHash
+
+    def __entryPath(self: 'FBXParseCache', key: str) -> str:
+        return os.path.join(self.__directory, key + self.EXTENSION)
+
+    def load(self: 'FBXParseCache', path: str, **options: Any) -> FBXDocument:
+        """
+        Load a document from the cache, parsing and storing it on a miss.
+
+        Args:
+            path (str): The path of the FBX file.
+            **options (Any): The parse options, see FBXDocumentParser.fromFile.
+
+        Returns:
+            FBXDocument: The parsed FBX document.
+
+        """
+        stats = options.get("stats")
+        key = self.key(path, **options)
+        document = self.get(key, options.get("nodeStorage", NODE_STORAGE_OBJECTS), options.get("arrayOutput", FBXPropertyParser.ARRAY_OUTPUT_ARRAY), options.get("lazyArrays", False))
+        if stats is not None:
+            stats.count("cache.misses" if document is None else "cache.hits")
+
+        if document is None:
+            document = FBXDocumentParser.fromFile(path, **options)
+            self.put(key, document)
+
+        return document
+
+    def get(self: 'FBXParseCache', key: str, nodeStorage: str = NODE_STORAGE_OBJECTS, arrayOutput: str = FBXPropertyParser.ARRAY_OUTPUT_ARRAY, lazyArrays: bool = False) -> FBXDocument:
+        """
+        Read a cache entry, marking it as recently used.
+
+        Args:
+            key (str): The cache key.
+            nodeStorage (str): How the nodes are rebuilt, see FBXDocumentParser.fromBuffer.
+            arrayOutput (str): How array properties are decoded, see FBXDocumentParser.fromBuffer.
+            lazyArrays (bool): Whether array properties are only decoded when read, see FBXDocumentParser.fromBuffer.
+
+        Returns:
+            FBXDocument: The cached document, None when missing or unreadable.
+
+        """
+        entryPath = self.__entryPath(key)
+        try:
+            with open(entryPath, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+
+        try:
+            document = self.__fromBytes(data, nodeStorage, arrayOutput, lazyArrays)
+        except Exception:
+            # a corrupt entry is dropped and parsed again
+            self.__remove(entryPath)
+            return None
+
+        try:
+            os.utime(entryPath)
+        except OSError:
+            # evicted meanwhile, the document is loaded already
+            pass
+
+        return document
+
+    def put(self: 'FBXParseCache', key: str, document: FBXDocument) -> None:
+        """
+        Store a document and evict the least recently used entries past the size limit.
+
+        Args:
+            key (str): The cache key.
+            document (FBXDocument): The document to store.
+
+        """
+        FBXAtomicFile.writeBytes(self.__entryPath(key), self.__toBytes(document))
+
+        self.evict()
+
+    def evict(self: 'FBXParseCache') -> None:
+        """
+        Remove the least recently used entries until the cache fits its size limit.
+        """
+        entries = []
+        for entry in os.scandir(self.__directory):
+            if entry.name.endswith(self.EXTENSION):
+                try:
+                    status = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((status.st_mtime_ns, status.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entryPath in sorted(entries):
+            if total <= self.__maxBytes:
+                break
+            self.__remove(entryPath)
+            total -= size
+
+    @staticmethod
+    def __remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def __toBytes(self: 'FBXParseCache', document: FBXDocument) -> bytes:
+        """
+        Flatten a document into a node table in pre-order, each row referring to its parent row.
+
+        Args:
+            document (FBXDocument): The document to flatten.
+
+        Returns:
+            bytes: The entry header, the file magic and node names (length prefixed, latin-1), the node columns (little endian), the array copy flags and the property lists.
+
+        """
+        nodes: List[FBXDocumentNode] = []
+        names: List[str] = []
+        nameIndex: Dict[str, int] = {}
+        copies = bytearray()
+        columns = [array("q") for _ in ENTRY_COLUMNS]
+        nameIds, parents, startOffsets, endOffsets, propertiesCounts, propertiesLengths, valueCounts = columns[:-1]
+
+        stack = [(document.topLevelDocument, -1)]
+        while stack:
+            node, parentIndex = stack.pop()
+            index = len(nodes)
+            nameId = nameIndex.get(node.name)
+            if nameId is None:
+                nameId = nameIndex[node.name] = len(names)
+                names.append(node.name)
+
+            nodes.append(node)
+            nameIds.append(nameId)
+            parents.append(parentIndex)
+            startOffsets.append(node.startOffset)
+            endOffsets.append(node.endOffset)
+            propertiesCounts.append(node.propertiesCount)
+            propertiesLengths.append(node.propertiesLength)
+            valueCounts.append(len(node.properties))
+            for index in self.__arrayIndices(node.propertyTypes):
+                # lazy arrays are written as stored, they load as they were parsed
+                value = node.properties[index]
+                copies.append(not isinstance(value, (memoryview, FBXLazyArrayProperty)))
+            stack.extend((child, index) for child in reversed(node.children))
+
+        # decoded arrays are stored uncompressed so loading an entry never inflates, lazy arrays keep
+        # their stored encoding (passed through, nothing is compressed past the maximum length)
+        properties, propertyOffsets = FBXBinarySerializer(threads=1, minCompressLength=sys.maxsize).encodeProperties(nodes)
+        columns[-1] = propertyOffsets[:-1]
+
+        header = document.header
+        parts = [ENTRY_HEADER.pack(ENTRY_MAGIC, ENTRY_FORMAT_VERSION, header.versionNumber, header.nullBytes, len(nodes), len(names), len(copies))]
+        for name in [header.fileMagic] + names:
+            encoded = name.encode("latin-1")
+            parts.append(ENTRY_NAME_LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+
+        for values in columns:
+            if sys.byteorder == "big":
+                values.byteswap()
+            parts.append(values.tobytes())
+
+        parts.append(copies)
+        parts.append(properties)
+        return b"".join(parts)
+
+    def __fromBytes(self: 'FBXParseCache', data: bytes, nodeStorage: str = NODE_STORAGE_OBJECTS, arrayOutput: str = FBXPropertyParser.ARRAY_OUTPUT_ARRAY, lazyArrays: bool = False) -> FBXDocument:
+        """
+        Rebuild a document flattened by __toBytes.
+
+        Args:
+            data (bytes): The entry content.
+            nodeStorage (str): How the nodes are rebuilt, see FBXDocumentParser.fromBuffer.
+            arrayOutput (str): How array properties are decoded, see FBXDocumentParser.fromBuffer.
+            lazyArrays (bool): Whether array properties are only decoded when read, see FBXDocumentParser.fromBuffer.
+
+        Returns:
+            FBXDocument: The rebuilt document.
+
+        Raises:
+            ValueError: If the data is not an entry of the current format version, or is truncated.
+
+        """
+        if len(data) < ENTRY_HEADER.size:
+            raise ValueError("Truncated parse cache entry")
+
+        magic, formatVersion, versionNumber, nullBytes, rows, nameCount, arrayCount = ENTRY_HEADER.unpack_from(data, 0)
+        if magic != ENTRY_MAGIC or formatVersion != ENTRY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported parse cache entry (format version {formatVersion})")
+
+        names, offset = [], ENTRY_HEADER.size
+        for _ in range(nameCount + 1):
+            length = data[offset]
+            names.append(sys.intern(str(data[offset + 1:offset + 1 + length], "latin-1")))
+            offset += 1 + length
+
+        columns = []
+        for _ in ENTRY_COLUMNS:
+            values = array("q")
+            end = offset + rows * values.itemsize
+            if end > len(data):
+                raise ValueError("Truncated parse cache entry")
+
+            values.frombytes(data[offset:end])
+            if sys.byteorder == "big":
+                values.byteswap()
+            columns.append(values)
+            offset = end
+
+        if offset + arrayCount > len(data):
+            raise ValueError("Truncated parse cache entry")
+        copies = data[offset:offset + arrayCount]
+        offset += arrayCount
+        # only views of the entry are copied, list and numpy outputs are the same either way
+        copies = iter(copies) if arrayOutput == FBXPropertyParser.ARRAY_OUTPUT_ARRAY and not lazyArrays and any(copies) else None
+
+        header = FBXDocumentHeader(names.pop(0), nullBytes, versionNumber)
+        parser = FBXPropertyParser(memoryview(data)[offset:], arrayOutput, lazyArrays)
+        rows = zip(*columns)
+
+        if nodeStorage == NODE_STORAGE_TABLE:
+            table = FBXNodeTable()
+            for nameId, parentIndex, startOffset, endOffset, propertiesCount, propertiesLength, valueCount, propertyOffset in rows:
+                properties, propertyTypes, _ = parser.readProperties(propertyOffset, valueCount)
+                if copies is not None:
+                    self.__copyArrays(properties, propertyTypes, copies)
+                table.append(startOffset, endOffset, propertiesCount, propertiesLength, names[nameId], properties, parentIndex, propertyTypes)
+            return FBXDocument(header, table.node(0))
+
+        nodes: List[FBXDocumentNode] = []
+        for nameId, parentIndex, startOffset, endOffset, propertiesCount, propertiesLength, valueCount, propertyOffset in rows:
+            properties, propertyTypes, _ = parser.readProperties(propertyOffset, valueCount)
+            if copies is not None:
+                self.__copyArrays(properties, propertyTypes, copies)
+            parent = nodes[parentIndex] if parentIndex >= 0 else None
+            nodes.append(FBXDocumentNode(startOffset, endOffset, propertiesCount, propertiesLength, names[nameId], properties, parent, propertyTypes))
+
+        return FBXDocument(header, nodes[0])
+
+    @staticmethod
+    def __arrayIndices(propertyTypes: str) -> Tuple[int, ...]:
+        """
+        Get the indices of the array properties of a node.
+
+        Args:
+            propertyTypes (str): The type codes of the node properties.
+
+        Returns:
+            Tuple[int, ...]: The indices, in property order.
+
+        """
+        indices = ARRAY_INDICES.get(propertyTypes)
+        if indices is None:
+            indices = tuple(index for index, typeCode in enumerate(propertyTypes) if typeCode in FBXArrayDecoder.ARRAY_FORMATS)
+            if len(ARRAY_INDICES) < ARRAY_INDICES_LIMIT:
+                ARRAY_INDICES[propertyTypes] = indices
+        return indices
+
+    @staticmethod
+    def __copyArrays(properties: list, propertyTypes: str, copies: Iterator[int]) -> None:
+        """
+        Copy the arrays a parse of the source decodes to array.array out of the entry.
+
+        Uncompressed arrays decode to views of the buffer they are read from, the arrays of an
+        entry are all uncompressed while a parse of the source copies its compressed arrays.
+
+        Args:
+            properties (list): The property values of a node, replaced in place.
+            propertyTypes (str): The type codes of the node properties.
+            copies (Iterator[int]): The copy flags of the arrays, in document order.
+
+        """
+        for index in FBXParseCache.__arrayIndices(propertyTypes):
+            value = properties[index]
+            if next(copies) and isinstance(value, memoryview):
+                copy = array(value.format)
+                copy.frombytes(value.cast("B"))
+                properties[index] = copy
@@ -0,0 +1,390 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, List, Tuple, Union
+from Domain.Entities.Document.FBXDocument import FBXDocument
+from Infrastructure.Converter.FBXByteLimiter import FBXByteLimiter
+from Infrastructure.Converter.FBXFileConverter import FBXFileConverter, FBXOutputFormat
+from Infrastructure.Diagnostics.FBXStats import FBXStats
+from Infrastructure.Parser.FBXArrayCache import FBXArrayCache
+from Infrastructure.Parser.FBXArrayInflater import FBXArrayInflater
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Storage.FBXAtomicFile import FBXAtomicFile
+
+
+class FBXOutputChannel:
+    """
+    File-like object bridging an encoder running on a worker thread to an event loop.
+
+    Writes are gathered into chunks, every chunk is queued for the loop and takes one of a fixed
+    number of slots until the loop has written it out: a slow consumer blocks the encoder (backpressure)
+    instead of letting chunks pile up in memory. Text is encoded as UTF-8.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): The loop consuming the chunks.
+        chunkSize (int): The number of bytes gathered before a chunk is queued.
+        maxChunks (int): The number of chunks queued at most.
+
+    """
+
+    # Queued after the last chunk
+    END = None
+
+    __loop: asyncio.AbstractEventLoop
+    __queue: asyncio.Queue
+    __slots: threading.Semaphore
+    __maxChunks: int
+    __chunkSize: int
+    __pending: bytearray
+    __written: int
+    __cancelled: bool
+
+    def __init__(self: 'FBXOutputChannel', loop: asyncio.AbstractEventLoop, chunkSize: int = 2**16, maxChunks: int = 8) -> None:
+        self.__loop = loop
+        self.__queue = asyncio.Queue()
+        self.__slots = threading.Semaphore(maxChunks)
+        self.__maxChunks = maxChunks
+        self.__chunkSize = chunkSize
+        self.__pending = bytearray()
+        self.__written = 0
+        self.__cancelled = False
+
+    def write(self: 'FBXOutputChannel', data: Union[bytes, str]) -> int:
+        """
+        Write data from the encoder thread, blocking while all chunk slots are taken.
+
+        Args:
+            data (Union[bytes, str]): The data, text is encoded as UTF-8.
+
+        Returns:
+            int: The length of the data.
+
+        Raises:
+            asyncio.CancelledError: If the conversion has been cancelled.
+
+        """
+        self.__pending += data.encode("utf-8") if isinstance(data, str) else data
+        while len(self.__pending) >= self.__chunkSize:
+            self.__queueChunk(self.__chunkSize)
+
+        return len(data)
+
+    def flush(self: 'FBXOutputChannel') -> None:
+        """
+        Queue the gathered data as a chunk.
+
+        Raises:
+            asyncio.CancelledError: If the conversion has been cancelled.
+
+        """
+        if self.__pending:
+            self.__queueChunk(len(self.__pending))
+
+    def __queueChunk(self: 'FBXOutputChannel', length: int) -> None:
+        """
+        Queue the first bytes of the gathered data, waiting for a free slot.
+
+        Args:
+            length (int): The length of the chunk.
+
+        Raises:
+            asyncio.CancelledError: If the conversion has been cancelled.
+
+        """
+        self.__slots.acquire()
+        if self.__cancelled:
+            raise asyncio.CancelledError()
+
+        chunk = bytes(self.__pending[:length])
+        del self.__pending[:length]
+        self.__written += length
+        self.__loop.call_soon_threadsafe(self.__queue.put_nowait, chunk)
+
+    def tell(self: 'FBXOutputChannel') -> int:
+        """Get the number of bytes written so far."""
+        return self.__written + len(self.__pending)
+
+    def close(self: 'FBXOutputChannel') -> None:
+        """
+        Queue the remaining data followed by the end of the output, called by the encoder thread.
+        """
+        try:
+            if not self.__cancelled:
+                self.flush()
+        finally:
+            self.__loop.call_soon_threadsafe(self.__queue.put_nowait, self.END)
+
+    def cancel(self: 'FBXOutputChannel') -> None:
+        """
+        Stop the encoder: its next write raises asyncio.CancelledError, a write blocked on a slot is released.
+        """
+        self.__cancelled = True
+        self.__slots.release(self.__maxChunks + 1)
+
+    async def chunks(self: 'FBXOutputChannel'):
+        """
+        Consume the queued chunks on the loop, freeing the slot of a chunk once the consumer asks for the next one.
+
+        Returns:
+            AsyncIterator[bytes]: The chunks, in order, until the end of the output.
+
+        """
+        while True:
+            chunk = await self.__queue.get()
+            if chunk is self.END:
+                return
+
+            yield chunk
+            self.__slots.release()
+
+
+class FBXAsyncConverter:
+    """
+    Asynchronous conversion of FBX files, for services running an asyncio event loop.
+
+    Nothing blocking runs on the loop: files are memory mapped and parsed on the executor (zlib inflation
+    releases the GIL), the output is encoded on the executor and handed to the loop chunk by chunk while
+    it is produced, and files are written through the executor. A slow output blocks the encoder instead
+    of buffering the document (backpressure), cancelling the conversion stops the encoder at its next chunk.
+
+    The parse is two-phase: arrays are first only located (see FBXLazyArrayProperty), their decompressed
+    size is then reserved on the byte limiter before they are inflated and encoded, so the total of
+    decompressed bytes in flight over all concurrent conversions stays under the limit.
+
+    Args:
+        executor (Executor, optional): The thread pool parsing and encoding, documents do not leave the process. Defaults to the loop's default executor.
+        limiter (FBXByteLimiter, optional): The limiter of decompressed bytes in flight, can be shared between converters. Defaults to a 1 GB limit.
+        chunkSize (int): The size in bytes of the output chunks.
+        maxChunks (int): The number of output chunks buffered ahead of the consumer.
+
+    """
+
+    __executor: Executor
+    __limiter: FBXByteLimiter
+    __chunkSize: int
+    __maxChunks: int
+
+    def __init__(self: 'FBXAsyncConverter', executor: Executor = None, limiter: FBXByteLimiter = None, chunkSize: int = 2**16, maxChunks: int = 8) -> None:
+        self.__executor = executor
+        self.__limiter = limiter or FBXByteLimiter()
+        self.__chunkSize = chunkSize
+        self.__maxChunks = maxChunks
+
+    @property
+    def limiter(self: 'FBXAsyncConverter') -> FBXByteLimiter:
+        """Get the limiter of decompressed bytes in flight."""
+        return self.__limiter
+
+    async def __run(self: 'FBXAsyncConverter', function, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, function, *args)
+
+    @staticmethod
+    async def __readSource(source: Any) -> bytes:
+        """
+        Read an asynchronous source as a whole.
+
+        Args:
+            source (Any): An object with a coroutine read(n) (ie: asyncio.StreamReader) or an async iterable of chunks.
+
+        Returns:
+            bytes: The content.
+
+        """
+        content = bytearray()
+        if hasattr(source, "read"):
+            while True:
+                chunk = await source.read(2**20)
+                if not chunk:
+                    break
+                content += chunk
+        else:
+            async for chunk in source:
+                content += chunk
+
+        return bytes(content)
+
+    @staticmethod
+    def __parse(source: Union[str, bytes], options: dict) -> Tuple[FBXDocument, int]:
+        """
+        Locate the arrays of a document, on the executor.
+
+        Args:
+            source (Union[str, bytes]): The path or the content of the FBX file.
+            options (dict): The keyword arguments of the parse.
+
+        Returns:
+            Tuple[FBXDocument, int]: The document with lazy arrays and the decompressed size of its arrays.
+
+        """
+        if isinstance(source, str):
+            document = FBXDocumentParser.fromFile(source, lazyArrays=True, **options)
+        else:
+            document = FBXDocumentParser.fromBuffer(source, lazyArrays=True, **options)
+
+        return document, sum(lazy.decodedLength for _, _, lazy in FBXArrayInflater.collect(document.topLevelDocument))
+
+    @staticmethod
+    def __encode(document: FBXDocument, outputFormat: FBXOutputFormat, inflateThreads: int, channel: FBXOutputChannel) -> Any:
+        """
+        Inflate and encode a document into the output channel, on the executor.
+
+        Args:
+            document (FBXDocument): The document with lazy arrays.
+            outputFormat (FBXOutputFormat): The encoder.
+            inflateThreads (int): When above 0 and the encoder does not read lazy arrays, arrays are inflated on this many threads first.
+            channel (FBXOutputChannel): The output channel.
+
+        Returns:
+            Any: The result of the encoder (ie: the manifest of a raw export).
+
+        """
+        try:
+            if inflateThreads > 0 and not outputFormat.lazyArrays:
+                FBXArrayInflater(inflateThreads).inflate(document.topLevelDocument)
+
+            return outputFormat.write(document, channel)
+        finally:
+            channel.close()
+            document.close()
+
+    @staticmethod
+    async def __writeChunk(output: Any, chunk: bytes) -> None:
+        """
+        Write a chunk to an asynchronous output, waiting for it to drain.
+
+        Args:
+            output (Any): An object with write(chunk), a coroutine or not, and optionally a coroutine drain() (ie: asyncio.StreamWriter).
+            chunk (bytes): The chunk.
+
+        """
+        result = output.write(chunk)
+        if asyncio.iscoroutine(result):
+            await result
+        if hasattr(output, "drain"):
+            await output.drain()
+
+    async def __writeFile(self: 'FBXAsyncConverter', target: str, channel: FBXOutputChannel, encoder: asyncio.Future) -> Any:
+        """
+        Write the chunks to a file through the executor, moved in place once the encoder succeeded.
+
+        Args:
+            target (str): The path of the file to write.
+            channel (FBXOutputChannel): The output channel.
+            encoder (asyncio.Future): The encoder running on the executor.
+
+        Returns:
+            Any: The result of the encoder.
+
+        """
+        with FBXAtomicFile(target) as atomic:
+            file = await self.__run(atomic.open)
+            try:
+                async for chunk in channel.chunks():
+                    await self.__run(file.write, chunk)
+            finally:
+                await self.__run(file.close)
+
+            result = await encoder
+            await self.__run(atomic.commit)
+
+        return result
+
+    async def convert(self: 'FBXAsyncConverter', source: Any, output: Any, format: str = FBXFileConverter.FORMAT_JSON, include: List[str] = None, exclude: List[str] = None, inflateThreads: int = 0, stats: FBXStats = None) -> Any:
+        """
+        Convert an FBX file without blocking the event loop.
+
+        Args:
+            source (Any): The path of the FBX file, its content (bytes) or an asynchronous source: an object with a coroutine read(n) (ie: asyncio.StreamReader) or an async iterable of chunks.
+            output (Any): The path of the file to write, or an asynchronous output the chunks are written to as they are produced: an object with write(chunk), a coroutine or not, and an optional coroutine drain() (ie: asyncio.StreamWriter).
+            format (str): The output format, a name registered in FBXFileConverter.FORMATS (default: "json").
+            include (List[str], optional): Node path patterns to export, see FBXNodeSelector.
+            exclude (List[str], optional): Node path patterns to leave out, see FBXNodeSelector.
+            inflateThreads (int): The number of threads inflating arrays before they are encoded, 0 inflates them while encoding.
+            stats (FBXStats, optional): Collects the parse and serialization counters and timers.
+
+        Returns:
+            Any: The result of the encoder, the manifest of an "npz" or "raw" export, None otherwise.
+            The manifest of a "raw" export written to a path is also written next to it as <target>.json.
+
+        Raises:
+            asyncio.CancelledError: If the conversion is cancelled, a target file is left untouched.
+
+        """
+        outputFormat = FBXFileConverter.outputFormat(format)
+        if not isinstance(source, (str, bytes, bytearray, memoryview)):
+            source = await self.__readSource(source)
+
+        # decoded arrays are not kept around once encoded, the limiter accounts for them instead
+        options = {"include": include, "exclude": exclude, "arrayCache": FBXArrayCache(0), "stats": stats}
+        loop = asyncio.get_running_loop()
+        parse = loop.run_in_executor(self.__executor, self.__parse, source, options)
+        try:
+            # shielded, a cancelled conversion still gets the document to close it
+            document, decodedBytes = await asyncio.shield(parse)
+        except asyncio.CancelledError:
+            parse.add_done_callback(FBXAsyncConverter.__closeParsed)
+            raise
+
+        encoder = None
+        try:
+            async with self.__limiter.reserve(decodedBytes):
+                channel = FBXOutputChannel(loop, self.__chunkSize, self.__maxChunks)
+                start = time.perf_counter()
+                encoder = loop.run_in_executor(self.__executor, self.__encode, document, outputFormat, inflateThreads, channel)
+                try:
+                    if isinstance(output, str):
+                        result = await self.__writeFile(output, channel, encoder)
+                    else:
+                        async for chunk in channel.chunks():
+                            await self.__writeChunk(output, chunk)
+                        result = await encoder
+                except BaseException:
+                    channel.cancel()
+                    # the encoder stops at its next chunk, the reservation is held until it did
+                    await asyncio.gather(encoder, return_exceptions=True)
+                    raise
+        finally:
+            # the encoder closes the document once it ran, otherwise it never started (ie: cancelled while waiting for the limiter)
+            if encoder is None:
+                document.close()
+
+        if stats is not None:
+            stats.time("serialize." + format, time.perf_counter() - start)
+            stats.count("serialize.bytes", channel.tell())
+
+        if outputFormat.manifest and result is not None and isinstance(output, str):
+            await self.__run(FBXAtomicFile.write, output + ".json", lambda file: json.dump(result, file, indent=1), False)
+
+        return result
+
+    @staticmethod
+    def __closeParsed(parse: asyncio.Future) -> None:
+        """
+        Close the document of a parse the conversion stopped waiting for.
+
+        Args:
+            parse (asyncio.Future): The parse running on the executor.
+
+        """
+        if not parse.cancelled() and parse.exception() is None:
+            parse.result()[0].close()
+
+    @staticmethod
+    async def convertAsync(source: Any, output: Any, executor: Executor = None, limiter: FBXByteLimiter = None, **options) -> Any:
+        """
+        Convert an FBX file without blocking the event loop, see convert.
+
+        Args:
+            source (Any): The path, content or asynchronous source of the FBX file.
+            output (Any): The path or asynchronous output of the converted file.
+            executor (Executor, optional): The thread pool parsing and encoding.
+            limiter (FBXByteLimiter, optional): The limiter of decompressed bytes in flight, share one between calls to cap their total.
+            **options: The keyword arguments of convert (format, include, exclude, inflateThreads, stats).
+
+        Returns:
+            Any: The result of the encoder, see convert.
+
+        """
+        return await FBXAsyncConverter(executor, limiter).convert(source, output, **options)
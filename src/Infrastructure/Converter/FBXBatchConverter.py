@@ -0,0 +1,201 @@
+import glob
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, NamedTuple
+from Infrastructure.Converter.FBXFileConverter import FBXFileConverter
+from Infrastructure.Diagnostics.FBXStats import FBXStats
+
+
+class FBXConversionResult(NamedTuple):
+    """
+    The outcome of converting a single file in a batch.
+
+    Attributes:
+        source (str): The path of the FBX file.
+        target (str): The path of the converted file.
+        status (str): "converted", "skipped" or "failed".
+        sourceBytes (int): The size of the FBX file in bytes.
+        seconds (float): The time spent on the file.
+        error (str): The error of a failed conversion, empty otherwise.
+        stats (Dict[str, Any]): The collected stats of the conversion (see FBXStats.toDict), None when not collected.
+    """
+
+    source: str
+    target: str
+    status: str
+    sourceBytes: int
+    seconds: float
+    error: str = ""
+    stats: Dict[str, Any] = None
+
+
+class FBXBatchConverter:
+    """
+    Converter fanning out the conversion of many FBX files over a process pool.
+
+    Every file is converted in isolation, a failing file is reported without stopping the batch.
+
+    Args:
+        outputDirectory (str): The directory the converted files are written to, mirroring the source layout.
+        workers (int, optional): The number of worker processes. Defaults to the CPU count, 1 converts in-process.
+        overwrite (str): What happens with existing targets: "skip", "overwrite" or "fail".
+        options (Dict[str, Any], optional): Extra keyword arguments for FBXFileConverter.convert.
+        collectStats (bool): Whether every conversion collects FBXStats, returned in the results.
+
+    """
+
+    OVERWRITE_SKIP = "skip"
+    OVERWRITE_REPLACE = "overwrite"
+    OVERWRITE_FAIL = "fail"
+    OVERWRITE_POLICIES = (OVERWRITE_SKIP, OVERWRITE_REPLACE, OVERWRITE_FAIL)
+
+    STATUS_CONVERTED = "converted"
+    STATUS_SKIPPED = "skipped"
+    STATUS_FAILED = "failed"
+
+    __outputDirectory: str
+    __workers: int
+    __overwrite: str
+    __options: Dict[str, Any]
+    __collectStats: bool
+
+    def __init__(self: 'FBXBatchConverter', outputDirectory: str, workers: int = None, overwrite: str = OVERWRITE_SKIP, options: Dict[str, Any] = None, collectStats: bool = False) -> None:
+        if overwrite not in self.OVERWRITE_POLICIES:
+            raise ValueError(f"Unknown overwrite policy: {overwrite}")
+
+        self.__outputDirectory = outputDirectory
+        self.__workers = workers or os.cpu_count() or 1
+        self.__overwrite = overwrite
+        self.__options = options or {}
+        self.__collectStats = collectStats
+
+    @staticmethod
+    def collectSources(patterns: List[str]) -> List[str]:
+        """
+        Expand directories (searched recursively) and glob patterns into FBX file paths.
+
+        Args:
+            patterns (List[str]): Files, directories or glob patterns.
+
+        Returns:
+            List[str]: The sorted, unique FBX file paths.
+
+        """
+        sources = set()
+        for pattern in patterns:
+            if os.path.isdir(pattern):
+                pattern = os.path.join(pattern, "**", "*")
+
+            for path in glob.glob(pattern, recursive=True):
+                if os.path.isfile(path) and path.lower().endswith(".fbx"):
+                    sources.add(os.path.abspath(path))
+
+        return sorted(sources)
+
+    def __targets(self: 'FBXBatchConverter', sources: List[str]) -> List[str]:
+        """
+        Map the sources to target paths in the output directory, relative to their common directory.
+
+        Args:
+            sources (List[str]): The FBX file paths.
+
+        Returns:
+            List[str]: The target file paths, with the extension of the output format.
+
+        """
+        if not sources:
+            return []
+
+        extension = FBXFileConverter.outputFormat(self.__options.get("format", FBXFileConverter.FORMAT_JSON)).extension
+        root = os.path.commonpath([os.path.dirname(source) for source in sources])
+        return [os.path.join(self.__outputDirectory, os.path.splitext(os.path.relpath(source, root))[0] + extension) for source in sources]
+
+    @staticmethod
+    def convertOne(source: str, target: str, overwrite: str, options: Dict[str, Any], collectStats: bool = False) -> FBXConversionResult:
+        """
+        Convert a single file, capturing any error in the result.
+
+        Args:
+            source (str): The path of the FBX file.
+            target (str): The path of the JSON file.
+            overwrite (str): The overwrite policy.
+            options (Dict[str, Any]): Extra keyword arguments for FBXFileConverter.convert.
+            collectStats (bool): Whether the conversion collects FBXStats.
+
+        Returns:
+            FBXConversionResult: The outcome of the conversion.
+
+        """
+        start = time.perf_counter()
+        sourceBytes = 0
+        try:
+            sourceBytes = os.path.getsize(source)
+            if os.path.exists(target):
+                if overwrite == FBXBatchConverter.OVERWRITE_SKIP:
+                    return FBXConversionResult(source, target, FBXBatchConverter.STATUS_SKIPPED, sourceBytes, time.perf_counter() - start)
+                elif overwrite == FBXBatchConverter.OVERWRITE_FAIL:
+                    raise FileExistsError(f"Target already exists: {target}")
+
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            stats = FBXStats() if collectStats else None
+            FBXFileConverter.convert(source, target, **options, stats=stats)
+        except Exception as e:
+            error = "".join(traceback.format_exception_only(type(e), e)).strip()
+            return FBXConversionResult(source, target, FBXBatchConverter.STATUS_FAILED, sourceBytes, time.perf_counter() - start, error)
+
+        return FBXConversionResult(source, target, FBXBatchConverter.STATUS_CONVERTED, sourceBytes, time.perf_counter() - start, stats=stats.toDict() if stats is not None else None)
+
+    def convert(self: 'FBXBatchConverter', sources: List[str]) -> List[FBXConversionResult]:
+        """
+        Convert all sources, in worker processes unless a single worker is configured.
+
+        Args:
+            sources (List[str]): The FBX file paths.
+
+        Returns:
+            List[FBXConversionResult]: The outcome per file, in completion order.
+
+        """
+        jobs = list(zip(sources, self.__targets(sources)))
+        if self.__workers == 1:
+            return [self.convertOne(source, target, self.__overwrite, self.__options, self.__collectStats) for source, target in jobs]
+
+        results = []
+        with ProcessPoolExecutor(max_workers=self.__workers) as executor:
+            futures = {executor.submit(FBXBatchConverter.convertOne, source, target, self.__overwrite, self.__options, self.__collectStats): (source, target) for source, target in jobs}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # the worker itself died (ie: killed), still report the file
+                    source, target = futures[future]
+                    results.append(FBXConversionResult(source, target, self.STATUS_FAILED, 0, 0.0, repr(e)))
+
+        return results
+
+    @staticmethod
+    def summarize(results: List[FBXConversionResult], elapsed: float) -> str:
+        """
+        Build a summary report of a batch.
+
+        Args:
+            results (List[FBXConversionResult]): The outcome per file.
+            elapsed (float): The wall clock time of the batch in seconds.
+
+        Returns:
+            str: The report, listing failures followed by counts and throughput.
+
+        """
+        converted = [result for result in results if result.status == FBXBatchConverter.STATUS_CONVERTED]
+        failed = [result for result in results if result.status == FBXBatchConverter.STATUS_FAILED]
+        skipped = len(results) - len(converted) - len(failed)
+        megabytes = sum(result.sourceBytes for result in converted) / 2**20
+        elapsed = max(elapsed, 1e-9)
+
+        lines = [f"FAILED {result.source}: {result.error}" for result in failed]
+        lines.append(f"{len(results)} files: {len(converted)} converted, {skipped} skipped, {len(failed)} failed in {elapsed:.2f}s")
+        lines.append(f"throughput: {len(converted) / elapsed:.2f} files/s, {megabytes / elapsed:.2f} MB/s")
+
+        return "\n".join(lines)
@@ -0,0 +1,95 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class FBXByteLimiter:
+    """
+    Asynchronous limiter capping the total number of bytes held by concurrent conversions.
+
+    Conversions reserve the decompressed size of their arrays before inflating them and wait while
+    the reservation would push the total past the limit. A reservation larger than the limit is
+    granted once nothing else is in flight, so a single huge file still converts. Waiters are
+    served in arrival order, a large reservation is not starved by smaller ones.
+
+    Args:
+        maxBytes (int): The maximum total of bytes in flight.
+
+    """
+
+    __maxBytes: int
+    __inFlightBytes: int
+    __waiters: list
+    __condition: asyncio.Condition
+
+    def __init__(self: 'FBXByteLimiter', maxBytes: int = 2**30) -> None:
+        if maxBytes <= 0:
+            raise ValueError(f"Invalid byte limit: {maxBytes}")
+
+        self.__maxBytes = maxBytes
+        self.__inFlightBytes = 0
+        self.__waiters = []
+        self.__condition = None
+
+    @property
+    def maxBytes(self: 'FBXByteLimiter') -> int:
+        """Get the maximum total of bytes in flight."""
+        return self.__maxBytes
+
+    @property
+    def inFlightBytes(self: 'FBXByteLimiter') -> int:
+        """Get the total of bytes currently reserved."""
+        return self.__inFlightBytes
+
+    def __fits(self: 'FBXByteLimiter', amount: int) -> bool:
+        return self.__inFlightBytes == 0 or self.__inFlightBytes + amount <= self.__maxBytes
+
+    async def acquire(self: 'FBXByteLimiter', amount: int) -> None:
+        """
+        Reserve bytes, waiting until they fit under the limit.
+
+        Args:
+            amount (int): The number of bytes to reserve.
+
+        """
+        if self.__condition is None:
+            # created on first use so the limiter can be built outside of a running loop
+            self.__condition = asyncio.Condition()
+
+        async with self.__condition:
+            ticket = object()
+            self.__waiters.append(ticket)
+            try:
+                await self.__condition.wait_for(lambda: self.__waiters[0] is ticket and self.__fits(amount))
+            finally:
+                self.__waiters.remove(ticket)
+                self.__condition.notify_all()
+
+            self.__inFlightBytes += amount
+
+    async def release(self: 'FBXByteLimiter', amount: int) -> None:
+        """
+        Return reserved bytes, waking up the waiting reservations.
+
+        Args:
+            amount (int): The number of bytes to return, as reserved.
+
+        """
+        async with self.__condition:
+            self.__inFlightBytes -= amount
+            self.__condition.notify_all()
+
+    @asynccontextmanager
+    async def reserve(self: 'FBXByteLimiter', amount: int) -> AsyncIterator[None]:
+        """
+        Hold a reservation for the duration of a block, released even when the block fails or is cancelled.
+
+        Args:
+            amount (int): The number of bytes to reserve.
+
+        """
+        await self.acquire(amount)
+        try:
+            yield
+        finally:
+            await asyncio.shield(self.release(amount))
@@ -0,0 +1,140 @@
+import json
+import os
+import time
+from typing import IO, Any, Callable, Dict, List, NamedTuple
+from Domain.Entities.Document.FBXDocument import FBXDocument
+from Infrastructure.Cache.FBXParseCache import FBXParseCache
+from Infrastructure.Diagnostics.FBXStats import FBXStats
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Serializers.FBXArrayExporter import FBXArrayExporter
+from Infrastructure.Serializers.FBXBinarySerializer import FBXBinarySerializer
+from Infrastructure.Serializers.FBXBlobStore import FBXBlobStore
+from Infrastructure.Serializers.FBXCBORSerializer import FBXCBORSerializer
+from Infrastructure.Serializers.FBXDocumentStreamSerializer import FBXDocumentStreamSerializer
+from Infrastructure.Serializers.FBXMessagePackSerializer import FBXMessagePackSerializer
+from Infrastructure.Storage.FBXAtomicFile import FBXAtomicFile
+
+
+class FBXOutputFormat(NamedTuple):
+    """
+    An output encoder of the converter.
+
+    Attributes:
+        write (Callable[[FBXDocument, IO], Any]): Writes a document to an open target file, may return a manifest.
+        binary (bool): Whether the target is opened in binary mode.
+        extension (str): The file extension of the targets, used by batch conversions.
+        lazyArrays (bool): Whether documents are parsed with lazy arrays, for encoders reading the stored array content.
+        manifest (bool): Whether the returned manifest is written as JSON next to the target (<target>.json).
+    """
+
+    write: Callable[[FBXDocument, IO], Any]
+    binary: bool
+    extension: str
+    lazyArrays: bool = False
+    manifest: bool = False
+
+
+class FBXFileConverter:
+    """
+    Conversion of a single FBX file, shared by the CLI and the batch converter.
+
+    The output encoders are registered in FORMATS by name, see registerFormat.
+    """
+
+    FORMAT_JSON = "json"
+
+    FORMATS: Dict[str, FBXOutputFormat] = {
+        "json": FBXOutputFormat(FBXDocumentStreamSerializer.serialize, False, ".json"),
+        "msgpack": FBXOutputFormat(FBXMessagePackSerializer.serialize, True, ".msgpack", True),
+        "cbor": FBXOutputFormat(FBXCBORSerializer.serialize, True, ".cbor", True),
+        "npz": FBXOutputFormat(FBXArrayExporter.serializeNpz, True, ".npz", True),
+        "raw": FBXOutputFormat(FBXArrayExporter.serializeRaw, True, ".bin", True, True),
+        "fbx": FBXOutputFormat(lambda document, output: FBXBinarySerializer().write(document, output), True, ".fbx", True),
+    }
+
+    @staticmethod
+    def registerFormat(name: str, outputFormat: FBXOutputFormat) -> None:
+        """
+        Register an output encoder, replacing any encoder with the same name.
+
+        Args:
+            name (str): The name of the format, as given to convert and the CLI.
+            outputFormat (FBXOutputFormat): The encoder.
+
+        """
+        FBXFileConverter.FORMATS[name] = outputFormat
+
+    @staticmethod
+    def outputFormat(name: str) -> FBXOutputFormat:
+        """
+        Get a registered output encoder.
+
+        Args:
+            name (str): The name of the format.
+
+        Returns:
+            FBXOutputFormat: The encoder.
+
+        Raises:
+            ValueError: If no encoder has this name.
+
+        """
+        if name not in FBXFileConverter.FORMATS:
+            raise ValueError(f"Unknown output format: {name}")
+        return FBXFileConverter.FORMATS[name]
+
+    @staticmethod
+    def convert(source: str, target: str, include: List[str] = None, exclude: List[str] = None, inflateThreads: int = 0, cacheDirectory: str = None, cacheBytes: int = 2**30, format: str = FORMAT_JSON, stats: FBXStats = None, blobDirectory: str = None, skipBlobs: bool = False) -> None:
+        """
+        Convert an FBX file to a JSON (or other format) file.
+
+        The output is written next to the target and moved in place once complete, a failing
+        conversion never leaves a partial target behind.
+
+        Args:
+            source (str): The path of the FBX file.
+            target (str): The path of the file to write.
+            include (List[str], optional): Node path patterns to export, see FBXNodeSelector.
+            exclude (List[str], optional): Node path patterns to leave out, see FBXNodeSelector.
+            inflateThreads (int): The number of threads inflating arrays, 0 inflates while parsing.
+            cacheDirectory (str, optional): The directory of a persistent parse cache, see FBXParseCache. Defaults to no cache.
+            cacheBytes (int): The maximum size in bytes of the parse cache.
+            format (str): The output format, a name registered in FORMATS: "json" (default), "msgpack", "cbor", "npz", "raw" or "fbx".
+            stats (FBXStats, optional): Collects the parse and serialization counters and timers. Defaults to none.
+            blobDirectory (str, optional): The directory raw binary properties (embedded textures, video) are spilled to, content addressed, see FBXBlobStore. Defaults to writing them inline (json format only).
+            skipBlobs (bool): Whether raw binary properties are left out, only their length is written (json format only).
+
+        Raises:
+            ValueError: If blobs are spilled or skipped with another format than json.
+
+        """
+        outputFormat = FBXFileConverter.outputFormat(format)
+        blobStore = FBXBlobStore(blobDirectory) if blobDirectory is not None else None
+        if blobStore is not None or skipBlobs:
+            if format != FBXFileConverter.FORMAT_JSON:
+                raise ValueError(f"Spilling or skipping blobs is not supported by the {format} format")
+            outputFormat = outputFormat._replace(write=lambda document, output: FBXDocumentStreamSerializer.serialize(document, output, blobStore=blobStore, skipBlobs=skipBlobs))
+        options: Dict[str, Any] = {"include": include, "exclude": exclude, "inflateThreads": inflateThreads, "stats": stats}
+        if outputFormat.lazyArrays and cacheDirectory is None:
+            # arrays are read from the stored content while writing, the parse only records where they are
+            options["lazyArrays"] = True
+
+        document: FBXDocument
+        if cacheDirectory is not None:
+            document = FBXParseCache(cacheDirectory, cacheBytes).load(source, **options)
+        else:
+            document = FBXDocumentParser.fromFile(source, **options)
+
+        start = time.perf_counter()
+        with document:
+            manifest = FBXAtomicFile.write(target, lambda file: outputFormat.write(document, file), outputFormat.binary, document.close)
+        if outputFormat.manifest and manifest is not None:
+            FBXAtomicFile.write(target + ".json", lambda file: json.dump(manifest, file, indent=1), False)
+
+        if stats is not None:
+            stats.time("serialize." + format, time.perf_counter() - start)
+            stats.count("serialize.bytes", os.path.getsize(target))
+            if blobStore is not None:
+                stats.count("serialize.blobs", blobStore.storedBlobs)
+                stats.count("serialize.blobBytes", blobStore.storedBytes)
+                stats.count("serialize.duplicateBlobs", blobStore.duplicateBlobs)
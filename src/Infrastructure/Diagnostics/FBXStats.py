@@ -0,0 +1,163 @@
+import heapq
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class FBXStats:
+    """
+    Counters and timers collected while parsing and serializing documents.
+
+    Instrumented code takes an optional FBXStats and does no extra work when it is None, hot paths
+    (like reading a property list) swap in timed readers once when stats are collected.
+
+    Counters are named by dotted phase (ie: "parse.nodes", "parse.inflatedBytes"), timers accumulate
+    seconds and calls per name (ie: "parse.header", "parse.property.d", "parse.property.run", "serialize"). The largest
+    arrays seen are kept as (decodedBytes, typeCode, arrayLength, storedBytes, offset).
+
+    Args:
+        largestArrays (int): The number of largest arrays to keep.
+
+    """
+
+    __counters: Dict[str, int]
+    __timers: Dict[str, List[float]]
+    __largestArrays: List[Tuple[int, str, int, int, int]]
+    __largestArraysCount: int
+
+    def __init__(self: 'FBXStats', largestArrays: int = 10) -> None:
+        self.__counters = {}
+        self.__timers = {}
+        self.__largestArrays = []
+        self.__largestArraysCount = largestArrays
+
+    @property
+    def counters(self: 'FBXStats') -> Dict[str, int]:
+        """Get the counters by name."""
+        return self.__counters
+
+    @property
+    def timers(self: 'FBXStats') -> Dict[str, Tuple[float, int]]:
+        """Get the accumulated seconds and number of calls per timer name."""
+        return {name: (seconds, int(calls)) for name, (seconds, calls) in self.__timers.items()}
+
+    @property
+    def largestArrays(self: 'FBXStats') -> List[Tuple[int, str, int, int, int]]:
+        """Get the largest arrays, largest first, as (decodedBytes, typeCode, arrayLength, storedBytes, offset)."""
+        return sorted(self.__largestArrays, reverse=True)
+
+    def count(self: 'FBXStats', name: str, amount: int = 1) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name (str): The counter name.
+            amount (int): The amount to add.
+
+        """
+        self.__counters[name] = self.__counters.get(name, 0) + amount
+
+    def time(self: 'FBXStats', name: str, seconds: float, calls: int = 1) -> None:
+        """
+        Add a measured duration to a timer.
+
+        Args:
+            name (str): The timer name.
+            seconds (float): The duration in seconds.
+            calls (int): The number of calls the duration covers.
+
+        """
+        timer = self.__timers.get(name)
+        if timer is None:
+            self.__timers[name] = [seconds, calls]
+        else:
+            timer[0] += seconds
+            timer[1] += calls
+
+    @contextmanager
+    def timer(self: 'FBXStats', name: str) -> Iterator[None]:
+        """
+        Time a block of code.
+
+        Args:
+            name (str): The timer name.
+
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.time(name, time.perf_counter() - start)
+
+    def recordArray(self: 'FBXStats', typeCode: str, arrayLength: int, storedBytes: int, decodedBytes: int, offset: int) -> None:
+        """
+        Record an array, keeping it when it is among the largest.
+
+        Args:
+            typeCode (str): The array type code.
+            arrayLength (int): The number of elements.
+            storedBytes (int): The stored (compressed) length in bytes.
+            decodedBytes (int): The decoded length in bytes.
+            offset (int): The offset of the array content in the file.
+
+        """
+        entry = (decodedBytes, typeCode, arrayLength, storedBytes, offset)
+        if len(self.__largestArrays) < self.__largestArraysCount:
+            heapq.heappush(self.__largestArrays, entry)
+        elif entry > self.__largestArrays[0]:
+            heapq.heapreplace(self.__largestArrays, entry)
+
+    def merge(self: 'FBXStats', other: Dict[str, Any]) -> None:
+        """
+        Add the stats of another collection, as returned by toDict (ie: from a worker process).
+
+        Args:
+            other (Dict[str, Any]): The stats to add.
+
+        """
+        for name, amount in other.get("counters", {}).items():
+            self.count(name, amount)
+        for name, timer in other.get("timers", {}).items():
+            self.time(name, timer["seconds"], timer["calls"])
+        for entry in other.get("largestArrays", []):
+            self.recordArray(entry["typeCode"], entry["arrayLength"], entry["storedBytes"], entry["decodedBytes"], entry["offset"])
+
+    def toDict(self: 'FBXStats') -> Dict[str, Any]:
+        """
+        Get the stats as a JSON serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: The counters, timers and largest arrays.
+
+        """
+        return {
+            "counters": dict(sorted(self.__counters.items())),
+            "timers": {name: {"seconds": seconds, "calls": calls} for name, (seconds, calls) in sorted(self.timers.items())},
+            "largestArrays": [
+                {"decodedBytes": decodedBytes, "typeCode": typeCode, "arrayLength": arrayLength, "storedBytes": storedBytes, "offset": offset}
+                for decodedBytes, typeCode, arrayLength, storedBytes, offset in self.largestArrays
+            ],
+        }
+
+    def report(self: 'FBXStats') -> str:
+        """
+        Build a human readable breakdown of the stats.
+
+        Returns:
+            str: The report: timers by time spent, counters and the largest arrays.
+
+        """
+        lines = ["timers:"]
+        for name, (seconds, calls) in sorted(self.timers.items(), key=lambda item: item[1][0], reverse=True):
+            lines.append(f"  {name:<32} {seconds * 1000:>10.2f} ms {calls:>10} calls")
+
+        lines.append("counters:")
+        for name, amount in sorted(self.__counters.items()):
+            lines.append(f"  {name:<32} {amount:>16}")
+
+        if self.__largestArrays:
+            lines.append("largest arrays:")
+            for decodedBytes, typeCode, arrayLength, storedBytes, offset in self.largestArrays:
+                lines.append(f"  '{typeCode}' x {arrayLength:<10} {decodedBytes:>12} bytes ({storedBytes} stored) at offset {offset}")
+
+        return "\n".join(lines)
@@ -0,0 +1,404 @@
+from array import array
+from itertools import compress, count, repeat
+from operator import invert
+from typing import Any, Iterator, List, NamedTuple, Sequence, Tuple
+from Domain.Entities.Document.FBXDocument import FBXDocument
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Parser.FBXArrayDecoder import numpy
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+
+# Layer element mappings: one element per polygon corner, control point, polygon, or one for the whole mesh
+MAPPING_BY_POLYGON_VERTEX = "ByPolygonVertex"
+MAPPING_BY_CONTROL_POINT = frozenset(("ByControlPoint", "ByVertice", "ByVertex"))
+MAPPING_BY_POLYGON = "ByPolygon"
+MAPPING_ALL_SAME = "AllSame"
+
+# Layer element references: elements read in mapping order, or through an index array ("Index" is the pre 7.x name)
+REFERENCE_DIRECT = "Direct"
+REFERENCE_INDEX_TO_DIRECT = ("IndexToDirect", "Index")
+
+
+class FBXMeshBuffers(NamedTuple):
+    """
+    Flat typed buffers of a mesh, see FBXGeometryExtractor.
+
+    Buffers are numpy arrays when numpy is used, array.array otherwise. Attributes are interleaved
+    per vertex (ie: x, y, z, x, y, z...) and vertices are shared through the indices.
+
+    Attributes:
+        objectId (int): The object ID of the Geometry node.
+        name (str): The name of the Geometry, without its class suffix.
+        positions (Any): The vertex positions, 3 float32 or float64 per vertex.
+        indices (Any): The triangle vertex indices, 3 uint32 per triangle.
+        normals (Any): The vertex normals, 3 floats per vertex, None without a normal layer.
+        uvs (List[Any]): The texture coordinates of every UV layer, 2 floats per vertex.
+        uvNames (List[str]): The name of every UV layer (ie: "map1").
+        controlPointIndices (Any): The control point (Vertices entry) of every vertex as uint32, None when the vertices are the control points.
+        polygonCount (int): The number of polygons of the mesh.
+    """
+
+    objectId: int
+    name: str
+    positions: Any
+    indices: Any
+    normals: Any
+    uvs: List[Any]
+    uvNames: List[str]
+    controlPointIndices: Any
+    polygonCount: int
+
+
+class FBXGeometryExtractor:
+    """
+    Extractor turning mesh Geometry nodes into flat typed buffers, ready for GPU upload or NumPy.
+
+    Polygons (PolygonVertexIndex, the last corner of a polygon stored as -index - 1) are fan
+    triangulated. When every attribute layer is mapped by control point the vertices are the control
+    points, otherwise the mesh is de-indexed to one vertex per polygon corner, the layers mapped by
+    polygon vertex, control point or polygon, directly or through an IndexToDirect index, are gathered
+    per corner. Vectorized with numpy when it is installed, with an array.array fallback.
+
+    Args:
+        precision (str): The float type of positions and attributes: "float32" (default) or "float64".
+        useNumpy (bool, optional): Whether to use numpy. Defaults to using it when installed.
+
+    Raises:
+        ValueError: If the precision is unknown or numpy is requested but not installed.
+
+    """
+
+    PRECISION_FLOAT32 = "float32"
+    PRECISION_FLOAT64 = "float64"
+
+    # Precision: (array.array type code, numpy dtype)
+    PRECISION_TYPES = {
+        PRECISION_FLOAT32: ("f", "<f4"),
+        PRECISION_FLOAT64: ("d", "<f8"),
+    }
+
+    __precision: str
+    __useNumpy: bool
+
+    def __init__(self: 'FBXGeometryExtractor', precision: str = PRECISION_FLOAT32, useNumpy: bool = None) -> None:
+        if precision not in self.PRECISION_TYPES:
+            raise ValueError(f"Unknown precision: {precision}")
+        if useNumpy and numpy is None:
+            raise ValueError("numpy is not installed")
+
+        self.__precision = precision
+        self.__useNumpy = numpy is not None if useNumpy is None else useNumpy
+
+    @property
+    def precision(self: 'FBXGeometryExtractor') -> str:
+        """Get the float type of positions and attributes."""
+        return self.__precision
+
+    @property
+    def useNumpy(self: 'FBXGeometryExtractor') -> bool:
+        """Whether buffers are computed and returned as numpy arrays."""
+        return self.__useNumpy
+
+    @staticmethod
+    def __values(value: Any) -> Any:
+        """Get the decoded array of a property, inflating lazy arrays."""
+        return value.value if isinstance(value, FBXLazyArrayProperty) else value
+
+    @staticmethod
+    def __child(node: FBXDocumentNode, name: str, default: Any = None) -> Any:
+        """Get the first property of the first child with a name."""
+        for child in node.children:
+            if child.name == name and child.properties:
+                return child.properties[0]
+        return default
+
+    @staticmethod
+    def __layers(geometry: FBXDocumentNode, name: str, valuesName: str, indexName: str) -> List[Tuple[str, str, str, Any, Any]]:
+        """
+        Get the layer elements of a kind, in document order.
+
+        Args:
+            geometry (FBXDocumentNode): The Geometry node.
+            name (str): The layer element node name (ie: "LayerElementUV").
+            valuesName (str): The name of the values child (ie: "UV").
+            indexName (str): The name of the index child (ie: "UVIndex").
+
+        Returns:
+            List[Tuple[str, str, str, Any, Any]]: The name, mapping, reference, values and index (None when direct) of every layer.
+
+        """
+        layers = []
+        for element in geometry.children:
+            if element.name != name:
+                continue
+
+            values = FBXGeometryExtractor.__child(element, valuesName)
+            if values is None:
+                continue
+
+            reference = FBXGeometryExtractor.__child(element, "ReferenceInformationType", REFERENCE_DIRECT)
+            index = FBXGeometryExtractor.__child(element, indexName) if reference in REFERENCE_INDEX_TO_DIRECT else None
+            if reference != REFERENCE_DIRECT and index is None:
+                raise ValueError(f"Unsupported {name} reference: {reference}")
+
+            layers.append((
+                FBXGeometryExtractor.__child(element, "Name", ""),
+                FBXGeometryExtractor.__child(element, "MappingInformationType", MAPPING_ALL_SAME),
+                reference,
+                FBXGeometryExtractor.__values(values),
+                FBXGeometryExtractor.__values(index) if index is not None else None,
+            ))
+
+        return layers
+
+    def extract(self: 'FBXGeometryExtractor', geometry: FBXDocumentNode) -> FBXMeshBuffers:
+        """
+        Extract the buffers of a mesh Geometry node.
+
+        Args:
+            geometry (FBXDocumentNode): The Geometry node, holding Vertices and PolygonVertexIndex.
+
+        Returns:
+            FBXMeshBuffers: The flat buffers of the mesh, the first normal layer and every UV layer included.
+
+        Raises:
+            ValueError: If the node has no Vertices or a layer uses an unsupported mapping or reference.
+
+        """
+        vertices = self.__child(geometry, "Vertices")
+        if vertices is None:
+            raise ValueError(f"Geometry without Vertices at offset {geometry.startOffset}")
+
+        vertices = self.__values(vertices)
+        polygonVertexIndex = self.__values(self.__child(geometry, "PolygonVertexIndex", []))
+        normals = self.__layers(geometry, "LayerElementNormal", "Normals", "NormalsIndex")[:1]
+        uvs = self.__layers(geometry, "LayerElementUV", "UV", "UVIndex")
+        layers = [(layer, 3) for layer in normals] + [(layer, 2) for layer in uvs]
+
+        for (_, mapping, _, _, _), _ in layers:
+            if mapping not in MAPPING_BY_CONTROL_POINT and mapping not in (MAPPING_BY_POLYGON_VERTEX, MAPPING_BY_POLYGON, MAPPING_ALL_SAME):
+                raise ValueError(f"Unsupported layer element mapping: {mapping}")
+
+        # the control points are the vertices unless a layer holds values per corner or per polygon
+        perCorner = any(mapping not in MAPPING_BY_CONTROL_POINT and mapping != MAPPING_ALL_SAME for (_, mapping, _, _, _), _ in layers)
+        gather = self.__gatherNumpy if self.__useNumpy else self.__gatherArray
+        polygons = (self.__polygonsNumpy if self.__useNumpy else self.__polygonsArray)(polygonVertexIndex, perCorner)
+        controlPoints, polygonCount = polygons[0], len(polygons[1])
+        vertexCount = len(controlPoints) if perCorner else len(vertices) // 3
+
+        attributes = [gather(values, components, self.__elements(mapping, index, polygons, perCorner, vertexCount), vertexCount) for (_, mapping, _, values, index), components in layers]
+
+        objectId = geometry.properties[0] if geometry.properties else None
+        name = geometry.properties[1].split("\x00\x01")[0] if len(geometry.properties) > 1 and isinstance(geometry.properties[1], str) else ""
+
+        return FBXMeshBuffers(
+            objectId, name,
+            gather(vertices, 3, controlPoints if perCorner else None, vertexCount),
+            polygons[2],
+            attributes[0] if normals else None,
+            attributes[len(normals):],
+            [layerName for layerName, _, _, _, _ in uvs],
+            controlPoints if perCorner else None,
+            polygonCount,
+        )
+
+    def extractAll(self: 'FBXGeometryExtractor', document: FBXDocument) -> Iterator[FBXMeshBuffers]:
+        """
+        Extract the buffers of every mesh of a document.
+
+        Args:
+            document (FBXDocument): The document, the "Objects/Geometry" nodes of subclass "Mesh" are extracted.
+
+        Returns:
+            Iterator[FBXMeshBuffers]: The buffers of every mesh, in document order.
+
+        """
+        for geometry in document.find("Objects/Geometry"):
+            if len(geometry.properties) > 2 and geometry.properties[2] == "Mesh":
+                yield self.extract(geometry)
+
+    def __elements(self: 'FBXGeometryExtractor', mapping: str, index: Any, polygons: tuple, perCorner: bool, vertexCount: int) -> Any:
+        """
+        Get the element of a layer read by every vertex.
+
+        Args:
+            mapping (str): The mapping of the layer.
+            index (Any): The IndexToDirect index of the layer, None when direct.
+            polygons (tuple): The control point of every corner, the polygon ends and the triangles, see __polygonsArray.
+            perCorner (bool): Whether the vertices are the polygon corners, otherwise the control points.
+            vertexCount (int): The number of vertices.
+
+        Returns:
+            Any: The element of every vertex, None for the identity (element i for vertex i).
+
+        """
+        if mapping == MAPPING_ALL_SAME:
+            elements = numpy.zeros(vertexCount, dtype="<u4") if self.__useNumpy else array("I", bytes(4 * vertexCount))
+        elif perCorner and mapping in MAPPING_BY_CONTROL_POINT:
+            elements = polygons[0]
+        elif perCorner and mapping == MAPPING_BY_POLYGON:
+            elements = self.__cornerPolygons(polygons[1])
+        else:
+            elements = None
+
+        if index is None:
+            return elements
+        if elements is None:
+            return numpy.asarray(index)[:vertexCount] if self.__useNumpy else index[:vertexCount]
+
+        return self.__take(index, elements)
+
+    def __take(self: 'FBXGeometryExtractor', values: Any, elements: Any) -> Any:
+        """Get values[element] for every element."""
+        if self.__useNumpy:
+            return numpy.asarray(values)[elements]
+        return array("I", map(values.__getitem__, elements))
+
+    def __polygonsArray(self: 'FBXGeometryExtractor', polygonVertexIndex: Any, perCorner: bool) -> Tuple[array, Sequence[int], array]:
+        """
+        Split and fan triangulate the polygons, with array.array.
+
+        Corners after the last polygon end (a truncated list) are left out. Loops stay in C where possible:
+        when all polygons have the same size (ie: all quads) the ends are checked and the triangles written
+        with strided slices, otherwise the ends are found with compress and the polygons fanned one by one.
+
+        Args:
+            polygonVertexIndex (Any): The PolygonVertexIndex array.
+            perCorner (bool): Whether the triangles index the corners, otherwise the control points.
+
+        Returns:
+            Tuple[array, Sequence[int], array]: The control point of every corner, the last corner of every polygon and the triangle indices.
+
+        """
+        corners = self.__typed(polygonVertexIndex[:], "i")
+        firstEnd = next(compress(count(), map((0).__gt__, corners)), -1)
+        size = firstEnd + 1
+
+        if size >= 3 and len(corners) % size == 0 and max(corners[firstEnd::size]) < 0 and all(min(corners[corner::size]) >= 0 for corner in range(firstEnd)):
+            ends = range(firstEnd, len(corners), size)
+            corners[firstEnd::size] = array("i", map(invert, corners[firstEnd::size]))
+
+            fans = size - 2
+            triangles = array("I", bytes(4 * 3 * fans * len(ends)))
+            for fan in range(fans):
+                triangles[3 * fan::3 * fans] = array("I", range(0, len(corners), size))
+                triangles[3 * fan + 1::3 * fans] = array("I", range(fan + 1, len(corners), size))
+                triangles[3 * fan + 2::3 * fans] = array("I", range(fan + 2, len(corners), size))
+        else:
+            ends = list(compress(count(), map((0).__gt__, corners)))
+            del corners[ends[-1] + 1 if ends else 0:]
+            for end in ends:
+                corners[end] = ~corners[end]
+
+            triangles, start = array("I"), 0
+            for end in ends:
+                for corner in range(start + 1, end):
+                    triangles.extend((start, corner, corner + 1))
+                start = end + 1
+
+        controlPoints = array("I")
+        controlPoints.frombytes(corners.tobytes())
+
+        if not perCorner:
+            triangles = array("I", map(controlPoints.__getitem__, triangles))
+
+        return controlPoints, ends, triangles
+
+    def __polygonsNumpy(self: 'FBXGeometryExtractor', polygonVertexIndex: Any, perCorner: bool) -> Tuple[Any, Any, Any]:
+        """
+        Split and fan triangulate the polygons, vectorized with numpy, see __polygonsArray.
+        """
+        polygonVertexIndex = numpy.asarray(polygonVertexIndex, dtype="<i8")
+        ends = numpy.flatnonzero(polygonVertexIndex < 0)
+        cornerCount = int(ends[-1]) + 1 if len(ends) else 0
+        corners = polygonVertexIndex[:cornerCount]
+        controlPoints = numpy.where(corners < 0, ~corners, corners).astype("<u4")
+
+        # triangle t of a polygon is (start, start + t + 1, start + t + 2)
+        starts = numpy.concatenate(([0], ends[:-1] + 1)) if len(ends) else ends
+        triangleCounts = numpy.maximum(ends - starts - 1, 0)
+        triangleStarts = numpy.repeat(starts, triangleCounts)
+        firstTriangles = numpy.cumsum(triangleCounts) - triangleCounts
+        steps = numpy.arange(int(triangleCounts.sum())) - numpy.repeat(firstTriangles, triangleCounts) + 1
+        triangles = numpy.stack((triangleStarts, triangleStarts + steps, triangleStarts + steps + 1), axis=1).ravel().astype("<u4")
+
+        if not perCorner:
+            triangles = controlPoints[triangles]
+
+        return controlPoints, ends, triangles
+
+    def __cornerPolygons(self: 'FBXGeometryExtractor', ends: Any) -> Any:
+        """
+        Get the polygon of every corner.
+
+        Args:
+            ends (Any): The last corner of every polygon.
+
+        Returns:
+            Any: The polygon index of every corner, as uint32.
+
+        """
+        if self.__useNumpy:
+            sizes = numpy.diff(ends, prepend=-1)
+            return numpy.repeat(numpy.arange(len(ends), dtype="<u4"), sizes)
+
+        cornerPolygons, start = array("I"), 0
+        for polygon, end in enumerate(ends):
+            cornerPolygons.extend(repeat(polygon, end - start + 1))
+            start = end + 1
+
+        return cornerPolygons
+
+    @staticmethod
+    def __typed(values: Any, typeCode: str) -> array:
+        """Get values as an array.array of a type, without converting values of that type one by one."""
+        if isinstance(values, array) and values.typecode == typeCode:
+            return values
+
+        if isinstance(values, memoryview) and values.format == typeCode:
+            typed = array(typeCode)
+            typed.frombytes(values.cast("B"))
+            return typed
+
+        return array(typeCode, values)
+
+    def __gatherArray(self: 'FBXGeometryExtractor', values: Any, components: int, elements: Any, vertexCount: int) -> array:
+        """
+        Gather the tuples of an attribute per vertex, with array.array.
+
+        The values are converted to the output precision once, then gathered as whole byte records:
+        the bytes of every element are cut once and joined in vertex order, both loops run in C.
+
+        Args:
+            values (Any): The attribute values, components per element.
+            components (int): The number of values per element.
+            elements (Any): The element of every vertex, None for the identity.
+            vertexCount (int): The number of vertices.
+
+        Returns:
+            array: The interleaved values of every vertex, in the extractor precision.
+
+        """
+        typeCode = self.PRECISION_TYPES[self.__precision][0]
+        if elements is None:
+            return self.__typed(values[:components * vertexCount], typeCode)
+
+        content = self.__typed(values, typeCode).tobytes()
+        width = components * array(typeCode).itemsize
+        records = list(map(content.__getitem__, map(slice, range(0, len(content), width), range(width, len(content) + width, width))))
+
+        gathered = array(typeCode)
+        gathered.frombytes(b"".join(map(records.__getitem__, elements)))
+
+        return gathered
+
+    def __gatherNumpy(self: 'FBXGeometryExtractor', values: Any, components: int, elements: Any, vertexCount: int) -> Any:
+        """
+        Gather the tuples of an attribute per vertex, vectorized with numpy, see __gatherArray.
+        """
+        dtype = self.PRECISION_TYPES[self.__precision][1]
+        values = numpy.asarray(values)
+        values = values[:len(values) - len(values) % components].reshape(-1, components)
+        values = values[elements] if elements is not None else values[:vertexCount]
+
+        return numpy.ascontiguousarray(values, dtype=dtype).ravel()
+
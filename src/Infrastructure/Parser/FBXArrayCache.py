@@ -0,0 +1,150 @@
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Set
+
+
+class FBXArrayCache:
+    """
+    Memory bounded least recently used cache for decoded array properties.
+
+    An entry can be tied to an owner object (ie: the buffer the array is read from): the entries of an
+    owner are dropped as soon as it is garbage collected, so the cache never keeps a released document
+    (or its file mapping) alive. Keys should not reference their owner.
+
+    Args:
+        maxBytes (int): The maximum total size in bytes of the cached values.
+
+    """
+
+    __maxBytes: int
+    __currentBytes: int
+    __entries: OrderedDict
+    __owners: Dict[int, Set[Hashable]]
+    __released: List[int]
+    __lock: threading.Lock
+
+    def __init__(self: 'FBXArrayCache', maxBytes: int = 256 * 2**20) -> None:
+        self.__maxBytes = maxBytes
+        self.__currentBytes = 0
+        self.__entries = OrderedDict()
+        self.__owners = {}
+        self.__released = []
+        self.__lock = threading.Lock()
+
+    @property
+    def maxBytes(self: 'FBXArrayCache') -> int:
+        """Get the maximum total size in bytes of the cached values."""
+        return self.__maxBytes
+
+    @property
+    def currentBytes(self: 'FBXArrayCache') -> int:
+        """Get the total size in bytes of the cached values."""
+        return self.__currentBytes
+
+    def __len__(self: 'FBXArrayCache') -> int:
+        return len(self.__entries)
+
+    def __contains__(self: 'FBXArrayCache', key: Hashable) -> bool:
+        return key in self.__entries
+
+    def __release(self: 'FBXArrayCache', ownerId: int) -> None:
+        """
+        Drop the entries of a collected owner.
+
+        Runs from the garbage collector, possibly while this thread holds the lock: the entries are
+        dropped right away when the lock is free, otherwise by the next call holding it.
+
+        Args:
+            ownerId (int): The id of the collected owner.
+
+        """
+        self.__released.append(ownerId)
+        if self.__lock.acquire(blocking=False):
+            try:
+                self.__dropReleased()
+            finally:
+                self.__lock.release()
+
+    def __dropReleased(self: 'FBXArrayCache') -> None:
+        """
+        Drop the entries of the collected owners, the lock being held.
+        """
+        while self.__released:
+            for key in self.__owners.pop(self.__released.pop(), ()):
+                _, size, _ = self.__entries.pop(key)
+                self.__currentBytes -= size
+
+    def discard(self: 'FBXArrayCache', owner: Any) -> None:
+        """
+        Drop the entries of an owner right away (ie: before its buffer gets released).
+
+        Args:
+            owner (Any): The owner the entries were cached with.
+
+        """
+        with self.__lock:
+            self.__released.append(id(owner))
+            self.__dropReleased()
+
+    def get(self: 'FBXArrayCache', key: Hashable, size: int, factory: Callable[[], Any], owner: Any = None) -> Any:
+        """
+        Get a cached value, creating and caching it when missing.
+
+        Values larger than the cache are returned without being cached.
+
+        Args:
+            key (Hashable): The cache key, it must not reference the owner.
+            size (int): The size in bytes of the value.
+            factory (Callable[[], Any]): Creates the value on a cache miss.
+            owner (Any, optional): The object the entry lives with, it must support weak references. Defaults to none.
+
+        Returns:
+            Any: The cached or created value.
+
+        """
+        with self.__lock:
+            self.__dropReleased()
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                return self.__entries[key][0]
+
+        value = factory()
+        if size > self.__maxBytes:
+            return value
+
+        with self.__lock:
+            self.__dropReleased()
+            if key not in self.__entries:
+                ownerId = None
+                if owner is not None:
+                    ownerId = id(owner)
+                    if ownerId not in self.__owners:
+                        self.__owners[ownerId] = set()
+                        weakref.finalize(owner, self.__release, ownerId)
+                    self.__owners[ownerId].add(key)
+
+                self.__entries[key] = (value, size, ownerId)
+                self.__currentBytes += size
+
+            while self.__currentBytes > self.__maxBytes:
+                evictedKey, (_, evictedSize, evictedOwner) = self.__entries.popitem(last=False)
+                self.__currentBytes -= evictedSize
+                if evictedOwner is not None:
+                    self.__owners[evictedOwner].discard(evictedKey)
+
+        return value
+
+    def clear(self: 'FBXArrayCache') -> None:
+        """
+        Remove all cached values.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__released.clear()
+            for keys in self.__owners.values():
+                keys.clear()
+            self.__currentBytes = 0
+
+
+defaultArrayCache = FBXArrayCache()
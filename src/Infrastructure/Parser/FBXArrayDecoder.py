@@ -0,0 +1,129 @@
+import numbers
+import sys
+from array import array
+from typing import Any
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class FBXArrayDecoder:
+    """
+    Bulk decoder turning the content of FBX array properties into typed arrays.
+
+    Arrays decode to array.array, except for boolean arrays and content which is already a
+    memoryview (uncompressed arrays read from a view), those decode to a cast memoryview.
+    encode turns decoded arrays (of any output type) back into their little-endian content.
+    """
+
+    ARRAY_OUTPUT_ARRAY = "array"
+    ARRAY_OUTPUT_NUMPY = "numpy"
+    ARRAY_OUTPUT_LIST = "list"
+
+    # FBX array type code: (array.array type code, numpy dtype, element size)
+    ARRAY_FORMATS = {
+        "f": ("f", "<f4", 4),
+        "d": ("d", "<f8", 8),
+        "l": ("q", "<i8", 8),
+        "i": ("i", "<i4", 4),
+        "b": ("?", "?", 1),
+    }
+
+    @staticmethod
+    def decode(content: bytes, typeCode: str, arrayLength: int, arrayOutput: str = ARRAY_OUTPUT_ARRAY) -> Any:
+        """
+        Decode the (decompressed) content of an array property in a single call.
+
+        Args:
+            content (bytes): The little-endian array content, a memoryview is decoded without copying where possible.
+            typeCode (str): The type code representing the array type.
+            arrayLength (int): The number of elements in the array.
+            arrayOutput (str): The output type, see FBXPropertyParser.
+
+        Returns:
+            Any: The decoded array.
+
+        Raises:
+            ValueError: If the content length does not match the array length.
+
+        """
+        arrayTypeCode, dtype, elementSize = FBXArrayDecoder.ARRAY_FORMATS[typeCode]
+        if len(content) != arrayLength * elementSize:
+            raise ValueError(f"Array content of {len(content)} bytes does not hold {arrayLength} '{typeCode}' elements")
+
+        if arrayOutput == FBXArrayDecoder.ARRAY_OUTPUT_NUMPY:
+            return numpy.frombuffer(content, dtype=dtype)
+        elif arrayOutput == FBXArrayDecoder.ARRAY_OUTPUT_LIST:
+            return FBXArrayDecoder.decode(content, typeCode, arrayLength).tolist()
+
+        # views can be cast in place, a cast does not copy so uncompressed arrays stay views of the source buffer
+        if isinstance(content, memoryview) or elementSize == 1:
+            if sys.byteorder == "little" or elementSize == 1:
+                return memoryview(content).cast(arrayTypeCode)
+
+        output = array(arrayTypeCode)
+        output.frombytes(content)
+        if sys.byteorder == "big":
+            output.byteswap()
+
+        return output
+
+    @staticmethod
+    def typeCodeOf(value: Any) -> str:
+        """
+        Infer the FBX type code of a decoded array from its element type.
+
+        Args:
+            value (Any): The array: array.array, memoryview, numpy.ndarray or a sequence of python values.
+
+        Returns:
+            str: The array type code.
+
+        """
+        if isinstance(value, (array, memoryview)):
+            kind, itemSize = value.typecode if isinstance(value, array) else value.format, value.itemsize
+        elif numpy is not None and isinstance(value, numpy.ndarray):
+            kind, itemSize = {"b": "?", "f": "d"}.get(value.dtype.kind, "q"), value.dtype.itemsize
+        elif value and all(isinstance(item, bool) for item in value):
+            return "b"
+        elif all(isinstance(item, numbers.Integral) for item in value):
+            return "i" if all(-2**31 <= item < 2**31 for item in value) else "l"
+        else:
+            return "d"
+
+        if kind == "?":
+            return "b"
+        elif kind in ("f", "d"):
+            return "f" if itemSize == 4 else "d"
+        return "i" if itemSize <= 4 else "l"
+
+    @staticmethod
+    def encode(value: Any, typeCode: str) -> bytes:
+        """
+        Encode a decoded array back into the little-endian content of an array property.
+
+        Args:
+            value (Any): The array: array.array, memoryview, numpy.ndarray or a sequence of python values.
+            typeCode (str): The type code representing the array type.
+
+        Returns:
+            bytes: The uncompressed array content.
+
+        """
+        arrayTypeCode, dtype, elementSize = FBXArrayDecoder.ARRAY_FORMATS[typeCode]
+
+        if numpy is not None and isinstance(value, numpy.ndarray):
+            return numpy.ascontiguousarray(value, dtype=dtype).tobytes()
+        elif isinstance(value, memoryview) and value.format == arrayTypeCode and (sys.byteorder == "little" or elementSize == 1):
+            return value.tobytes()
+        elif typeCode == "b":
+            return bytes(bool(item) for item in value)
+
+        if not isinstance(value, array) or value.typecode != arrayTypeCode or sys.byteorder == "big":
+            value = array(arrayTypeCode, value)
+            if sys.byteorder == "big":
+                value.byteswap()
+
+        return value.tobytes()
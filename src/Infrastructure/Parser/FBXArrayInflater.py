@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+
+
+class FBXArrayInflater:
+    """
+    Second phase of a two-phase parse: inflates and decodes lazy array properties concurrently.
+
+    The first phase (a parse with lazyArrays) only records where every array is stored, this phase
+    hands the arrays to a thread pool and patches the decoded values back into the node properties.
+    zlib releases the GIL while inflating, so arrays are inflated in parallel.
+
+    Args:
+        threads (int, optional): The number of threads. Defaults to the CPU count.
+
+    """
+
+    __threads: int
+
+    def __init__(self: 'FBXArrayInflater', threads: int = None) -> None:
+        self.__threads = threads or os.cpu_count() or 1
+
+    @staticmethod
+    def collect(root: FBXDocumentNode) -> List[Tuple[FBXDocumentNode, int, FBXLazyArrayProperty]]:
+        """
+        Collect the lazy array properties below a node.
+
+        Args:
+            root (FBXDocumentNode): The node to search from.
+
+        Returns:
+            List[Tuple[FBXDocumentNode, int, FBXLazyArrayProperty]]: The node, property index and lazy property of every array.
+
+        """
+        found, stack = [], [root]
+        while stack:
+            node = stack.pop()
+            found.extend((node, index, value) for index, value in enumerate(node.properties) if isinstance(value, FBXLazyArrayProperty))
+            stack.extend(node.children)
+
+        return found
+
+    def inflate(self: 'FBXArrayInflater', root: FBXDocumentNode) -> int:
+        """
+        Decode all lazy array properties below a node and replace them with their values.
+
+        Args:
+            root (FBXDocumentNode): The node to inflate from.
+
+        Returns:
+            int: The number of decoded arrays.
+
+        """
+        found = self.collect(root)
+        # largest arrays first so a single huge array does not end up last on one thread
+        found.sort(key=lambda entry: entry[2].compressedLength, reverse=True)
+
+        if self.__threads == 1 or len(found) < 2:
+            values = [lazy.decode() for _, _, lazy in found]
+        else:
+            with ThreadPoolExecutor(max_workers=self.__threads) as executor:
+                values = list(executor.map(FBXLazyArrayProperty.decode, [lazy for _, _, lazy in found]))
+
+        for (node, index, _), value in zip(found, values):
+            node.properties[index] = value
+
+        return len(found)
@@ -1,10 +1,40 @@
+import mmap
+import os
+from array import array
+import struct
+import sys
+from typing import List, Union
 from Domain.Entities.Document.FBXDocumentHeader import FBXDocumentHeader
 from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
 from Domain.Entities.Document.FBXDocument import FBXDocument
+from Domain.Entities.Document.FBXNodeTable import FBXNodeTable
+from Domain.Entities.Document.FBXOffsetIndex import FBXOffsetIndex
+from Domain.Entities.Document.FBXTableOfContents import FBXTableOfContents
 from Domain.Entities.DataView.DataView import DataView
-from Domain.Entities.DataView.DataViewInterface import DataViewInterface
+from Infrastructure.Diagnostics.FBXStats import FBXStats
+from Infrastructure.Parser.FBXArrayCache import FBXArrayCache
+from Infrastructure.Parser.FBXArrayInflater import FBXArrayInflater
+from Infrastructure.Parser.FBXNodeSelector import FBXNodeSelector
 from Infrastructure.Parser.FBXPropertyParser import FBXPropertyParser
 
+# Version of the parsed document layout, bump when parsed documents change shape (invalidates parse caches)
+PARSER_VERSION = 2
+
+# Node storage backends: an object per node, or rows in a columnar FBXNodeTable
+NODE_STORAGE_OBJECTS = "objects"
+NODE_STORAGE_TABLE = "table"
+
+# Fixed node record header: endOffset, numProperties, propertyListLen, nameLen
+NODE_HEADER_32 = struct.Struct("<IIIB")
+NODE_HEADER_64 = struct.Struct("<QQQB")
+
+# File header: magic, null bytes, version number
+FILE_HEADER_LENGTH = 27
+FILE_VERSION = struct.Struct("<I")
+
+# Object ID, the leading "L" property of the children of the top level "Objects" node
+OBJECT_ID = struct.Struct("<q")
+
 
 class FBXDocumentParser:
     """
@@ -12,13 +42,21 @@ class FBXDocumentParser:
 
     Args:
         buffer (bytes): The FBX file buffer.
+        arrayOutput (str): How array properties are decoded, see FBXPropertyParser.
+        lazyArrays (bool): Whether array properties are only decoded when read, see FBXLazyArrayProperty.
+        arrayCache (FBXArrayCache, optional): The cache holding decoded lazy arrays.
+        stats (FBXStats, optional): Collects parse counters and timers, see FBXStats.
 
     """
 
-    __contentParser: DataViewInterface
+    __contentParser: FBXPropertyParser
+    __nodeHeader: struct.Struct
+    __stats: FBXStats
 
-    def __init__(self: 'FBXDocumentParser', buffer: bytes) -> None:
-        self.__contentParser = FBXPropertyParser(buffer)
+    def __init__(self: 'FBXDocumentParser', buffer: bytes, arrayOutput: str = FBXPropertyParser.ARRAY_OUTPUT_ARRAY, lazyArrays: bool = False, arrayCache: FBXArrayCache = None, stats: FBXStats = None) -> None:
+        self.__contentParser = FBXPropertyParser(buffer, arrayOutput, lazyArrays, arrayCache, stats)
+        self.__nodeHeader = NODE_HEADER_32
+        self.__stats = stats
 
     def __parseHeader(self: 'FBXDocumentParser') -> FBXDocumentHeader:
         """
@@ -30,30 +68,120 @@ class FBXDocumentParser:
         """
         return FBXDocumentHeader(
             self.__contentParser.readString(0, 20).value,
-            self.__contentParser.targetBuffer[21:23],
+            bytes(self.__contentParser.targetBuffer[21:23]),
             self.__contentParser.readUInt32(23).value
         )
 
-    def __parseNodes(self: 'FBXDocumentParser', offset=0, document=None) -> FBXDocumentNode:
+    @staticmethod
+    def nodeHeaderLayout(versionNumber: int) -> struct.Struct:
+        """
+        Get the node record header layout used by a FBX version.
+
+        Version 7500 and up store endOffset, numProperties and propertyListLen as 64-bit integers,
+        a null record (closing a nested node list) has the size of the header: 25 or 13 bytes.
+
+        Args:
+            versionNumber (int): The FBX version number from the header.
+
+        Returns:
+            struct.Struct: NODE_HEADER_64 for version 7500 and up, NODE_HEADER_32 otherwise.
+
+        """
+        return NODE_HEADER_64 if versionNumber >= 7500 else NODE_HEADER_32
+
+    def __parseNodes(self: 'FBXDocumentParser', offset: int, versionNumber: int, selector: FBXNodeSelector = None, nodeStorage: str = NODE_STORAGE_OBJECTS, limit: int = None, base: int = 0) -> FBXDocumentNode:
         """
-        Recursively parse the FBX document nodes.
+        Parse the FBX document nodes into a hierarchy.
+
+        The records are walked with an explicit stack instead of recursion, a record with an endOffset
+        past its property list holds a nested list which is closed by a null record (all zero header).
+        Subtrees left out by the selector are jumped over using their endOffset, without reading their properties.
 
         Args:
             offset (int): The offset in bytes where the node data starts.
-            document (FBXDocumentNode): The parent document node.
+            versionNumber (int): The FBX version number from the header.
+            selector (FBXNodeSelector, optional): The node paths to parse. Defaults to all nodes.
+            nodeStorage (str): NODE_STORAGE_OBJECTS for a node object per record, NODE_STORAGE_TABLE for rows in a FBXNodeTable.
+            limit (int, optional): The offset where the records stop. Defaults to the end of the buffer.
+            base (int): The file offset of the buffer, when it is a window of the file: record end offsets are
+                translated to the buffer and node offsets are kept as file offsets.
 
         Returns:
-            FBXDocumentNode: The parsed FBX document node.
+            FBXDocumentNode: A nameless root node holding the top level nodes as children.
 
         """
-        if offset >= len(self.__contentParser.targetBuffer):
-            return document
+        bufferLength = len(self.__contentParser.targetBuffer) if limit is None else limit
+        self.__nodeHeader = FBXDocumentParser.nodeHeaderLayout(versionNumber)
+        nullRecordLength = self.__nodeHeader.size
+        table = FBXNodeTable() if nodeStorage == NODE_STORAGE_TABLE else None
+        document = FBXDocumentNode(base + offset, base + bufferLength, 0, 0, "", []) if table is None else table.append(base + offset, base + bufferLength, 0, 0, "", [])
+        stack = [document]
+        paths = [()]
+
+        while stack and offset + nullRecordLength <= bufferLength:
+            startOffset = offset
+            endOffset, numProps, propsLen, name, offset = self.__readNodeHeader(offset)
+
+            if endOffset == 0:
+                offset = startOffset + nullRecordLength
+                stack.pop()
+                paths.pop()
+                continue
+
+            endOffset -= base
+            if selector is not None:
+                path = paths[-1] + (name,)
+                if selector.match(path) == FBXNodeSelector.SKIP:
+                    offset = endOffset
+                    if self.__stats is not None:
+                        self.__stats.count("parse.skippedNodes")
+                        self.__stats.count("parse.skippedBytes", endOffset - startOffset)
+                    continue
+
+            properties, propertyTypes, offset = self.__readProperties(offset, numProps)
+            if table is None:
+                node = FBXDocumentNode(base + startOffset, base + endOffset, numProps, propsLen, name, properties, stack[-1], propertyTypes)
+            else:
+                node = table.append(base + startOffset, base + endOffset, numProps, propsLen, name, properties, stack[-1], propertyTypes)
 
-        startOffset = offset
-        endOffset, numProps, propsLen, name, offset, properties = self.__readNodeRecord(offset)
-        document = FBXDocumentNode(startOffset, endOffset, numProps, propsLen, name, properties, document)
+            if offset < endOffset:
+                stack.append(node)
+                paths.append(path if selector is not None else ())
+            else:
+                offset = endOffset
 
-        return self.__parseNodes(offset, document)
+        return document if table is None else table.node(document)
+
+    def __readNodeHeader(self: 'FBXDocumentParser', offset: int):
+        """
+        Read the fixed header and the name of a node record.
+
+        Args:
+            offset (int): The offset in bytes where the node record starts.
+
+        Returns:
+            tuple: A tuple containing the end offset, number of properties, property list length, name and
+            the offset where the property list starts.
+
+        """
+        endOffset, numProperties, propertyListLen, nameLen = self.__contentParser.readStruct(self.__nodeHeader, offset)
+        name = self.__contentParser.readString(offset + self.__nodeHeader.size, nameLen)
+
+        return endOffset, numProperties, propertyListLen, sys.intern(name.value), name.endOffset
+
+    def __readProperties(self: 'FBXDocumentParser', offset: int, numProperties: int):
+        """
+        Read the property list of a node record.
+
+        Args:
+            offset (int): The offset in bytes where the property list starts.
+            numProperties (int): The number of properties in the list.
+
+        Returns:
+            tuple: A tuple containing the list of properties, their type codes and the offset after the list.
+
+        """
+        return self.__contentParser.readProperties(offset, numProperties)
 
     def __readNodeRecord(self: 'FBXDocumentParser', offset: int):
         """
@@ -64,40 +192,328 @@ class FBXDocumentParser:
 
         Returns:
             tuple: A tuple containing the end offset, number of properties, property list length, name, current offset,
-            and the list of properties.
+            the list of properties and their type codes.
 
         """
-        endOffset, numProperties, propertyListLen = [self.__contentParser.readInt32((offset + (i * 4))) for i in range(3)]
-        nameLen = self.__contentParser.readUChar(propertyListLen.endOffset)
-        name = self.__contentParser.readString(nameLen.endOffset, nameLen.value)
-        offset = name.endOffset
+        endOffset, numProperties, propertyListLen, name, offset = self.__readNodeHeader(offset)
+        properties, propertyTypes, offset = self.__readProperties(offset, numProperties)
 
-        properties = []
-        if numProperties.value:
-            for _ in range(numProperties.value):
-                typeCode: DataViewInterface = self.__contentParser.readChar(offset)
-                result = self.__contentParser.readByTypeCode(typeCode.endOffset, typeCode.value)
+        return endOffset, numProperties, propertyListLen, name, offset, properties, propertyTypes
 
-                offset = result.endOffset
-                properties.append(result.value)
+    @staticmethod
+    def __countNodes(root: FBXDocumentNode) -> int:
+        """
+        Count the nodes below a node.
+
+        Args:
+            root (FBXDocumentNode): The node to count from.
+
+        Returns:
+            int: The number of nodes, the node itself excluded.
 
-        return endOffset.value, numProperties.value, propertyListLen.value, name.value, offset, properties
+        """
+        count, stack = 0, [root]
+        while stack:
+            children = stack.pop().children
+            count += len(children)
+            stack.extend(children)
+
+        return count
 
     @staticmethod
-    def fromBuffer(buffer: bytes) -> FBXDocument:
+    def fromBuffer(buffer: bytes, arrayOutput: str = FBXPropertyParser.ARRAY_OUTPUT_ARRAY, lazyArrays: bool = False, arrayCache: FBXArrayCache = None, include: List[str] = None, exclude: List[str] = None, inflateThreads: int = 0, nodeStorage: str = NODE_STORAGE_OBJECTS, stats: FBXStats = None) -> FBXDocument:
         """
         Create an FBX document from a buffer.
 
         Args:
             buffer (bytes): The FBX file buffer.
+            arrayOutput (str): How array properties are decoded: "array" (array.array, default), "numpy" or "list".
+            lazyArrays (bool): Whether array properties are kept as FBXLazyArrayProperty and only inflated when read.
+            arrayCache (FBXArrayCache, optional): The memory bounded cache holding decoded lazy arrays. Defaults to the shared cache.
+            include (List[str], optional): Node path patterns to parse (ie: ["Objects/Geometry/*", "Connections"]), see FBXNodeSelector. Defaults to all nodes.
+            exclude (List[str], optional): Node path patterns to leave out, see FBXNodeSelector.
+            inflateThreads (int): When above 0, arrays are recorded during the parse and inflated afterwards on this many threads, see FBXArrayInflater.
+            nodeStorage (str): "objects" (default) for a FBXDocumentNode per node, "table" to store nodes compactly as rows of a FBXNodeTable read through FBXNodeView.
+            stats (FBXStats, optional): Collects the parse counters and timers (nodes parsed, bytes inflated, time per phase and type code). Defaults to none.
 
         Returns:
             FBXDocument: The parsed FBX document.
 
         """
-        parser = FBXDocumentParser(buffer)
+        parallel = inflateThreads > 0 and not lazyArrays
+        parser = FBXDocumentParser(buffer, arrayOutput, lazyArrays or parallel, arrayCache, stats)
+        selector = FBXNodeSelector(include, exclude) if include or exclude else None
 
-        return FBXDocument(
-            parser.__parseHeader(),
-            parser.__parseNodes(27)
-        )
+        if stats is None:
+            header = parser.__parseHeader()
+            document = parser.__parseNodes(FILE_HEADER_LENGTH, header.versionNumber, selector, nodeStorage)
+            if parallel:
+                FBXArrayInflater(inflateThreads).inflate(document)
+
+            return FBXDocument(header, document)
+
+        with stats.timer("parse.header"):
+            header = parser.__parseHeader()
+        with stats.timer("parse.nodes"):
+            document = parser.__parseNodes(FILE_HEADER_LENGTH, header.versionNumber, selector, nodeStorage)
+        if parallel:
+            with stats.timer("parse.inflateThreads"):
+                stats.count("parse.arrays", FBXArrayInflater(inflateThreads).inflate(document))
+
+        stats.count("parse.files")
+        stats.count("parse.bytes", len(parser.__contentParser.targetBuffer))
+        stats.count("parse.nodes", FBXDocumentParser.__countNodes(document))
+
+        return FBXDocument(header, document)
+
+    @staticmethod
+    def fromFile(path: str, arrayOutput: str = FBXPropertyParser.ARRAY_OUTPUT_ARRAY, lazyArrays: bool = False, arrayCache: FBXArrayCache = None, include: List[str] = None, exclude: List[str] = None, inflateThreads: int = 0, nodeStorage: str = NODE_STORAGE_OBJECTS, stats: FBXStats = None) -> FBXDocument:
+        """
+        Create an FBX document from a file, read through a memory mapping.
+
+        The file is never read as a whole, raw "R" properties and uncompressed arrays are memoryviews
+        into the mapping which stays open for as long as any of them is referenced, use bytes(view)
+        or view.tolist() to materialize them. Close the document (or use it as a context manager) to
+        release the mapping right away, a mapped file can not be replaced nor deleted on Windows.
+
+        Args:
+            path (str): The path of the FBX file.
+            arrayOutput (str): How array properties are decoded, see fromBuffer.
+            lazyArrays (bool): Whether array properties are only inflated when read, see fromBuffer.
+            arrayCache (FBXArrayCache, optional): The cache holding decoded lazy arrays, see fromBuffer.
+            include (List[str], optional): Node path patterns to parse, see fromBuffer.
+            exclude (List[str], optional): Node path patterns to leave out, see fromBuffer.
+            inflateThreads (int): The number of threads inflating arrays after the parse, see fromBuffer.
+            nodeStorage (str): How nodes are stored, see fromBuffer.
+            stats (FBXStats, optional): Collects parse counters and timers, see fromBuffer.
+
+        Returns:
+            FBXDocument: The parsed FBX document.
+
+        """
+        with open(path, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(mapping)
+        document = FBXDocumentParser.fromBuffer(view, arrayOutput, lazyArrays, arrayCache, include, exclude, inflateThreads, nodeStorage, stats)
+        if not lazyArrays:
+            # the parser view is only kept by lazy arrays, properties are views of their own
+            view.release()
+
+        return FBXDocument(document.header, document.topLevelDocument, mapping)
+
+
+    @staticmethod
+    def __readFileHeader(buffer: bytes) -> FBXDocumentHeader:
+        """
+        Read the file header, without a property parser.
+
+        Args:
+            buffer (bytes): The first FILE_HEADER_LENGTH bytes of the file, or more.
+
+        Returns:
+            FBXDocumentHeader: The file header.
+
+        """
+        return FBXDocumentHeader(str(buffer[0:20], "latin-1"), bytes(buffer[21:23]), FILE_VERSION.unpack_from(buffer, 23)[0])
+
+    @staticmethod
+    def __recordEndOffset(record: bytes, offset: int, nodeHeader: struct.Struct, length: int) -> int:
+        """
+        Read the end offset of the node record starting at an offset, checking there is one.
+
+        Args:
+            record (bytes): The bytes of the record, at least its fixed header.
+            offset (int): The file offset of the record.
+            nodeHeader (struct.Struct): The node record header layout of the file.
+            length (int): The length of the file.
+
+        Returns:
+            int: The end offset of the record.
+
+        Raises:
+            ValueError: If there is no node record at the offset.
+
+        """
+        if offset < FILE_HEADER_LENGTH or len(record) < nodeHeader.size:
+            raise ValueError(f"No node record at offset {offset}")
+
+        endOffset = nodeHeader.unpack_from(record)[0]
+        if endOffset <= offset + nodeHeader.size or endOffset > length:
+            raise ValueError(f"No node record at offset {offset}")
+
+        return endOffset
+
+    @staticmethod
+    def tableOfContents(buffer: bytes) -> FBXTableOfContents:
+        """
+        Index the nodes of a FBX file without decoding any property.
+
+        Only the fixed header and the name of every record are read, property lists are jumped over
+        using their length, so the cost depends on the number of nodes and not on the size of the file.
+
+        Args:
+            buffer (bytes): The FBX file buffer.
+
+        Returns:
+            FBXTableOfContents: The name, depth, offsets, property count and property list length of every node.
+
+        """
+        versionNumber = FBXDocumentParser.__readFileHeader(buffer).versionNumber
+        nodeHeader = FBXDocumentParser.nodeHeaderLayout(versionNumber)
+        readHeader, headerLength = nodeHeader.unpack_from, nodeHeader.size
+        bufferLength = len(buffer)
+
+        # rows go straight into the columns, names are interned by their raw bytes
+        nameIndex, names = {}, []
+        nameIds, depths, parents, startOffsets, endOffsets, propertiesCounts, propertiesLengths = array("I"), array("I"), array("q"), array("q"), array("q"), array("q"), array("q")
+        stack = [-1]
+        offset = FILE_HEADER_LENGTH
+
+        while stack and offset + headerLength <= bufferLength:
+            endOffset, numProperties, propertyListLen, nameLen = readHeader(buffer, offset)
+            if endOffset == 0:
+                offset += headerLength
+                stack.pop()
+                continue
+
+            nameOffset = offset + headerLength
+            rawName = bytes(buffer[nameOffset:nameOffset + nameLen])
+            nameId = nameIndex.get(rawName)
+            if nameId is None:
+                nameId = nameIndex[rawName] = len(names)
+                names.append(sys.intern(str(rawName, "latin-1")))
+
+            row = len(startOffsets)
+            nameIds.append(nameId)
+            depths.append(len(stack))
+            parents.append(stack[-1])
+            startOffsets.append(offset)
+            endOffsets.append(endOffset)
+            propertiesCounts.append(numProperties)
+            propertiesLengths.append(propertyListLen)
+
+            offset = nameOffset + nameLen + propertyListLen
+            if offset < endOffset:
+                stack.append(row)
+            else:
+                offset = endOffset
+
+        return FBXTableOfContents.fromColumns(versionNumber, bufferLength, names, nameIds, depths, parents, startOffsets, endOffsets, propertiesCounts, propertiesLengths)
+
+    @staticmethod
+    def tableOfContentsFromFile(path: str) -> FBXTableOfContents:
+        """
+        Index the nodes of a FBX file without decoding any property, see tableOfContents.
+
+        The file is read through a memory mapping, only the pages holding node records are touched.
+
+        Args:
+            path (str): The path of the FBX file.
+
+        Returns:
+            FBXTableOfContents: The outline of the file.
+
+        """
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            return FBXDocumentParser.tableOfContents(mapping)
+
+    @staticmethod
+    def readNodeAt(source: Union[bytes, str, os.PathLike], offset: int, versionNumber: int = None, arrayOutput: str = FBXPropertyParser.ARRAY_OUTPUT_ARRAY, lazyArrays: bool = False, arrayCache: FBXArrayCache = None) -> FBXDocumentNode:
+        """
+        Decode a single node, with its nested nodes, from the offset of its record (ie: from a FBXTableOfContents
+        row or a FBXOffsetIndex lookup).
+
+        A file is not parsed nor read as a whole: the record header is read, then only the byte range of
+        the record is memory mapped. As with fromFile, raw properties and uncompressed arrays are views
+        into the mapping, which stays open for as long as any of them is referenced.
+
+        Args:
+            source (Union[bytes, str, os.PathLike]): The FBX file buffer, or the path of the FBX file.
+            offset (int): The offset of the node record in the file.
+            versionNumber (int, optional): The FBX version number, read from the file header when not given.
+            arrayOutput (str): How array properties are decoded, see fromBuffer.
+            lazyArrays (bool): Whether array properties are only inflated when read, see fromBuffer.
+            arrayCache (FBXArrayCache, optional): The cache holding decoded lazy arrays, see fromBuffer.
+
+        Returns:
+            FBXDocumentNode: The node, with file offsets, whose parent is a nameless placeholder root.
+
+        Raises:
+            ValueError: If there is no node record at the offset.
+
+        """
+        if not isinstance(source, (str, os.PathLike)):
+            if versionNumber is None:
+                versionNumber = FBXDocumentParser.__readFileHeader(source).versionNumber
+
+            nodeHeader = FBXDocumentParser.nodeHeaderLayout(versionNumber)
+            endOffset = FBXDocumentParser.__recordEndOffset(source[offset:offset + nodeHeader.size], offset, nodeHeader, len(source))
+            parser = FBXDocumentParser(source, arrayOutput, lazyArrays, arrayCache)
+
+            return parser.__parseNodes(offset, versionNumber, limit=endOffset).children[0]
+
+        with open(source, "rb") as file:
+            if versionNumber is None:
+                versionNumber = FBXDocumentParser.__readFileHeader(file.read(FILE_HEADER_LENGTH)).versionNumber
+
+            nodeHeader = FBXDocumentParser.nodeHeaderLayout(versionNumber)
+            file.seek(offset)
+            endOffset = FBXDocumentParser.__recordEndOffset(file.read(nodeHeader.size), offset, nodeHeader, os.fstat(file.fileno()).st_size)
+
+            # mappings start on an allocation boundary, the window is the record and the few bytes before it
+            windowStart = offset - offset % mmap.ALLOCATIONGRANULARITY
+            mapping = mmap.mmap(file.fileno(), endOffset - windowStart, access=mmap.ACCESS_READ, offset=windowStart)
+
+        parser = FBXDocumentParser(memoryview(mapping), arrayOutput, lazyArrays, arrayCache)
+
+        return parser.__parseNodes(offset - windowStart, versionNumber, limit=endOffset - windowStart, base=windowStart).children[0]
+
+    @staticmethod
+    def offsetIndex(buffer: bytes, toc: FBXTableOfContents = None, sourceModified: int = 0) -> FBXOffsetIndex:
+        """
+        Index the node offsets of a FBX file by path and object ID, without decoding any property.
+
+        The outline comes from a table of contents scan, the object IDs are read from the leading
+        "L" property of the children of the top level "Objects" node.
+
+        Args:
+            buffer (bytes): The FBX file buffer.
+            toc (FBXTableOfContents, optional): The outline of the file, scanned when not given.
+            sourceModified (int): The modification time of the file in nanoseconds, 0 when unknown.
+
+        Returns:
+            FBXOffsetIndex: The offset index.
+
+        """
+        if toc is None:
+            toc = FBXDocumentParser.tableOfContents(buffer)
+
+        headerLength = FBXDocumentParser.nodeHeaderLayout(toc.versionNumber).size
+        objects = set(toc.find("Objects"))
+        objectIds, objectRows = array("q"), array("q")
+        for row, entry in enumerate(toc.entries()):
+            if entry.parent in objects and entry.propertiesCount:
+                propertiesOffset = entry.startOffset + headerLength + len(entry.name)
+                if buffer[propertiesOffset] == 0x4C:
+                    objectIds.append(OBJECT_ID.unpack_from(buffer, propertiesOffset + 1)[0])
+                    objectRows.append(row)
+
+        return FBXOffsetIndex(toc, objectIds, objectRows, sourceModified)
+
+    @staticmethod
+    def offsetIndexFromFile(path: str) -> FBXOffsetIndex:
+        """
+        Index the node offsets of a FBX file by path and object ID, see offsetIndex.
+
+        The file is read through a memory mapping, its modification time is kept to detect later changes.
+
+        Args:
+            path (str): The path of the FBX file.
+
+        Returns:
+            FBXOffsetIndex: The offset index.
+
+        """
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            return FBXDocumentParser.offsetIndex(mapping, sourceModified=os.fstat(file.fileno()).st_mtime_ns)
@@ -0,0 +1,130 @@
+import zlib
+from typing import Any
+from Infrastructure.Parser.FBXArrayCache import FBXArrayCache, defaultArrayCache
+from Infrastructure.Parser.FBXArrayDecoder import FBXArrayDecoder
+
+
+class FBXLazyArrayProperty:
+    """
+    Array property which is only inflated and decoded when its value is read.
+
+    Decoded values are kept in a memory bounded FBXArrayCache, so they get decoded again once evicted.
+    Cache entries are keyed by the buffer identity and the offset, and live with the buffer: they are
+    dropped once every property of the buffer is released, so the cache never pins a file mapping.
+
+    Args:
+        buffer (bytes): The FBX file buffer, properties of a same parse should share one memoryview.
+        offset (int): The offset in bytes where the (compressed) array content starts.
+        encoding (int): The array encoding, 0 for raw and 1 for zlib.
+        typeCode (str): The type code representing the array type.
+        arrayLength (int): The number of elements in the array.
+        compressedLength (int): The length in bytes of the stored content.
+        arrayOutput (str): How the array is decoded, see FBXPropertyParser.
+        cache (FBXArrayCache, optional): The cache holding decoded values. Defaults to the shared cache.
+
+    """
+
+    __buffer: memoryview
+    __offset: int
+    __encoding: int
+    __typeCode: str
+    __arrayLength: int
+    __compressedLength: int
+    __arrayOutput: str
+    __cache: FBXArrayCache
+    __cacheKey: tuple
+
+    def __init__(self: 'FBXLazyArrayProperty', buffer: bytes, offset: int, encoding: int, typeCode: str, arrayLength: int, compressedLength: int, arrayOutput: str = FBXArrayDecoder.ARRAY_OUTPUT_ARRAY, cache: FBXArrayCache = None) -> None:
+        self.__buffer = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        self.__offset = offset
+        self.__encoding = encoding
+        self.__typeCode = typeCode
+        self.__arrayLength = arrayLength
+        self.__compressedLength = compressedLength
+        self.__arrayOutput = arrayOutput
+        self.__cache = cache if cache is not None else defaultArrayCache
+        self.__cacheKey = (id(self.__buffer), offset, arrayOutput)
+
+    @property
+    def offset(self: 'FBXLazyArrayProperty') -> int:
+        """Get the offset in bytes where the (compressed) array content starts."""
+        return self.__offset
+
+    @property
+    def encoding(self: 'FBXLazyArrayProperty') -> int:
+        """Get the array encoding, 0 for raw and 1 for zlib."""
+        return self.__encoding
+
+    @property
+    def typeCode(self: 'FBXLazyArrayProperty') -> str:
+        """Get the type code representing the array type."""
+        return self.__typeCode
+
+    @property
+    def arrayLength(self: 'FBXLazyArrayProperty') -> int:
+        """Get the number of elements in the array."""
+        return self.__arrayLength
+
+    @property
+    def compressedLength(self: 'FBXLazyArrayProperty') -> int:
+        """Get the length in bytes of the stored content."""
+        return self.__compressedLength
+
+    @property
+    def content(self: 'FBXLazyArrayProperty') -> memoryview:
+        """Get the stored (compressed) array content as it sits in the buffer, without copying."""
+        return self.__buffer[self.__offset:self.__offset + self.__compressedLength]
+
+    @property
+    def decodedLength(self: 'FBXLazyArrayProperty') -> int:
+        """Get the length in bytes of the decoded content."""
+        return self.__arrayLength * FBXArrayDecoder.ARRAY_FORMATS[self.__typeCode][2]
+
+    @property
+    def isCached(self: 'FBXLazyArrayProperty') -> bool:
+        """Whether the decoded value currently sits in the cache."""
+        return self.__cacheKey in self.__cache
+
+    @property
+    def value(self: 'FBXLazyArrayProperty') -> Any:
+        """Get the decoded array, inflating and decoding it on a cache miss."""
+        return self.__cache.get(self.__cacheKey, self.decodedLength, self.decode, self.__buffer)
+
+    def inflate(self: 'FBXLazyArrayProperty') -> bytes:
+        """
+        Get the uncompressed little-endian array content, bypassing the cache.
+
+        Returns:
+            bytes: The array content, a view of the buffer when stored uncompressed.
+
+        """
+        content = self.__buffer[self.__offset:self.__offset + self.__compressedLength]
+        if self.__encoding == 1:
+            content = zlib.decompress(content)
+
+        return content
+
+    def release(self: 'FBXLazyArrayProperty') -> None:
+        """
+        Drop the cached value and release the view of the source buffer (ie: before the file mapping is closed).
+
+        The buffer view is shared by the lazy arrays of a parse, none of them can be read afterwards.
+        """
+        self.__cache.discard(self.__buffer)
+        self.__buffer.release()
+
+    def decode(self: 'FBXLazyArrayProperty') -> Any:
+        """
+        Inflate and decode the array, bypassing the cache.
+
+        Returns:
+            Any: The decoded array.
+
+        """
+        return FBXArrayDecoder.decode(self.inflate(), self.__typeCode, self.__arrayLength, self.__arrayOutput)
+
+    def __len__(self: 'FBXLazyArrayProperty') -> int:
+        return self.__arrayLength
+
+    def __repr__(self: 'FBXLazyArrayProperty') -> str:
+        return f"FBXLazyArrayProperty(typeCode={self.__typeCode!r}, arrayLength={self.__arrayLength}, encoding={self.__encoding}, compressedLength={self.__compressedLength})"
@@ -0,0 +1,94 @@
+import fnmatch
+import re
+from typing import Dict, List, Tuple
+
+
+class FBXNodeSelector:
+    """
+    Selection of node paths used to project a document while it is parsed.
+
+    Paths are node names joined by "/" (ie: "Objects/Geometry/Vertices"), every segment of a
+    pattern is matched with fnmatch wildcards against the name at the same depth.
+    A node is selected, together with its whole subtree, when an include pattern matches the node
+    or one of its ancestors. Nodes on the way to an include pattern are traversed, they are kept
+    so the selected nodes keep their place in the hierarchy. Excluded subtrees are always skipped.
+
+    Args:
+        include (List[str], optional): The path patterns to keep, everything is kept when empty.
+        exclude (List[str], optional): The path patterns to drop.
+
+    """
+
+    SKIP = 0
+    TRAVERSE = 1
+    SELECT = 2
+
+    __include: List[List[re.Pattern]]
+    __exclude: List[List[re.Pattern]]
+    __decisions: Dict[Tuple[str, ...], int]
+
+    def __init__(self: 'FBXNodeSelector', include: List[str] = None, exclude: List[str] = None) -> None:
+        self.__include = [self.__compile(pattern) for pattern in include or []]
+        self.__exclude = [self.__compile(pattern) for pattern in exclude or []]
+        self.__decisions = {}
+
+    @staticmethod
+    def __compile(pattern: str) -> List[re.Pattern]:
+        """
+        Compile a path pattern into a matcher per segment.
+
+        Args:
+            pattern (str): The "/" separated path pattern.
+
+        Returns:
+            List[re.Pattern]: The compiled segments.
+
+        """
+        return [re.compile(fnmatch.translate(segment)) for segment in pattern.strip("/").split("/")]
+
+    @staticmethod
+    def __matchesPrefix(segments: List[re.Pattern], path: Tuple[str, ...]) -> bool:
+        """
+        Check whether the leading segments of a pattern and a path match each other.
+
+        Args:
+            segments (List[re.Pattern]): The compiled pattern segments.
+            path (Tuple[str, ...]): The node names from the top level down.
+
+        Returns:
+            bool: True when all segments present in both match.
+
+        """
+        return all(segment.match(name) for segment, name in zip(segments, path))
+
+    def match(self: 'FBXNodeSelector', path: Tuple[str, ...]) -> int:
+        """
+        Decide what happens with the node at a path.
+
+        Args:
+            path (Tuple[str, ...]): The node names from the top level down.
+
+        Returns:
+            int: SKIP, TRAVERSE or SELECT.
+
+        """
+        decision = self.__decisions.get(path)
+        if decision is not None:
+            return decision
+
+        decision = self.SKIP
+        if any(len(segments) <= len(path) and self.__matchesPrefix(segments, path) for segments in self.__exclude):
+            decision = self.SKIP
+        elif not self.__include:
+            decision = self.SELECT
+        else:
+            for segments in self.__include:
+                if not self.__matchesPrefix(segments, path):
+                    continue
+                elif len(segments) <= len(path):
+                    decision = self.SELECT
+                    break
+                decision = self.TRAVERSE
+
+        self.__decisions[path] = decision
+        return decision
@@ -1,8 +1,236 @@
+import struct
+import sys
+import time
 import zlib
+from functools import partial
+from typing import Any, Callable, Dict, Tuple
 from Domain.Entities.DataView.DataView import DataView
 from Domain.Entities.DataView.DataViewResult import DataViewResult
+from Infrastructure.Diagnostics.FBXStats import FBXStats
+from Infrastructure.Parser.FBXArrayCache import FBXArrayCache
+from Infrastructure.Parser.FBXArrayDecoder import FBXArrayDecoder, numpy
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+
+# Array property header: arrayLength, encoding, compressedLength
+ARRAY_HEADER = struct.Struct("<III")
+
+# Length prefix of "S" and "R" properties
+LENGTH_PREFIX = struct.Struct("<I")
+
+# Layouts of the fixed size primitive properties, keyed by the raw type code byte
+PRIMITIVE_LAYOUTS: Dict[int, struct.Struct] = {
+    ord("Y"): struct.Struct("<h"),
+    ord("C"): struct.Struct("<?"),
+    ord("I"): struct.Struct("<i"),
+    ord("F"): struct.Struct("<f"),
+    ord("D"): struct.Struct("<d"),
+    ord("L"): struct.Struct("<q"),
+    ord("B"): struct.Struct("<H"),
+}
+PRIMITIVE_SIZES: Dict[int, int] = {code: layout.size for code, layout in PRIMITIVE_LAYOUTS.items()}
+
+# Compiled layouts of runs of consecutive primitive properties, keyed by their type codes
+PRIMITIVE_RUNS: Dict[bytes, struct.Struct] = {}
+PRIMITIVE_RUNS_LIMIT = 4096
+
 
 class FBXPropertyParser(DataView):
+    """
+    Parser for FBX node properties.
+
+    Properties are decoded through a dispatch table keyed by the raw type code byte, holding a
+    specialized reader per type code. Runs of consecutive primitive properties (ie: the three
+    doubles of a Properties70 "P" record) are decoded with a single unpack of a layout compiled
+    once per run of type codes, the type code bytes in between being skipped as padding.
+
+    Args:
+        buffer (bytes): The FBX file buffer.
+        arrayOutput (str): How array properties are decoded: "array" (array.array), "numpy" (numpy.ndarray) or "list" (list of python values, compatibility mode).
+        lazyArrays (bool): Whether array properties are returned as FBXLazyArrayProperty, only decoded when read.
+        arrayCache (FBXArrayCache, optional): The cache holding decoded lazy arrays. Defaults to the shared cache.
+        stats (FBXStats, optional): Collects the time per type code, inflated bytes and largest arrays. Defaults to none.
+
+    """
+
+    ARRAY_OUTPUT_ARRAY = FBXArrayDecoder.ARRAY_OUTPUT_ARRAY
+    ARRAY_OUTPUT_NUMPY = FBXArrayDecoder.ARRAY_OUTPUT_NUMPY
+    ARRAY_OUTPUT_LIST = FBXArrayDecoder.ARRAY_OUTPUT_LIST
+
+    __buffer: memoryview
+    __readers: Dict[int, Callable[[int], Tuple[Any, int]]]
+    __arrayOutput: str
+    __lazyArrays: bool
+    __arrayCache: FBXArrayCache
+    __stats: FBXStats
+
+    def __init__(self: 'FBXPropertyParser', buffer: bytes, arrayOutput: str = ARRAY_OUTPUT_ARRAY, lazyArrays: bool = False, arrayCache: FBXArrayCache = None, stats: FBXStats = None) -> None:
+        super().__init__(buffer)
+
+        if arrayOutput not in (self.ARRAY_OUTPUT_ARRAY, self.ARRAY_OUTPUT_NUMPY, self.ARRAY_OUTPUT_LIST):
+            raise ValueError(f"Unknown array output: {arrayOutput}")
+        elif arrayOutput == self.ARRAY_OUTPUT_NUMPY and numpy is None:
+            raise ValueError("Array output numpy requires numpy to be installed")
+
+        self.__arrayOutput = arrayOutput
+        self.__lazyArrays = lazyArrays
+        self.__arrayCache = arrayCache
+        self.__stats = stats
+        self.__buffer = self.targetBuffer
+
+        readers = {code: self.__primitiveReader(self.__buffer, layout) for code, layout in PRIMITIVE_LAYOUTS.items()}
+        readers[ord("S")] = self.__readString
+        readers[ord("R")] = self.__readRaw
+        for typeCode in FBXArrayDecoder.ARRAY_FORMATS:
+            readers[ord(typeCode)] = partial(self.__readArray, typeCode)
+        if stats is not None:
+            readers = {code: self.__timedReader(chr(code), reader) for code, reader in readers.items()}
+        self.__readers = readers
+
+    @staticmethod
+    def __primitiveReader(buffer: memoryview, layout: struct.Struct) -> Callable[[int], Tuple[Any, int]]:
+        """
+        Build the reader of a fixed size primitive property.
+
+        Args:
+            buffer (memoryview): The buffer the reader reads from.
+            layout (struct.Struct): The layout of the property value.
+
+        Returns:
+            Callable[[int], Tuple[Any, int]]: A reader taking the offset of the value, returning the value and the offset after it.
+
+        """
+        unpack, size = layout.unpack_from, layout.size
+
+        def read(offset: int) -> Tuple[Any, int]:
+            return unpack(buffer, offset)[0], offset + size
+
+        return read
+
+    @staticmethod
+    def primitiveRun(typeCodes: bytes) -> struct.Struct:
+        """
+        Get the layout of a run of consecutive primitive properties, type code bytes included.
+
+        Args:
+            typeCodes (bytes): The type codes of the run.
+
+        Returns:
+            struct.Struct: The layout, unpacking the values of the run starting at its first type code.
+
+        """
+        layout = PRIMITIVE_RUNS.get(typeCodes)
+        if layout is None:
+            layout = struct.Struct("<" + "".join("x" + PRIMITIVE_LAYOUTS[code].format[1:] for code in typeCodes))
+            if len(PRIMITIVE_RUNS) < PRIMITIVE_RUNS_LIMIT:
+                PRIMITIVE_RUNS[typeCodes] = layout
+
+        return layout
+
+    def readProperties(self: 'FBXPropertyParser', offset: int, count: int) -> Tuple[list, str, int]:
+        """
+        Read the property list of a node record.
+
+        With stats, the readers are timed per type code (see __timedReader) and fused runs of
+        primitives are unpacked through __unpackRunTimed, the loop itself is the same.
+
+        Args:
+            offset (int): The offset in bytes where the property list starts (the first type code).
+            count (int): The number of properties in the list.
+
+        Returns:
+            Tuple[list, str, int]: The properties, their type codes and the offset after the list.
+
+        Raises:
+            ValueError: If a type code is unknown.
+
+        """
+        buffer, readers, sizes = self.__buffer, self.__readers, PRIMITIVE_SIZES
+        unpackRunTimed = self.__unpackRunTimed if self.__stats is not None else None
+        properties = []
+        typeCodes = bytearray()
+        index = 0
+
+        while index < count:
+            code = buffer[offset]
+            size = sizes.get(code)
+            if size is None:
+                reader = readers.get(code)
+                if reader is None:
+                    raise ValueError(f"Unknown type code: {chr(code)}")
+
+                value, offset = reader(offset + 1)
+                properties.append(value)
+                typeCodes.append(code)
+                index += 1
+                continue
+
+            # a run of primitives, unpacked at once
+            runStart, runIndex = offset, len(typeCodes)
+            while True:
+                typeCodes.append(code)
+                offset += 1 + size
+                index += 1
+                if index == count:
+                    break
+
+                code = buffer[offset]
+                size = sizes.get(code)
+                if size is None:
+                    break
+
+            if unpackRunTimed is not None:
+                properties.extend(unpackRunTimed(runStart, bytes(typeCodes[runIndex:])))
+            elif len(typeCodes) - runIndex == 1:
+                properties.append(PRIMITIVE_LAYOUTS[typeCodes[runIndex]].unpack_from(buffer, runStart + 1)[0])
+            else:
+                properties.extend(self.primitiveRun(bytes(typeCodes[runIndex:])).unpack_from(buffer, runStart))
+
+        return properties, sys.intern(typeCodes.decode("latin-1")), offset
+
+    def __unpackRunTimed(self: 'FBXPropertyParser', offset: int, typeCodes: bytes) -> tuple:
+        """
+        Unpack a run of primitives, timed as "parse.property.run" (or by its type code when it holds a single property).
+
+        Args:
+            offset (int): The offset in bytes of the first type code of the run.
+            typeCodes (bytes): The type codes of the run.
+
+        Returns:
+            tuple: The values of the run.
+
+        """
+        start = time.perf_counter()
+        values = self.primitiveRun(typeCodes).unpack_from(self.__buffer, offset)
+        if len(typeCodes) == 1:
+            self.__stats.time("parse.property." + chr(typeCodes[0]), time.perf_counter() - start)
+        else:
+            self.__stats.time("parse.property.run", time.perf_counter() - start)
+            self.__stats.count("parse.property.runValues", len(typeCodes))
+
+        return values
+
+    def __timedReader(self: 'FBXPropertyParser', typeCode: str, reader: Callable[[int], Tuple[Any, int]]) -> Callable[[int], Tuple[Any, int]]:
+        """
+        Wrap a reader to time it as "parse.property.<type code>".
+
+        Args:
+            typeCode (str): The type code the reader reads.
+            reader (Callable[[int], Tuple[Any, int]]): The reader.
+
+        Returns:
+            Callable[[int], Tuple[Any, int]]: The timed reader.
+
+        """
+        stats, clock, name = self.__stats, time.perf_counter, "parse.property." + typeCode
+
+        def read(offset: int) -> Tuple[Any, int]:
+            start = clock()
+            result = reader(offset)
+            stats.time(name, clock() - start)
+            return result
+
+        return read
+
     def readByTypeCode(self: 'FBXPropertyParser', offset: int, typeCode: str) -> DataViewResult:
         """
         Read a property from the FBX file based on its type code.
@@ -18,47 +246,57 @@ class FBXPropertyParser(DataView):
             ValueError: If the type code is unknown.
 
         """
+        reader = self.__readers.get(ord(typeCode)) if len(typeCode) == 1 else None
+        if reader is None:
+            raise ValueError(f"Unknown type code: {typeCode}")
 
-        out: DataViewResult = None
+        value, endOffset = reader(offset)
+        return DataViewResult(value, offset, endOffset)
 
-        if ["Y", "C", "I", "F", "D", "L", "B"].count(typeCode) > 0:
-            out = self.__parsePrimitiveType(offset, typeCode)
-        elif ["f", "d", "l", "i", "b"].count(typeCode) > 0:
-            out = self.__parseArrayType(offset, typeCode)
-        elif ["S", "R"].count(typeCode) > 0:
-            out = self.__parseSpecialType(offset, typeCode)
+    def __readString(self: 'FBXPropertyParser', offset: int) -> Tuple[str, int]:
+        """
+        Read a length prefixed string property.
 
-        if out is None:
-            raise ValueError(f"Unknown type code: {typeCode}")
+        Args:
+            offset (int): The offset in bytes where the property data starts.
+
+        Returns:
+            Tuple[str, int]: The string and the offset after it.
 
-        return out
+        """
+        start = offset + 4
+        end = start + LENGTH_PREFIX.unpack_from(self.__buffer, offset)[0]
+        return str(self.__buffer[start:end], "latin-1"), end
 
-    def __parsePrimitiveType(self: 'FBXPropertyParser', offset: int, typeCode: str) -> DataViewResult:
+    def __readRaw(self: 'FBXPropertyParser', offset: int) -> Tuple[memoryview, int]:
         """
-        Parse a primitive type property from the FBX file.
+        Read a length prefixed raw binary property.
 
         Args:
             offset (int): The offset in bytes where the property data starts.
-            typeCode (str): The type code representing the property type.
 
         Returns:
-            DataViewResult: The parsed property data.
+            Tuple[memoryview, int]: A view of the bytes and the offset after them.
 
         """
-        if typeCode == "Y":
-            return self.readShort(offset)
-        elif typeCode == "C":
-            return self.readBool(offset)
-        elif typeCode == "I":
-            return self.readInt32(offset)
-        elif typeCode == "F":
-            return self.readFloat(offset)
-        elif typeCode == "D":
-            return self.readDouble(offset)
-        elif typeCode == "L":
-            return self.readInt64(offset)
-        elif typeCode == "B":
-            return self.readUShort(offset)
+        start = offset + 4
+        end = start + LENGTH_PREFIX.unpack_from(self.__buffer, offset)[0]
+        return self.__buffer[start:end], end
+
+    def __readArray(self: 'FBXPropertyParser', typeCode: str, offset: int) -> Tuple[Any, int]:
+        """
+        Read an array property, see __parseArrayType.
+
+        Args:
+            typeCode (str): The type code representing the array type.
+            offset (int): The offset in bytes where the property data starts.
+
+        Returns:
+            Tuple[Any, int]: The array and the offset after it.
+
+        """
+        result = self.__parseArrayType(offset, typeCode)
+        return result.value, result.endOffset
 
     def __parseArrayType(self: 'FBXPropertyParser', offset: int, typeCode: str) -> DataViewResult:
         """
@@ -75,50 +313,57 @@ class FBXPropertyParser(DataView):
             ValueError: If the encoding is invalid.
 
         """
-        arrayLength: DataViewResult = self.readUInt32(offset)
-        encoding: DataViewResult = self.readUInt32(arrayLength.endOffset)
-        compressedLength: DataViewResult = self.readUInt32(encoding.endOffset)
-        content: bytearray = self.targetBuffer[compressedLength.endOffset:compressedLength.endOffset + compressedLength.value]
+        arrayLength, encoding, compressedLength = self.readStruct(ARRAY_HEADER, offset)
+        contentOffset = offset + ARRAY_HEADER.size
+        endOffset = contentOffset + compressedLength
 
-        contentView: FBXPropertyParser
-        if encoding.value == 0:
-            contentView = FBXPropertyParser(content)
-        elif encoding.value == 1:
-            contentView = FBXPropertyParser(zlib.decompress(content))
-        else:
+        if encoding not in (0, 1):
             raise ValueError("Invalid encoding. 0/1 allowed")
 
-        output = []
-        contentOffset = 0
-        primitiveTypeCode = (typeCode if typeCode != "b" else "c").upper()
-        current: DataViewResult = None
+        if self.__lazyArrays:
+            output = FBXLazyArrayProperty(self.targetBuffer, contentOffset, encoding, typeCode, arrayLength, compressedLength, self.__arrayOutput, self.__arrayCache)
+            if self.__stats is not None:
+                self.__stats.count("parse.lazyArrays")
+            return DataViewResult(output, offset, endOffset)
+        elif self.__stats is not None:
+            return DataViewResult(self.__decodeArrayTimed(contentOffset, encoding, typeCode, arrayLength, compressedLength), offset, endOffset)
+
+        content: bytes = self.targetBuffer[contentOffset:endOffset]
+        if encoding == 1:
+            content = zlib.decompress(content)
 
-        for _ in range(arrayLength.value):
-            current = contentView.__parsePrimitiveType(contentOffset, primitiveTypeCode)
-            contentOffset = current.endOffset
-            output.append(current.value)
+        output = FBXArrayDecoder.decode(content, typeCode, arrayLength, self.__arrayOutput)
 
-        return DataViewResult(output, offset, offset + (compressedLength.endOffset + compressedLength.value) + current.endOffset)
+        return DataViewResult(output, offset, endOffset)
 
-    def __parseSpecialType(self: 'FBXPropertyParser', offset: int, typeCode: str) -> DataViewResult:
+    def __decodeArrayTimed(self: 'FBXPropertyParser', contentOffset: int, encoding: int, typeCode: str, arrayLength: int, compressedLength: int):
         """
-        Parse a special type property from the FBX file.
+        Inflate and decode an array like __parseArrayType, timing both steps and recording the array.
 
         Args:
-            offset (int): The offset in bytes where the property data starts.
-            typeCode (str): The type code representing the property type.
+            contentOffset (int): The offset in bytes where the (compressed) array content starts.
+            encoding (int): The array encoding, 0 for raw and 1 for zlib.
+            typeCode (str): The type code representing the array type.
+            arrayLength (int): The number of elements in the array.
+            compressedLength (int): The length in bytes of the stored content.
 
         Returns:
-            DataViewResult: The parsed property data.
+            Any: The decoded array.
 
         """
-        length: DataViewResult = None
+        stats = self.__stats
+        content: bytes = self.targetBuffer[contentOffset:contentOffset + compressedLength]
+        if encoding == 1:
+            start = time.perf_counter()
+            content = zlib.decompress(content)
+            stats.time("parse.inflate", time.perf_counter() - start)
+            stats.count("parse.inflatedBytes", len(content))
+            stats.count("parse.compressedBytes", compressedLength)
 
-        if typeCode == "S":  # String
-            length = self.readUInt32(offset)
-            return self.readString(length.endOffset, length.value)
-        elif typeCode == "R":  # raw binary data
-            length = self.readUInt32(offset)
-            offset = length.endOffset
+        start = time.perf_counter()
+        output = FBXArrayDecoder.decode(content, typeCode, arrayLength, self.__arrayOutput)
+        stats.time("parse.decode", time.perf_counter() - start)
+        stats.count("parse.arrays")
+        stats.recordArray(typeCode, arrayLength, compressedLength, len(content), contentOffset)
 
-        return DataViewResult(self.targetBuffer[offset:offset + length.value], offset, offset + length.value)
+        return output
@@ -0,0 +1,398 @@
+import struct
+import sys
+from typing import BinaryIO, Iterable, Iterator, List, NamedTuple, Tuple, Union
+from Domain.Entities.DataView.DataView import DataView
+from Domain.Entities.Document.FBXDocumentHeader import FBXDocumentHeader
+from Infrastructure.Diagnostics.FBXStats import FBXStats
+from Infrastructure.Parser.FBXArrayDecoder import FBXArrayDecoder
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Parser.FBXNodeSelector import FBXNodeSelector
+from Infrastructure.Parser.FBXPropertyParser import ARRAY_HEADER, LENGTH_PREFIX, PRIMITIVE_LAYOUTS, FBXPropertyParser
+
+# Length of the file header: magic, 0x1A 0x00 and the version number
+HEADER_LENGTH = 27
+
+
+class FBXStreamEvent(NamedTuple):
+    """
+    A node event emitted by the stream parser.
+
+    Attributes:
+        kind (str): FBXStreamParser.START when the node record and its properties have been read, FBXStreamParser.END once its children have.
+        name (str): The node name.
+        properties (list): The decoded properties, empty on END events.
+        propertyTypes (str): The property type codes, empty on END events.
+        depth (int): The nesting depth, top level nodes have depth 1.
+        startOffset (int): The offset of the node record in the file.
+        endOffset (int): The offset after the node record in the file.
+    """
+
+    kind: str
+    name: str
+    properties: list
+    propertyTypes: str
+    depth: int
+    startOffset: int
+    endOffset: int
+
+
+class FBXStreamParser:
+    """
+    Incremental (SAX-style) parser turning chunks of an FBX file into node start and end events.
+
+    The parser works on a small read-ahead buffer instead of the whole file: input is pushed with
+    feed (ie: chunks received from a socket) or pulled from a file-like object with parse, and the
+    bytes of every record are dropped as soon as they are decoded. A property is decoded once it is
+    complete in the buffer, so the memory used is bounded by the largest single property (plus the
+    decoded properties of the node being read), not by the file size.
+
+    Subtrees left out by the selector are discarded as their bytes arrive, without decoding them.
+
+    Args:
+        arrayOutput (str): How array properties are decoded, see FBXPropertyParser.
+        include (List[str], optional): Node path patterns to emit, see FBXNodeSelector. Defaults to all nodes.
+        exclude (List[str], optional): Node path patterns to leave out, see FBXNodeSelector.
+        stats (FBXStats, optional): Collects parse counters and timers, see FBXStats.
+
+    """
+
+    START = "start"
+    END = "end"
+
+    __buffer: bytearray
+    __bufferOffset: int
+    __bytesNeeded: int
+    __header: FBXDocumentHeader
+    __nodeHeader: struct.Struct
+    __stack: List[Tuple[str, int, int, tuple]]
+    __pending: list
+    __skipUntil: int
+    __finished: bool
+    __arrayOutput: str
+    __selector: FBXNodeSelector
+    __stats: FBXStats
+
+    def __init__(self: 'FBXStreamParser', arrayOutput: str = FBXPropertyParser.ARRAY_OUTPUT_ARRAY, include: List[str] = None, exclude: List[str] = None, stats: FBXStats = None) -> None:
+        # validates the array output once, instead of on the first array property
+        FBXPropertyParser(b"", arrayOutput)
+
+        self.__buffer = bytearray()
+        self.__bufferOffset = 0
+        self.__bytesNeeded = HEADER_LENGTH
+        self.__header = None
+        self.__nodeHeader = None
+        self.__stack = []
+        self.__pending = None
+        self.__skipUntil = -1
+        self.__finished = False
+        self.__arrayOutput = arrayOutput
+        self.__selector = FBXNodeSelector(include, exclude) if include or exclude else None
+        self.__stats = stats
+
+    @property
+    def header(self: 'FBXStreamParser') -> FBXDocumentHeader:
+        """Get the file header, None until its bytes have been fed."""
+        return self.__header
+
+    @property
+    def finished(self: 'FBXStreamParser') -> bool:
+        """Get whether the node list has been closed, the bytes after it (the footer) are ignored."""
+        return self.__finished
+
+    @property
+    def bytesNeeded(self: 'FBXStreamParser') -> int:
+        """Get the number of buffered bytes the parser waits for before it can decode the next record or property."""
+        return max(self.__bytesNeeded - len(self.__buffer), 0)
+
+    def feed(self: 'FBXStreamParser', chunk: bytes) -> List[FBXStreamEvent]:
+        """
+        Push the next chunk of the file.
+
+        Args:
+            chunk (bytes): The bytes following the previously fed ones, of any length.
+
+        Returns:
+            List[FBXStreamEvent]: The events of the records completed by the chunk.
+
+        """
+        if self.__finished:
+            return []
+
+        self.__buffer += chunk
+        if self.__stats is not None:
+            self.__stats.count("parse.bytes", len(chunk))
+
+        return list(self.__events())
+
+    def close(self: 'FBXStreamParser') -> None:
+        """
+        Signal the end of the input.
+
+        Raises:
+            ValueError: If the input ended before the node list was closed.
+
+        """
+        if not self.__finished and (self.__header is None or self.__stack or self.__pending is not None or self.__skipUntil >= 0):
+            raise ValueError(f"Truncated FBX stream: input ended at offset {self.__bufferOffset + len(self.__buffer)} inside a record")
+
+        self.__finished = True
+        self.__buffer = bytearray()
+
+    def __consume(self: 'FBXStreamParser', length: int) -> None:
+        """
+        Drop decoded bytes from the front of the read-ahead buffer.
+
+        Args:
+            length (int): The number of bytes to drop.
+
+        """
+        del self.__buffer[:length]
+        self.__bufferOffset += length
+
+    def __events(self: 'FBXStreamParser') -> Iterator[FBXStreamEvent]:
+        """
+        Decode as many records as the buffered bytes allow.
+
+        Returns:
+            Iterator[FBXStreamEvent]: The node events, in file order.
+
+        """
+        buffer = self.__buffer
+        while not self.__finished:
+            if self.__header is None:
+                if not self.__readHeader():
+                    return
+            elif self.__skipUntil >= 0:
+                length = min(len(buffer), self.__skipUntil - self.__bufferOffset)
+                self.__consume(length)
+                if self.__bufferOffset < self.__skipUntil:
+                    self.__bytesNeeded = self.__skipUntil - self.__bufferOffset
+                    return
+                self.__skipUntil = -1
+            elif self.__pending is None:
+                read, event = self.__readNodeHeader()
+                if not read:
+                    return
+                elif event is not None:
+                    yield event
+            else:
+                if not self.__readProperties():
+                    return
+
+                startOffset, endOffset, numProperties, name, properties, typeCodes, path = self.__pending
+                self.__pending = None
+                depth = len(self.__stack)
+                if self.__stats is not None:
+                    self.__stats.count("parse.nodes")
+
+                yield FBXStreamEvent(self.START, name, properties, sys.intern("".join(typeCodes)), depth, startOffset, endOffset)
+                if self.__bufferOffset < endOffset:
+                    self.__stack.append((name, startOffset, endOffset, path))
+                else:
+                    yield FBXStreamEvent(self.END, name, [], "", depth, startOffset, endOffset)
+
+    def __readHeader(self: 'FBXStreamParser') -> bool:
+        """
+        Read the file header once it is buffered.
+
+        Returns:
+            bool: Whether the header has been read.
+
+        """
+        if len(self.__buffer) < HEADER_LENGTH:
+            self.__bytesNeeded = HEADER_LENGTH
+            return False
+
+        view = DataView(bytes(self.__buffer[:HEADER_LENGTH]))
+        self.__header = FBXDocumentHeader(view.readString(0, 20).value, bytes(view.targetBuffer[21:23]), view.readUInt32(23).value)
+        self.__nodeHeader = FBXDocumentParser.nodeHeaderLayout(self.__header.versionNumber)
+        self.__stack.append(("", 0, -1, ()))
+        self.__consume(HEADER_LENGTH)
+
+        return True
+
+    def __readNodeHeader(self: 'FBXStreamParser') -> Tuple[bool, FBXStreamEvent]:
+        """
+        Read the fixed header and the name of the next node record once they are buffered.
+
+        A null record closes the innermost open node, a record left out by the selector starts a skip.
+
+        Returns:
+            Tuple[bool, FBXStreamEvent]: Whether the record has been read (False when more bytes are
+            needed) and the END event of the node a null record closed.
+
+        """
+        buffer, nodeHeader = self.__buffer, self.__nodeHeader
+        if len(buffer) < nodeHeader.size:
+            self.__bytesNeeded = nodeHeader.size
+            return False, None
+
+        endOffset, numProperties, _, nameLength = nodeHeader.unpack_from(buffer)
+        startOffset = self.__bufferOffset
+        if endOffset == 0:
+            self.__consume(nodeHeader.size)
+            name, nodeStartOffset, nodeEndOffset, _ = self.__stack.pop()
+            if not self.__stack:
+                # the null record closing the top level list, the footer follows
+                self.__finished = True
+                self.__buffer = bytearray()
+                return True, None
+
+            return True, FBXStreamEvent(self.END, name, [], "", len(self.__stack), nodeStartOffset, nodeEndOffset)
+
+        recordLength = nodeHeader.size + nameLength
+        if len(buffer) < recordLength:
+            self.__bytesNeeded = recordLength
+            return False, None
+
+        name = sys.intern(str(buffer[nodeHeader.size:recordLength], "latin-1"))
+        self.__consume(recordLength)
+
+        path = ()
+        if self.__selector is not None:
+            path = self.__stack[-1][3] + (name,)
+            if self.__selector.match(path) == FBXNodeSelector.SKIP:
+                self.__skipUntil = endOffset
+                if self.__stats is not None:
+                    self.__stats.count("parse.skippedNodes")
+                    self.__stats.count("parse.skippedBytes", endOffset - startOffset)
+                return True, None
+
+        self.__pending = [startOffset, endOffset, numProperties, name, [], [], path]
+        return True, None
+
+    def __readProperties(self: 'FBXStreamParser') -> bool:
+        """
+        Decode the properties of the pending node record as they become complete in the buffer.
+
+        Returns:
+            bool: Whether all properties of the pending record have been read.
+
+        """
+        buffer = self.__buffer
+        _, _, numProperties, _, properties, typeCodes, _ = self.__pending
+        while len(properties) < numProperties:
+            if not buffer:
+                self.__bytesNeeded = 1
+                return False
+
+            typeCode = chr(buffer[0])
+            layout = PRIMITIVE_LAYOUTS.get(buffer[0])
+            if layout is not None:
+                length = 1 + layout.size
+                if len(buffer) < length:
+                    self.__bytesNeeded = length
+                    return False
+
+                properties.append(layout.unpack_from(buffer, 1)[0])
+            else:
+                length = self.__propertyLength(typeCode)
+                if length is None or len(buffer) < length:
+                    return False
+                elif typeCode == "S":
+                    properties.append(str(buffer[1 + LENGTH_PREFIX.size:length], "latin-1"))
+                    typeCodes.append(typeCode)
+                    self.__consume(length)
+                    continue
+
+                # a copy of this property only, the read-ahead buffer keeps shrinking while views of the copy live on
+                with memoryview(buffer) as view:
+                    content = bytes(view[:length])
+                parser = FBXPropertyParser(content, self.__arrayOutput, stats=self.__stats)
+                properties.append(parser.readByTypeCode(1, typeCode).value)
+
+            typeCodes.append(typeCode)
+            self.__consume(length)
+
+        return True
+
+    def __propertyLength(self: 'FBXStreamParser', typeCode: str) -> int:
+        """
+        Get the length of the buffered property, type code included, from its length prefix or array header.
+
+        Args:
+            typeCode (str): The type code of the property at the front of the buffer.
+
+        Returns:
+            int: The length in bytes, None when its prefix is not buffered yet.
+
+        Raises:
+            ValueError: If the type code is unknown.
+
+        """
+        if typeCode in FBXArrayDecoder.ARRAY_FORMATS:
+            prefix = ARRAY_HEADER
+        elif typeCode in ("S", "R"):
+            prefix = LENGTH_PREFIX
+        else:
+            raise ValueError(f"Unknown type code: {typeCode} at offset {self.__bufferOffset}")
+
+        if len(self.__buffer) < 1 + prefix.size:
+            self.__bytesNeeded = 1 + prefix.size
+            return None
+
+        # the content length is the last field of both prefixes
+        length = 1 + prefix.size + prefix.unpack_from(self.__buffer, 1)[-1]
+        self.__bytesNeeded = length
+        return length
+
+    @staticmethod
+    def __chunks(source: Union[str, BinaryIO, Iterable[bytes]], parser: 'FBXStreamParser', chunkSize: int) -> Iterator[bytes]:
+        """
+        Read a source in chunks, growing a read to the size of a property the parser waits for.
+
+        Args:
+            source (Union[str, BinaryIO, Iterable[bytes]]): A path, a binary file-like object or an iterable of chunks.
+            parser (FBXStreamParser): The parser the chunks are fed to.
+            chunkSize (int): The read-ahead size in bytes.
+
+        Returns:
+            Iterator[bytes]: The chunks, empty once the source is exhausted.
+
+        """
+        if isinstance(source, str):
+            with open(source, "rb") as file:
+                yield from FBXStreamParser.__chunks(file, parser, chunkSize)
+            return
+
+        if not hasattr(source, "read"):
+            yield from source
+            return
+
+        while not parser.finished:
+            chunk = source.read(max(chunkSize, parser.bytesNeeded))
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def parse(source: Union[str, BinaryIO, Iterable[bytes]], chunkSize: int = 2**16, arrayOutput: str = FBXPropertyParser.ARRAY_OUTPUT_ARRAY, include: List[str] = None, exclude: List[str] = None, stats: FBXStats = None) -> Iterator[FBXStreamEvent]:
+        """
+        Pull the node events of an FBX file as its bytes are read.
+
+        Args:
+            source (Union[str, BinaryIO, Iterable[bytes]]): A path, a binary file-like object (ie: socket.makefile("rb")) or an iterable of chunks.
+            chunkSize (int): The read-ahead size in bytes, reads grow to the size of a larger property.
+            arrayOutput (str): How array properties are decoded, see FBXPropertyParser.
+            include (List[str], optional): Node path patterns to emit, see FBXNodeSelector.
+            exclude (List[str], optional): Node path patterns to leave out, see FBXNodeSelector.
+            stats (FBXStats, optional): Collects parse counters and timers, see FBXStats.
+
+        Returns:
+            Iterator[FBXStreamEvent]: The node start and end events, in file order.
+
+        Raises:
+            ValueError: If the input ends before the node list is closed.
+
+        """
+        parser = FBXStreamParser(arrayOutput, include, exclude, stats)
+        for chunk in FBXStreamParser.__chunks(source, parser, chunkSize):
+            if parser.finished:
+                break
+
+            parser.__buffer += chunk
+            if stats is not None:
+                stats.count("parse.bytes", len(chunk))
+            yield from parser.__events()
+
+        parser.close()
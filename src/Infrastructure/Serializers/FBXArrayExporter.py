@@ -0,0 +1,188 @@
+import json
+import numbers
+import zipfile
+from array import array
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+from Domain.Entities.Document.FBXDocument import FBXDocument
+from Infrastructure.Parser.FBXArrayDecoder import FBXArrayDecoder, numpy
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+from Infrastructure.Serializers.FBXPackedSerializer import ARRAY_TYPE_CODES
+
+# NumPy dtype descriptions per array type code
+ARRAY_DTYPES = {
+    "f": "<f4",
+    "d": "<f8",
+    "l": "<i8",
+    "i": "<i4",
+    "b": "|b1",
+}
+
+# Version 1.0 .npy header, padded so the data starts on a 64 byte boundary
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_ALIGNMENT = 64
+
+
+class FBXArrayExporter:
+    """
+    Exporter writing the numeric array properties of a document as contiguous typed blobs.
+
+    Every array is described in a small JSON manifest: the path of its node, the node index (in
+    document pre-order, the document root being 0), the property index, the id of the object it
+    belongs to (the first property of the enclosing Objects/* node), its dtype, length and location.
+
+    writeRaw concatenates the arrays into a single buffer, each starting on an aligned offset, so
+    consumers can memory-map it (ie: numpy.memmap(path, dtype, "r", offset, (length,))). writeNpz
+    writes an uncompressed .npz archive of .npy files, with the manifest stored as manifest.json.
+
+    Args:
+        alignment (int): The byte boundary every array of a raw buffer starts on.
+
+    """
+
+    __alignment: int
+
+    def __init__(self: 'FBXArrayExporter', alignment: int = 64) -> None:
+        self.__alignment = alignment
+
+    @staticmethod
+    def arrays(document: FBXDocument) -> Iterator[Tuple[Dict[str, Any], str, Any]]:
+        """
+        Walk the array properties of a document in pre-order.
+
+        Args:
+            document (FBXDocument): The document to walk.
+
+        Returns:
+            Iterator[Tuple[Dict[str, Any], str, Any]]: The manifest entry, type code and value of every array.
+
+        """
+        index = 0
+        stack = [(document.topLevelDocument, (), None)]
+        while stack:
+            node, path, objectId = stack.pop()
+            properties, typeCodes = node.properties, node.propertyTypes
+            if len(path) == 2 and path[0] == "Objects" and properties and isinstance(properties[0], numbers.Integral):
+                objectId = properties[0]
+
+            for position, value in enumerate(properties):
+                if isinstance(value, FBXLazyArrayProperty):
+                    typeCode = value.typeCode
+                elif len(typeCodes) == len(properties) and typeCodes[position] in ARRAY_TYPE_CODES:
+                    typeCode = typeCodes[position]
+                elif isinstance(value, array) or (isinstance(value, memoryview) and value.format != "B") or (numpy is not None and isinstance(value, numpy.ndarray)):
+                    typeCode = FBXArrayDecoder.typeCodeOf(value)
+                else:
+                    continue
+
+                entry = {"name": f"array{index}_{position}", "path": "/".join(path), "node": index, "property": position, "objectId": objectId, "typeCode": typeCode, "dtype": ARRAY_DTYPES[typeCode], "length": len(value)}
+                yield entry, typeCode, value
+
+            index += 1
+            stack.extend((child, path + (child.name,), objectId) for child in reversed(node.children))
+
+    @staticmethod
+    def __content(value: Any, typeCode: str) -> bytes:
+        return value.inflate() if isinstance(value, FBXLazyArrayProperty) else FBXArrayDecoder.encode(value, typeCode)
+
+    def writeRaw(self: 'FBXArrayExporter', document: FBXDocument, output: BinaryIO) -> Dict[str, Any]:
+        """
+        Write the arrays of a document as one aligned raw buffer.
+
+        Args:
+            document (FBXDocument): The document to export.
+            output (BinaryIO): The binary file-like object the buffer gets written to.
+
+        Returns:
+            Dict[str, Any]: The manifest, with the offset and byteLength of every array in the buffer.
+
+        """
+        entries: List[Dict[str, Any]] = []
+        offset = 0
+        for entry, typeCode, value in self.arrays(document):
+            padding = -offset % self.__alignment
+            if padding:
+                output.write(bytes(padding))
+                offset += padding
+
+            content = self.__content(value, typeCode)
+            output.write(content)
+            entry.update(offset=offset, byteLength=len(content))
+            entries.append(entry)
+            offset += len(content)
+
+        return {"versionNumber": document.header.versionNumber, "alignment": self.__alignment, "byteLength": offset, "arrays": entries}
+
+    def writeNpz(self: 'FBXArrayExporter', document: FBXDocument, output: BinaryIO) -> Dict[str, Any]:
+        """
+        Write the arrays of a document as an uncompressed .npz archive, readable with numpy.load.
+
+        Args:
+            document (FBXDocument): The document to export.
+            output (BinaryIO): The seekable binary file-like object the archive gets written to.
+
+        Returns:
+            Dict[str, Any]: The manifest, also stored in the archive as manifest.json.
+
+        """
+        entries: List[Dict[str, Any]] = []
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for entry, typeCode, value in self.arrays(document):
+                content = self.__content(value, typeCode)
+                with archive.open(entry["name"] + ".npy", "w", force_zip64=len(content) > 2**31) as file:
+                    file.write(self.__npyHeader(entry["dtype"], entry["length"]))
+                    file.write(content)
+                entries.append(entry)
+
+            manifest = {"versionNumber": document.header.versionNumber, "arrays": entries}
+            archive.writestr("manifest.json", json.dumps(manifest))
+
+        return manifest
+
+    @staticmethod
+    def __npyHeader(dtype: str, length: int) -> bytes:
+        """
+        Build the header of a one-dimensional .npy file.
+
+        Args:
+            dtype (str): The NumPy dtype description.
+            length (int): The number of elements.
+
+        Returns:
+            bytes: The header, the data follows it.
+
+        """
+        header = f"{{'descr': '{dtype}', 'fortran_order': False, 'shape': ({length},), }}"
+        padding = -(len(NPY_MAGIC) + 2 + len(header) + 1) % NPY_ALIGNMENT
+        header = (header + " " * padding + "\n").encode("latin-1")
+        return NPY_MAGIC + len(header).to_bytes(2, "little") + header
+
+    @staticmethod
+    def serializeRaw(target: FBXDocument, output: BinaryIO, alignment: int = 64) -> Dict[str, Any]:
+        """
+        Export the arrays of an FBXDocument as one aligned raw buffer, see writeRaw.
+
+        Args:
+            target (FBXDocument): The FBX document to export.
+            output (BinaryIO): The binary file-like object the buffer gets written to.
+            alignment (int): The byte boundary every array starts on.
+
+        Returns:
+            Dict[str, Any]: The manifest.
+
+        """
+        return FBXArrayExporter(alignment).writeRaw(target, output)
+
+    @staticmethod
+    def serializeNpz(target: FBXDocument, output: BinaryIO) -> Dict[str, Any]:
+        """
+        Export the arrays of an FBXDocument as an uncompressed .npz archive, see writeNpz.
+
+        Args:
+            target (FBXDocument): The FBX document to export.
+            output (BinaryIO): The seekable binary file-like object the archive gets written to.
+
+        Returns:
+            Dict[str, Any]: The manifest.
+
+        """
+        return FBXArrayExporter().writeNpz(target, output)
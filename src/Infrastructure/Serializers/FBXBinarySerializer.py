@@ -0,0 +1,418 @@
+import numbers
+import os
+import struct
+import zlib
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Deque, Iterable, List, Tuple
+from Domain.Entities.DataView.DataView import BOOL, DOUBLE, FLOAT, INT32, INT64, SHORT, UCHAR, UINT32, UINT64, USHORT
+from Domain.Entities.Document.FBXDocument import FBXDocument, FBXDocumentNode
+from Infrastructure.Parser.FBXArrayDecoder import FBXArrayDecoder, numpy
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+from Infrastructure.Parser.FBXPropertyParser import ARRAY_HEADER
+
+# Layouts of the primitive property types
+PRIMITIVE_LAYOUTS = {
+    "Y": SHORT,
+    "C": BOOL,
+    "I": INT32,
+    "F": FLOAT,
+    "D": DOUBLE,
+    "L": INT64,
+    "B": USHORT,
+}
+
+# Python value kind accepted by each type code
+TYPE_KINDS = {
+    "Y": "int", "I": "int", "L": "int", "B": "int",
+    "C": "bool",
+    "F": "float", "D": "float",
+    "S": "str",
+    "R": "raw",
+    "f": "array", "d": "array", "l": "array", "i": "array", "b": "array",
+}
+
+# File footer, as written by the FBX SDK
+FOOTER_ID = bytes.fromhex("fabcab09d0c8d466b176fb831cf7267e")
+FOOTER_MAGIC = bytes.fromhex("f85a8c6adef5d97eece90ce3758f290b")
+
+
+class FBXBinarySerializer:
+    """
+    Serializer writing FBX documents back to the binary FBX format (7.4 with 32-bit, 7.5 with 64-bit node headers).
+
+    The file is built in a single pass into a preallocated buffer, every node header is written with
+    a zero endOffset which is back-patched once its properties and children are written. Property
+    types are taken from the node propertyTypes when they still match the values, and inferred otherwise.
+
+    Lazy array properties (see FBXLazyArrayProperty) which are already compressed are copied to the
+    output byte-for-byte, other arrays are compressed on a thread pool, a bounded number of arrays
+    ahead of the writer. To strip nodes, leave them out when parsing (ie: exclude=["Objects/Video/Content"])
+    or remove them from the children of their parent.
+
+    Args:
+        versionNumber (int, optional): The FBX version to write. Defaults to the version of the document.
+        compressArrays (bool): Whether arrays are stored zlib compressed.
+        compressionLevel (int): The zlib compression level, from 0 to 9 or -1 for the zlib default.
+        threads (int, optional): The number of threads compressing arrays. Defaults to the CPU count.
+        minCompressLength (int): The size in bytes below which arrays are stored uncompressed.
+
+    """
+
+    __versionNumber: int
+    __compressArrays: bool
+    __compressionLevel: int
+    __threads: int
+    __minCompressLength: int
+    __buffer: bytearray
+    __length: int
+
+    def __init__(self: 'FBXBinarySerializer', versionNumber: int = None, compressArrays: bool = True, compressionLevel: int = zlib.Z_DEFAULT_COMPRESSION, threads: int = None, minCompressLength: int = 128) -> None:
+        if not -1 <= compressionLevel <= 9:
+            raise ValueError(f"Invalid compression level: {compressionLevel}")
+
+        self.__versionNumber = versionNumber
+        self.__compressArrays = compressArrays
+        self.__compressionLevel = compressionLevel
+        self.__threads = threads or os.cpu_count() or 1
+        self.__minCompressLength = minCompressLength
+        self.__buffer = bytearray()
+        self.__length = 0
+
+    def __reserve(self: 'FBXBinarySerializer', size: int) -> None:
+        """
+        Grow the buffer, at least doubling it, so that size more bytes fit.
+
+        Args:
+            size (int): The number of bytes about to be written.
+
+        """
+        missing = self.__length + size - len(self.__buffer)
+        if missing > 0:
+            self.__buffer.extend(bytes(max(missing, len(self.__buffer))))
+
+    def __writeBytes(self: 'FBXBinarySerializer', content: bytes) -> None:
+        length = len(content)
+        self.__reserve(length)
+        self.__buffer[self.__length:self.__length + length] = content
+        self.__length += length
+
+    def __writeStruct(self: 'FBXBinarySerializer', layout: struct.Struct, *values: Any) -> None:
+        self.__reserve(layout.size)
+        layout.pack_into(self.__buffer, self.__length, *values)
+        self.__length += layout.size
+
+    @staticmethod
+    def __kind(value: Any) -> str:
+        """
+        Get the kind of a property value, see TYPE_KINDS.
+
+        Args:
+            value (Any): The property value.
+
+        Returns:
+            str: The value kind.
+
+        Raises:
+            TypeError: If the value can not be written as a property.
+
+        """
+        if isinstance(value, bool):
+            return "bool"
+        elif isinstance(value, numbers.Integral):
+            return "int"
+        elif isinstance(value, numbers.Real):
+            return "float"
+        elif isinstance(value, str):
+            return "str"
+        elif isinstance(value, (bytes, bytearray)) or (isinstance(value, memoryview) and value.format == "B"):
+            return "raw"
+        elif isinstance(value, (FBXLazyArrayProperty, array, memoryview, list, tuple)) or (numpy is not None and isinstance(value, numpy.ndarray)):
+            return "array"
+
+        raise TypeError(f"Can not write a property of type {type(value).__name__}")
+
+    def __typeCodes(self: 'FBXBinarySerializer', node: FBXDocumentNode) -> str:
+        """
+        Get the type codes of the properties of a node, keeping the parsed types which still match their values.
+
+        Args:
+            node (FBXDocumentNode): The node.
+
+        Returns:
+            str: One type code per property.
+
+        """
+        properties, parsed = node.properties, node.propertyTypes
+        if len(parsed) != len(properties):
+            parsed = "?" * len(properties)
+
+        typeCodes = []
+        for value, typeCode in zip(properties, parsed):
+            kind = self.__kind(value)
+            if TYPE_KINDS.get(typeCode) == kind and not (kind == "array" and isinstance(value, FBXLazyArrayProperty)):
+                typeCodes.append(typeCode)
+            elif kind == "array":
+                typeCodes.append(value.typeCode if isinstance(value, FBXLazyArrayProperty) else FBXArrayDecoder.typeCodeOf(value))
+            elif kind == "int":
+                typeCodes.append("I" if -2**31 <= value < 2**31 else "L")
+            else:
+                typeCodes.append({"bool": "C", "float": "D", "str": "S", "raw": "R"}[kind])
+
+        return "".join(typeCodes)
+
+    def __isPassthrough(self: 'FBXBinarySerializer', value: Any, typeCode: str) -> bool:
+        """
+        Whether an array is copied as stored: lazy arrays already in the wanted encoding.
+
+        Args:
+            value (Any): The array value.
+            typeCode (str): The array type code.
+
+        Returns:
+            bool: True when the stored content is written as is.
+
+        """
+        if not isinstance(value, FBXLazyArrayProperty) or value.typeCode != typeCode:
+            return False
+        elif value.encoding == 1:
+            return self.__compressArrays
+        return not self.__compressArrays or value.compressedLength < self.__minCompressLength
+
+    def __encodeArray(self: 'FBXBinarySerializer', value: Any, typeCode: str) -> Tuple[int, int, bytes]:
+        """
+        Encode an array property, compressing it when enabled and large enough.
+
+        Args:
+            value (Any): The array value.
+            typeCode (str): The array type code.
+
+        Returns:
+            Tuple[int, int, bytes]: The array length, the encoding and the stored content.
+
+        """
+        if self.__isPassthrough(value, typeCode):
+            return len(value), value.encoding, value.content
+
+        content = value.inflate() if isinstance(value, FBXLazyArrayProperty) else FBXArrayDecoder.encode(value, typeCode)
+        if self.__compressArrays and len(content) >= self.__minCompressLength:
+            return len(value), 1, zlib.compress(content, self.__compressionLevel)
+
+        return len(value), 0, content
+
+    def __writeProperties(self: 'FBXBinarySerializer', properties: List[Any], typeCodes: str, encoded: Deque) -> None:
+        """
+        Write the property list of a node.
+
+        Args:
+            properties (List[Any]): The property values.
+            typeCodes (str): One type code per property.
+            encoded (Deque): The arrays encoded ahead of the writer, in document order, see __encodeAhead.
+
+        """
+        for value, typeCode in zip(properties, typeCodes):
+            self.__writeStruct(UCHAR, ord(typeCode))
+            layout = PRIMITIVE_LAYOUTS.get(typeCode)
+
+            if layout is not None:
+                self.__writeStruct(layout, value)
+            elif typeCode == "S" or typeCode == "R":
+                content = value.encode("latin-1") if typeCode == "S" else value
+                self.__writeStruct(UINT32, len(content))
+                self.__writeBytes(content)
+            else:
+                if encoded and encoded[0][0] is value:
+                    arrayLength, encoding, content = encoded.popleft()[1]()
+                else:
+                    arrayLength, encoding, content = self.__encodeArray(value, typeCode)
+                self.__writeStruct(ARRAY_HEADER, arrayLength, encoding, len(content))
+                self.__writeBytes(content)
+
+    def __encodeAhead(self: 'FBXBinarySerializer', root: FBXDocumentNode, executor: ThreadPoolExecutor) -> Deque:
+        """
+        Start encoding the arrays to compress on the thread pool, in the order the writer reaches them.
+
+        Args:
+            root (FBXDocumentNode): The root node.
+            executor (ThreadPoolExecutor): The pool compressing the arrays.
+
+        Returns:
+            Deque: The (array, result getter) pairs in document order, the pool is kept a few arrays ahead of the writer.
+
+        """
+        jobs, stack = [], list(reversed(root.children))
+        while stack:
+            node = stack.pop()
+            for value, typeCode in zip(node.properties, self.__typeCodes(node)):
+                if TYPE_KINDS[typeCode] == "array" and not self.__isPassthrough(value, typeCode):
+                    jobs.append((value, typeCode))
+            stack.extend(reversed(node.children))
+
+        pending = iter(jobs)
+        window = deque()
+
+        def submit() -> None:
+            job = next(pending, None)
+            if job is not None:
+                window.append(executor.submit(self.__encodeArray, *job))
+
+        def result() -> Tuple[int, int, bytes]:
+            future = window.popleft()
+            submit()
+            return future.result()
+
+        for _ in range(self.__threads * 4):
+            submit()
+
+        return deque((value, result) for value, _ in jobs)
+
+    def encode(self: 'FBXBinarySerializer', document: FBXDocument) -> bytearray:
+        """
+        Encode a document to the binary FBX format.
+
+        Args:
+            document (FBXDocument): The document to encode.
+
+        Returns:
+            bytearray: The FBX file content.
+
+        Raises:
+            ValueError: If a node name is longer than 255 bytes.
+
+        """
+        header, root = document.header, document.topLevelDocument
+        versionNumber = self.__versionNumber or header.versionNumber
+        layout = FBXDocumentParser.nodeHeaderLayout(versionNumber)
+        endOffsetLayout = UINT64 if layout.size > 13 else UINT32
+        nullRecord = bytes(layout.size)
+
+        self.__buffer = bytearray(max(root.endOffset, 2**16))
+        self.__length = 0
+
+        self.__writeBytes(header.fileMagic.encode("latin-1").ljust(20, b" ") + b"\x00" + header.nullBytes)
+        self.__writeStruct(UINT32, versionNumber)
+
+        executor = ThreadPoolExecutor(max_workers=self.__threads) if self.__compressArrays and self.__threads > 1 else None
+        try:
+            encoded = self.__encodeAhead(root, executor) if executor is not None else deque()
+
+            stack, opened = [iter(root.children)], []
+            while stack:
+                node = next(stack[-1], None)
+                if node is None:
+                    stack.pop()
+                    if opened:
+                        self.__writeBytes(nullRecord)
+                        endOffsetLayout.pack_into(self.__buffer, opened.pop(), self.__length)
+                    continue
+
+                name = node.name.encode("latin-1")
+                if len(name) > 255:
+                    raise ValueError(f"Node name too long: {node.name[:32]}...")
+
+                startOffset = self.__length
+                properties = node.properties
+                self.__writeStruct(layout, 0, len(properties), 0, len(name))
+                self.__writeBytes(name)
+                propertiesOffset = self.__length
+                self.__writeProperties(properties, self.__typeCodes(node), encoded)
+                layout.pack_into(self.__buffer, startOffset, 0, len(properties), self.__length - propertiesOffset, len(name))
+
+                children = node.children
+                if children:
+                    stack.append(iter(children))
+                    opened.append(startOffset)
+                    continue
+
+                # records without properties nor children are closed by a null record as well
+                if not properties:
+                    self.__writeBytes(nullRecord)
+                endOffsetLayout.pack_into(self.__buffer, startOffset, self.__length)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        self.__writeBytes(nullRecord)
+        self.__writeFooter(versionNumber)
+
+        output = self.__buffer
+        del output[self.__length:]
+        self.__buffer = bytearray()
+        return output
+
+    def encodeProperties(self: 'FBXBinarySerializer', nodes: Iterable[FBXDocumentNode]) -> Tuple[bytearray, array]:
+        """
+        Encode the property lists of nodes back to back, as they are stored in node records.
+
+        Arrays are encoded on the calling thread. The lists can be read back with FBXPropertyParser.readProperties.
+
+        Args:
+            nodes (Iterable[FBXDocumentNode]): The nodes.
+
+        Returns:
+            Tuple[bytearray, array]: The property lists, and the offset of every list followed by the end offset (array("q")).
+
+        """
+        self.__buffer = bytearray(2**16)
+        self.__length = 0
+
+        offsets = array("q")
+        for node in nodes:
+            offsets.append(self.__length)
+            self.__writeProperties(node.properties, self.__typeCodes(node), deque())
+        offsets.append(self.__length)
+
+        output = self.__buffer
+        del output[self.__length:]
+        self.__buffer = bytearray()
+        return output, offsets
+
+    def __writeFooter(self: 'FBXBinarySerializer', versionNumber: int) -> None:
+        """
+        Write the file footer: an id, padding to a 16 byte boundary, the version and a closing magic.
+
+        Args:
+            versionNumber (int): The FBX version.
+
+        """
+        self.__writeBytes(FOOTER_ID)
+        self.__writeBytes(bytes(4))
+        self.__writeBytes(bytes(-self.__length % 16 or 16))
+        self.__writeStruct(UINT32, versionNumber)
+        self.__writeBytes(bytes(120))
+        self.__writeBytes(FOOTER_MAGIC)
+
+    def write(self: 'FBXBinarySerializer', document: FBXDocument, output: BinaryIO) -> int:
+        """
+        Encode a document and write it to a binary file-like object.
+
+        Args:
+            document (FBXDocument): The document to write.
+            output (BinaryIO): The file-like object the FBX file gets written to.
+
+        Returns:
+            int: The number of bytes written.
+
+        """
+        content = self.encode(document)
+        output.write(content)
+        return len(content)
+
+    @staticmethod
+    def serialize(target: FBXDocument, versionNumber: int = None, compressionLevel: int = zlib.Z_DEFAULT_COMPRESSION, threads: int = None) -> bytearray:
+        """
+        Serialize an FBX document to the binary FBX format.
+
+        Args:
+            target (FBXDocument): The FBX document to serialize.
+            versionNumber (int, optional): The FBX version to write. Defaults to the version of the document.
+            compressionLevel (int): The zlib compression level of recompressed arrays.
+            threads (int, optional): The number of threads compressing arrays. Defaults to the CPU count.
+
+        Returns:
+            bytearray: The FBX file content.
+
+        """
+        return FBXBinarySerializer(versionNumber, compressionLevel=compressionLevel, threads=threads).encode(target)
@@ -0,0 +1,110 @@
+import hashlib
+import os
+from typing import Any, Dict
+from Infrastructure.Storage.FBXAtomicFile import FBXAtomicFile
+
+
+class FBXBlobStore:
+    """
+    Content addressed store for raw binary ("R") properties spilled out of a serialized document.
+
+    Every blob is written once to <directory>/<digest[:2]>/<digest>, named by the SHA-256 of its
+    content, a blob already in the store (ie: the same texture embedded twice, or in another file
+    exported to the same directory) is not written again. Blobs are hashed and written straight from
+    their view of the source buffer, without copies.
+
+    Args:
+        directory (str): The directory of the store, created when missing.
+        minLength (int): The length in bytes from which blobs are spilled, shorter ones stay inline.
+
+    """
+
+    __directory: str
+    __minLength: int
+    __storedBlobs: int
+    __storedBytes: int
+    __duplicateBlobs: int
+
+    def __init__(self: 'FBXBlobStore', directory: str, minLength: int = 0) -> None:
+        self.__directory = directory
+        self.__minLength = minLength
+        self.__storedBlobs = 0
+        self.__storedBytes = 0
+        self.__duplicateBlobs = 0
+
+    @property
+    def directory(self: 'FBXBlobStore') -> str:
+        """Get the directory of the store."""
+        return self.__directory
+
+    @property
+    def minLength(self: 'FBXBlobStore') -> int:
+        """Get the length in bytes from which blobs are spilled."""
+        return self.__minLength
+
+    @property
+    def storedBlobs(self: 'FBXBlobStore') -> int:
+        """Get the number of blobs written by this store."""
+        return self.__storedBlobs
+
+    @property
+    def storedBytes(self: 'FBXBlobStore') -> int:
+        """Get the number of bytes written by this store."""
+        return self.__storedBytes
+
+    @property
+    def duplicateBlobs(self: 'FBXBlobStore') -> int:
+        """Get the number of blobs found already stored."""
+        return self.__duplicateBlobs
+
+    def accepts(self: 'FBXBlobStore', content: bytes) -> bool:
+        """
+        Check whether a blob is long enough to be spilled.
+
+        Args:
+            content (bytes): The blob.
+
+        Returns:
+            bool: True when the blob is spilled by store.
+
+        """
+        return len(content) >= self.__minLength
+
+    def path(self: 'FBXBlobStore', digest: str) -> str:
+        """
+        Get the path of a stored blob.
+
+        Args:
+            digest (str): The hex SHA-256 digest of the blob.
+
+        Returns:
+            str: The path of the blob file.
+
+        """
+        return os.path.join(self.__directory, digest[:2], digest)
+
+    def store(self: 'FBXBlobStore', content: bytes) -> Dict[str, Any]:
+        """
+        Store a blob unless it already is.
+
+        Args:
+            content (bytes): The blob, any buffer object (a memoryview of the source is not copied).
+
+        Returns:
+            Dict[str, Any]: The reference written in place of the blob: its sha256 digest, byteLength and
+            path, relative to the store directory.
+
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.path(digest)
+
+        if os.path.exists(path):
+            self.__duplicateBlobs += 1
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            FBXAtomicFile.writeBytes(path, content)
+
+            self.__storedBlobs += 1
+            self.__storedBytes += len(content)
+
+        return {"sha256": digest, "byteLength": len(content), "path": os.path.relpath(path, self.__directory).replace(os.sep, "/")}
@@ -0,0 +1,110 @@
+import struct
+from typing import BinaryIO
+from Domain.Entities.Document.FBXDocument import FBXDocument
+from Infrastructure.Serializers.FBXPackedSerializer import FBXPackedSerializer
+
+# CBOR major types
+MAJOR_UNSIGNED = 0
+MAJOR_NEGATIVE = 1
+MAJOR_BYTES = 2
+MAJOR_TEXT = 3
+MAJOR_ARRAY = 4
+MAJOR_MAP = 5
+MAJOR_TAG = 6
+
+# RFC 8746 typed array tags per array type code: uint8 (booleans), sint32le, sint64le, float32le, float64le
+TYPED_ARRAY_TAGS = {
+    "b": 64,
+    "i": 78,
+    "l": 79,
+    "f": 85,
+    "d": 86,
+}
+
+# RFC 8949 self-described CBOR tag, marks the output as CBOR
+SELF_DESCRIBED_TAG = 55799
+
+DOUBLE = struct.Struct(">Bd")
+
+
+class FBXCBORSerializer(FBXPackedSerializer):
+    """
+    Serializer writing FBX documents to CBOR (RFC 8949), standard library only.
+
+    Arrays are RFC 8746 typed arrays: a tag giving the element type around a byte string of
+    little-endian elements (ie: tag 86 for float64le), boolean arrays are uint8 arrays of 0/1.
+    The output starts with the self-described CBOR tag (d9 d9 f7).
+
+    Args:
+        output (BinaryIO): The binary file-like object the CBOR gets written to.
+        bufferSize (int): The number of bytes buffered before a write to the output.
+
+    """
+
+    @staticmethod
+    def __head(majorType: int, value: int) -> bytes:
+        """
+        Encode the initial byte and argument of a data item.
+
+        Args:
+            majorType (int): The major type.
+            value (int): The argument: the value, a length or a tag.
+
+        Returns:
+            bytes: The encoded head.
+
+        """
+        majorType <<= 5
+        if value < 24:
+            return bytes((majorType | value,))
+        elif value < 2**8:
+            return struct.pack(">BB", majorType | 24, value)
+        elif value < 2**16:
+            return struct.pack(">BH", majorType | 25, value)
+        elif value < 2**32:
+            return struct.pack(">BI", majorType | 26, value)
+        return struct.pack(">BQ", majorType | 27, value)
+
+    def packMap(self: 'FBXCBORSerializer', length: int) -> bytes:
+        return self.__head(MAJOR_MAP, length)
+
+    def packArray(self: 'FBXCBORSerializer', length: int) -> bytes:
+        return self.__head(MAJOR_ARRAY, length)
+
+    def packString(self: 'FBXCBORSerializer', value: str) -> bytes:
+        content = value.encode("utf-8")
+        return self.__head(MAJOR_TEXT, len(content)) + content
+
+    def packBytesHead(self: 'FBXCBORSerializer', length: int) -> bytes:
+        return self.__head(MAJOR_BYTES, length)
+
+    def packTypedArrayHead(self: 'FBXCBORSerializer', typeCode: str, length: int) -> bytes:
+        return self.__head(MAJOR_TAG, TYPED_ARRAY_TAGS[typeCode]) + self.__head(MAJOR_BYTES, length)
+
+    def packInt(self: 'FBXCBORSerializer', value: int) -> bytes:
+        return self.__head(MAJOR_UNSIGNED, value) if value >= 0 else self.__head(MAJOR_NEGATIVE, -1 - value)
+
+    def packFloat(self: 'FBXCBORSerializer', value: float) -> bytes:
+        return DOUBLE.pack(0xfb, value)
+
+    def packBool(self: 'FBXCBORSerializer', value: bool) -> bytes:
+        return b"\xf5" if value else b"\xf4"
+
+    def packNull(self: 'FBXCBORSerializer') -> bytes:
+        return b"\xf6"
+
+    def packPreamble(self: 'FBXCBORSerializer') -> bytes:
+        return self.__head(MAJOR_TAG, SELF_DESCRIBED_TAG)
+
+    @staticmethod
+    def serialize(target: FBXDocument, output: BinaryIO, bufferSize: int = 2**16) -> None:
+        """
+        Serialize the FBXDocument object as CBOR to a binary file-like object.
+
+        Args:
+            target (FBXDocument): The FBX document to serialize.
+            output (BinaryIO): The binary file-like object the CBOR gets written to.
+            bufferSize (int): The number of bytes buffered before a write to the output.
+
+        """
+        FBXCBORSerializer(output, bufferSize).write(target)
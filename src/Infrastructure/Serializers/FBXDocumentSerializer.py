@@ -1,13 +1,55 @@
 import json
+import time
+from array import array
 from typing import Any
-from Domain.Entities.Document.FBXDocument import FBXDocument, FBXDocumentNode, FBXDocumentHeader
+from Domain.Entities.Document.FBXDocument import FBXDocument, FBXDocumentHeader
+from Domain.Entities.Document.FBXDocumentNodeInterface import FBXDocumentNodeInterface
+from Infrastructure.Diagnostics.FBXStats import FBXStats
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+from Infrastructure.Serializers.FBXBlobStore import FBXBlobStore
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 class FBXDocumentSerializer(json.JSONEncoder):
     """
     Serializer for FBX documents to JSON.
 
+    Raw binary ("R") properties are encoded as hex, spilled to a blob store or left out, see FBXDocumentStreamSerializer.
+
+    Args:
+        blobStore (FBXBlobStore, optional): The store raw binary properties are spilled to. Defaults to encoding them as hex.
+        skipBlobs (bool): Whether raw binary properties are left out, only their length is written.
+
     """
 
+    __blobStore: FBXBlobStore
+    __skipBlobs: bool
+
+    def __init__(self: "FBXDocumentSerializer", *args, blobStore: FBXBlobStore = None, skipBlobs: bool = False, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.__blobStore = blobStore
+        self.__skipBlobs = skipBlobs
+
+    def __blob(self: "FBXDocumentSerializer", content: bytes) -> Any:
+        """
+        Encode a raw binary property.
+
+        Args:
+            content (bytes): The blob.
+
+        Returns:
+            Any: The hex string, or the reference of a spilled or skipped blob.
+
+        """
+        if self.__skipBlobs:
+            return {"byteLength": len(content)}
+        elif self.__blobStore is not None and self.__blobStore.accepts(content):
+            return self.__blobStore.store(content)
+        return content.hex()
+
     def default(self: "FBXDocumentSerializer", obj: Any):
         """
         Override the default JSON encoder to handle specific types.
@@ -20,11 +62,24 @@ class FBXDocumentSerializer(json.JSONEncoder):
 
         """
         if isinstance(obj, bytes):
-            return obj.hex()
-        elif isinstance(obj, (FBXDocument, FBXDocumentHeader, FBXDocumentNode)):
-            return self.__serializeObject(obj)
+            return self.__blob(obj)
+        elif isinstance(obj, memoryview):
+            return self.__blob(obj) if obj.format == "B" else obj.tolist()
+        elif isinstance(obj, FBXLazyArrayProperty):
+            return obj.value
+        elif isinstance(obj, array) or (numpy is not None and isinstance(obj, numpy.ndarray)):
+            return obj.tolist()
+        elif isinstance(obj, (FBXDocument, FBXDocumentHeader, FBXDocumentNodeInterface)):
+            return self.__serializeObject(obj, ["parent"])
         return super().default(obj)
 
+    # serialized fields per type, in output order
+    __FIELDS = (
+        (FBXDocumentNodeInterface, ("startOffset", "endOffset", "propertiesCount", "propertiesLength", "name", "properties", "parent", "children")),
+        (FBXDocumentHeader, ("fileMagic", "versionNumber", "nullBytes")),
+        (FBXDocument, ("header", "topLevelDocument")),
+    )
+
     def __serializeObject(self: "FBXDocumentSerializer", target: Any, filterKeys: list[str] = []) -> dict:
         """
         Serialize an object to a dictionary.
@@ -37,24 +92,34 @@ class FBXDocumentSerializer(json.JSONEncoder):
             dict: The serialized object as a dictionary.
 
         """
+        fields = next(fields for type, fields in self.__FIELDS if isinstance(target, type))
+
         serialized = {}
-        for key, value in target.__dict__.items():
-            key = key.split("__")[-1]
+        for key in fields:
+            if key in filterKeys:
+                continue
 
-            if isinstance(value, (FBXDocument, FBXDocumentHeader, FBXDocumentNode)):
+            value = getattr(target, key)
+            if isinstance(value, (FBXDocument, FBXDocumentHeader, FBXDocumentNodeInterface)):
                 value = self.__serializeObject(value, filterKeys)
+            elif isinstance(value, bytes):
+                # header fields, only properties are blobs
+                value = value.hex()
 
             serialized[key] = value
 
         return serialized
 
     @staticmethod
-    def serialize(target: FBXDocument) -> str:
+    def serialize(target: FBXDocument, stats: FBXStats = None, blobStore: FBXBlobStore = None, skipBlobs: bool = False) -> str:
         """
         Serialize the FBXDocument object to a JSON string.
 
         Args:
             target (FBXDocument): The FBX document to serialize.
+            stats (FBXStats, optional): Collects the serialization time and output length. Defaults to none.
+            blobStore (FBXBlobStore, optional): The store raw binary properties are spilled to. Defaults to encoding them as hex.
+            skipBlobs (bool): Whether raw binary properties are left out, only their length is written.
 
         Returns:
             str: The JSON representation of the FBXDocument.
@@ -65,10 +130,19 @@ class FBXDocumentSerializer(json.JSONEncoder):
         """
         assert target is not None
 
-        return json.dumps(
+        start = time.perf_counter()
+        output = json.dumps(
             {
                 'header': target.header,
                 'document': target.topLevelDocument,
             },
-            cls=FBXDocumentSerializer
+            cls=FBXDocumentSerializer,
+            blobStore=blobStore,
+            skipBlobs=skipBlobs
         )
+
+        if stats is not None:
+            stats.time("serialize.json", time.perf_counter() - start)
+            stats.count("serialize.characters", len(output))
+
+        return output
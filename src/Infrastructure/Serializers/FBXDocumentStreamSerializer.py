@@ -0,0 +1,176 @@
+from array import array
+from typing import Any, List, TextIO
+from Domain.Entities.Document.FBXDocument import FBXDocument, FBXDocumentNode
+from Infrastructure.Serializers.FBXBlobStore import FBXBlobStore
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+from Infrastructure.Serializers.FBXDocumentSerializer import FBXDocumentSerializer, numpy
+
+
+class FBXDocumentStreamSerializer:
+    """
+    Serializer writing FBX documents to JSON incrementally.
+
+    The node tree is walked without recursion and written in chunks through a small buffer,
+    arrays and raw blobs are written in slices, so memory use does not grow with the document.
+    The output is identical to FBXDocumentSerializer.serialize.
+
+    Raw binary ("R") properties are written inline as hex by default. With a blob store they are
+    spilled to it and written as a reference ({"sha256", "byteLength", "path"}), with skipBlobs only
+    their length is written ({"byteLength"}).
+
+    Args:
+        output (TextIO): The file-like object the JSON gets written to.
+        bufferSize (int): The number of characters buffered before a write to the output.
+        sliceLength (int): The number of array elements encoded at once.
+        blobStore (FBXBlobStore, optional): The store raw binary properties are spilled to. Defaults to writing them inline.
+        skipBlobs (bool): Whether raw binary properties are left out, only their length is written.
+
+    """
+
+    __output: TextIO
+    __bufferSize: int
+    __sliceLength: int
+    __chunks: List[str]
+    __chunksLength: int
+    __encoder: FBXDocumentSerializer
+    __blobStore: FBXBlobStore
+    __skipBlobs: bool
+
+    def __init__(self: 'FBXDocumentStreamSerializer', output: TextIO, bufferSize: int = 2**16, sliceLength: int = 2**12, blobStore: FBXBlobStore = None, skipBlobs: bool = False) -> None:
+        self.__output = output
+        self.__bufferSize = bufferSize
+        self.__sliceLength = sliceLength
+        self.__chunks = []
+        self.__chunksLength = 0
+        self.__encoder = FBXDocumentSerializer()
+        self.__blobStore = blobStore
+        self.__skipBlobs = skipBlobs
+
+    def __write(self: 'FBXDocumentStreamSerializer', chunk: str) -> None:
+        """
+        Buffer a chunk, flushing the buffer to the output once it is full.
+
+        Args:
+            chunk (str): The JSON text to write.
+
+        """
+        self.__chunks.append(chunk)
+        self.__chunksLength += len(chunk)
+
+        if self.__chunksLength >= self.__bufferSize:
+            self.flush()
+
+    def flush(self: 'FBXDocumentStreamSerializer') -> None:
+        """
+        Write the buffered chunks to the output.
+        """
+        if self.__chunks:
+            self.__output.write("".join(self.__chunks))
+            self.__chunks.clear()
+            self.__chunksLength = 0
+
+    def __writeProperty(self: 'FBXDocumentStreamSerializer', value: Any) -> None:
+        """
+        Write a single property, arrays and blobs are written slice by slice.
+
+        Args:
+            value (Any): The property value.
+
+        """
+        if isinstance(value, FBXLazyArrayProperty):
+            value = value.value
+
+        if isinstance(value, (bytes, memoryview)) and (not isinstance(value, memoryview) or value.format == "B"):
+            if self.__skipBlobs:
+                self.__write(f'{{"byteLength": {len(value)}}}')
+                return
+            elif self.__blobStore is not None and self.__blobStore.accepts(value):
+                self.__write(self.__encoder.encode(self.__blobStore.store(value)))
+                return
+
+            self.__write('"')
+            for start in range(0, len(value), self.__sliceLength * 8):
+                self.__write(value[start:start + self.__sliceLength * 8].hex())
+            self.__write('"')
+        elif isinstance(value, (array, memoryview)) or (numpy is not None and isinstance(value, numpy.ndarray)):
+            self.__write("[")
+            for start in range(0, len(value), self.__sliceLength):
+                if start:
+                    self.__write(", ")
+                self.__write(self.__encoder.encode(value[start:start + self.__sliceLength].tolist())[1:-1])
+            self.__write("]")
+        else:
+            self.__write(self.__encoder.encode(value))
+
+    def __writeNodeHead(self: 'FBXDocumentStreamSerializer', node: FBXDocumentNode) -> None:
+        """
+        Write a node up to and including the opening bracket of its children.
+
+        Args:
+            node (FBXDocumentNode): The node to write.
+
+        """
+        encode = self.__encoder.encode
+        self.__write(
+            f'{{"startOffset": {node.startOffset}, "endOffset": {node.endOffset}, '
+            f'"propertiesCount": {node.propertiesCount}, "propertiesLength": {node.propertiesLength}, '
+            f'"name": {encode(node.name)}, "properties": ['
+        )
+
+        for index, value in enumerate(node.properties):
+            if index:
+                self.__write(", ")
+            self.__writeProperty(value)
+
+        self.__write('], "children": [')
+
+    def write(self: 'FBXDocumentStreamSerializer', target: FBXDocument) -> None:
+        """
+        Write the FBXDocument as JSON to the output.
+
+        Args:
+            target (FBXDocument): The FBX document to serialize.
+
+        Raises:
+            AssertionError: If the target is None.
+
+        """
+        assert target is not None
+
+        self.__write(f'{{"header": {self.__encoder.encode(target.header)}, "document": ')
+        self.__writeNodeHead(target.topLevelDocument)
+
+        stack, firsts = [iter(target.topLevelDocument.children)], [True]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                firsts.pop()
+                self.__write("]}")
+                continue
+
+            if not firsts[-1]:
+                self.__write(", ")
+            firsts[-1] = False
+
+            self.__writeNodeHead(child)
+            stack.append(iter(child.children))
+            firsts.append(True)
+
+        self.__write("}")
+        self.flush()
+
+    @staticmethod
+    def serialize(target: FBXDocument, output: TextIO, bufferSize: int = 2**16, blobStore: FBXBlobStore = None, skipBlobs: bool = False) -> None:
+        """
+        Serialize the FBXDocument object as JSON to a file-like object.
+
+        Args:
+            target (FBXDocument): The FBX document to serialize.
+            output (TextIO): The file-like object the JSON gets written to.
+            bufferSize (int): The number of characters buffered before a write to the output.
+            blobStore (FBXBlobStore, optional): The store raw binary properties are spilled to, see FBXDocumentStreamSerializer.
+            skipBlobs (bool): Whether raw binary properties are left out, see FBXDocumentStreamSerializer.
+
+        """
+        FBXDocumentStreamSerializer(output, bufferSize, blobStore=blobStore, skipBlobs=skipBlobs).write(target)
@@ -0,0 +1,106 @@
+import struct
+from typing import BinaryIO
+from Domain.Entities.Document.FBXDocument import FBXDocument
+from Infrastructure.Serializers.FBXPackedSerializer import FBXPackedSerializer
+
+# Fixed-size extension formats per payload length
+FIXEXT_FORMATS = {1: 0xd4, 2: 0xd5, 4: 0xd6, 8: 0xd7, 16: 0xd8}
+
+DOUBLE = struct.Struct(">Bd")
+
+
+class FBXMessagePackSerializer(FBXPackedSerializer):
+    """
+    Serializer writing FBX documents to MessagePack, standard library only.
+
+    Arrays are extension values whose type is the FBX array type code as a byte (ie: ord("d") == 100
+    for float64) around the little-endian elements, boolean arrays hold one 0/1 byte per element.
+    Raw "R" properties are bin values.
+
+    Args:
+        output (BinaryIO): The binary file-like object the MessagePack gets written to.
+        bufferSize (int): The number of bytes buffered before a write to the output.
+
+    """
+
+    @staticmethod
+    def __sized(value: int, fixed: int, fixedLimit: int, formats: tuple) -> bytes:
+        """
+        Encode the head of a sized value: a fix format below fixedLimit, then 8, 16 and 32-bit sizes.
+
+        Args:
+            value (int): The size.
+            fixed (int): The first byte of the fix format, None when there is none.
+            fixedLimit (int): The sizes stored in the fix format.
+            formats (tuple): The first bytes of the 8-bit (None when there is none), 16-bit and 32-bit size formats.
+
+        Returns:
+            bytes: The encoded head.
+
+        """
+        if fixed is not None and value < fixedLimit:
+            return bytes((fixed | value,))
+        elif formats[0] is not None and value < 2**8:
+            return struct.pack(">BB", formats[0], value)
+        elif value < 2**16:
+            return struct.pack(">BH", formats[1], value)
+        return struct.pack(">BI", formats[2], value)
+
+    def packMap(self: 'FBXMessagePackSerializer', length: int) -> bytes:
+        return self.__sized(length, 0x80, 16, (None, 0xde, 0xdf))
+
+    def packArray(self: 'FBXMessagePackSerializer', length: int) -> bytes:
+        return self.__sized(length, 0x90, 16, (None, 0xdc, 0xdd))
+
+    def packString(self: 'FBXMessagePackSerializer', value: str) -> bytes:
+        content = value.encode("utf-8")
+        return self.__sized(len(content), 0xa0, 32, (0xd9, 0xda, 0xdb)) + content
+
+    def packBytesHead(self: 'FBXMessagePackSerializer', length: int) -> bytes:
+        return self.__sized(length, None, 0, (0xc4, 0xc5, 0xc6))
+
+    def packTypedArrayHead(self: 'FBXMessagePackSerializer', typeCode: str, length: int) -> bytes:
+        if length in FIXEXT_FORMATS:
+            return bytes((FIXEXT_FORMATS[length], ord(typeCode)))
+        return self.__sized(length, None, 0, (0xc7, 0xc8, 0xc9)) + typeCode.encode("ascii")
+
+    def packInt(self: 'FBXMessagePackSerializer', value: int) -> bytes:
+        if -32 <= value < 128:
+            return struct.pack(">b", value) if value < 0 else bytes((value,))
+        elif value >= 0:
+            if value < 2**8:
+                return struct.pack(">BB", 0xcc, value)
+            elif value < 2**16:
+                return struct.pack(">BH", 0xcd, value)
+            elif value < 2**32:
+                return struct.pack(">BI", 0xce, value)
+            return struct.pack(">BQ", 0xcf, value)
+        elif value >= -2**7:
+            return struct.pack(">Bb", 0xd0, value)
+        elif value >= -2**15:
+            return struct.pack(">Bh", 0xd1, value)
+        elif value >= -2**31:
+            return struct.pack(">Bi", 0xd2, value)
+        return struct.pack(">Bq", 0xd3, value)
+
+    def packFloat(self: 'FBXMessagePackSerializer', value: float) -> bytes:
+        return DOUBLE.pack(0xcb, value)
+
+    def packBool(self: 'FBXMessagePackSerializer', value: bool) -> bytes:
+        return b"\xc3" if value else b"\xc2"
+
+    def packNull(self: 'FBXMessagePackSerializer') -> bytes:
+        return b"\xc0"
+
+    @staticmethod
+    def serialize(target: FBXDocument, output: BinaryIO, bufferSize: int = 2**16) -> None:
+        """
+        Serialize the FBXDocument object as MessagePack to a binary file-like object.
+
+        Args:
+            target (FBXDocument): The FBX document to serialize.
+            output (BinaryIO): The binary file-like object the MessagePack gets written to.
+            bufferSize (int): The number of bytes buffered before a write to the output.
+
+        """
+        FBXMessagePackSerializer(output, bufferSize).write(target)
@@ -0,0 +1,207 @@
+import abc
+import numbers
+from array import array
+from typing import Any, BinaryIO
+from Domain.Entities.Document.FBXDocument import FBXDocument, FBXDocumentNode
+from Infrastructure.Parser.FBXArrayDecoder import FBXArrayDecoder, numpy
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+
+# Array property type codes
+ARRAY_TYPE_CODES = ("f", "d", "l", "i", "b")
+
+
+class FBXPackedSerializer(abc.ABC):
+    """
+    Base of the serializers writing FBX documents to a compact binary object format (MessagePack, CBOR).
+
+    Documents get the structure of the JSON output: {"header": {...}, "document": node} with every node
+    a map of startOffset, endOffset, propertiesCount, propertiesLength, name, properties and children.
+    Array properties stay packed little-endian typed binary instead of lists of numbers, raw "R"
+    properties are byte strings. The node tree is walked without recursion and written through a
+    small buffer, large arrays and blobs go to the output without being copied into it.
+
+    Subclasses provide the encoding of the individual values.
+
+    Args:
+        output (BinaryIO): The binary file-like object the document gets written to.
+        bufferSize (int): The number of bytes buffered before a write to the output.
+
+    """
+
+    __output: BinaryIO
+    __bufferSize: int
+    __buffer: bytearray
+    __keys: dict
+
+    def __init__(self: 'FBXPackedSerializer', output: BinaryIO, bufferSize: int = 2**16) -> None:
+        self.__output = output
+        self.__bufferSize = bufferSize
+        self.__buffer = bytearray()
+        self.__keys = {key: self.packString(key) for key in ("header", "document", "fileMagic", "versionNumber", "nullBytes", "startOffset", "endOffset", "propertiesCount", "propertiesLength", "name", "properties", "children")}
+
+    @abc.abstractmethod
+    def packMap(self, length: int) -> bytes:
+        """ Encode the head of a map of length key/value pairs. """
+        raise NotImplementedError(f"{self.__class__.__name__}: packMap() not implemented.")
+
+    @abc.abstractmethod
+    def packArray(self, length: int) -> bytes:
+        """ Encode the head of an array of length items. """
+        raise NotImplementedError(f"{self.__class__.__name__}: packArray() not implemented.")
+
+    @abc.abstractmethod
+    def packString(self, value: str) -> bytes:
+        """ Encode a text string. """
+        raise NotImplementedError(f"{self.__class__.__name__}: packString() not implemented.")
+
+    @abc.abstractmethod
+    def packBytesHead(self, length: int) -> bytes:
+        """ Encode the head of a byte string of length bytes, the bytes follow. """
+        raise NotImplementedError(f"{self.__class__.__name__}: packBytesHead() not implemented.")
+
+    @abc.abstractmethod
+    def packTypedArrayHead(self, typeCode: str, length: int) -> bytes:
+        """ Encode the head of a typed array holding length bytes of little-endian content, the content follows. """
+        raise NotImplementedError(f"{self.__class__.__name__}: packTypedArrayHead() not implemented.")
+
+    @abc.abstractmethod
+    def packInt(self, value: int) -> bytes:
+        """ Encode an integer. """
+        raise NotImplementedError(f"{self.__class__.__name__}: packInt() not implemented.")
+
+    @abc.abstractmethod
+    def packFloat(self, value: float) -> bytes:
+        """ Encode a floating-point number. """
+        raise NotImplementedError(f"{self.__class__.__name__}: packFloat() not implemented.")
+
+    @abc.abstractmethod
+    def packBool(self, value: bool) -> bytes:
+        """ Encode a boolean. """
+        raise NotImplementedError(f"{self.__class__.__name__}: packBool() not implemented.")
+
+    @abc.abstractmethod
+    def packNull(self) -> bytes:
+        """ Encode a null value. """
+        raise NotImplementedError(f"{self.__class__.__name__}: packNull() not implemented.")
+
+    def packPreamble(self) -> bytes:
+        """ Encode what precedes the document, nothing by default. """
+        return b""
+
+    def __write(self: 'FBXPackedSerializer', chunk: bytes) -> None:
+        """
+        Buffer a chunk, chunks larger than the buffer are written to the output directly.
+
+        Args:
+            chunk (bytes): The encoded bytes.
+
+        """
+        if len(chunk) >= self.__bufferSize:
+            self.flush()
+            self.__output.write(chunk)
+            return
+
+        self.__buffer += chunk
+        if len(self.__buffer) >= self.__bufferSize:
+            self.flush()
+
+    def flush(self: 'FBXPackedSerializer') -> None:
+        """
+        Write the buffered bytes to the output.
+        """
+        if self.__buffer:
+            self.__output.write(self.__buffer)
+            self.__buffer = bytearray()
+
+    def __writeProperty(self: 'FBXPackedSerializer', value: Any, typeCode: str) -> None:
+        """
+        Write a single property, arrays as packed typed binary.
+
+        Args:
+            value (Any): The property value.
+            typeCode (str): The type code of the property, "" when unknown.
+
+        """
+        if isinstance(value, FBXLazyArrayProperty):
+            content = value.inflate()
+            self.__write(self.packTypedArrayHead(value.typeCode, len(content)))
+            self.__write(content)
+        elif isinstance(value, bool):
+            self.__write(self.packBool(value))
+        elif isinstance(value, numbers.Integral):
+            self.__write(self.packInt(int(value)))
+        elif isinstance(value, numbers.Real):
+            self.__write(self.packFloat(float(value)))
+        elif isinstance(value, str):
+            self.__write(self.packString(value))
+        elif isinstance(value, (bytes, bytearray)) or (isinstance(value, memoryview) and value.format == "B"):
+            self.__write(self.packBytesHead(len(value)))
+            self.__write(value)
+        elif isinstance(value, (array, list, tuple, memoryview)) or (numpy is not None and isinstance(value, numpy.ndarray)):
+            typeCode = typeCode if typeCode in ARRAY_TYPE_CODES else FBXArrayDecoder.typeCodeOf(value)
+            content = FBXArrayDecoder.encode(value, typeCode)
+            self.__write(self.packTypedArrayHead(typeCode, len(content)))
+            self.__write(content)
+        elif value is None:
+            self.__write(self.packNull())
+        else:
+            raise TypeError(f"Can not serialize a property of type {type(value).__name__}")
+
+    def __writeNodeHead(self: 'FBXPackedSerializer', node: FBXDocumentNode) -> None:
+        """
+        Write a node up to and including the head of its children array.
+
+        Args:
+            node (FBXDocumentNode): The node to write.
+
+        """
+        keys, properties, children = self.__keys, node.properties, node.children
+        self.__write(b"".join((
+            self.packMap(7),
+            keys["startOffset"], self.packInt(node.startOffset),
+            keys["endOffset"], self.packInt(node.endOffset),
+            keys["propertiesCount"], self.packInt(node.propertiesCount),
+            keys["propertiesLength"], self.packInt(node.propertiesLength),
+            keys["name"], self.packString(node.name),
+            keys["properties"], self.packArray(len(properties)),
+        )))
+
+        typeCodes = node.propertyTypes
+        if len(typeCodes) != len(properties):
+            typeCodes = "?" * len(properties)
+        for value, typeCode in zip(properties, typeCodes):
+            self.__writeProperty(value, typeCode)
+
+        self.__write(keys["children"] + self.packArray(len(children)))
+
+    def write(self: 'FBXPackedSerializer', target: FBXDocument) -> None:
+        """
+        Write the FBXDocument to the output.
+
+        Args:
+            target (FBXDocument): The FBX document to serialize.
+
+        Raises:
+            AssertionError: If the target is None.
+
+        """
+        assert target is not None
+
+        keys, header = self.__keys, target.header
+        self.__write(b"".join((
+            self.packPreamble(),
+            self.packMap(2),
+            keys["header"], self.packMap(3),
+            keys["fileMagic"], self.packString(header.fileMagic),
+            keys["versionNumber"], self.packInt(header.versionNumber),
+            keys["nullBytes"], self.packBytesHead(len(header.nullBytes)), header.nullBytes,
+            keys["document"],
+        )))
+
+        stack = [target.topLevelDocument]
+        while stack:
+            node = stack.pop()
+            self.__writeNodeHead(node)
+            stack.extend(reversed(node.children))
+
+        self.flush()
@@ -0,0 +1,106 @@
+import os
+from typing import IO, Any, Callable
+
+
+class FBXAtomicFile:
+    """
+    A file written next to its target and moved in place once complete.
+
+    Readers never see a partially written target: the content goes to a temporary file in the same
+    directory (so the final os.replace is atomic), which is removed when the write fails or is
+    abandoned. Use write for content produced in one go, or the instance as a context manager when the
+    content is produced piecewise (ie: chunks from an event loop): open, write, commit, and the
+    temporary file is removed on exit unless committed.
+
+    Args:
+        path (str): The path of the file to write.
+        binary (bool): Whether the temporary file is opened in binary mode.
+
+    """
+
+    __path: str
+    __temporary: str
+    __binary: bool
+
+    def __init__(self: 'FBXAtomicFile', path: str, binary: bool = True) -> None:
+        self.__path = path
+        # unique per writer, concurrent writers of the same target do not share a temporary file
+        self.__temporary = f"{path}.{os.getpid()}.{id(self):x}.tmp"
+        self.__binary = binary
+
+    @property
+    def path(self: 'FBXAtomicFile') -> str:
+        """Get the path of the file to write."""
+        return self.__path
+
+    @property
+    def temporary(self: 'FBXAtomicFile') -> str:
+        """Get the path of the temporary file the content is written to."""
+        return self.__temporary
+
+    def open(self: 'FBXAtomicFile') -> IO:
+        """
+        Open the temporary file for writing.
+
+        Returns:
+            IO: The open file, to be closed before commit.
+
+        """
+        return open(self.__temporary, "w+b" if self.__binary else "w+")
+
+    def commit(self: 'FBXAtomicFile') -> None:
+        """
+        Move the written temporary file in place of the target.
+        """
+        os.replace(self.__temporary, self.__path)
+
+    def discard(self: 'FBXAtomicFile') -> None:
+        """
+        Remove the temporary file, if it was not committed.
+        """
+        try:
+            os.remove(self.__temporary)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self: 'FBXAtomicFile') -> 'FBXAtomicFile':
+        return self
+
+    def __exit__(self: 'FBXAtomicFile', *exception) -> None:
+        self.discard()
+
+    @staticmethod
+    def write(path: str, write: Callable[[IO], Any], binary: bool = True, beforeReplace: Callable[[], Any] = None) -> Any:
+        """
+        Write a file atomically.
+
+        Args:
+            path (str): The path of the file to write.
+            write (Callable[[IO], Any]): Writes the content to the open file.
+            binary (bool): Whether the file is opened in binary mode.
+            beforeReplace (Callable[[], Any], optional): Runs once the content is written, before the file is moved in place (ie: closes the source mapping, which blocks replacing the file on Windows). Defaults to none.
+
+        Returns:
+            Any: The result of write.
+
+        """
+        with FBXAtomicFile(path, binary) as atomic:
+            with atomic.open() as file:
+                result = write(file)
+            if beforeReplace is not None:
+                beforeReplace()
+            atomic.commit()
+
+        return result
+
+    @staticmethod
+    def writeBytes(path: str, content: bytes) -> None:
+        """
+        Write a buffer to a file atomically.
+
+        Args:
+            path (str): The path of the file to write.
+            content (bytes): The content, any buffer object.
+
+        """
+        FBXAtomicFile.write(path, lambda file: file.write(content))
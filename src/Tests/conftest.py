@@ -0,0 +1,9 @@
+import os
+import sys
+
+# the packages live in src, next to the tests
+SOURCE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SOURCE_DIRECTORY not in sys.path:
+    sys.path.insert(0, SOURCE_DIRECTORY)
+
+EXAMPLE_PATH = os.path.join(SOURCE_DIRECTORY, "..", "assets", "example.fbx")
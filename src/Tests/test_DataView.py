@@ -0,0 +1,70 @@
+import struct
+import pytest
+from Domain.Entities.DataView.DataView import DataView
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+# reader: (struct format, size)
+READERS = {
+    "readSChar": ("<b", 1), "readUChar": ("<B", 1), "readBool": ("<?", 1),
+    "readShort": ("<h", 2), "readUShort": ("<H", 2),
+    "readInt32": ("<i", 4), "readUInt32": ("<I", 4), "readLong": ("<i", 4), "readULong": ("<I", 4),
+    "readInt64": ("<q", 8), "readUInt64": ("<Q", 8),
+    "readFloat": ("<f", 4), "readDouble": ("<d", 8),
+}
+
+BUFFER = bytes(range(1, 250, 7)) + struct.pack("<dqi", -1.5, -2**40, -7) + b"\xff" * 9
+
+
+@pytest.mark.parametrize("reader", READERS.keys())
+def testReadersMatchStruct(reader: str) -> None:
+    view = DataView(BUFFER)
+    format, size = READERS[reader]
+
+    # every offset, unaligned ones included, values compared by their bytes (the tail holds NaNs)
+    for offset in range(len(BUFFER) - size + 1):
+        result = getattr(view, reader)(offset)
+
+        assert (result.startOffset, result.endOffset) == (offset, offset + size)
+        if format == "<?":
+            assert result.value is (BUFFER[offset] != 0)
+        else:
+            assert type(result.value) is type(struct.unpack_from(format, BUFFER, offset)[0])
+            assert struct.pack(format, result.value) == BUFFER[offset:offset + size]
+
+
+def testStringsAndCharacters() -> None:
+    view = DataView(b"xyModel\x00\x01Geometry\xe9t\xc3\xa9")
+
+    assert view.readChar(0) == ("x", 0, 1)
+    assert view.readString(2, 5) == ("Model", 2, 7)
+    assert view.readString(9, 10) == ("Geometry\xe9t", 9, 19)
+    assert view.readString(19, 2, "utf-8") == ("\xe9", 19, 21)
+
+
+@pytest.mark.parametrize("versionNumber, format", [(7400, "<IIIB"), (7500, "<QQQB")])
+def testNodeRecordsAreReadInOneCall(versionNumber: int, format: str) -> None:
+    record = struct.pack(format, 1_000, 3, 42, 5) + b"Model"
+    view = DataView(b"\x00" * 3 + record)
+
+    assert view.readStruct(FBXDocumentParser.nodeHeaderLayout(versionNumber), 3) == (1_000, 3, 42, 5)
+
+
+def testResultsAreLightweightTuples() -> None:
+    result = DataView(struct.pack("<i", -5)).readInt32(0)
+
+    value, startOffset, endOffset = result
+    assert (value, startOffset, endOffset) == (result.value, result.startOffset, result.endOffset) == (-5, 0, 4)
+    assert isinstance(result, tuple) and not hasattr(result, "__dict__")
+    with pytest.raises(AttributeError):
+        result.value = 1
+
+
+@pytest.mark.parametrize("buffer", [b"\x01\x02", bytearray(b"\x01\x02"), memoryview(b"\x01\x02")], ids=["bytes", "bytearray", "memoryview"])
+def testBuffersAreViewedWithoutCopying(buffer) -> None:
+    view = DataView(buffer)
+
+    assert isinstance(view.targetBuffer, memoryview)
+    assert view.targetBuffer.obj is (buffer.obj if isinstance(buffer, memoryview) else buffer)
+    if isinstance(buffer, memoryview):
+        assert view.targetBuffer is buffer
+    assert view.readUShort(0).value == 0x0201
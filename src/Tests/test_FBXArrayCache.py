@@ -0,0 +1,133 @@
+import gc
+import threading
+from typing import Callable, List
+from Infrastructure.Parser.FBXArrayCache import FBXArrayCache
+
+
+class Owner:
+    """Weak referenceable stand-in for a source buffer."""
+
+
+def factory(value: str, calls: List[str]) -> Callable[[], str]:
+    """Get a factory creating a value and recording the call."""
+    def create() -> str:
+        calls.append(value)
+        return value
+    return create
+
+
+def testLeastRecentlyUsedValuesAreEvicted() -> None:
+    cache, calls = FBXArrayCache(30), []
+    for key in "abc":
+        cache.get(key, 10, factory(key, calls))
+
+    # reading "a" makes "b" the least recently used
+    assert cache.get("a", 10, factory("a", calls)) == "a"
+    cache.get("d", 10, factory("d", calls))
+
+    assert calls == ["a", "b", "c", "d"]
+    assert ["a" in cache, "b" in cache, "c" in cache, "d" in cache] == [True, False, True, True]
+    assert (len(cache), cache.currentBytes, cache.maxBytes) == (3, 30, 30)
+
+    cache.get("b", 10, factory("b", calls))
+    assert calls[-1] == "b" and "c" not in cache
+
+
+def testLargeValuesEvictSeveralEntries() -> None:
+    cache, calls = FBXArrayCache(30), []
+    for key in "abc":
+        cache.get(key, 10, factory(key, calls))
+
+    cache.get("large", 25, factory("large", calls))
+
+    assert not any(key in cache for key in "abc") and "large" in cache
+    assert cache.currentBytes == 25
+
+
+def testValuesLargerThanTheCacheAreNotCached() -> None:
+    cache, calls = FBXArrayCache(30), []
+    cache.get("a", 10, factory("a", calls))
+
+    assert cache.get("huge", 31, factory("huge", calls)) == "huge"
+    assert cache.get("huge", 31, factory("huge", calls)) == "huge"
+
+    assert calls == ["a", "huge", "huge"]
+    assert "huge" not in cache and "a" in cache and cache.currentBytes == 10
+
+
+def testEntriesAreDroppedWithTheirOwner() -> None:
+    cache, calls = FBXArrayCache(100), []
+    owner, other = Owner(), Owner()
+    cache.get("a", 10, factory("a", calls), owner)
+    cache.get("b", 10, factory("b", calls), owner)
+    cache.get("c", 10, factory("c", calls), other)
+    cache.get("d", 10, factory("d", calls))
+
+    del owner
+    gc.collect()
+
+    assert ["a" in cache, "b" in cache, "c" in cache, "d" in cache] == [False, False, True, True]
+    assert cache.currentBytes == 20
+
+
+def testEvictedEntriesOfACollectedOwner() -> None:
+    cache, calls = FBXArrayCache(20), []
+    owner = Owner()
+    cache.get("a", 10, factory("a", calls), owner)
+    cache.get("b", 10, factory("b", calls), owner)
+    cache.get("c", 10, factory("c", calls))
+
+    # "a" was evicted, the owner then only holds "b"
+    del owner
+    gc.collect()
+
+    assert (len(cache), cache.currentBytes, "c" in cache) == (1, 10, True)
+
+
+def testDiscardDropsTheEntriesOfAnOwnerRightAway() -> None:
+    cache, calls = FBXArrayCache(100), []
+    owner = Owner()
+    cache.get("a", 10, factory("a", calls), owner)
+    cache.get("b", 10, factory("b", calls))
+
+    cache.discard(owner)
+
+    assert ("a" in cache, "b" in cache, cache.currentBytes) == (False, True, 10)
+    # the owner stays usable for new entries
+    cache.get("a", 10, factory("a", calls), owner)
+    assert "a" in cache and calls == ["a", "b", "a"]
+
+
+def testClear() -> None:
+    cache, calls = FBXArrayCache(100), []
+    owner = Owner()
+    cache.get("a", 10, factory("a", calls), owner)
+    cache.get("b", 10, factory("b", calls))
+
+    cache.clear()
+    del owner
+    gc.collect()
+
+    assert (len(cache), cache.currentBytes) == (0, 0)
+
+
+def testConcurrentReadersKeepTheCacheBounded() -> None:
+    cache = FBXArrayCache(50)
+    errors = []
+
+    def read(thread: int) -> None:
+        try:
+            for index in range(2_000):
+                key = (index * 7 + thread) % 13
+                assert cache.get(key, 10, lambda: key) == key
+        except AssertionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read, args=(thread,)) for thread in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.currentBytes == 10 * len(cache) <= 50
@@ -0,0 +1,116 @@
+import struct
+from array import array
+from typing import Any, List
+import pytest
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Parser.FBXArrayDecoder import FBXArrayDecoder, numpy
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Parser.FBXPropertyParser import FBXPropertyParser
+
+# struct formats of the little-endian array elements
+ARRAY_FORMATS = {"f": "f", "d": "d", "l": "q", "i": "i", "b": "?"}
+
+VALUES = {
+    "f": [0.5, -1.25, 3.0e10, 0.0],
+    "d": [0.1, -2.0**60, 1e-300, 3.5],
+    "l": [-2**62, 2**40, 0, -1],
+    "i": [-2**31, 2**31 - 1, 7, 0],
+    "b": [True, False, False, True],
+}
+
+OUTPUTS = pytest.mark.parametrize("arrayOutput", ["array", "list", pytest.param("numpy", marks=pytest.mark.skipif(numpy is None, reason="numpy is not installed"))])
+TYPE_CODES = pytest.mark.parametrize("typeCode", VALUES.keys())
+
+
+def content(typeCode: str, values: List[Any]) -> bytes:
+    """Get the little-endian content of an array property."""
+    return struct.pack(f"<{len(values)}{ARRAY_FORMATS[typeCode]}", *values)
+
+
+def reference(typeCode: str, values: List[Any]) -> List[Any]:
+    """Reference decoding: element by element, the way arrays were decoded before the bulk path."""
+    data, size = content(typeCode, values), struct.calcsize(ARRAY_FORMATS[typeCode])
+    return [struct.unpack_from(f"<{ARRAY_FORMATS[typeCode]}", data, offset)[0] for offset in range(0, len(data), size)]
+
+
+@OUTPUTS
+@TYPE_CODES
+def testBulkDecodingMatchesElementByElement(typeCode: str, arrayOutput: str) -> None:
+    for source in (content(typeCode, VALUES[typeCode]), memoryview(content(typeCode, VALUES[typeCode]))):
+        decoded = FBXArrayDecoder.decode(source, typeCode, len(VALUES[typeCode]), arrayOutput)
+
+        assert (decoded.tolist() if arrayOutput == "numpy" else list(decoded)) == reference(typeCode, VALUES[typeCode])
+        if arrayOutput == "list":
+            assert type(decoded) is list
+        else:
+            assert FBXArrayDecoder.typeCodeOf(decoded) == typeCode
+
+
+@TYPE_CODES
+def testDecodedViewsShareTheSource(typeCode: str) -> None:
+    source = bytearray(content(typeCode, VALUES[typeCode]))
+
+    decoded = FBXArrayDecoder.decode(memoryview(source), typeCode, len(VALUES[typeCode]))
+    source[:] = content(typeCode, VALUES[typeCode][::-1])
+
+    # uncompressed arrays read from a view are cast, not copied
+    assert isinstance(decoded, memoryview)
+    assert list(decoded) == reference(typeCode, VALUES[typeCode][::-1])
+
+
+def testDecodedBytesAreTypedArrays() -> None:
+    decoded = FBXArrayDecoder.decode(content("d", VALUES["d"]), "d", 4)
+
+    assert isinstance(decoded, array) and decoded.typecode == "d"
+    assert isinstance(FBXArrayDecoder.decode(content("b", VALUES["b"]), "b", 4), memoryview)
+
+
+@pytest.mark.parametrize("data, length", [(content("i", VALUES["i"]), 3), (content("i", VALUES["i"]), 5), (b"\x00", 1)])
+def testContentOfTheWrongLengthRaises(data: bytes, length: int) -> None:
+    with pytest.raises(ValueError):
+        FBXArrayDecoder.decode(data, "i", length)
+
+
+@OUTPUTS
+@TYPE_CODES
+def testEncodeRoundTrips(typeCode: str, arrayOutput: str) -> None:
+    data = content(typeCode, VALUES[typeCode])
+    decoded = FBXArrayDecoder.decode(data, typeCode, len(VALUES[typeCode]), arrayOutput)
+
+    assert FBXArrayDecoder.encode(decoded, typeCode) == data
+    assert FBXArrayDecoder.encode(memoryview(data).cast(ARRAY_FORMATS[typeCode]), typeCode) == data
+
+
+@pytest.mark.parametrize("value, typeCode", [
+    (array("f", [1.0]), "f"), (array("d", [1.0]), "d"), (array("i", [1]), "i"), (array("q", [1]), "l"),
+    (memoryview(b"\x01").cast("?"), "b"), ([True, False], "b"), ([1, -2], "i"), ([1, 2**40], "l"), ([1.5, 2], "d"),
+])
+def testTypeCodesAreInferred(value: Any, typeCode: str) -> None:
+    assert FBXArrayDecoder.typeCodeOf(value) == typeCode
+
+
+def writeArrays(compressArrays: bool) -> bytes:
+    generator = SyntheticFBXGenerator(compressArrays=compressArrays)
+    for typeCode, values in VALUES.items():
+        generator.beginNode("Array", [(typeCode, values * 1_000)])
+        generator.endNode()
+    return generator.build()
+
+
+@OUTPUTS
+@pytest.mark.parametrize("compressArrays", [False, True], ids=["raw", "compressed"])
+def testParsedArraysMatchElementByElement(compressArrays: bool, arrayOutput: str) -> None:
+    document = FBXDocumentParser.fromBuffer(writeArrays(compressArrays), arrayOutput)
+
+    for node, (typeCode, values) in zip(document.topLevelDocument.children, VALUES.items()):
+        decoded = node.properties[0]
+        assert node.propertyTypes == typeCode
+        assert (decoded.tolist() if arrayOutput == "numpy" else list(decoded)) == reference(typeCode, values * 1_000)
+
+
+def testUnknownArrayOutputsRaise() -> None:
+    with pytest.raises(ValueError):
+        FBXPropertyParser(b"", arrayOutput="tuple")
+    if numpy is None:
+        with pytest.raises(ValueError):
+            FBXPropertyParser(b"", arrayOutput="numpy")
@@ -0,0 +1,141 @@
+import ast
+import io
+import json
+import struct
+import zipfile
+from typing import Any, Dict, List, Tuple
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocument import FBXDocument
+from Infrastructure.Parser.FBXArrayDecoder import numpy
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Serializers.FBXArrayExporter import FBXArrayExporter
+
+# struct formats and numpy dtypes of the little-endian array elements
+ARRAY_FORMATS = {"f": "f", "d": "d", "l": "q", "i": "i", "b": "?"}
+ARRAY_DTYPES = {"f": "<f4", "d": "<f8", "l": "<i8", "i": "<i4", "b": "|b1"}
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+def writeEveryArrayType(compressArrays: bool) -> bytes:
+    """Write a file with a Geometry object holding every array type, in lengths that are not multiples of the alignment."""
+    generator = SyntheticFBXGenerator(compressArrays=compressArrays)
+    generator.beginNode("Objects")
+    generator.beginNode("Geometry", [("L", 77), ("S", "Shape\x00\x01Geometry"), ("S", "Mesh")])
+    for typeCode, length in (("d", 7), ("f", 5), ("i", 3), ("l", 9), ("b", 13), ("d", 1_000)):
+        generator.beginNode("Array", [("I", length), (typeCode, [index % 2 == 1 if typeCode == "b" else index * 3 for index in range(length)])])
+        generator.endNode()
+    generator.endNode()
+    generator.endNode()
+    generator.beginNode("Loose", [("i", [1, 2, 3])])
+    generator.endNode()
+    return generator.build()
+
+
+BUFFERS = {"example": readExample(), "every-type": writeEveryArrayType(False), "every-type-compressed": writeEveryArrayType(True)}
+DOCUMENTS = pytest.mark.parametrize("buffer", BUFFERS.values(), ids=BUFFERS.keys())
+PARSE_OPTIONS = pytest.mark.parametrize("options", [{}, {"lazyArrays": True}, {"arrayOutput": "list"}], ids=["array", "lazy", "list"])
+
+
+def walk(document: FBXDocument) -> List[Tuple[Any, Tuple[str, ...], int]]:
+    """Get the (node, path, object ID) of every node in pre-order, the object being the enclosing Objects/* node."""
+    found = []
+
+    def visit(node, path: Tuple[str, ...], objectId: int) -> None:
+        if len(path) == 2 and path[0] == "Objects" and node.properties and isinstance(node.properties[0], int):
+            objectId = node.properties[0]
+        found.append((node, path, objectId))
+        for child in node.children:
+            visit(child, path + (child.name,), objectId)
+
+    visit(document.topLevelDocument, (), None)
+    return found
+
+
+def expectedArrays(buffer: bytes) -> List[Tuple[Dict[str, Any], bytes]]:
+    """Get the manifest entry (without location) and little-endian content of every array, in pre-order."""
+    arrays = []
+    for index, (node, path, objectId) in enumerate(walk(FBXDocumentParser.fromBuffer(buffer, arrayOutput="list"))):
+        for position, (value, typeCode) in enumerate(zip(node.properties, node.propertyTypes)):
+            if typeCode in ARRAY_FORMATS:
+                entry = {"name": f"array{index}_{position}", "path": "/".join(path), "node": index, "property": position, "objectId": objectId, "typeCode": typeCode, "dtype": ARRAY_DTYPES[typeCode], "length": len(value)}
+                arrays.append((entry, struct.pack(f"<{len(value)}{ARRAY_FORMATS[typeCode]}", *value)))
+    return arrays
+
+
+@DOCUMENTS
+@PARSE_OPTIONS
+@pytest.mark.parametrize("alignment", [1, 16, 64])
+def testRawBufferHoldsAlignedArrays(buffer: bytes, options: dict, alignment: int) -> None:
+    output = io.BytesIO()
+    manifest = FBXArrayExporter.serializeRaw(FBXDocumentParser.fromBuffer(buffer, **options), output, alignment)
+    content = output.getvalue()
+
+    assert (manifest["versionNumber"], manifest["alignment"], manifest["byteLength"]) == (FBXDocumentParser.fromBuffer(buffer).header.versionNumber, alignment, len(content))
+
+    end = 0
+    expected = expectedArrays(buffer)
+    assert len(manifest["arrays"]) == len(expected) > 0
+    for entry, (expectedEntry, expectedContent) in zip(manifest["arrays"], expected):
+        offset, byteLength = entry.pop("offset"), entry.pop("byteLength")
+        assert entry == expectedEntry
+        assert offset % alignment == 0 and offset - end < alignment
+        assert content[end:offset] == bytes(offset - end)
+        assert (byteLength, content[offset:offset + byteLength]) == (len(expectedContent), expectedContent)
+        end = offset + byteLength
+    assert end == len(content)
+
+
+def readNpy(content: bytes) -> Tuple[Dict[str, Any], int]:
+    """Read a version 1.0 .npy header, get the header dictionary and the offset of the data."""
+    assert content[:8] == b"\x93NUMPY\x01\x00"
+    headerLength = int.from_bytes(content[8:10], "little")
+    header = content[10:10 + headerLength]
+    assert header.endswith(b"\n")
+    return ast.literal_eval(header.decode("latin-1")), 10 + headerLength
+
+
+@DOCUMENTS
+@PARSE_OPTIONS
+def testNpzArchiveHoldsAlignedNpyFiles(buffer: bytes, options: dict) -> None:
+    output = io.BytesIO()
+    manifest = FBXArrayExporter.serializeNpz(FBXDocumentParser.fromBuffer(buffer, **options), output)
+    expected = expectedArrays(buffer)
+
+    assert manifest["arrays"] == [entry for entry, _ in expected]
+    with zipfile.ZipFile(io.BytesIO(output.getvalue())) as archive:
+        assert archive.namelist() == [entry["name"] + ".npy" for entry, _ in expected] + ["manifest.json"]
+        assert json.loads(archive.read("manifest.json")) == manifest
+
+        for entry, expectedContent in expected:
+            info = archive.getinfo(entry["name"] + ".npy")
+            assert info.compress_type == zipfile.ZIP_STORED
+
+            content = archive.read(info)
+            header, dataOffset = readNpy(content)
+            assert dataOffset % 64 == 0
+            assert header == {"descr": entry["dtype"], "fortran_order": False, "shape": (entry["length"],)}
+            assert content[dataOffset:] == expectedContent
+
+
+@pytest.mark.skipif(numpy is None, reason="numpy is not installed")
+def testExportsLoadWithNumpy(tmp_path) -> None:
+    document = FBXDocumentParser.fromBuffer(BUFFERS["every-type-compressed"], lazyArrays=True)
+    with open(tmp_path / "arrays.npz", "wb") as file:
+        npzManifest = FBXArrayExporter.serializeNpz(document, file)
+    with open(tmp_path / "arrays.bin", "wb") as file:
+        rawManifest = FBXArrayExporter.serializeRaw(document, file)
+
+    nodes = walk(FBXDocumentParser.fromBuffer(BUFFERS["every-type"], arrayOutput="list"))
+    values = {entry["name"]: nodes[entry["node"]][0].properties[entry["property"]] for entry in npzManifest["arrays"]}
+    with numpy.load(tmp_path / "arrays.npz") as archive:
+        for entry in npzManifest["arrays"]:
+            assert archive[entry["name"]].tolist() == values[entry["name"]]
+    for entry in rawManifest["arrays"]:
+        mapped = numpy.memmap(tmp_path / "arrays.bin", entry["dtype"], "r", entry["offset"], (entry["length"],))
+        assert mapped.tolist() == values[entry["name"]]
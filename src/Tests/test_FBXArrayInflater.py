@@ -0,0 +1,106 @@
+import threading
+from typing import Any, List
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Diagnostics.FBXStats import FBXStats
+from Infrastructure.Parser.FBXArrayDecoder import numpy
+from Infrastructure.Parser.FBXArrayInflater import FBXArrayInflater
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+from Infrastructure.Serializers.FBXDocumentSerializer import FBXDocumentSerializer
+
+OUTPUTS = pytest.mark.parametrize("arrayOutput", ["array", "list", pytest.param("numpy", marks=pytest.mark.skipif(numpy is None, reason="numpy is not installed"))])
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+def valueTypes(node: FBXDocumentNode) -> List[Any]:
+    """Get the types of the property values of the children of a node."""
+    return [([type(value) for value in child.properties], valueTypes(child)) for child in node.children]
+
+
+BUFFERS = pytest.mark.parametrize("buffer", [
+    readExample(),
+    SyntheticFBXGenerator.generateMeshes(6, 2_000),
+    SyntheticFBXGenerator.generateMeshes(6, 2_000, compressArrays=False),
+], ids=["example", "compressed", "raw"])
+
+
+@BUFFERS
+@OUTPUTS
+@pytest.mark.parametrize("inflateThreads", [1, 2, 4, 8])
+def testParallelInflationEqualsASequentialParse(buffer: bytes, arrayOutput: str, inflateThreads: int) -> None:
+    sequential = FBXDocumentParser.fromBuffer(buffer, arrayOutput)
+
+    parallel = FBXDocumentParser.fromBuffer(buffer, arrayOutput, inflateThreads=inflateThreads)
+
+    assert FBXDocumentSerializer.serialize(parallel) == FBXDocumentSerializer.serialize(sequential)
+    assert valueTypes(parallel.topLevelDocument) == valueTypes(sequential.topLevelDocument)
+    assert FBXArrayInflater.collect(parallel.topLevelDocument) == []
+
+
+@pytest.mark.parametrize("threads", [1, 3])
+def testInflateReplacesTheLazyProperties(threads: int) -> None:
+    buffer = SyntheticFBXGenerator.generateMeshes(3, 500)
+    expected = FBXDocumentParser.fromBuffer(buffer)
+    document = FBXDocumentParser.fromBuffer(buffer, lazyArrays=True)
+    found = FBXArrayInflater.collect(document.topLevelDocument)
+    assert len(found) == 6 and all(node.properties[index] is lazy for node, index, lazy in found)
+
+    inflater = FBXArrayInflater(threads)
+
+    assert inflater.inflate(document.topLevelDocument) == 6
+    assert FBXDocumentSerializer.serialize(document) == FBXDocumentSerializer.serialize(expected)
+    assert inflater.inflate(document.topLevelDocument) == 0
+
+
+def testArraysAreInflatedConcurrently(monkeypatch) -> None:
+    document = FBXDocumentParser.fromBuffer(SyntheticFBXGenerator.generateMeshes(2, 500), lazyArrays=True)
+    # every decode waits for a second one, which only returns when two run at the same time
+    barrier, decode = threading.Barrier(2, timeout=5), FBXLazyArrayProperty.decode
+
+    def waitingDecode(self: FBXLazyArrayProperty) -> Any:
+        barrier.wait()
+        return decode(self)
+
+    monkeypatch.setattr(FBXLazyArrayProperty, "decode", waitingDecode)
+
+    assert FBXArrayInflater(2).inflate(document.topLevelDocument) == 4
+
+
+def testLargestArraysAreInflatedFirst(monkeypatch) -> None:
+    generator = SyntheticFBXGenerator(compressArrays=True)
+    for length in (10, 5_000, 100, 1_000):
+        generator.beginNode("Array", [("d", [float(index) for index in range(length)])])
+        generator.endNode()
+    document = FBXDocumentParser.fromBuffer(generator.build(), lazyArrays=True)
+    lengths, decode = [], FBXLazyArrayProperty.decode
+
+    def recordingDecode(self: FBXLazyArrayProperty) -> Any:
+        lengths.append(self.arrayLength)
+        return decode(self)
+
+    monkeypatch.setattr(FBXLazyArrayProperty, "decode", recordingDecode)
+    FBXArrayInflater(1).inflate(document.topLevelDocument)
+
+    assert lengths == [5_000, 1_000, 100, 10]
+
+
+def testLazyParsesAreNotInflated() -> None:
+    document = FBXDocumentParser.fromBuffer(SyntheticFBXGenerator.generateMeshes(2, 100), lazyArrays=True, inflateThreads=4)
+
+    assert len(FBXArrayInflater.collect(document.topLevelDocument)) == 4
+
+
+def testInflatedArraysAreCounted() -> None:
+    stats = FBXStats()
+
+    FBXDocumentParser.fromBuffer(SyntheticFBXGenerator.generateMeshes(3, 100), inflateThreads=2, stats=stats)
+
+    assert stats.counters["parse.arrays"] == 6
+    assert stats.timers["parse.inflateThreads"][1] == 1
@@ -0,0 +1,234 @@
+import asyncio
+import glob
+import json
+import os
+import threading
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Converter.FBXAsyncConverter import FBXAsyncConverter, FBXOutputChannel
+from Infrastructure.Converter.FBXByteLimiter import FBXByteLimiter
+from Infrastructure.Converter.FBXFileConverter import FBXFileConverter
+
+
+class Sink:
+    """Asynchronous output gathering the chunks, with a coroutine write and drain like asyncio.StreamWriter."""
+
+    def __init__(self) -> None:
+        self.chunks = []
+
+    async def write(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+
+    async def drain(self) -> None:
+        await asyncio.sleep(0)
+
+
+class CountingLimiter(FBXByteLimiter):
+    """Byte limiter recording the requested reservations and the largest number of reservations held at once."""
+
+    def __init__(self, maxBytes: int) -> None:
+        super().__init__(maxBytes)
+        self.requested = 0
+        self.held = 0
+        self.mostHeld = 0
+
+    async def acquire(self, amount: int) -> None:
+        self.requested += 1
+        await super().acquire(amount)
+        self.held += 1
+        self.mostHeld = max(self.mostHeld, self.held)
+
+    async def release(self, amount: int) -> None:
+        self.held -= 1
+        await super().release(amount)
+
+
+def convertSynchronously(source: str, target: str, format: str = FBXFileConverter.FORMAT_JSON) -> bytes:
+    FBXFileConverter.convert(source, target, format=format)
+    with open(target, "rb") as file:
+        return file.read()
+
+
+def writeMeshes(path, meshCount: int = 2, vertexCount: int = 2_000) -> str:
+    path.write_bytes(SyntheticFBXGenerator.generateMeshes(meshCount, vertexCount))
+    return str(path)
+
+
+def testPathOutputMatchesTheFileConverter(tmp_path) -> None:
+    target = str(tmp_path / "example.json")
+
+    assert asyncio.run(FBXAsyncConverter(chunkSize=256).convert(EXAMPLE_PATH, target)) is None
+
+    with open(target, "rb") as file:
+        assert file.read() == convertSynchronously(EXAMPLE_PATH, str(tmp_path / "expected.json"))
+    assert glob.glob(str(tmp_path / "*.tmp")) == []
+
+
+@pytest.mark.parametrize("source", ["path", "bytes", "chunks"])
+def testSinkOutputMatchesPathOutput(source: str, tmp_path) -> None:
+    with open(EXAMPLE_PATH, "rb") as file:
+        content = file.read()
+
+    async def chunks():
+        for offset in range(0, len(content), 1_000):
+            yield content[offset:offset + 1_000]
+
+    sources = {"path": lambda: EXAMPLE_PATH, "bytes": lambda: content, "chunks": chunks}
+    sink = Sink()
+    asyncio.run(FBXAsyncConverter(chunkSize=256, maxChunks=2).convert(sources[source](), sink))
+
+    assert max(len(chunk) for chunk in sink.chunks) == 256
+    assert b"".join(sink.chunks) == convertSynchronously(EXAMPLE_PATH, str(tmp_path / "expected.json"))
+
+
+def testManifestIsWrittenNextToTheTarget(tmp_path) -> None:
+    source = writeMeshes(tmp_path / "meshes.fbx")
+    target = str(tmp_path / "meshes.bin")
+
+    manifest = asyncio.run(FBXAsyncConverter().convert(source, target, format="raw"))
+
+    with open(target + ".json") as file:
+        assert json.load(file) == json.loads(json.dumps(manifest))
+    with open(target, "rb") as file:
+        assert file.read() == convertSynchronously(source, str(tmp_path / "expected.bin"), "raw")
+    assert glob.glob(str(tmp_path / "*.tmp")) == []
+
+
+def testLimiterSerializesConversions(tmp_path) -> None:
+    source = writeMeshes(tmp_path / "meshes.fbx")
+    limiter = CountingLimiter(1)
+
+    async def convertAll():
+        converter = FBXAsyncConverter(limiter=limiter, chunkSize=1_024, maxChunks=1)
+        return await asyncio.gather(*(converter.convert(source, str(tmp_path / f"{index}.json")) for index in range(4)))
+
+    asyncio.run(convertAll())
+
+    # every reservation is larger than the limit, they are granted one at a time
+    assert limiter.mostHeld == 1
+    assert limiter.inFlightBytes == 0
+    expected = convertSynchronously(source, str(tmp_path / "expected.json"))
+    for index in range(4):
+        with open(tmp_path / f"{index}.json", "rb") as file:
+            assert file.read() == expected
+
+
+def testCancellingWhileEncodingLeavesTheTargetUntouched(tmp_path) -> None:
+    source = writeMeshes(tmp_path / "meshes.fbx", 8, 20_000)
+    target = tmp_path / "meshes.json"
+    target.write_text("previous")
+    limiter = FBXByteLimiter()
+
+    async def cancelMidway():
+        task = asyncio.ensure_future(FBXAsyncConverter(limiter=limiter, chunkSize=1_024, maxChunks=1).convert(source, str(target)))
+        while not any(os.path.getsize(path) for path in glob.glob(str(tmp_path / "*.tmp"))):
+            await asyncio.sleep(0.001)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancelMidway())
+
+    assert target.read_text() == "previous"
+    assert glob.glob(str(tmp_path / "*.tmp")) == []
+    assert limiter.inFlightBytes == 0
+
+
+def testCancellingWhileWaitingForTheLimiterClosesTheDocument(tmp_path) -> None:
+    source = writeMeshes(tmp_path / "meshes.fbx")
+    target = tmp_path / "meshes.json"
+    limiter = CountingLimiter(1)
+
+    async def cancelWaiting():
+        await limiter.acquire(1)
+        task = asyncio.ensure_future(FBXAsyncConverter(limiter=limiter).convert(source, str(target)))
+        # the parse runs on the executor, the conversion then waits for the held reservation
+        while limiter.requested < 2:
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.01)
+        assert not task.done()
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await limiter.release(1)
+
+    asyncio.run(cancelWaiting())
+
+    assert not target.exists()
+    assert limiter.inFlightBytes == 0
+    if os.path.exists("/proc/self/maps"):
+        with open("/proc/self/maps") as maps:
+            assert source not in maps.read()
+
+
+def testOutputChannelBlocksTheWriterUntilChunksAreConsumed() -> None:
+    async def run():
+        channel = FBXOutputChannel(asyncio.get_running_loop(), chunkSize=4, maxChunks=2)
+        writer = threading.Thread(target=lambda: (channel.write(b"x" * 40), channel.close()))
+        writer.start()
+
+        # two chunks fill the slots, the writer waits on the third
+        await asyncio.sleep(0.05)
+        assert writer.is_alive()
+        assert channel.tell() == 40
+
+        chunks = [chunk async for chunk in channel.chunks()]
+        writer.join()
+        return chunks
+
+    assert asyncio.run(run()) == [b"xxxx"] * 10
+
+
+def testCancellingTheChannelStopsABlockedWriter() -> None:
+    errors = []
+
+    async def run():
+        channel = FBXOutputChannel(asyncio.get_running_loop(), chunkSize=4, maxChunks=1)
+
+        def write() -> None:
+            try:
+                channel.write(b"x" * 40)
+            except asyncio.CancelledError as e:
+                errors.append(e)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        await asyncio.sleep(0.05)
+        channel.cancel()
+        writer.join(5)
+        assert not writer.is_alive()
+
+    asyncio.run(run())
+
+    assert len(errors) == 1
+
+
+def testLimiterAdmitsInArrivalOrder() -> None:
+    async def run():
+        limiter = FBXByteLimiter(10)
+        order = []
+
+        async def reserve(name: str, amount: int) -> None:
+            async with limiter.reserve(amount):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        await limiter.acquire(6)
+        # the large reservation arrived first, the small one (which would fit) waits behind it
+        waiting = [asyncio.ensure_future(reserve("large", 8)), asyncio.ensure_future(reserve("small", 2))]
+        await asyncio.sleep(0.01)
+        assert order == []
+
+        await limiter.release(6)
+        await asyncio.gather(*waiting)
+        return order, limiter.inFlightBytes
+
+    assert asyncio.run(run()) == (["large", "small"], 0)
+
+
+def testLimiterRejectsAnEmptyLimit() -> None:
+    with pytest.raises(ValueError):
+        FBXByteLimiter(0)
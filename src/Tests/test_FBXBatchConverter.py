@@ -0,0 +1,116 @@
+import json
+import os
+import pytest
+from conftest import EXAMPLE_PATH
+from main import FBXConverter
+from Infrastructure.Converter.FBXBatchConverter import FBXBatchConverter
+from Infrastructure.Storage.FBXAtomicFile import FBXAtomicFile
+
+
+def makeSources(directory) -> None:
+    """Lay out a small batch: two copies of the example, a nested one and a file that is not FBX."""
+    with open(EXAMPLE_PATH, "rb") as file:
+        content = file.read()
+
+    (directory / "nested").mkdir()
+    (directory / "a.fbx").write_bytes(content)
+    (directory / "B.FBX").write_bytes(content)
+    (directory / "nested" / "c.fbx").write_bytes(content)
+    (directory / "notes.txt").write_text("not a scene")
+
+
+def testCollectSourcesExpandsDirectoriesAndGlobs(tmp_path) -> None:
+    makeSources(tmp_path)
+    expected = sorted(os.path.abspath(str(path)) for path in (tmp_path / "a.fbx", tmp_path / "B.FBX", tmp_path / "nested" / "c.fbx"))
+
+    assert FBXBatchConverter.collectSources([str(tmp_path)]) == expected
+    assert FBXBatchConverter.collectSources([str(tmp_path / "*.fbx"), str(tmp_path / "a.fbx")]) == [os.path.abspath(str(tmp_path / "a.fbx"))]
+    assert FBXBatchConverter.collectSources([str(tmp_path / "**" / "*.fbx"), str(tmp_path)]) == expected
+    assert FBXBatchConverter.collectSources([str(tmp_path / "missing")]) == []
+
+
+def testTargetsMirrorTheSourceLayout(tmp_path) -> None:
+    sources = tmp_path / "in"
+    sources.mkdir()
+    makeSources(sources)
+    output = tmp_path / "out"
+    results = FBXBatchConverter(str(output), workers=1).convert(FBXBatchConverter.collectSources([str(sources)]))
+
+    assert {result.status for result in results} == {FBXBatchConverter.STATUS_CONVERTED}
+    assert sorted(os.path.relpath(result.target, str(output)) for result in results) == ["B.json", "a.json", os.path.join("nested", "c.json")]
+    with open(results[0].target) as file:
+        assert json.load(file)
+
+
+@pytest.mark.parametrize("overwrite, status, replaced", [
+    (FBXBatchConverter.OVERWRITE_SKIP, FBXBatchConverter.STATUS_SKIPPED, False),
+    (FBXBatchConverter.OVERWRITE_REPLACE, FBXBatchConverter.STATUS_CONVERTED, True),
+    (FBXBatchConverter.OVERWRITE_FAIL, FBXBatchConverter.STATUS_FAILED, False),
+])
+def testOverwritePolicies(overwrite: str, status: str, replaced: bool, tmp_path) -> None:
+    target = tmp_path / "example.json"
+    target.write_text("existing")
+
+    result = FBXBatchConverter.convertOne(EXAMPLE_PATH, str(target), overwrite, {})
+
+    assert result.status == status
+    assert (target.read_text() != "existing") == replaced
+    if status == FBXBatchConverter.STATUS_FAILED:
+        assert "FileExistsError" in result.error
+
+
+def testUnknownOverwritePolicy(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        FBXBatchConverter(str(tmp_path), overwrite="merge")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def testFailuresAreIsolated(workers: int, tmp_path) -> None:
+    sources = tmp_path / "in"
+    sources.mkdir()
+    makeSources(sources)
+    # the node list ends in the middle of a record
+    (sources / "broken.fbx").write_bytes((sources / "a.fbx").read_bytes()[:4_000])
+
+    results = FBXBatchConverter(str(tmp_path / "out"), workers=workers).convert(FBXBatchConverter.collectSources([str(sources)]))
+    byName = {os.path.basename(result.source): result for result in results}
+
+    assert byName["broken.fbx"].status == FBXBatchConverter.STATUS_FAILED and byName["broken.fbx"].error
+    assert not os.path.exists(byName["broken.fbx"].target)
+    assert [byName[name].status for name in ("a.fbx", "B.FBX", "c.fbx")] == [FBXBatchConverter.STATUS_CONVERTED] * 3
+    assert "1 failed" in FBXBatchConverter.summarize(results, 1.0)
+
+
+def testFailedBatchExitsWithOne(tmp_path, capsys) -> None:
+    sources = tmp_path / "in"
+    sources.mkdir()
+    makeSources(sources)
+    arguments = ["--batch", str(sources), "--output-dir", str(tmp_path / "out"), "--workers", "1"]
+
+    FBXConverter.main(*arguments)
+    assert "3 converted" in capsys.readouterr().out
+
+    (sources / "broken.fbx").write_bytes(b"not an fbx file")
+    with pytest.raises(SystemExit) as exit:
+        FBXConverter.main(*arguments)
+    assert exit.value.code == 1
+    assert "3 skipped, 1 failed" in capsys.readouterr().out
+
+
+def testAtomicFilesLeaveNothingBehindOnFailure(tmp_path) -> None:
+    target = tmp_path / "target.bin"
+    target.write_bytes(b"previous")
+
+    def fail(file) -> None:
+        file.write(b"partial")
+        raise RuntimeError("encoder failed")
+
+    with pytest.raises(RuntimeError):
+        FBXAtomicFile.write(str(target), fail)
+
+    assert target.read_bytes() == b"previous"
+    assert os.listdir(str(tmp_path)) == ["target.bin"]
+
+    FBXAtomicFile.writeBytes(str(target), b"replaced")
+    assert target.read_bytes() == b"replaced"
+    assert os.listdir(str(tmp_path)) == ["target.bin"]
@@ -0,0 +1,105 @@
+from typing import Any, List, Tuple
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocument import FBXDocument
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+from Infrastructure.Serializers.FBXBinarySerializer import FBXBinarySerializer, FOOTER_MAGIC
+
+
+def normalize(value: Any) -> Any:
+    """Get a comparable form of a property value: bytes for raw properties, a list for arrays."""
+    if isinstance(value, FBXLazyArrayProperty):
+        value = value.value
+
+    if isinstance(value, (bytes, bytearray)) or (isinstance(value, memoryview) and value.format == "B"):
+        return bytes(value)
+    elif isinstance(value, (str, bool, int, float)):
+        return value
+
+    return list(value)
+
+
+def contents(node: FBXDocumentNode) -> List[Tuple]:
+    """Get the names, properties, type codes and nesting of the children of a node, without offsets."""
+    return [(child.name, [normalize(value) for value in child.properties], child.propertyTypes, contents(child)) for child in node.children]
+
+
+def lazyArrays(document: FBXDocument) -> List[FBXLazyArrayProperty]:
+    """Get the array properties of a document parsed with lazyArrays, in document order."""
+    found, stack = [], [document.topLevelDocument]
+    while stack:
+        node = stack.pop()
+        found.extend(value for value in node.properties if isinstance(value, FBXLazyArrayProperty))
+        stack.extend(reversed(node.children))
+    return found
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("buffer", [
+    readExample(),
+    SyntheticFBXGenerator.generate(2_000, depth=4),
+    SyntheticFBXGenerator.generateMeshes(4, 1_000, compressArrays=False),
+    SyntheticFBXGenerator.generateProfile(SyntheticFBXGenerator.PROFILES["mixed-7500"]._replace(nodeCount=500)),
+], ids=["example", "chains", "meshes", "mixed-7500"])
+def testWriteThenParseGivesTheSameNodes(buffer: bytes, tmp_path) -> None:
+    document = FBXDocumentParser.fromBuffer(buffer)
+    path = tmp_path / "written.fbx"
+    with open(path, "wb") as file:
+        FBXBinarySerializer(threads=2).write(document, file)
+
+    written = FBXDocumentParser.fromFile(str(path))
+
+    assert written.header.versionNumber == document.header.versionNumber
+    assert contents(written.topLevelDocument) == contents(document.topLevelDocument)
+    assert path.read_bytes().endswith(FOOTER_MAGIC)
+
+
+def testArraysAreZlibCompressed() -> None:
+    document = FBXDocumentParser.fromBuffer(SyntheticFBXGenerator.generateMeshes(4, 1_000, compressArrays=False), lazyArrays=True)
+    assert {array.encoding for array in lazyArrays(document)} == {0}
+
+    written = FBXDocumentParser.fromBuffer(FBXBinarySerializer(minCompressLength=0, threads=2).encode(document), lazyArrays=True)
+
+    assert {array.encoding for array in lazyArrays(written)} == {1}
+    assert contents(written.topLevelDocument) == contents(document.topLevelDocument)
+
+
+def testArraysCanBeWrittenUncompressed() -> None:
+    document = FBXDocumentParser.fromBuffer(readExample())
+    written = FBXDocumentParser.fromBuffer(FBXBinarySerializer(compressArrays=False).encode(document), lazyArrays=True)
+
+    assert {array.encoding for array in lazyArrays(written)} == {0}
+    assert contents(written.topLevelDocument) == contents(document.topLevelDocument)
+
+
+def testCompressedLazyArraysAreCopiedAsStored() -> None:
+    buffer = SyntheticFBXGenerator.generateMeshes(4, 1_000, compressArrays=True)
+    document = FBXDocumentParser.fromBuffer(buffer, lazyArrays=True)
+    written = FBXDocumentParser.fromBuffer(FBXBinarySerializer(threads=2).encode(document), lazyArrays=True)
+
+    assert [bytes(array.content) for array in lazyArrays(written)] == [bytes(array.content) for array in lazyArrays(document)]
+    assert contents(written.topLevelDocument) == contents(document.topLevelDocument)
+
+
+@pytest.mark.parametrize("fromVersion, toVersion", [(7400, 7500), (7500, 7400)])
+def testVersionConversion(fromVersion: int, toVersion: int) -> None:
+    document = FBXDocumentParser.fromBuffer(SyntheticFBXGenerator.generateMeshes(4, 1_000, versionNumber=fromVersion))
+    written = FBXDocumentParser.fromBuffer(FBXBinarySerializer(toVersion, threads=2).encode(document))
+
+    assert written.header.versionNumber == toVersion
+    assert contents(written.topLevelDocument) == contents(document.topLevelDocument)
+
+
+def testWritingIsStable() -> None:
+    document = FBXDocumentParser.fromBuffer(readExample())
+    first = FBXBinarySerializer(threads=2).encode(document)
+    second = FBXBinarySerializer(threads=2).encode(FBXDocumentParser.fromBuffer(bytes(first)))
+
+    assert second == first
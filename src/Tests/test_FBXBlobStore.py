@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List
+import pytest
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from main import FBXConverter
+from Infrastructure.Converter.FBXFileConverter import FBXFileConverter
+from Infrastructure.Serializers.FBXBlobStore import FBXBlobStore
+
+TEXTURE = bytes(range(256)) * 40
+VIDEO = b"\x00\x01" * 3_000
+BLOBS = (TEXTURE, VIDEO, TEXTURE, b"png")
+
+
+def reference(blob: bytes) -> Dict[str, Any]:
+    """Get the reference written in place of a stored blob."""
+    digest = hashlib.sha256(blob).hexdigest()
+    return {"sha256": digest, "byteLength": len(blob), "path": f"{digest[:2]}/{digest}"}
+
+
+def writeBlobs(path) -> str:
+    """Write a file embedding a texture twice, a video and a short blob, next to a string."""
+    generator = SyntheticFBXGenerator()
+    generator.beginNode("Objects")
+    for name, blob in zip(("Texture", "Video", "Texture", "Thumbnail"), BLOBS):
+        generator.beginNode(name, [("S", name), ("R", blob)])
+        generator.endNode()
+    generator.endNode()
+
+    path.write_bytes(generator.build())
+    return str(path)
+
+
+def blobProperties(path: str) -> List[Any]:
+    """Get the second property of the Objects children in a converted JSON file, where the blobs are."""
+    with open(path) as file:
+        document = json.load(file)["document"]
+    return [child["properties"][1] for child in document["children"][0]["children"]]
+
+
+def storedFiles(directory: str) -> Dict[str, bytes]:
+    """Get the files of a store by their path relative to the store directory."""
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            with open(os.path.join(root, name), "rb") as file:
+                files[os.path.relpath(os.path.join(root, name), directory).replace(os.sep, "/")] = file.read()
+    return files
+
+
+def testBlobsAreStoredOnceByDigest(tmp_path) -> None:
+    store = FBXBlobStore(str(tmp_path))
+
+    first = store.store(memoryview(TEXTURE))
+    second = store.store(TEXTURE)
+
+    assert first == second == reference(TEXTURE)
+    assert storedFiles(str(tmp_path)) == {reference(TEXTURE)["path"]: TEXTURE}
+    assert (store.storedBlobs, store.storedBytes, store.duplicateBlobs) == (1, len(TEXTURE), 1)
+
+    # another store over the same directory finds it too
+    other = FBXBlobStore(str(tmp_path))
+    other.store(TEXTURE)
+    assert (other.storedBlobs, other.duplicateBlobs) == (0, 1)
+
+
+def testShortBlobsStayInline(tmp_path) -> None:
+    store = FBXBlobStore(str(tmp_path), minLength=16)
+
+    assert store.accepts(TEXTURE) and not store.accepts(b"png")
+
+
+def testConvertedJsonReferencesTheStoredBlobs(tmp_path) -> None:
+    source = writeBlobs(tmp_path / "blobs.fbx")
+    target = str(tmp_path / "blobs.json")
+    blobs = str(tmp_path / "blobs")
+
+    FBXFileConverter.convert(source, target, blobDirectory=blobs)
+
+    assert blobProperties(target) == [reference(blob) for blob in BLOBS]
+    assert storedFiles(blobs) == {reference(blob)["path"]: blob for blob in BLOBS}
+
+
+def testSkippedBlobsOnlyKeepTheirLength(tmp_path) -> None:
+    source = writeBlobs(tmp_path / "blobs.fbx")
+    target = str(tmp_path / "blobs.json")
+
+    FBXFileConverter.convert(source, target, skipBlobs=True)
+
+    assert blobProperties(target) == [{"byteLength": len(blob)} for blob in BLOBS]
+
+
+def testBlobsAreInlineByDefault(tmp_path) -> None:
+    source = writeBlobs(tmp_path / "blobs.fbx")
+    target = str(tmp_path / "blobs.json")
+
+    FBXFileConverter.convert(source, target)
+
+    assert blobProperties(target) == [blob.hex() for blob in BLOBS]
+
+
+def testCommandLineBlobOptions(tmp_path) -> None:
+    source = writeBlobs(tmp_path / "blobs.fbx")
+    blobs = str(tmp_path / "blobs")
+
+    FBXConverter.main(source, str(tmp_path / "skipped.json"), "--skip-blobs")
+    FBXConverter.main(source, str(tmp_path / "spilled.json"), "--blobs-dir", blobs)
+
+    assert blobProperties(str(tmp_path / "skipped.json")) == [{"byteLength": len(blob)} for blob in BLOBS]
+    assert blobProperties(str(tmp_path / "spilled.json")) == [reference(blob) for blob in BLOBS]
+    assert storedFiles(blobs) == {reference(blob)["path"]: blob for blob in BLOBS}
+
+
+def testBlobOptionsNeedTheJsonFormat(tmp_path) -> None:
+    source = writeBlobs(tmp_path / "blobs.fbx")
+
+    with pytest.raises(ValueError):
+        FBXFileConverter.convert(source, str(tmp_path / "blobs.msgpack"), format="msgpack", skipBlobs=True)
+    assert not os.path.exists(str(tmp_path / "blobs.msgpack"))
@@ -0,0 +1,99 @@
+from typing import Dict, List, Tuple
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser, NODE_STORAGE_TABLE
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+def preOrder(root: FBXDocumentNode) -> List[Tuple[FBXDocumentNode, str]]:
+    """Reference walk: the (node, path) of every node in document order."""
+    found = []
+
+    def visit(node: FBXDocumentNode, path: str) -> None:
+        found.append((node, path))
+        for child in node.children:
+            visit(child, f"{path}/{child.name}" if path else child.name)
+
+    for child in root.children:
+        visit(child, child.name)
+    return found
+
+
+def offsets(nodes: List[FBXDocumentNode]) -> List[int]:
+    return [node.startOffset for node in nodes]
+
+
+DOCUMENTS = pytest.mark.parametrize("buffer", [readExample(), SyntheticFBXGenerator.generateScene(100), SyntheticFBXGenerator.generate(500, depth=8)], ids=["example", "scene", "chains"])
+STORAGES = pytest.mark.parametrize("options", [{}, {"nodeStorage": NODE_STORAGE_TABLE}], ids=["objects", "table"])
+
+
+@DOCUMENTS
+@STORAGES
+def testPathsAndNamesMatchAWalk(buffer: bytes, options: dict) -> None:
+    document = FBXDocumentParser.fromBuffer(buffer, **options)
+    walked = preOrder(document.topLevelDocument)
+
+    paths: Dict[str, List[FBXDocumentNode]] = {}
+    for node, path in walked:
+        paths.setdefault(path, []).append(node)
+
+    assert sorted(document.index.paths) == sorted(paths)
+    for path, nodes in paths.items():
+        assert offsets(document.find(path)) == offsets(nodes)
+        assert offsets(document.find(f"/{path}/")) == offsets(nodes)
+
+    for name in {node.name for node, _ in walked}:
+        assert offsets(document.byName(name)) == offsets([node for node, _ in walked if node.name == name])
+
+
+@DOCUMENTS
+def testObjectsAreFoundById(buffer: bytes) -> None:
+    document = FBXDocumentParser.fromBuffer(buffer)
+    objects = [node for node, path in preOrder(document.topLevelDocument) if path.startswith("Objects/") and path.count("/") == 1]
+
+    for node in objects:
+        assert document.byId(node.properties[0]) is node
+        assert document.index.byId(node.properties[0]) is node
+
+
+def testOnlyChildrenOfObjectsHaveIds() -> None:
+    # chains of Model nodes nest in one another, every one with an integer first property
+    document = FBXDocumentParser.fromBuffer(SyntheticFBXGenerator.generate(500, depth=8))
+    nested = [node for node, path in preOrder(document.topLevelDocument) if path.startswith("Objects/Model/Model")]
+
+    assert len(nested) > 0
+    assert [document.byId(node.properties[0]) for node in nested] == [None] * len(nested)
+
+
+def testNodesFoundByDocumentAndIndexAreTheSame() -> None:
+    document = FBXDocumentParser.fromBuffer(readExample())
+
+    assert document.find("Objects/Model") == document.index.find("Objects/Model")
+    assert document.byName("Model") == document.index.byName("Model")
+    assert all(node is indexed for node, indexed in zip(document.find("Objects/Model"), document.index.find("Objects/Model")))
+
+
+def testLookupsReturnCopies() -> None:
+    document = FBXDocumentParser.fromBuffer(readExample())
+    models, named = document.find("Objects/Model"), document.byName("Model")
+
+    models.clear()
+    named.append(None)
+    document.find("Objects/Missing").append(None)
+
+    assert document.find("Objects/Model") != [] and None not in document.byName("Model")
+    assert document.find("Objects/Missing") == []
+
+
+def testUnknownLookups() -> None:
+    document = FBXDocumentParser.fromBuffer(readExample())
+
+    assert document.find("Missing") == document.find("Objects/Model/Missing") == document.find("Model") == []
+    assert document.byName("Missing") == []
+    assert document.byId(-1) is None
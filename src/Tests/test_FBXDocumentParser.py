@@ -0,0 +1,159 @@
+import os
+import struct
+import sys
+from typing import List, Tuple
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser, NODE_STORAGE_TABLE
+
+RECORD_32 = struct.Struct("<IIIB")
+RECORD_64 = struct.Struct("<QQQB")
+
+
+def readRecords(buffer: bytes, offset: int, layout: struct.Struct) -> List[Tuple]:
+    """
+    Reference reader: read a node list recursively, straight from the record headers.
+
+    Args:
+        buffer (bytes): The FBX file buffer.
+        offset (int): The offset of the first record of the list.
+        layout (struct.Struct): The record header layout.
+
+    Returns:
+        List[Tuple]: A (name, startOffset, endOffset, propertiesCount, propertiesLength, children) tuple per record, up to the null record.
+
+    """
+    records = []
+    while True:
+        endOffset, propertiesCount, propertiesLength, nameLength = layout.unpack_from(buffer, offset)
+        if endOffset == 0:
+            return records
+
+        nameOffset = offset + layout.size
+        childrenOffset = nameOffset + nameLength + propertiesLength
+        children = readRecords(buffer, childrenOffset, layout) if childrenOffset < endOffset else []
+        records.append((buffer[nameOffset:nameOffset + nameLength].decode("latin-1"), offset, endOffset, propertiesCount, propertiesLength, children))
+        offset = endOffset
+
+
+def outline(node: FBXDocumentNode) -> List[Tuple]:
+    """Get the children of a parsed node in the form of readRecords."""
+    return [(child.name, child.startOffset, child.endOffset, child.propertiesCount, child.propertiesLength, outline(child)) for child in node.children]
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("buffer", [
+    readExample(),
+    SyntheticFBXGenerator.generate(2_000, depth=4),
+    SyntheticFBXGenerator.generate(500, depth=64),
+    SyntheticFBXGenerator.generateScene(200),
+    SyntheticFBXGenerator.generateMeshes(4, 100),
+], ids=["example", "chains", "deep-chains", "scene", "meshes"])
+def testWalkerMatchesReferenceReader(buffer: bytes) -> None:
+    document = FBXDocumentParser.fromBuffer(buffer)
+
+    assert outline(document.topLevelDocument) == readRecords(buffer, 27, RECORD_32)
+
+
+def testTableStorageMatchesObjects() -> None:
+    buffer = readExample()
+    objects = FBXDocumentParser.fromBuffer(buffer).topLevelDocument
+    table = FBXDocumentParser.fromBuffer(buffer, nodeStorage=NODE_STORAGE_TABLE).topLevelDocument
+
+    assert outline(table) == outline(objects)
+
+
+def testChildrenLinkToTheirParent() -> None:
+    stack = [FBXDocumentParser.fromBuffer(readExample()).topLevelDocument]
+    while stack:
+        node = stack.pop()
+        for child in node.children:
+            assert child.parent is node
+        stack.extend(node.children)
+
+
+def testDeepNestingDoesNotRecurse() -> None:
+    buffer = SyntheticFBXGenerator.generate(4_000, depth=1_000)
+    previousLimit = sys.getrecursionlimit()
+    sys.setrecursionlimit(100)
+    try:
+        document = FBXDocumentParser.fromBuffer(buffer)
+    finally:
+        sys.setrecursionlimit(previousLimit)
+
+    deepest, stack = 0, [(document.topLevelDocument, 0)]
+    while stack:
+        node, depth = stack.pop()
+        deepest = max(deepest, depth)
+        stack.extend((child, depth + 1) for child in node.children)
+
+    # Objects, the chain of 1000 Model nodes and the leaf P node
+    assert deepest == 1 + 1_000 + 1
+
+
+@pytest.mark.parametrize("buffer", [
+    SyntheticFBXGenerator.generate(2_000, depth=4, versionNumber=7500),
+    SyntheticFBXGenerator.generateScene(200, versionNumber=7500),
+    SyntheticFBXGenerator.generateMeshes(4, 100, versionNumber=7500),
+    SyntheticFBXGenerator.generateProfile(SyntheticFBXGenerator.PROFILES["mixed-7500"]._replace(nodeCount=500)),
+], ids=["chains", "scene", "meshes", "mixed"])
+def testWalkerReads64BitRecords(buffer: bytes) -> None:
+    document = FBXDocumentParser.fromBuffer(buffer)
+
+    assert document.header.versionNumber >= 7500
+    assert outline(document.topLevelDocument) == readRecords(buffer, 27, RECORD_64)
+
+
+def testNullRecordsOf64BitLists() -> None:
+    buffer = SyntheticFBXGenerator.generate(2_000, depth=4, versionNumber=7500)
+    document = FBXDocumentParser.fromBuffer(buffer)
+
+    assert FBXDocumentParser.nodeHeaderLayout(7400).size == 13
+    assert FBXDocumentParser.nodeHeaderLayout(7500).size == 25
+
+    # nested lists, and the top level list, end with a 25 byte null record
+    stack = list(document.topLevelDocument.children)
+    while stack:
+        node = stack.pop()
+        if node.children:
+            assert node.children[-1].endOffset == node.endOffset - 25
+            assert buffer[node.endOffset - 25:node.endOffset] == bytes(25)
+        stack.extend(node.children)
+
+    last = document.topLevelDocument.children[-1].endOffset
+    assert buffer[last:last + 25] == bytes(25)
+
+
+def test64BitRecordsHoldTheSameNodes() -> None:
+    narrow = FBXDocumentParser.fromBuffer(SyntheticFBXGenerator.generate(2_000, depth=4, versionNumber=7400))
+    wide = FBXDocumentParser.fromBuffer(SyntheticFBXGenerator.generate(2_000, depth=4, versionNumber=7500))
+
+    def contents(node: FBXDocumentNode) -> List[Tuple]:
+        return [(child.name, child.properties, child.propertyTypes, contents(child)) for child in node.children]
+
+    assert contents(wide.topLevelDocument) == contents(narrow.topLevelDocument)
+
+
+@pytest.mark.parametrize("lazyArrays", [False, True])
+def testClosingReleasesTheFileMapping(lazyArrays: bool, tmp_path) -> None:
+    path = tmp_path / "meshes.fbx"
+    path.write_bytes(SyntheticFBXGenerator.generateMeshes(2, 100, compressArrays=False))
+
+    with FBXDocumentParser.fromFile(str(path), lazyArrays=lazyArrays) as document:
+        vertices = document.find("Objects/Geometry/Vertices")[0].properties[0]
+        assert len(vertices) == 300
+
+    # the views are released and the file is no longer mapped
+    with pytest.raises(ValueError):
+        bytes(vertices) if not lazyArrays else vertices.value
+    if os.path.exists("/proc/self/maps"):
+        with open("/proc/self/maps") as maps:
+            assert str(path) not in maps.read()
+
+    document.close()
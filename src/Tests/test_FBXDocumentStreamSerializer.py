@@ -0,0 +1,127 @@
+import io
+import json
+from typing import List
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from main import FBXConverter
+from Infrastructure.Parser.FBXArrayDecoder import numpy
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Serializers.FBXBlobStore import FBXBlobStore
+from Infrastructure.Serializers.FBXDocumentSerializer import FBXDocumentSerializer
+from Infrastructure.Serializers.FBXDocumentStreamSerializer import FBXDocumentStreamSerializer
+
+
+class RecordingOutput(io.StringIO):
+    """Text output recording the length of every write."""
+
+    def __init__(self: 'RecordingOutput') -> None:
+        super().__init__()
+        self.writes: List[int] = []
+
+    def write(self: 'RecordingOutput', text: str) -> int:
+        self.writes.append(len(text))
+        return super().write(text)
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+def writeBlobs() -> bytes:
+    """Write a file with a long blob, an empty one and a short one, next to arrays and strings."""
+    generator = SyntheticFBXGenerator(compressArrays=True)
+    generator.beginNode("Objects")
+    for name, blob in (("Texture", bytes(range(256)) * 300), ("Empty", b""), ("Thumbnail", b"png")):
+        generator.beginNode(name, [("S", name), ("R", blob), ("d", [0.5] * 100)])
+        generator.endNode()
+    generator.endNode()
+    return generator.build()
+
+
+BUFFERS = {
+    "example": readExample(),
+    "meshes": SyntheticFBXGenerator.generateMeshes(3, 5_000),
+    "nodes": SyntheticFBXGenerator.generate(500, depth=12),
+    "blobs": writeBlobs(),
+}
+
+OPTIONS = [
+    {},
+    {"arrayOutput": "list"},
+    {"lazyArrays": True},
+    {"include": ["Objects/Geometry"]},
+    pytest.param({"arrayOutput": "numpy"}, marks=pytest.mark.skipif(numpy is None, reason="numpy is not installed")),
+]
+
+
+def streamed(document, **kwargs) -> str:
+    output = io.StringIO()
+    FBXDocumentStreamSerializer.serialize(document, output, **kwargs)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("buffer", BUFFERS.values(), ids=BUFFERS.keys())
+@pytest.mark.parametrize("options", OPTIONS, ids=["default", "list", "lazy", "selected", "numpy"])
+def testOutputEqualsTheDocumentSerializer(buffer: bytes, options: dict) -> None:
+    document = FBXDocumentParser.fromBuffer(buffer, **options)
+
+    assert streamed(document) == FBXDocumentSerializer.serialize(document)
+
+
+@pytest.mark.parametrize("bufferSize, sliceLength", [(1, 1), (7, 3), (2**10, 100), (2**20, 2**12)])
+def testBufferAndSliceSizesDoNotChangeTheOutput(bufferSize: int, sliceLength: int) -> None:
+    document = FBXDocumentParser.fromBuffer(BUFFERS["blobs"])
+    output = RecordingOutput()
+
+    FBXDocumentStreamSerializer(output, bufferSize, sliceLength).write(document)
+
+    assert output.getvalue() == FBXDocumentSerializer.serialize(document)
+    # the output is written once per filled buffer, then once for the rest
+    assert all(length >= bufferSize for length in output.writes[:-1])
+    assert len(output.writes) <= len(output.getvalue()) // bufferSize + 1
+
+
+def testArraysAreWrittenSliceBySlice() -> None:
+    document = FBXDocumentParser.fromBuffer(SyntheticFBXGenerator.generateMeshes(1, 10_000))
+    output = RecordingOutput()
+
+    FBXDocumentStreamSerializer(output, bufferSize=1, sliceLength=100).write(document)
+
+    # with a one character buffer every chunk is written on its own, no chunk holds a whole array
+    assert max(output.writes) < 100 * 25
+    assert output.getvalue() == FBXDocumentSerializer.serialize(document)
+
+
+@pytest.mark.parametrize("skipBlobs", [False, True], ids=["stored", "skipped"])
+def testBlobsEqualTheDocumentSerializer(skipBlobs: bool, tmp_path) -> None:
+    document = FBXDocumentParser.fromBuffer(BUFFERS["blobs"])
+
+    expected = FBXDocumentSerializer.serialize(document, blobStore=FBXBlobStore(str(tmp_path / "expected"), minLength=16), skipBlobs=skipBlobs)
+    assert streamed(document, blobStore=FBXBlobStore(str(tmp_path / "streamed"), minLength=16), skipBlobs=skipBlobs) == expected
+
+
+def testDeepDocumentsAreWrittenWithoutRecursion() -> None:
+    generator = SyntheticFBXGenerator()
+    for depth in range(2_000):
+        generator.beginNode("Child", [("I", depth)])
+    for _ in range(2_000):
+        generator.endNode()
+    document = FBXDocumentParser.fromBuffer(generator.build())
+
+    output = streamed(document)
+
+    with pytest.raises(RecursionError):
+        FBXDocumentSerializer.serialize(document)
+    assert output.count('"name": "Child"') == 2_000
+    assert output.endswith("]}" * 2_001 + "}")
+
+
+def testTheCommandLineWritesTheStreamedOutput(tmp_path) -> None:
+    target = tmp_path / "example.json"
+
+    FBXConverter.main(EXAMPLE_PATH, str(target))
+
+    assert target.read_text() == FBXDocumentSerializer.serialize(FBXDocumentParser.fromFile(EXAMPLE_PATH))
+    assert json.loads(target.read_text())["document"]["children"]
@@ -0,0 +1,236 @@
+from array import array
+from typing import Any, List, Optional, Tuple
+import pytest
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Geometry.FBXGeometryExtractor import FBXGeometryExtractor, FBXMeshBuffers
+from Infrastructure.Parser.FBXArrayDecoder import numpy
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+# Layer kind: (element node, values child, index child, components)
+LAYER_KINDS = {
+    "Normal": ("LayerElementNormal", "Normals", "NormalsIndex", 3),
+    "UV": ("LayerElementUV", "UV", "UVIndex", 2),
+}
+
+# A triangle, a quad, a pentagon and a hexagon over 9 control points, sharing corners
+VERTICES = [float(value) / 2 for value in range(27)]
+POLYGON_VERTEX_INDEX = [0, 1, ~2, 2, 1, 3, ~4, 4, 3, 5, 6, ~7, 7, 6, 8, 0, 2, ~1]
+
+EXTRACTORS = pytest.mark.parametrize("useNumpy", [False, pytest.param(True, marks=pytest.mark.skipif(numpy is None, reason="numpy is not installed"))], ids=["array", "numpy"])
+
+# Layer: (kind, name, mapping, reference, values, index)
+Layer = Tuple[str, str, str, str, List[float], Optional[List[int]]]
+
+
+def writeGeometry(vertices: List[float], polygonVertexIndex: List[int], layers: List[Layer] = [], compressArrays: bool = False) -> bytes:
+    """Write a file holding a single mesh Geometry with layer elements."""
+    generator = SyntheticFBXGenerator(compressArrays=compressArrays)
+    generator.beginNode("Objects")
+    generator.beginNode("Geometry", [("L", 42), ("S", "Shape\x00\x01Geometry"), ("S", "Mesh")])
+    for name, properties in (("Vertices", [("d", vertices)]), ("PolygonVertexIndex", [("i", polygonVertexIndex)])):
+        generator.beginNode(name, properties)
+        generator.endNode()
+
+    for kind, name, mapping, reference, values, index in layers:
+        element, valuesName, indexName, _ = LAYER_KINDS[kind]
+        children = [("Name", [("S", name)]), ("MappingInformationType", [("S", mapping)]), ("ReferenceInformationType", [("S", reference)]), (valuesName, [("d", values)])]
+        if index is not None:
+            children.append((indexName, [("i", index)]))
+
+        generator.beginNode(element, [("I", 0)])
+        for child, properties in children:
+            generator.beginNode(child, properties)
+            generator.endNode()
+        generator.endNode()
+
+    generator.endNode()
+    generator.endNode()
+    return generator.build()
+
+
+def referenceMesh(vertices: List[float], polygonVertexIndex: List[int], layers: List[Layer] = []) -> dict:
+    """Reference extraction: polygons split at negative indices, fanned and gathered corner by corner."""
+    polygons, polygon = [], []
+    for value in polygonVertexIndex:
+        polygon.append(value if value >= 0 else ~value)
+        if value < 0:
+            polygons.append(polygon)
+            polygon = []
+
+    perCorner = any(mapping not in ("ByControlPoint", "ByVertice", "ByVertex", "AllSame") for _, _, mapping, _, _, _ in layers)
+    # vertex: (control point, polygon, corner)
+    if perCorner:
+        vertexList = [(controlPoint, polygonIndex) for polygonIndex, polygon in enumerate(polygons) for controlPoint in polygon]
+        vertexList = [(controlPoint, polygonIndex, corner) for corner, (controlPoint, polygonIndex) in enumerate(vertexList)]
+    else:
+        vertexList = [(controlPoint, None, None) for controlPoint in range(len(vertices) // 3)]
+
+    indices, start = [], 0
+    for polygon in polygons:
+        for corner in range(1, len(polygon) - 1):
+            fan = (start, start + corner, start + corner + 1)
+            indices.extend(fan if perCorner else (polygon[0], polygon[corner], polygon[corner + 1]))
+        start += len(polygon)
+
+    def gather(kind: str, mapping: str, values: List[float], index: Optional[List[int]]) -> List[float]:
+        components = LAYER_KINDS[kind][3]
+        gathered = []
+        for controlPoint, polygonIndex, corner in vertexList:
+            element = {"ByPolygonVertex": corner, "ByPolygon": polygonIndex, "AllSame": 0}.get(mapping, controlPoint)
+            if index is not None:
+                element = index[element]
+            gathered.extend(values[element * components:(element + 1) * components])
+        return gathered
+
+    normals = [gather(kind, mapping, values, index) for kind, _, mapping, _, values, index in layers if kind == "Normal"]
+    return {
+        "positions": [value for controlPoint, _, _ in vertexList for value in vertices[controlPoint * 3:controlPoint * 3 + 3]],
+        "indices": indices,
+        "normals": normals[0] if normals else None,
+        "uvs": [gather(kind, mapping, values, index) for kind, _, mapping, _, values, index in layers if kind == "UV"],
+        "uvNames": [name for kind, name, _, _, _, _ in layers if kind == "UV"],
+        "controlPointIndices": [controlPoint for controlPoint, _, _ in vertexList] if perCorner else None,
+        "polygonCount": len(polygons),
+    }
+
+
+def plain(mesh: FBXMeshBuffers) -> dict:
+    """Get the buffers of a mesh as lists, to compare with referenceMesh."""
+    def values(buffer: Any) -> Optional[list]:
+        return None if buffer is None else [value.item() if hasattr(value, "item") else value for value in buffer]
+
+    return {
+        "positions": values(mesh.positions),
+        "indices": values(mesh.indices),
+        "normals": values(mesh.normals),
+        "uvs": [values(uv) for uv in mesh.uvs],
+        "uvNames": mesh.uvNames,
+        "controlPointIndices": values(mesh.controlPointIndices),
+        "polygonCount": mesh.polygonCount,
+    }
+
+
+def extract(buffer: bytes, useNumpy: bool, precision: str = FBXGeometryExtractor.PRECISION_FLOAT32, **options) -> FBXMeshBuffers:
+    meshes = list(FBXGeometryExtractor(precision, useNumpy).extractAll(FBXDocumentParser.fromBuffer(buffer, **options)))
+    assert len(meshes) == 1
+    return meshes[0]
+
+
+def cornerValues(count: int, components: int) -> List[float]:
+    """Get distinct, float32 exact values for count elements."""
+    return [float(value) / 4 for value in range(count * components)]
+
+
+CORNER_COUNT = len(POLYGON_VERTEX_INDEX)
+POLYGON_COUNT = sum(1 for value in POLYGON_VERTEX_INDEX if value < 0)
+
+LAYER_SETS = {
+    "none": [],
+    "control-points": [("Normal", "", "ByControlPoint", "Direct", cornerValues(9, 3), None), ("UV", "map1", "ByVertice", "IndexToDirect", cornerValues(3, 2), [2, 1, 0] * 3)],
+    "all-same": [("Normal", "", "AllSame", "Direct", [0.0, 0.0, 1.0], None)],
+    "polygon-vertex": [("Normal", "", "ByPolygonVertex", "Direct", cornerValues(CORNER_COUNT, 3), None), ("UV", "map1", "ByPolygonVertex", "IndexToDirect", cornerValues(5, 2), [corner % 5 for corner in range(CORNER_COUNT)])],
+    "mixed": [
+        ("Normal", "", "ByPolygon", "IndexToDirect", cornerValues(2, 3), [1, 0, 1, 0]),
+        ("UV", "map1", "ByControlPoint", "Direct", cornerValues(9, 2), None),
+        ("UV", "map2", "ByPolygon", "Direct", cornerValues(POLYGON_COUNT, 2), None),
+        ("UV", "map3", "AllSame", "Direct", [0.5, 0.25], None),
+    ],
+}
+
+
+@EXTRACTORS
+@pytest.mark.parametrize("layers", LAYER_SETS.values(), ids=LAYER_SETS.keys())
+def testMeshesMatchTheReference(layers: List[Layer], useNumpy: bool) -> None:
+    mesh = extract(writeGeometry(VERTICES, POLYGON_VERTEX_INDEX, layers), useNumpy)
+
+    assert (mesh.objectId, mesh.name) == (42, "Shape")
+    assert plain(mesh) == referenceMesh(VERTICES, POLYGON_VERTEX_INDEX, layers)
+
+
+@EXTRACTORS
+def testPolygonsAreFanTriangulated(useNumpy: bool) -> None:
+    mesh = extract(writeGeometry(VERTICES, POLYGON_VERTEX_INDEX), useNumpy)
+
+    # the triangle as is, then fans around the first corner of the quad, pentagon and hexagon
+    assert plain(mesh)["indices"] == [
+        0, 1, 2,
+        2, 1, 3, 2, 3, 4,
+        4, 3, 5, 4, 5, 6, 4, 6, 7,
+        7, 6, 8, 7, 8, 0, 7, 0, 2, 7, 2, 1,
+    ]
+    assert mesh.polygonCount == 4 and mesh.controlPointIndices is None
+
+
+@EXTRACTORS
+def testCornersAfterTheLastPolygonEndAreDropped(useNumpy: bool) -> None:
+    layers = LAYER_SETS["polygon-vertex"]
+    mesh = extract(writeGeometry(VERTICES, POLYGON_VERTEX_INDEX + [3, 5], layers), useNumpy)
+
+    assert plain(mesh) == referenceMesh(VERTICES, POLYGON_VERTEX_INDEX, layers)
+
+
+@EXTRACTORS
+@pytest.mark.parametrize("precision", [FBXGeometryExtractor.PRECISION_FLOAT32, FBXGeometryExtractor.PRECISION_FLOAT64])
+def testQuadGridsTakeTheSameSizePolygonPath(precision: str, useNumpy: bool) -> None:
+    buffer = SyntheticFBXGenerator.generateGridMesh(5, 3)
+    mesh = extract(buffer, useNumpy, precision)
+
+    geometry = FBXDocumentParser.fromBuffer(buffer).find("Objects/Geometry")[0]
+    children = {child.name: child for child in geometry.children}
+    uv = {child.name: child.properties[0] for child in children["LayerElementUV"].children}
+    normals = {child.name: child.properties[0] for child in children["LayerElementNormal"].children}
+    layers = [("Normal", "", "ByPolygonVertex", "Direct", list(normals["Normals"]), None), ("UV", "map1", "ByPolygonVertex", "IndexToDirect", list(uv["UV"]), list(uv["UVIndex"]))]
+    expected = referenceMesh(list(children["Vertices"].properties[0]), list(children["PolygonVertexIndex"].properties[0]), layers)
+
+    actual = plain(mesh)
+    assert (actual["indices"], actual["controlPointIndices"], actual["polygonCount"]) == (expected["indices"], expected["controlPointIndices"], 15)
+    for name in ("positions", "normals"):
+        assert actual[name] == pytest.approx(expected[name])
+    assert actual["uvs"][0] == pytest.approx(expected["uvs"][0], abs=1e-7)
+
+    typeCode, dtype = FBXGeometryExtractor.PRECISION_TYPES[precision]
+    assert (mesh.positions.dtype == numpy.dtype(dtype)) if useNumpy else (mesh.positions.typecode == typeCode)
+
+
+@EXTRACTORS
+@pytest.mark.parametrize("options", [{"lazyArrays": True}, {"arrayOutput": "list"}], ids=["lazy", "list"])
+def testArraysOfAnyParseOutput(options: dict, useNumpy: bool) -> None:
+    layers = LAYER_SETS["mixed"]
+    buffer = writeGeometry(VERTICES, POLYGON_VERTEX_INDEX, layers, compressArrays=True)
+
+    assert plain(extract(buffer, useNumpy, **options)) == referenceMesh(VERTICES, POLYGON_VERTEX_INDEX, layers)
+
+
+def testBuffersAreArraysWithoutNumpy() -> None:
+    mesh = extract(writeGeometry(VERTICES, POLYGON_VERTEX_INDEX, LAYER_SETS["polygon-vertex"]), False)
+
+    assert [buffer.typecode for buffer in (mesh.positions, mesh.indices, mesh.normals, mesh.uvs[0], mesh.controlPointIndices)] == ["f", "I", "f", "f", "I"]
+    assert isinstance(mesh.positions, array)
+
+
+@pytest.mark.skipif(numpy is None, reason="numpy is not installed")
+def testBuffersAreNumpyArraysWithNumpy() -> None:
+    mesh = extract(writeGeometry(VERTICES, POLYGON_VERTEX_INDEX, LAYER_SETS["polygon-vertex"]), True)
+
+    assert [str(buffer.dtype) for buffer in (mesh.positions, mesh.indices, mesh.normals, mesh.uvs[0], mesh.controlPointIndices)] == ["float32", "uint32", "float32", "float32", "uint32"]
+
+
+def testInvalidGeometriesRaise() -> None:
+    extractor = FBXGeometryExtractor(useNumpy=False)
+    for layers in ([("Normal", "", "ByEdge", "Direct", [0.0] * 3, None)], [("UV", "map1", "ByPolygonVertex", "IndexToDirect", [0.0] * 2, None)]):
+        with pytest.raises(ValueError):
+            list(extractor.extractAll(FBXDocumentParser.fromBuffer(writeGeometry(VERTICES, POLYGON_VERTEX_INDEX, layers))))
+
+    generator = SyntheticFBXGenerator()
+    generator.beginNode("Geometry", [("L", 1), ("S", "Empty"), ("S", "Mesh")])
+    generator.endNode()
+    with pytest.raises(ValueError):
+        extractor.extract(FBXDocumentParser.fromBuffer(generator.build()).topLevelDocument.children[0])
+
+
+def testInvalidOptionsRaise() -> None:
+    with pytest.raises(ValueError):
+        FBXGeometryExtractor("float16")
+    if numpy is None:
+        with pytest.raises(ValueError):
+            FBXGeometryExtractor(useNumpy=True)
@@ -0,0 +1,118 @@
+import gc
+import zlib
+from array import array
+from typing import Any
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Parser.FBXArrayCache import FBXArrayCache
+from Infrastructure.Parser.FBXArrayDecoder import numpy
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+
+OUTPUTS = pytest.mark.parametrize("arrayOutput", ["array", "list", pytest.param("numpy", marks=pytest.mark.skipif(numpy is None, reason="numpy is not installed"))])
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+def comparable(value: Any) -> list:
+    return value.tolist() if numpy is not None and isinstance(value, numpy.ndarray) else list(value)
+
+
+def arrayProperties(document) -> list:
+    """Get the (node, position) of every array property, in document order."""
+    found, stack = [], [document.topLevelDocument]
+    while stack:
+        node = stack.pop()
+        found.extend((node, position) for position, typeCode in enumerate(node.propertyTypes) if typeCode in "fdlib")
+        stack.extend(reversed(node.children))
+    return found
+
+
+BUFFERS = pytest.mark.parametrize("buffer", [
+    readExample(),
+    SyntheticFBXGenerator.generateMeshes(3, 500),
+    SyntheticFBXGenerator.generateMeshes(3, 500, compressArrays=False),
+], ids=["example", "compressed", "raw"])
+
+
+@BUFFERS
+@OUTPUTS
+def testLazyValuesEqualEagerDecoding(buffer: bytes, arrayOutput: str) -> None:
+    cache = FBXArrayCache()
+    eager = FBXDocumentParser.fromBuffer(buffer, arrayOutput)
+    lazy = FBXDocumentParser.fromBuffer(buffer, arrayOutput, lazyArrays=True, arrayCache=cache)
+
+    eagerArrays, lazyArrays = arrayProperties(eager), arrayProperties(lazy)
+    assert len(eagerArrays) == len(lazyArrays) > 0
+    # nothing is inflated by the parse
+    assert len(cache) == 0
+
+    for (eagerNode, position), (lazyNode, _) in zip(eagerArrays, lazyArrays):
+        expected, value = eagerNode.properties[position], lazyNode.properties[position]
+        assert isinstance(value, FBXLazyArrayProperty)
+        assert (value.typeCode, len(value), value.arrayLength) == (eagerNode.propertyTypes[position], len(expected), len(expected))
+        assert not value.isCached
+
+        assert comparable(value.value) == comparable(expected)
+        assert comparable(value.decode()) == comparable(expected)
+        assert value.isCached and value.value is value.value
+
+
+@BUFFERS
+def testStoredContentAndInflatedContent(buffer: bytes) -> None:
+    document = FBXDocumentParser.fromBuffer(buffer, lazyArrays=True, arrayCache=FBXArrayCache())
+
+    for node, position in arrayProperties(document):
+        value = node.properties[position]
+        stored = bytes(buffer[value.offset:value.offset + value.compressedLength])
+
+        assert bytes(value.content) == stored
+        assert bytes(value.inflate()) == (zlib.decompress(stored) if value.encoding == 1 else stored)
+        assert len(value.inflate()) == value.decodedLength
+        assert not value.isCached
+
+
+def testEvictedValuesAreDecodedAgain() -> None:
+    content = array("d", range(100)).tobytes()
+    compressed = zlib.compress(content)
+    buffer = memoryview(compressed + content)
+    # room for one decoded array
+    cache = FBXArrayCache(len(content))
+    first = FBXLazyArrayProperty(buffer, 0, 1, "d", 100, len(compressed), cache=cache)
+    second = FBXLazyArrayProperty(buffer, len(compressed), 0, "d", 100, len(content), cache=cache)
+
+    assert list(first.value) == list(second.value) == list(range(100))
+    assert (first.isCached, second.isCached) == (False, True)
+
+    assert list(first.value) == list(range(100))
+    assert (first.isCached, second.isCached) == (True, False)
+
+
+def testCachedValuesDoNotOutliveTheirBuffer() -> None:
+    cache = FBXArrayCache()
+    document = FBXDocumentParser.fromBuffer(SyntheticFBXGenerator.generateMeshes(2, 100), lazyArrays=True, arrayCache=cache)
+    for node, position in arrayProperties(document):
+        node.properties[position].value
+    assert len(cache) == 4
+
+    del document, node
+    gc.collect()
+
+    assert (len(cache), cache.currentBytes) == (0, 0)
+
+
+def testReleaseDropsTheCachedValues() -> None:
+    cache = FBXArrayCache()
+    content = array("i", range(10)).tobytes()
+    value = FBXLazyArrayProperty(bytearray(content), 0, 0, "i", 10, len(content), cache=cache)
+    assert list(value.value) == list(range(10))
+
+    value.release()
+
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        value.inflate()
@@ -0,0 +1,119 @@
+import fnmatch
+from typing import List, Tuple
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Diagnostics.FBXStats import FBXStats
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Parser.FBXNodeSelector import FBXNodeSelector
+
+SKIP, TRAVERSE, SELECT = FBXNodeSelector.SKIP, FBXNodeSelector.TRAVERSE, FBXNodeSelector.SELECT
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+def kept(include: List[str], exclude: List[str], path: Tuple[str, ...]) -> bool:
+    """Reference selection: whether the node at a path is parsed, matching the names one by one with fnmatchcase."""
+    def prefixMatches(pattern: str) -> bool:
+        return all(fnmatch.fnmatchcase(name, segment) for name, segment in zip(path, pattern.strip("/").split("/")))
+
+    if any(len(pattern.strip("/").split("/")) <= len(path) and prefixMatches(pattern) for pattern in exclude):
+        return False
+    return not include or any(prefixMatches(pattern) for pattern in include)
+
+
+def outline(node: FBXDocumentNode) -> List[Tuple]:
+    return [(child.name, child.startOffset, child.endOffset, len(child.properties), outline(child)) for child in node.children]
+
+
+def projectedOutline(node: FBXDocumentNode, include: List[str], exclude: List[str], path: Tuple[str, ...] = ()) -> List[Tuple]:
+    """Get the outline of a full parse, left with the nodes the reference selection keeps."""
+    return [
+        (child.name, child.startOffset, child.endOffset, len(child.properties), projectedOutline(child, include, exclude, path + (child.name,)))
+        for child in node.children if kept(include, exclude, path + (child.name,))
+    ]
+
+
+@pytest.mark.parametrize("include, exclude, decisions", [
+    (["Objects/Geometry"], [], {("Objects",): TRAVERSE, ("Objects", "Geometry"): SELECT, ("Objects", "Geometry", "Vertices"): SELECT, ("Objects", "Model"): SKIP, ("Connections",): SKIP}),
+    (["/Objects/Geometry/"], [], {("Objects",): TRAVERSE, ("Objects", "Geometry"): SELECT}),
+    (["Objects/Geo*/Vert?ces"], [], {("Objects", "Geometry"): TRAVERSE, ("Objects", "Geometry", "Vertices"): SELECT, ("Objects", "Geometry", "Normals"): SKIP, ("Objects", "Model", "Vertices"): SKIP}),
+    (["Objects/[GM]*"], [], {("Objects", "Geometry"): SELECT, ("Objects", "Material"): SELECT, ("Objects", "Texture"): SKIP}),
+    (["*/Model"], [], {("Objects",): TRAVERSE, ("Takes",): TRAVERSE, ("Objects", "Model"): SELECT, ("Objects", "Model", "Properties70"): SELECT, ("Objects", "Geometry"): SKIP}),
+    (["objects"], [], {("Objects",): SKIP}),
+    (["Objects/Model", "Objects"], [], {("Objects",): SELECT, ("Objects", "Geometry"): SELECT}),
+    ([], ["Objects/Geometry"], {("Objects",): SELECT, ("Objects", "Geometry"): SKIP, ("Objects", "Geometry", "Vertices"): SKIP, ("Objects", "Model"): SELECT}),
+    (["Objects"], ["Objects/Geometry/*"], {("Objects", "Geometry"): SELECT, ("Objects", "Geometry", "Vertices"): SKIP, ("Objects", "Model", "Properties70"): SELECT}),
+    (["Objects/Geometry"], ["Objects"], {("Objects",): SKIP, ("Objects", "Geometry"): SKIP}),
+    (["Objects/Geometry"], ["*/*/Vertices"], {("Objects", "Geometry"): SELECT, ("Objects", "Geometry", "Vertices"): SKIP, ("Objects", "Geometry", "Normals"): SELECT}),
+], ids=["include", "slashes", "wildcards", "character-class", "wildcard-segment", "case-sensitive", "several-includes", "exclude", "exclude-below-include", "exclude-above-include", "wildcard-exclude"])
+def testDecisions(include: List[str], exclude: List[str], decisions: dict) -> None:
+    selector = FBXNodeSelector(include, exclude)
+
+    for _ in range(2):
+        # the second round is answered from the decision cache
+        assert {path: selector.match(path) for path in decisions} == decisions
+    for path in decisions:
+        assert (selector.match(path) != SKIP) == kept(include, exclude, path)
+
+
+def testEverythingIsSelectedWithoutPatterns() -> None:
+    selector = FBXNodeSelector()
+
+    assert selector.match(("Objects",)) == selector.match(("Objects", "Geometry", "Vertices")) == SELECT
+
+
+@pytest.mark.parametrize("include, exclude", [
+    (["Objects/Geometry"], []),
+    (["*/Model", "Connections"], []),
+    (["Objects/*/Properties70"], []),
+    ([], ["Objects/Geometry", "Takes"]),
+    (["Objects"], ["*/*/Properties70", "Objects/Model/*"]),
+], ids=["include", "wildcard-segment", "traversed", "exclude", "both"])
+def testParsedDocumentsAreProjections(include: List[str], exclude: List[str]) -> None:
+    buffer = readExample()
+    full = FBXDocumentParser.fromBuffer(buffer).topLevelDocument
+
+    projected = FBXDocumentParser.fromBuffer(buffer, include=include, exclude=exclude).topLevelDocument
+
+    assert outline(projected) == projectedOutline(full, include, exclude)
+    assert outline(projected) != outline(full)
+
+
+def writeWithBrokenNode() -> bytes:
+    """Write a file whose Objects/Broken node holds a property with an unknown type code."""
+    generator = SyntheticFBXGenerator()
+    generator.beginNode("Objects")
+    generator.beginNode("Model", [("L", 1), ("S", "Model")])
+    generator.endNode()
+    generator.beginNode("Broken", [("S", "unreadable")])
+    generator.beginNode("Child", [("I", 1)])
+    generator.endNode()
+    generator.endNode()
+    generator.endNode()
+    generator.beginNode("Connections", [("I", 2)])
+    generator.endNode()
+
+    buffer = bytearray(generator.build())
+    typeCode = buffer.index(b"Broken") + len("Broken")
+    assert buffer[typeCode:typeCode + 1] == b"S"
+    buffer[typeCode] = ord("Z")
+    return bytes(buffer)
+
+
+@pytest.mark.parametrize("include, exclude", [([], ["Objects/Broken"]), (["Objects/Model", "Connections"], []), ([], ["*/B*"])], ids=["exclude", "include", "wildcard"])
+def testSkippedSubtreesAreJumpedOver(include: List[str], exclude: List[str]) -> None:
+    buffer = writeWithBrokenNode()
+    with pytest.raises(ValueError):
+        FBXDocumentParser.fromBuffer(buffer)
+
+    stats = FBXStats()
+    document = FBXDocumentParser.fromBuffer(buffer, include=include, exclude=exclude, stats=stats)
+
+    assert [(node.name, [child.name for child in node.children]) for node in document.topLevelDocument.children] == [("Objects", ["Model"]), ("Connections", [])]
+    # the Broken node is skipped as a whole, its child is never reached
+    assert stats.counters["parse.skippedNodes"] == 1
@@ -0,0 +1,93 @@
+import os
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXOffsetIndex import FBXOffsetIndex
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+def writeScene(path) -> str:
+    path.write_bytes(SyntheticFBXGenerator.generateScene(100))
+    return str(path)
+
+
+@pytest.mark.parametrize("buffer", [readExample(), SyntheticFBXGenerator.generateScene(100)], ids=["example", "scene"])
+def testObjectsAreIndexedByIdAndPath(buffer: bytes) -> None:
+    index = FBXDocumentParser.offsetIndex(buffer)
+    document = FBXDocumentParser.fromBuffer(buffer)
+    objects = [node for section in document.topLevelDocument.children if section.name == "Objects" for node in section.children]
+
+    assert list(index.objectIds) == [node.properties[0] for node in objects]
+    for node in objects:
+        assert index.offsetOf(node.properties[0]) == node.startOffset
+        assert FBXDocumentParser.readNodeAt(buffer, index.offsetOf(node.properties[0])).properties[0] == node.properties[0]
+
+    for path in ("Objects/Model", "Objects/Geometry", "Connections/C", "Objects"):
+        assert index.rows(path) == index.toc.find(path)
+        assert index.offsets(path) == [index.toc.startOffsets[row] for row in index.toc.find(path)]
+    assert index.rowOf(-1) == index.offsetOf(-1) == -1
+    assert index.rows("Objects/Missing") == index.offsets("Objects/Missing") == []
+
+
+def testSavedIndexRoundTrips(tmp_path) -> None:
+    source = writeScene(tmp_path / "scene.fbx")
+    index = FBXDocumentParser.offsetIndexFromFile(source)
+
+    index.save(source + ".idx")
+    loaded = FBXOffsetIndex.load(source + ".idx")
+
+    assert (loaded.versionNumber, list(loaded.objectIds)) == (index.versionNumber, list(index.objectIds))
+    assert list(loaded.toc.entries()) == list(index.toc.entries())
+    assert [loaded.offsetOf(objectId) for objectId in index.objectIds] == [index.offsetOf(objectId) for objectId in index.objectIds]
+    assert loaded.isCurrent(source)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["scene.fbx", "scene.fbx.idx"]
+
+
+def testIndexFromFileMatchesTheBuffer(tmp_path) -> None:
+    source = writeScene(tmp_path / "scene.fbx")
+    with open(source, "rb") as file:
+        expected = FBXDocumentParser.offsetIndex(file.read())
+
+    index = FBXDocumentParser.offsetIndexFromFile(source)
+
+    assert list(index.objectIds) == list(expected.objectIds)
+    assert list(index.toc.entries()) == list(expected.toc.entries())
+
+
+def testModifiedSourcesAreNotCurrent(tmp_path) -> None:
+    source = writeScene(tmp_path / "scene.fbx")
+    index = FBXDocumentParser.offsetIndexFromFile(source)
+    assert index.isCurrent(source)
+
+    # same length, touched
+    status = os.stat(source)
+    os.utime(source, ns=(status.st_atime_ns, status.st_mtime_ns + 1_000_000_000))
+    assert not index.isCurrent(source)
+
+    # an index without a modification time only checks the length
+    with open(source, "rb") as file:
+        untimed = FBXDocumentParser.offsetIndex(file.read())
+    assert untimed.isCurrent(source)
+
+    with open(source, "ab") as file:
+        file.write(b"\x00")
+    assert not untimed.isCurrent(source)
+
+    os.remove(source)
+    assert not untimed.isCurrent(source)
+
+
+def testUnsupportedIndexesRaise() -> None:
+    saved = FBXDocumentParser.offsetIndex(readExample()).toBytes()
+
+    with pytest.raises(ValueError):
+        FBXOffsetIndex.fromBytes(saved[:10])
+    with pytest.raises(ValueError):
+        FBXOffsetIndex.fromBytes(b"FBXTOC\x00" + saved[7:])
+    with pytest.raises(ValueError):
+        FBXOffsetIndex.fromBytes(saved[:-1])
@@ -0,0 +1,266 @@
+import io
+import struct
+from typing import Any, Callable, Dict
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Serializers.FBXCBORSerializer import FBXCBORSerializer
+from Infrastructure.Serializers.FBXMessagePackSerializer import FBXMessagePackSerializer
+
+# struct formats of the little-endian array elements, booleans are one 0/1 byte
+ARRAY_FORMATS = {"f": "f", "d": "d", "l": "q", "i": "i", "b": "?"}
+
+# RFC 8746 typed array tags: uint8, sint32le, sint64le, float32le, float64le
+CBOR_TAGS = {"b": 64, "i": 78, "l": 79, "f": 85, "d": 86}
+
+# content lengths 1, 3, 4, 8, 16, 12, 16, 320 and 80 000 bytes: every fixext size and the ext 8, 16 and 32 heads
+ARRAYS = [
+    ("b", [True]), ("b", [True, False, True]), ("i", [-1]), ("d", [0.5]), ("d", [1.0, 2.0]),
+    ("f", [0.5, 1.5, 2.5]), ("l", [-2**40, 3]), ("d", [float(value) for value in range(40)]), ("i", list(range(20_000))),
+]
+PRIMITIVES = [("Y", -3), ("C", True), ("I", -70_000), ("F", 0.5), ("D", 1.25), ("L", -2**40), ("S", "Cube\x00\x01Model"), ("R", b"\x00\x01\x02")]
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+def writeEveryType(compressArrays: bool) -> bytes:
+    """Write a file holding every primitive type, then every array type in every head size."""
+    generator = SyntheticFBXGenerator(compressArrays=compressArrays)
+    generator.beginNode("Objects")
+    generator.beginNode("Model", [("L", 7)] + PRIMITIVES)
+    for typeCode, values in ARRAYS:
+        generator.beginNode("Array", [(typeCode, values)])
+        generator.endNode()
+    generator.endNode()
+    generator.endNode()
+    return generator.build()
+
+
+BUFFERS = {"example": readExample(), "every-type": writeEveryType(False), "every-type-compressed": writeEveryType(True)}
+OPTIONS = [{}, {"lazyArrays": True}, {"arrayOutput": "list"}]
+
+
+def expectedDocument(buffer: bytes, typedArray: Callable[[str, bytes], Any]) -> Dict[str, Any]:
+    """Get the structure a decoder should read back, arrays as typedArray(type code, little-endian content)."""
+    document = FBXDocumentParser.fromBuffer(buffer, arrayOutput="list")
+
+    def node(current) -> Dict[str, Any]:
+        properties = []
+        for value, typeCode in zip(current.properties, current.propertyTypes):
+            if typeCode in ARRAY_FORMATS:
+                properties.append(typedArray(typeCode, struct.pack(f"<{len(value)}{ARRAY_FORMATS[typeCode]}", *value)))
+            else:
+                properties.append(bytes(value) if typeCode == "R" else value)
+
+        return {
+            "startOffset": current.startOffset, "endOffset": current.endOffset,
+            "propertiesCount": current.propertiesCount, "propertiesLength": current.propertiesLength,
+            "name": current.name, "properties": properties, "children": [node(child) for child in current.children],
+        }
+
+    header = document.header
+    return {"header": {"fileMagic": header.fileMagic, "versionNumber": header.versionNumber, "nullBytes": bytes(header.nullBytes)}, "document": node(document.topLevelDocument)}
+
+
+def serialize(serializer, buffer: bytes, bufferSize: int = 2**16, **options) -> bytes:
+    output = io.BytesIO()
+    serializer.serialize(FBXDocumentParser.fromBuffer(buffer, **options), output, bufferSize)
+    return output.getvalue()
+
+
+class Reader:
+    """Cursor over an encoded buffer."""
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.offset = 0
+
+    def take(self, length: int) -> bytes:
+        chunk = self.data[self.offset:self.offset + length]
+        assert len(chunk) == length, "truncated"
+        self.offset += length
+        return chunk
+
+    def unpack(self, format: str) -> Any:
+        return struct.unpack(">" + format, self.take(struct.calcsize(">" + format)))[0]
+
+
+def decodeMessagePack(data: bytes) -> Any:
+    """Reference MessagePack decoder, straight from the specification, extension values as ("ext", type, data)."""
+    reader = Reader(data)
+
+    def item() -> Any:
+        first = reader.take(1)[0]
+        if first < 0x80 or first >= 0xe0:
+            return first if first < 0x80 else first - 0x100
+        elif first & 0xf0 in (0x80, 0x90):
+            length = first & 0x0f
+        elif first & 0xe0 == 0xa0:
+            return reader.take(first & 0x1f).decode("utf-8")
+        elif first in (0xde, 0xdf, 0xdc, 0xdd):
+            length = reader.unpack("H" if first in (0xde, 0xdc) else "I")
+        elif 0xd9 <= first <= 0xdb:
+            return reader.take(reader.unpack("BHI"[first - 0xd9])).decode("utf-8")
+        elif 0xc4 <= first <= 0xc6:
+            return reader.take(reader.unpack("BHI"[first - 0xc4]))
+        elif 0xc7 <= first <= 0xc9:
+            length = reader.unpack("BHI"[first - 0xc7])
+            return ("ext", chr(reader.take(1)[0]), reader.take(length))
+        elif 0xd4 <= first <= 0xd8:
+            return ("ext", chr(reader.take(1)[0]), reader.take(1 << (first - 0xd4)))
+        elif 0xcc <= first <= 0xd3:
+            return reader.unpack("BHIQbhiq"[first - 0xcc])
+        elif first in (0xca, 0xcb):
+            return reader.unpack("f" if first == 0xca else "d")
+        else:
+            return {0xc0: None, 0xc2: False, 0xc3: True}[first]
+
+        if first & 0xf0 == 0x80 or first in (0xde, 0xdf):
+            return {item(): item() for _ in range(length)}
+        return [item() for _ in range(length)]
+
+    value = item()
+    assert reader.offset == len(data), "trailing bytes"
+    return value
+
+
+def decodeCBOR(data: bytes) -> Any:
+    """Reference CBOR decoder, straight from RFC 8949, tagged items as ("tag", tag, item)."""
+    reader = Reader(data)
+
+    def item() -> Any:
+        first = reader.take(1)[0]
+        major, info = first >> 5, first & 0x1f
+        if major == 7:
+            if first in (0xfa, 0xfb):
+                return reader.unpack("f" if first == 0xfa else "d")
+            return {0xf4: False, 0xf5: True, 0xf6: None}[first]
+
+        argument = info if info < 24 else reader.unpack({24: "B", 25: "H", 26: "I", 27: "Q"}[info])
+        if major == 0:
+            return argument
+        elif major == 1:
+            return -1 - argument
+        elif major == 2:
+            return reader.take(argument)
+        elif major == 3:
+            return reader.take(argument).decode("utf-8")
+        elif major == 4:
+            return [item() for _ in range(argument)]
+        elif major == 5:
+            return {item(): item() for _ in range(argument)}
+        return ("tag", argument, item())
+
+    value = item()
+    assert reader.offset == len(data), "trailing bytes"
+    return value
+
+
+def cborTags(value: Any) -> Any:
+    """Get a value decoded by cbor2 in the form of decodeCBOR."""
+    import cbor2
+    if isinstance(value, cbor2.CBORTag):
+        return ("tag", value.tag, cborTags(value.value))
+    elif isinstance(value, dict):
+        return {key: cborTags(item) for key, item in value.items()}
+    elif isinstance(value, list):
+        return [cborTags(item) for item in value]
+    return value
+
+
+def messagePackLibrary(data: bytes) -> Any:
+    msgpack = pytest.importorskip("msgpack")
+    return msgpack.unpackb(data, raw=False, strict_map_key=False, ext_hook=lambda code, content: ("ext", chr(code), content))
+
+
+def cborLibrary(data: bytes) -> Any:
+    cbor2 = pytest.importorskip("cbor2")
+    return cborTags(cbor2.loads(data))
+
+
+MESSAGE_PACK_DECODERS = pytest.mark.parametrize("decode", [decodeMessagePack, messagePackLibrary], ids=["reference", "msgpack"])
+CBOR_DECODERS = pytest.mark.parametrize("decode", [decodeCBOR, cborLibrary], ids=["reference", "cbor2"])
+DOCUMENTS = pytest.mark.parametrize("buffer", BUFFERS.values(), ids=BUFFERS.keys())
+PARSE_OPTIONS = pytest.mark.parametrize("options", OPTIONS, ids=["array", "lazy", "list"])
+
+
+@MESSAGE_PACK_DECODERS
+@PARSE_OPTIONS
+@DOCUMENTS
+def testMessagePackDecodesToTheDocument(buffer: bytes, options: dict, decode) -> None:
+    data = serialize(FBXMessagePackSerializer, buffer, **options)
+
+    assert decode(data) == expectedDocument(buffer, lambda typeCode, content: ("ext", typeCode, content))
+
+
+@CBOR_DECODERS
+@PARSE_OPTIONS
+@DOCUMENTS
+def testCBORDecodesToTheDocument(buffer: bytes, options: dict, decode) -> None:
+    data = serialize(FBXCBORSerializer, buffer, **options)
+
+    # self-described CBOR
+    assert data[:3] == b"\xd9\xd9\xf7"
+    assert decode(data[3:]) == expectedDocument(buffer, lambda typeCode, content: ("tag", CBOR_TAGS[typeCode], content))
+
+
+@pytest.mark.parametrize("serializer", [FBXMessagePackSerializer, FBXCBORSerializer], ids=["msgpack", "cbor"])
+@pytest.mark.parametrize("bufferSize", [1, 7, 4_096])
+def testBufferSizeDoesNotChangeTheOutput(serializer, bufferSize: int) -> None:
+    buffer = BUFFERS["every-type"]
+
+    assert serialize(serializer, buffer, bufferSize) == serialize(serializer, buffer)
+
+
+@pytest.mark.parametrize("typeCode, length, head", [
+    ("b", 1, "d4 62"), ("b", 2, "d5 62"), ("i", 4, "d6 69"), ("d", 8, "d7 64"), ("d", 16, "d8 64"),
+    ("b", 3, "c7 03 62"), ("f", 12, "c7 0c 66"), ("d", 255, "c7 ff 64"), ("d", 256, "c8 01 00 64"), ("l", 65_535, "c8 ff ff 6c"), ("i", 65_536, "c9 00 01 00 00 69"),
+])
+def testMessagePackTypedArrayHeads(typeCode: str, length: int, head: str) -> None:
+    assert FBXMessagePackSerializer(io.BytesIO()).packTypedArrayHead(typeCode, length) == bytes.fromhex(head)
+
+
+@pytest.mark.parametrize("value, encoded", [
+    (0, "00"), (127, "7f"), (128, "cc 80"), (256, "cd 01 00"), (2**16, "ce 00 01 00 00"), (2**32, "cf 00 00 00 01 00 00 00 00"),
+    (-1, "ff"), (-32, "e0"), (-33, "d0 df"), (-129, "d1 ff 7f"), (-2**15 - 1, "d2 ff ff 7f ff"), (-2**31 - 1, "d3 ff ff ff ff 7f ff ff ff"),
+])
+def testMessagePackIntegers(value: int, encoded: str) -> None:
+    assert FBXMessagePackSerializer(io.BytesIO()).packInt(value) == bytes.fromhex(encoded)
+
+
+def testMessagePackSizedHeads() -> None:
+    serializer = FBXMessagePackSerializer(io.BytesIO())
+
+    assert [serializer.packString("a" * length)[:3] for length in (31, 32, 256)] == [b"\xbfaa", b"\xd9\x20a", b"\xda\x01\x00"]
+    assert [serializer.packBytesHead(length) for length in (0, 256, 65_536)] == [b"\xc4\x00", b"\xc5\x01\x00", b"\xc6\x00\x01\x00\x00"]
+    assert [serializer.packMap(length) for length in (15, 16, 65_536)] == [b"\x8f", b"\xde\x00\x10", b"\xdf\x00\x01\x00\x00"]
+    assert [serializer.packArray(length) for length in (0, 16)] == [b"\x90", b"\xdc\x00\x10"]
+    assert (serializer.packFloat(0.5), serializer.packBool(True), serializer.packNull()) == (bytes.fromhex("cb 3f e0 00 00 00 00 00 00"), b"\xc3", b"\xc0")
+
+
+@pytest.mark.parametrize("typeCode, length, head", [
+    ("b", 3, "d8 40 43"), ("i", 24, "d8 4e 58 18"), ("l", 256, "d8 4f 59 01 00"), ("f", 12, "d8 55 4c"), ("d", 65_536, "d8 56 5a 00 01 00 00"),
+])
+def testCBORTypedArrayHeads(typeCode: str, length: int, head: str) -> None:
+    assert FBXCBORSerializer(io.BytesIO()).packTypedArrayHead(typeCode, length) == bytes.fromhex(head)
+
+
+@pytest.mark.parametrize("value, encoded", [
+    (0, "00"), (23, "17"), (24, "18 18"), (255, "18 ff"), (256, "19 01 00"), (2**16, "1a 00 01 00 00"), (2**32, "1b 00 00 00 01 00 00 00 00"),
+    (-1, "20"), (-24, "37"), (-25, "38 18"), (-2**40, "3b 00 00 00 ff ff ff ff ff"),
+])
+def testCBORIntegers(value: int, encoded: str) -> None:
+    assert FBXCBORSerializer(io.BytesIO()).packInt(value) == bytes.fromhex(encoded)
+
+
+def testCBORSizedHeads() -> None:
+    serializer = FBXCBORSerializer(io.BytesIO())
+
+    assert [serializer.packString("a" * length)[:3] for length in (23, 24, 256)] == [b"\x77aa", b"\x78\x18a", b"\x79\x01\x00"]
+    assert [serializer.packMap(length) for length in (7, 24)] == [b"\xa7", b"\xb8\x18"]
+    assert [serializer.packArray(length) for length in (0, 65_536)] == [b"\x80", b"\x9a\x00\x01\x00\x00"]
+    assert (serializer.packFloat(0.5), serializer.packBool(False), serializer.packNull()) == (bytes.fromhex("fb 3f e0 00 00 00 00 00 00"), b"\xf4", b"\xf6")
@@ -0,0 +1,82 @@
+import hashlib
+import os
+from typing import Any, List
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Cache.FBXParseCache import FBXParseCache
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Parser.FBXLazyArrayProperty import FBXLazyArrayProperty
+from Infrastructure.Serializers.FBXDocumentSerializer import FBXDocumentSerializer
+
+OPTIONS = [{}, {"nodeStorage": "table"}, {"arrayOutput": "list"}, {"lazyArrays": True}, {"exclude": ["Objects/Geometry/*"]}]
+
+
+def valueTypes(node: FBXDocumentNode) -> List[Any]:
+    """Get the types of the property values of the children of a node, with the encoding of lazy arrays."""
+    return [([(type(value), value.encoding if isinstance(value, FBXLazyArrayProperty) else None) for value in child.properties], valueTypes(child)) for child in node.children]
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def testCachedDocumentsMatchAParse(options: dict, tmp_path) -> None:
+    cache = FBXParseCache(str(tmp_path))
+    expected = FBXDocumentSerializer.serialize(FBXDocumentParser.fromFile(EXAMPLE_PATH, **options))
+
+    assert FBXDocumentSerializer.serialize(cache.load(EXAMPLE_PATH, **options)) == expected
+    assert os.path.exists(os.path.join(str(tmp_path), cache.key(EXAMPLE_PATH, **options) + FBXParseCache.EXTENSION))
+    assert FBXDocumentSerializer.serialize(cache.load(EXAMPLE_PATH, **options)) == expected
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+@pytest.mark.parametrize("compressArrays", [True, False], ids=["compressed", "raw"])
+def testCachedValuesHaveTheTypesOfAParse(options: dict, compressArrays: bool, tmp_path) -> None:
+    path = tmp_path / "meshes.fbx"
+    path.write_bytes(SyntheticFBXGenerator.generateMeshes(2, 200, compressArrays=compressArrays))
+    cache = FBXParseCache(str(tmp_path / "cache"))
+    expected = valueTypes(FBXDocumentParser.fromFile(str(path), **options).topLevelDocument)
+
+    assert valueTypes(cache.load(str(path), **options).topLevelDocument) == expected
+    assert valueTypes(cache.load(str(path), **options).topLevelDocument) == expected
+
+
+def testUnchangedFilesAreNotHashedAgain(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "example.fbx"
+    with open(EXAMPLE_PATH, "rb") as file:
+        path.write_bytes(file.read())
+    cache = FBXParseCache(str(tmp_path / "cache"))
+
+    hashed = []
+    fileDigest = hashlib.file_digest
+    monkeypatch.setattr(hashlib, "file_digest", lambda *arguments: hashed.append(arguments) or fileDigest(*arguments))
+
+    key = cache.key(str(path))
+    assert cache.key(str(path)) == key and cache.key(str(path), nodeStorage="table") != key
+    assert len(hashed) == 1
+
+    # a changed modification time or size rehashes
+    os.utime(str(path), ns=(1, 1))
+    touched = cache.key(str(path))
+    assert touched != key and cache.key(str(path)) == touched
+    assert len(hashed) == 2
+
+    path.write_bytes(path.read_bytes() + b"\x00")
+    os.utime(str(path), ns=(1, 1))
+    assert cache.key(str(path)) not in (key, touched)
+    assert len(hashed) == 3
+
+
+def testCorruptEntriesAreDropped(tmp_path) -> None:
+    cache = FBXParseCache(str(tmp_path))
+    cache.load(EXAMPLE_PATH)
+    key = cache.key(EXAMPLE_PATH)
+    entryPath = os.path.join(str(tmp_path), key + FBXParseCache.EXTENSION)
+    with open(entryPath, "rb") as file:
+        content = file.read()
+
+    for corrupt in (b"not an entry", content[:len(content) // 2]):
+        with open(entryPath, "wb") as file:
+            file.write(corrupt)
+
+        assert cache.get(key) is None
+        assert not os.path.exists(entryPath)
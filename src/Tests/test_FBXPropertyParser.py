@@ -0,0 +1,126 @@
+import random
+import struct
+from typing import Any, List, Tuple
+import pytest
+from Infrastructure.Diagnostics.FBXStats import FBXStats
+from Infrastructure.Parser import FBXPropertyParser as PropertyParserModule
+from Infrastructure.Parser.FBXPropertyParser import ARRAY_HEADER, LENGTH_PREFIX, PRIMITIVE_LAYOUTS, FBXPropertyParser
+
+PRIMITIVE_VALUES = {"Y": -12, "C": True, "I": -70_000, "F": 0.5, "D": 1.25, "L": -2**40, "B": 60_000}
+
+
+def encodeProperties(properties: List[Tuple[str, Any]]) -> bytes:
+    """Encode a property list: a type code byte followed by the value, arrays uncompressed."""
+    parts = []
+    for typeCode, value in properties:
+        parts.append(typeCode.encode())
+        if ord(typeCode) in PRIMITIVE_LAYOUTS:
+            parts.append(PRIMITIVE_LAYOUTS[ord(typeCode)].pack(value))
+        elif typeCode in ("S", "R"):
+            parts.append(LENGTH_PREFIX.pack(len(value)) + value)
+        else:
+            content = struct.pack(f"<{len(value)}d", *value)
+            parts.append(ARRAY_HEADER.pack(len(value), 0, len(content)) + content)
+    return b"".join(parts)
+
+
+def readOneByOne(parser: FBXPropertyParser, offset: int, count: int) -> Tuple[list, str, int]:
+    """Reference reader: every property through readByTypeCode."""
+    properties, typeCodes = [], ""
+    for _ in range(count):
+        typeCode = chr(parser.targetBuffer[offset])
+        result = parser.readByTypeCode(offset + 1, typeCode)
+        properties.append(result.value)
+        typeCodes += typeCode
+        offset = result.endOffset
+    return properties, typeCodes, offset
+
+
+def normalize(value: Any) -> Any:
+    """Get a comparable form of a property value: bytes for raw properties, a list for arrays."""
+    if isinstance(value, memoryview) and value.format == "B":
+        return bytes(value)
+    elif isinstance(value, (str, bool, int, float)):
+        return value
+
+    return list(value)
+
+
+def comparable(result: Tuple[list, str, int]) -> Tuple[list, str, int]:
+    properties, typeCodes, offset = result
+    return [normalize(value) for value in properties], typeCodes, offset
+
+
+def randomProperties(generator: random.Random, count: int) -> List[Tuple[str, Any]]:
+    """Mostly primitives, so runs of any length and mix form, broken up by strings, raw bytes and arrays."""
+    properties = []
+    for _ in range(count):
+        typeCode = generator.choice("YCIFDLB" * 3 + "SRd")
+        if typeCode == "S":
+            properties.append(("S", b"name" * generator.randrange(3)))
+        elif typeCode == "R":
+            properties.append(("R", bytes(generator.randrange(5))))
+        elif typeCode == "d":
+            properties.append(("d", [float(index) for index in range(generator.randrange(4))]))
+        else:
+            properties.append((typeCode, PRIMITIVE_VALUES[typeCode]))
+    return properties
+
+
+@pytest.mark.parametrize("typeCodes", [
+    "D", "DDD", "SSDDD", "DDDSS", "SDS", "ILFD", "YCIFDLB", "SYCIFDLBS", "dDd", "RDDDR", "SSSS",
+])
+def testFusedRunsMatchPropertyByProperty(typeCodes: str) -> None:
+    properties = [(typeCode, {"S": b"P", "R": b"\x01\x02", "d": [1.0, 2.0]}.get(typeCode, PRIMITIVE_VALUES.get(typeCode))) for typeCode in typeCodes]
+    parser = FBXPropertyParser(b"\x00" * 3 + encodeProperties(properties))
+
+    assert comparable(parser.readProperties(3, len(properties))) == comparable(readOneByOne(parser, 3, len(properties)))
+
+
+@pytest.mark.parametrize("stats", [None, FBXStats()], ids=["plain", "timed"])
+def testRandomPropertyListsMatchPropertyByProperty(stats: FBXStats) -> None:
+    generator = random.Random(7)
+    for _ in range(300):
+        properties = randomProperties(generator, generator.randrange(1, 24))
+        parser = FBXPropertyParser(encodeProperties(properties), stats=stats)
+        expected = comparable(readOneByOne(FBXPropertyParser(parser.targetBuffer), 0, len(properties)))
+
+        assert comparable(parser.readProperties(0, len(properties))) == expected
+        assert expected[1] == "".join(typeCode for typeCode, _ in properties)
+
+
+def testRunsPastTheLayoutCacheLimit(monkeypatch) -> None:
+    # once the cache is full, the layouts of new runs are compiled for every run instead of kept
+    monkeypatch.setattr(PropertyParserModule, "PRIMITIVE_RUNS", {})
+    monkeypatch.setattr(PropertyParserModule, "PRIMITIVE_RUNS_LIMIT", 2)
+
+    generator = random.Random(11)
+    for _ in range(100):
+        properties = randomProperties(generator, generator.randrange(1, 16))
+        parser = FBXPropertyParser(encodeProperties(properties))
+
+        assert comparable(parser.readProperties(0, len(properties))) == comparable(readOneByOne(parser, 0, len(properties)))
+
+    assert len(PropertyParserModule.PRIMITIVE_RUNS) == 2
+
+
+def testStatsTimeRunsAndTypeCodes() -> None:
+    stats = FBXStats()
+    parser = FBXPropertyParser(encodeProperties([("S", b"P"), ("D", 1.0), ("D", 2.0), ("D", 3.0), ("S", b"x"), ("I", 4)]), stats=stats)
+
+    properties, typeCodes, _ = parser.readProperties(0, 6)
+
+    assert (properties, typeCodes) == (["P", 1.0, 2.0, 3.0, "x", 4], "SDDDSI")
+    assert stats.timers["parse.property.S"][1] == 2
+    assert stats.timers["parse.property.run"][1] == 1
+    assert stats.timers["parse.property.I"][1] == 1
+    assert stats.counters["parse.property.runValues"] == 3
+
+
+def testUnknownTypeCodesRaise() -> None:
+    parser = FBXPropertyParser(encodeProperties([("D", 1.0)]) + b"Z\x00\x00")
+
+    with pytest.raises(ValueError):
+        parser.readProperties(0, 2)
+    with pytest.raises(ValueError):
+        parser.readByTypeCode(0, "Z")
@@ -0,0 +1,138 @@
+from typing import Dict, List, Tuple
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocument import FBXDocument
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+
+class BruteForceGraph:
+    """Reference graph: the objects by ID and the "C" records as a plain edge list, scanned on every query."""
+
+    def __init__(self, document: FBXDocument) -> None:
+        self.objects: Dict[int, FBXDocumentNode] = {}
+        self.edges: List[Tuple[int, int, str, str]] = []
+        for section in document.topLevelDocument.children:
+            if section.name == "Objects":
+                for node in section.children:
+                    self.objects.setdefault(node.properties[0], node)
+
+        for section in document.topLevelDocument.children:
+            if section.name == "Connections":
+                for connection in section.children:
+                    kind, childId, parentId = connection.properties[:3]
+                    self.edges.append((childId, parentId, kind, connection.properties[3] if len(connection.properties) > 3 else None))
+
+    def ids(self) -> List[int]:
+        return sorted(set(self.objects) | {edge[0] for edge in self.edges} | {edge[1] for edge in self.edges})
+
+    @staticmethod
+    def matches(node: FBXDocumentNode, name: str, subclass: str) -> bool:
+        return node is not None and name in (None, node.name) and subclass in (None, node.properties[2])
+
+    def neighbours(self, objectId: int, up: bool) -> List[Tuple[int, str]]:
+        """Get the (ID, property name) of the parents (up) or children of an object, in connection order."""
+        if up:
+            return [(parentId, name) for childId, parentId, _, name in self.edges if childId == objectId]
+        return [(childId, name) for childId, parentId, _, name in self.edges if parentId == objectId]
+
+    def linked(self, objectId: int, up: bool, name: str = None, subclass: str = None, property: str = None) -> List[FBXDocumentNode]:
+        return [self.objects.get(target) for target, connected in self.neighbours(objectId, up) if self.matches(self.objects.get(target), name, subclass) and property in (None, connected)]
+
+    def reachable(self, objectId: int, up: bool, name: str = None, subclass: str = None, through: str = None) -> List[FBXDocumentNode]:
+        """Breadth first, nearest first, every object once."""
+        if objectId not in self.ids():
+            return []
+
+        found, visited, queue = [], {objectId}, [objectId]
+        for current in queue:
+            for target, _ in self.neighbours(current, up):
+                if target in visited:
+                    continue
+
+                visited.add(target)
+                node = self.objects.get(target)
+                if self.matches(node, name, subclass):
+                    found.append(node)
+                if through is None or (node is not None and node.name == through):
+                    queue.append(target)
+        return found
+
+    def deformers(self, objectId: int) -> List[FBXDocumentNode]:
+        node = self.objects.get(objectId)
+        geometries = self.linked(objectId, False, "Geometry") if node is not None and node.name == "Model" else [node]
+        return [deformer for geometry in geometries if geometry is not None for deformer in self.reachable(geometry.properties[0], False, "Deformer", None, "Deformer")]
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+DOCUMENTS = pytest.mark.parametrize("buffer", [readExample(), SyntheticFBXGenerator.generateScene(200), SyntheticFBXGenerator.generateScene(300, fanout=2)], ids=["example", "scene", "deep-scene"])
+
+
+@DOCUMENTS
+def testObjectsAndConnectionsAreIndexed(buffer: bytes) -> None:
+    document = FBXDocumentParser.fromBuffer(buffer)
+    graph, reference = document.sceneGraph, BruteForceGraph(document)
+
+    assert sorted(graph.objectIds) == reference.ids()
+    assert graph.connectionCount == len(reference.edges)
+    for objectId in reference.ids():
+        assert graph.objectIds[graph.indexOf(objectId)] == objectId
+        assert graph.node(objectId) is reference.objects.get(objectId)
+        assert graph.connections(objectId) == [(childId, kind, name) for childId, parentId, kind, name in reference.edges if parentId == objectId]
+
+
+@DOCUMENTS
+def testChildrenAndParentsMatchTheConnections(buffer: bytes) -> None:
+    document = FBXDocumentParser.fromBuffer(buffer)
+    graph, reference = document.sceneGraph, BruteForceGraph(document)
+
+    for objectId in reference.ids():
+        assert graph.children(objectId) == reference.linked(objectId, False)
+        assert graph.parents(objectId) == reference.linked(objectId, True)
+        for name, subclass in (("Geometry", None), ("Model", "Mesh"), ("Deformer", "Cluster"), (None, "Light")):
+            assert graph.children(objectId, name, subclass) == reference.linked(objectId, False, name, subclass)
+            assert graph.parents(objectId, name, subclass) == reference.linked(objectId, True, name, subclass)
+        assert graph.children(objectId, property="DiffuseColor") == reference.linked(objectId, False, property="DiffuseColor")
+
+
+@DOCUMENTS
+def testDescendantsAndAncestorsMatchABreadthFirstWalk(buffer: bytes) -> None:
+    document = FBXDocumentParser.fromBuffer(buffer)
+    graph, reference = document.sceneGraph, BruteForceGraph(document)
+
+    for objectId in reference.ids():
+        assert graph.descendants(objectId) == reference.reachable(objectId, False)
+        assert graph.ancestors(objectId) == reference.reachable(objectId, True)
+        assert graph.descendants(objectId, "Geometry", "Mesh") == reference.reachable(objectId, False, "Geometry", "Mesh")
+        assert graph.ancestors(objectId, "Model") == reference.reachable(objectId, True, "Model")
+
+
+@DOCUMENTS
+def testDeformersOfModelsAndGeometries(buffer: bytes) -> None:
+    document = FBXDocumentParser.fromBuffer(buffer)
+    graph, reference = document.sceneGraph, BruteForceGraph(document)
+
+    for objectId, node in reference.objects.items():
+        if node.name in ("Model", "Geometry"):
+            assert graph.deformers(objectId) == reference.deformers(objectId)
+
+
+def testSkinnedMeshesFindTheirClusters() -> None:
+    document = FBXDocumentParser.fromBuffer(SyntheticFBXGenerator.generateScene(200))
+    graph = document.sceneGraph
+
+    # every other Model is skinned: a Skin and its two Clusters, not the bones bound to them
+    assert [(node.name, node.properties[2]) for node in graph.deformers(1_000_001)] == [("Deformer", "Skin"), ("Deformer", "Cluster"), ("Deformer", "Cluster")]
+    assert graph.deformers(1_000_000) == []
+
+
+def testUnknownObjects() -> None:
+    graph = FBXDocumentParser.fromBuffer(readExample()).sceneGraph
+
+    assert graph.indexOf(-1) == -1 and graph.node(-1) is None
+    assert graph.children(-1) == graph.parents(-1) == graph.descendants(-1) == graph.ancestors(-1) == graph.deformers(-1) == []
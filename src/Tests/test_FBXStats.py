@@ -0,0 +1,163 @@
+import json
+import zlib
+from typing import List
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from main import FBXConverter
+from Infrastructure.Diagnostics.FBXStats import FBXStats
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Serializers.FBXDocumentSerializer import FBXDocumentSerializer
+
+# struct sizes of the array elements
+ITEM_SIZES = {"f": 4, "d": 8, "l": 8, "i": 4, "b": 1}
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+def nodes(root: FBXDocumentNode) -> List[FBXDocumentNode]:
+    """Get the nodes below a node, the node itself excluded."""
+    found, stack = [], list(root.children)
+    while stack:
+        node = stack.pop()
+        found.append(node)
+        stack.extend(node.children)
+    return found
+
+
+def writeArrays() -> bytes:
+    """Write a file with arrays of every type code, of different lengths, next to a few primitives."""
+    generator = SyntheticFBXGenerator(compressArrays=True)
+    for length, typeCode in zip((300, 10, 2_000, 50, 700), ITEM_SIZES):
+        generator.beginNode("Array", [(typeCode, [index % 2 for index in range(length)]), ("I", length), ("S", typeCode)])
+        generator.endNode()
+    return generator.build()
+
+
+def testParseCounters() -> None:
+    buffer = writeArrays()
+    stats = FBXStats()
+
+    document = FBXDocumentParser.fromBuffer(buffer, stats=stats)
+
+    decodedBytes = sum(len(node.properties[0]) * ITEM_SIZES[node.propertyTypes[0]] for node in nodes(document.topLevelDocument))
+    assert stats.counters["parse.files"] == 1
+    assert stats.counters["parse.bytes"] == len(buffer)
+    assert stats.counters["parse.nodes"] == 5
+    assert stats.counters["parse.arrays"] == 5
+    assert stats.counters["parse.inflatedBytes"] == decodedBytes
+    assert stats.counters["parse.compressedBytes"] < decodedBytes
+
+
+def testTimersPerPhaseAndTypeCode() -> None:
+    stats = FBXStats()
+
+    FBXDocumentParser.fromBuffer(writeArrays(), stats=stats)
+
+    timers = stats.timers
+    assert {"parse.header", "parse.nodes", "parse.inflate", "parse.decode"} <= timers.keys()
+    assert (timers["parse.header"][1], timers["parse.nodes"][1], timers["parse.inflate"][1], timers["parse.decode"][1]) == (1, 1, 5, 5)
+    # every array property is timed by its type code
+    assert all(timers["parse.property." + typeCode][1] == 1 for typeCode in ITEM_SIZES)
+    assert all(seconds >= 0 for seconds, _ in timers.values())
+
+
+def testLargestArraysAreKept() -> None:
+    buffer = writeArrays()
+    stats = FBXStats(largestArrays=3)
+
+    FBXDocumentParser.fromBuffer(buffer, stats=stats)
+
+    assert [(decodedBytes, typeCode, arrayLength) for decodedBytes, typeCode, arrayLength, _, _ in stats.largestArrays] == [(2_000 * 8, "l", 2_000), (300 * 4, "f", 300), (700, "b", 700)]
+    for decodedBytes, typeCode, arrayLength, storedBytes, offset in stats.largestArrays:
+        assert len(zlib.decompress(buffer[offset:offset + storedBytes])) == decodedBytes
+
+
+def testSerializationIsTimed() -> None:
+    stats = FBXStats()
+
+    output = FBXDocumentSerializer.serialize(FBXDocumentParser.fromBuffer(readExample()), stats)
+
+    assert stats.timers["serialize.json"][1] == 1
+    assert stats.counters["serialize.characters"] == len(output)
+
+
+def testMergeAndDictRoundTrip() -> None:
+    first, second = FBXStats(largestArrays=2), FBXStats(largestArrays=2)
+    first.count("parse.nodes", 3)
+    first.time("parse.header", 0.5)
+    first.recordArray("d", 10, 20, 80, 100)
+    second.count("parse.nodes", 4)
+    second.time("parse.header", 0.25, 2)
+    second.recordArray("i", 40, 30, 160, 200)
+    second.recordArray("f", 5, 20, 20, 300)
+
+    merged = FBXStats(largestArrays=2)
+    merged.merge(json.loads(json.dumps(first.toDict())))
+    merged.merge(json.loads(json.dumps(second.toDict())))
+
+    assert merged.counters == {"parse.nodes": 7}
+    assert merged.timers == {"parse.header": (0.75, 3)}
+    assert merged.largestArrays == [(160, "i", 40, 30, 200), (80, "d", 10, 20, 100)]
+
+
+def testReport() -> None:
+    stats = FBXStats()
+    stats.count("parse.nodes", 12)
+    stats.time("parse.nodes", 0.002, 4)
+    stats.time("parse.header", 0.001)
+    stats.recordArray("d", 10, 20, 80, 100)
+
+    report = stats.report().splitlines()
+
+    assert report[0] == "timers:" and "parse.nodes" in report[1] and "parse.header" in report[2]
+    assert "4 calls" in report[1] and "2.00 ms" in report[1]
+    assert report[3] == "counters:" and report[4].split() == ["parse.nodes", "12"]
+    assert report[5] == "largest arrays:" and report[6].split()[:3] == ["'d'", "x", "10"]
+
+
+@pytest.mark.parametrize("options", [{}, {"lazyArrays": True}, {"inflateThreads": 2}, {"exclude": ["Objects/Geometry"]}], ids=["default", "lazy", "threads", "selected"])
+def testStatsDoNotChangeTheDocument(options: dict) -> None:
+    buffer = readExample()
+
+    expected = FBXDocumentSerializer.serialize(FBXDocumentParser.fromBuffer(buffer, **options))
+
+    assert FBXDocumentSerializer.serialize(FBXDocumentParser.fromBuffer(buffer, stats=FBXStats(), **options)) == expected
+
+
+def testNothingIsCollectedWithoutStats(monkeypatch) -> None:
+    def fail(*args, **kwargs) -> None:
+        raise AssertionError("stats collected")
+
+    for method in ("count", "time", "timer", "recordArray"):
+        monkeypatch.setattr(FBXStats, method, fail)
+
+    document = FBXDocumentParser.fromBuffer(writeArrays())
+    FBXDocumentSerializer.serialize(document)
+
+    assert len(document.topLevelDocument.children) == 5
+
+
+def testTheCommandLinePrintsTheStats(tmp_path, capsys) -> None:
+    FBXConverter.main(EXAMPLE_PATH, str(tmp_path / "example.json"), "--stats")
+
+    output = capsys.readouterr().out
+    assert "timers:" in output and "counters:" in output and "largest arrays:" in output
+    assert "parse.nodes" in output and "serialize.json" in output
+
+
+def testTheCommandLineWritesTheStats(tmp_path) -> None:
+    target = tmp_path / "stats.json"
+
+    FBXConverter.main(EXAMPLE_PATH, str(tmp_path / "example.json"), f"--stats={target}")
+
+    stats = json.loads(target.read_text())
+    assert stats["counters"]["parse.files"] == 1
+    assert stats["counters"]["parse.bytes"] == len(readExample())
+    assert stats["counters"]["serialize.bytes"] == (tmp_path / "example.json").stat().st_size
+    assert stats["timers"]["serialize.json"]["calls"] == 1
+    assert stats["largestArrays"] and stats["largestArrays"] == sorted(stats["largestArrays"], key=lambda entry: entry["decodedBytes"], reverse=True)
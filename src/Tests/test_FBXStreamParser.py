@@ -0,0 +1,119 @@
+import io
+from typing import Any, Iterable, List, Tuple
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Parser.FBXStreamParser import FBXStreamEvent, FBXStreamParser
+
+
+def normalize(value: Any) -> Any:
+    """Get a comparable form of a property value: bytes for raw properties, a list for arrays."""
+    if isinstance(value, (bytes, bytearray)) or (isinstance(value, memoryview) and value.format == "B"):
+        return bytes(value)
+    elif isinstance(value, (str, bool, int, float)):
+        return value
+
+    return list(value)
+
+
+def expectedEvents(node: FBXDocumentNode, depth: int = 1) -> List[Tuple]:
+    """Get the events a stream parse should emit for the children of a parsed node, in file order."""
+    events = []
+    for child in node.children:
+        events.append((FBXStreamParser.START, child.name, [normalize(value) for value in child.properties], child.propertyTypes, depth, child.startOffset, child.endOffset))
+        events.extend(expectedEvents(child, depth + 1))
+        events.append((FBXStreamParser.END, child.name, [], "", depth, child.startOffset, child.endOffset))
+    return events
+
+
+def comparable(events: Iterable[FBXStreamEvent]) -> List[Tuple]:
+    """Get the stream events in the form of expectedEvents."""
+    return [event._replace(properties=[normalize(value) for value in event.properties]) for event in events]
+
+
+def chunked(buffer: bytes, size: int) -> List[bytes]:
+    return [buffer[offset:offset + size] for offset in range(0, len(buffer), size)]
+
+
+def feedAll(parser: FBXStreamParser, chunks: Iterable[bytes]) -> List[FBXStreamEvent]:
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    parser.close()
+    return events
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("buffer", [
+    readExample(),
+    SyntheticFBXGenerator.generate(500, depth=8),
+    SyntheticFBXGenerator.generateMeshes(2, 200, compressArrays=True),
+    SyntheticFBXGenerator.generateProfile(SyntheticFBXGenerator.PROFILES["mixed-7500"]._replace(nodeCount=200)),
+], ids=["example", "chains", "meshes", "mixed-7500"])
+@pytest.mark.parametrize("chunkSize", [1, 7, 4096])
+def testFedEventsMatchAFullParse(buffer: bytes, chunkSize: int) -> None:
+    parser = FBXStreamParser()
+    events = feedAll(parser, chunked(buffer, chunkSize))
+
+    assert comparable(events) == expectedEvents(FBXDocumentParser.fromBuffer(buffer).topLevelDocument)
+    assert parser.finished
+    assert parser.header.versionNumber == FBXDocumentParser.fromBuffer(buffer).header.versionNumber
+
+
+def testChunkBoundariesDoNotChangeTheEvents() -> None:
+    buffer = readExample()
+    expected = comparable(feedAll(FBXStreamParser(), [buffer]))
+
+    # a split inside the header, a record header, a name, a length prefix and an array payload
+    for split in range(1, 400, 3):
+        assert comparable(feedAll(FBXStreamParser(), [buffer[:split], buffer[split:]])) == expected
+
+
+@pytest.mark.parametrize("source", ["path", "file", "chunks"])
+def testParsePullsFromAnySource(source: str) -> None:
+    buffer = readExample()
+    sources = {"path": EXAMPLE_PATH, "file": io.BytesIO(buffer), "chunks": iter(chunked(buffer, 7))}
+
+    events = FBXStreamParser.parse(sources[source], chunkSize=7)
+
+    assert comparable(events) == expectedEvents(FBXDocumentParser.fromBuffer(buffer).topLevelDocument)
+
+
+@pytest.mark.parametrize("include, exclude", [
+    (["Objects/Geometry"], None),
+    (None, ["Objects/*", "Connections"]),
+    (["Objects/*/Vertices"], ["Objects/Model"]),
+], ids=["include", "exclude", "both"])
+def testSelectionMatchesAProjectedParse(include: List[str], exclude: List[str]) -> None:
+    buffer = readExample()
+    events = feedAll(FBXStreamParser(include=include, exclude=exclude), chunked(buffer, 7))
+
+    assert comparable(events) == expectedEvents(FBXDocumentParser.fromBuffer(buffer, include=include, exclude=exclude).topLevelDocument)
+
+
+@pytest.mark.parametrize("length", [10, 27, 200, len(readExample()) // 2])
+def testTruncatedInputRaises(length: int) -> None:
+    parser = FBXStreamParser()
+    for chunk in chunked(readExample()[:length], 7):
+        parser.feed(chunk)
+
+    assert not parser.finished
+    with pytest.raises(ValueError):
+        parser.close()
+    with pytest.raises(ValueError):
+        list(FBXStreamParser.parse(io.BytesIO(readExample()[:length])))
+
+
+def testBytesAfterTheNodeListAreIgnored() -> None:
+    parser = FBXStreamParser()
+    events = feedAll(parser, [readExample(), b"trailing bytes"])
+
+    assert parser.finished
+    assert parser.feed(b"more") == []
+    assert comparable(events) == expectedEvents(FBXDocumentParser.fromBuffer(readExample()).topLevelDocument)
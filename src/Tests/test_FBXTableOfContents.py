@@ -0,0 +1,135 @@
+from typing import Any, List, Tuple
+import pytest
+from conftest import EXAMPLE_PATH
+from Benchmarks.SyntheticFBXGenerator import SyntheticFBXGenerator
+from Domain.Entities.Document.FBXDocumentNode import FBXDocumentNode
+from Domain.Entities.Document.FBXTableOfContents import FBXTableOfContents, FBXTocEntry
+from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+
+
+def readExample() -> bytes:
+    with open(EXAMPLE_PATH, "rb") as file:
+        return file.read()
+
+
+def documentOrder(root: FBXDocumentNode) -> List[Tuple[FBXDocumentNode, int, int]]:
+    """Get the (node, depth, parent row) of every node of a full parse, depth first like the table of contents rows."""
+    rows, stack = [], [(child, 1, -1) for child in reversed(root.children)]
+    while stack:
+        node, depth, parent = stack.pop()
+        rows.append((node, depth, parent))
+        stack.extend((child, depth + 1, len(rows) - 1) for child in reversed(node.children))
+    return rows
+
+
+def normalize(value: Any) -> Any:
+    """Get a comparable form of a property value: bytes for raw properties, a list for arrays."""
+    if isinstance(value, memoryview) and value.format == "B":
+        return bytes(value)
+    elif isinstance(value, (str, bool, int, float)):
+        return value
+
+    return list(value)
+
+
+def subtree(node: FBXDocumentNode) -> Tuple:
+    """Get a comparable form of a node and its nested nodes."""
+    return (node.name, node.startOffset, node.endOffset, node.propertiesCount, node.propertiesLength, [normalize(value) for value in node.properties], [subtree(child) for child in node.children])
+
+
+DOCUMENTS = pytest.mark.parametrize("buffer", [
+    readExample(),
+    SyntheticFBXGenerator.generate(2_000, depth=16),
+    SyntheticFBXGenerator.generateScene(100, versionNumber=7500),
+], ids=["example", "chains", "scene-7500"])
+
+
+@DOCUMENTS
+def testRowsMatchAFullParse(buffer: bytes) -> None:
+    toc = FBXDocumentParser.tableOfContents(buffer)
+    rows = documentOrder(FBXDocumentParser.fromBuffer(buffer).topLevelDocument)
+
+    assert (toc.sourceLength, len(toc)) == (len(buffer), len(rows))
+    assert list(toc.entries()) == [FBXTocEntry(node.name, depth, parent, node.startOffset, node.endOffset, node.propertiesCount, node.propertiesLength) for node, depth, parent in rows]
+
+
+@DOCUMENTS
+def testSavedTableOfContentsRoundTrips(buffer: bytes, tmp_path) -> None:
+    toc = FBXDocumentParser.tableOfContents(buffer)
+
+    loaded = FBXTableOfContents.fromBytes(toc.toBytes())
+    toc.save(str(tmp_path / "scene.fbx.toc"))
+    saved = FBXTableOfContents.load(str(tmp_path / "scene.fbx.toc"))
+
+    for other in (loaded, saved):
+        assert (other.versionNumber, other.sourceLength, other.names) == (toc.versionNumber, toc.sourceLength, toc.names)
+        assert list(other.entries()) == list(toc.entries())
+    assert [path.name for path in tmp_path.iterdir()] == ["scene.fbx.toc"]
+
+
+def testTableOfContentsFromFileMatchesTheBuffer() -> None:
+    toc = FBXDocumentParser.tableOfContentsFromFile(EXAMPLE_PATH)
+
+    assert list(toc.entries()) == list(FBXDocumentParser.tableOfContents(readExample()).entries())
+
+
+def testDepthsPastSixteenBits(tmp_path) -> None:
+    # a chain of 70 000 Model nodes under Objects, each holding a leaf P node
+    buffer = SyntheticFBXGenerator.generate(140_002, depth=70_000)
+    toc = FBXDocumentParser.tableOfContents(buffer)
+
+    assert max(entry.depth for entry in toc.entries()) == 1 + 70_000 + 1
+    assert list(FBXTableOfContents.fromBytes(toc.toBytes()).entries()) == list(toc.entries())
+
+
+@DOCUMENTS
+def testFindMatchesThePathOfEveryRow(buffer: bytes) -> None:
+    toc = FBXDocumentParser.tableOfContents(buffer)
+    paths = [toc.path(row) for row in range(len(toc))]
+
+    for path in set(paths):
+        assert toc.find(path) == [row for row, rowPath in enumerate(paths) if rowPath == path]
+        assert toc.find("/" + path + "/") == toc.find(path)
+
+
+def testFindUnknownPaths() -> None:
+    toc = FBXDocumentParser.tableOfContents(readExample())
+
+    assert toc.find("Missing") == toc.find("Objects/Missing") == toc.find("Geometry") == []
+
+
+def testFoundRowsAreCopies() -> None:
+    toc = FBXDocumentParser.tableOfContents(readExample())
+
+    toc.find("Objects").append(-1)
+
+    assert toc.find("Objects") == [row for row in range(len(toc)) if toc.path(row) == "Objects"]
+
+
+@DOCUMENTS
+def testNodesReadAtEveryRowMatchAFullParse(buffer: bytes, tmp_path) -> None:
+    path = tmp_path / "scene.fbx"
+    path.write_bytes(buffer)
+    toc = FBXDocumentParser.tableOfContents(buffer)
+    rows = documentOrder(FBXDocumentParser.fromBuffer(buffer).topLevelDocument)
+
+    for row, (node, _, _) in enumerate(rows):
+        expected = subtree(node)
+        assert subtree(FBXDocumentParser.readNodeAt(buffer, toc.startOffsets[row])) == expected
+        assert subtree(FBXDocumentParser.readNodeAt(buffer, toc.startOffsets[row], toc.versionNumber)) == expected
+        assert subtree(FBXDocumentParser.readNodeAt(str(path), toc.startOffsets[row])) == expected
+
+
+@pytest.mark.parametrize("source", ["bytes", "path"])
+def testReadingAnInvalidOffsetRaises(source: str, tmp_path) -> None:
+    buffer = readExample()
+    path = tmp_path / "example.fbx"
+    path.write_bytes(buffer)
+    toc = FBXDocumentParser.tableOfContents(buffer)
+    target = buffer if source == "bytes" else str(path)
+
+    # inside the file header, in the middle of a record, on a null record and past the end of the file
+    lastChild = max(row for row in range(len(toc)) if toc.entry(row).parent == 0)
+    for offset in (0, 10, toc.startOffsets[1] + 1, toc.endOffsets[lastChild], len(buffer), len(buffer) + 100):
+        with pytest.raises(ValueError):
+            FBXDocumentParser.readNodeAt(target, offset)
@@ -2,37 +2,38 @@
 from Domain.Entities.Document.FBXDocument import FBXDocument
 from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
 
+def walk(document: FBXDocument):
+    stack = list(reversed(document.topLevelDocument.children))
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(current.children))
+
+
 def printNames(document: FBXDocument): 
-    current = document.topLevelDocument
-    names = []
-    while current is not None:
-        names.append(current.name)
-        current = current.parent
+    names = [current.name for current in walk(document)]
     print(", ".join(names))
     
 
 def extractName(document: FBXDocument, name:str = "Vertices"): 
-    out = None
-    current = document.topLevelDocument
-    while current is not None and out is None:
-        if current.name == name:
-            out = current
-            print(out.startOffset)
-            print(out.endOffset)
-        
-        current = current.parent
+    for out in document.byName(name)[:1]:
+        print(out.startOffset)
+        print(out.endOffset)
+
+
+def extractObject(document: FBXDocument, path: str = "Objects/Model"):
+    for model in document.find(path):
+        print(model.properties[1], "->", document.byId(model.properties[0]) is model)
         
     
 def dump(node: FBXDocument, count: int):
-    current = node.topLevelDocument
-    for i in range(count):
+    for i, current in zip(range(count), walk(node)):
         print("name", current.name)
         print("endOffset", current.endOffset)
         print("propertiesCount", current.propertiesCount)
         print("propertiesLength", current.propertiesLength)
         print("nameLength", len(current.name))
         print("properties", current.properties)
-        current = current.parent
 
 if __name__ == "__main__":
     document = None
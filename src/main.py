@@ -1,9 +1,12 @@
+import argparse
+import json
 import sys
 import os
-from Domain.Entities.Document.FBXDocument import FBXDocument
+import time
 
-from Infrastructure.Serializers.FBXDocumentSerializer import FBXDocumentSerializer
-from Infrastructure.Parser.FBXDocumentParser import FBXDocumentParser
+from Infrastructure.Converter.FBXBatchConverter import FBXBatchConverter
+from Infrastructure.Converter.FBXFileConverter import FBXFileConverter
+from Infrastructure.Diagnostics.FBXStats import FBXStats
 
 class FBXConverter: 
     @staticmethod 
@@ -19,14 +22,55 @@ class FBXConverter:
         
         
         
+    @staticmethod
+    def __arguments() -> argparse.ArgumentParser:
+        arguments = argparse.ArgumentParser(prog="FBXConvert", description="Convert a binary FBX file to JSON or another output format.")
+        arguments.add_argument("source", nargs="?", help="the FBX file to convert")
+        arguments.add_argument("target", nargs="?", help="the JSON (or --format) file to write")
+        arguments.add_argument("--format", choices=sorted(FBXFileConverter.FORMATS), default=FBXFileConverter.FORMAT_JSON, help="the output format: json, msgpack/cbor (arrays as packed typed binary), npz/raw (numeric arrays only, with a JSON manifest) or fbx (default: json)")
+        arguments.add_argument("--include", action="append", default=[], metavar="PATH", help="only export nodes matching the path pattern (ie: Objects/Geometry/*), can be repeated")
+        arguments.add_argument("--exclude", action="append", default=[], metavar="PATH", help="leave out nodes matching the path pattern, can be repeated")
+        arguments.add_argument("--inflate-threads", dest="inflateThreads", type=int, default=0, metavar="N", help="inflate compressed arrays on N threads after parsing (default: 0, inflate while parsing)")
+        arguments.add_argument("--cache", dest="cacheDirectory", metavar="DIR", help="keep parsed documents in a persistent cache directory, unchanged files load from it")
+        arguments.add_argument("--cache-size", dest="cacheSize", type=int, default=1024, metavar="MB", help="the maximum size of the parse cache (default: 1024 MB)")
+        arguments.add_argument("--blobs-dir", dest="blobDirectory", metavar="DIR", help="write raw binary properties (embedded textures, video) to DIR, named by their SHA-256 so duplicates are stored once, the JSON only references them")
+        arguments.add_argument("--skip-blobs", dest="skipBlobs", action="store_true", help="leave raw binary properties out of the JSON, only their length is written")
+        arguments.add_argument("--stats", nargs="?", const="-", metavar="JSON", help="collect parse and serialization stats, print a breakdown or write them as JSON to the given file")
+        arguments.add_argument("--batch", nargs="+", metavar="SOURCE", help="convert all FBX files in the given directories/globs into --output-dir")
+        arguments.add_argument("--output-dir", dest="outputDirectory", help="the directory batch conversions are written to")
+        arguments.add_argument("--workers", type=int, help="the number of batch worker processes (default: CPU count)")
+        arguments.add_argument("--overwrite", choices=FBXBatchConverter.OVERWRITE_POLICIES, default=FBXBatchConverter.OVERWRITE_SKIP, help="what batch conversions do with existing targets (default: skip)")
+        
+        return arguments
+        
     @staticmethod
     def __init(*args: list[str]) -> dict:
-        if len(args) < 1: 
+        options = FBXConverter.__arguments().parse_args(args)
+        if options.batch:
+            if options.outputDirectory is None:
+                raise Exception("Batch output directory (--output-dir) not found...")
+            
+            return {
+                "batch": options.batch,
+                "outputDirectory": options.outputDirectory,
+                "workers": options.workers,
+                "overwrite": options.overwrite,
+                "include": options.include,
+                "exclude": options.exclude,
+                "inflateThreads": options.inflateThreads,
+                "cacheDirectory": options.cacheDirectory,
+                "cacheBytes": options.cacheSize * 2**20,
+                "format": options.format,
+                "blobDirectory": options.blobDirectory,
+                "skipBlobs": options.skipBlobs,
+                "stats": options.stats
+            }
+        elif options.source is None: 
             raise Exception("Source argument not found...")
-        elif len(args)< 2:
+        elif options.target is None:
             raise Exception("Output filepath not found...")
         
-        source, target = args
+        source, target = options.source, options.target
         if not os.path.exists(source):
             raise Exception("Source file does not exists...")
         elif not source.lower().endswith("fbx"):
@@ -46,27 +90,78 @@ class FBXConverter:
  
         return {
             "source": source,
-            "target": target
+            "target": target,
+            "include": options.include,
+            "exclude": options.exclude,
+            "inflateThreads": options.inflateThreads,
+            "cacheDirectory": options.cacheDirectory,
+            "cacheBytes": options.cacheSize * 2**20,
+            "format": options.format,
+            "blobDirectory": options.blobDirectory,
+            "skipBlobs": options.skipBlobs,
+            "stats": options.stats
         }
     
+    def __reportStats(stats: FBXStats, destination: str) -> None:
+        if destination == "-":
+            print(stats.report())
+        else:
+            with open(destination, "w") as file:
+                json.dump(stats.toDict(), file, indent=1)
+            
     def __act(**kwargs) -> None:
-        document: FBXDocument = None
-        output: str = ''
-        with open(kwargs["source"], "rb") as file:
-            try:
-                document = FBXDocumentParser.fromBuffer(file.read())
-                output = FBXDocumentSerializer.serialize(document)
-            except Exception as e:
-                raise e
-            finally: 
-                if not file.closed:
-                    file.close()
-        
-        with open(kwargs["target"], "w+") as file: 
-            file.write(output)
-            file.close()
+        stats = FBXStats() if kwargs["stats"] else None
+        FBXFileConverter.convert(
+            kwargs["source"], 
+            kwargs["target"], 
+            kwargs["include"], 
+            kwargs["exclude"], 
+            kwargs["inflateThreads"], 
+            kwargs["cacheDirectory"], 
+            kwargs["cacheBytes"],
+            kwargs["format"],
+            stats,
+            kwargs["blobDirectory"],
+            kwargs["skipBlobs"]
+        )
         print("Object succesfully serialized")
         
+        if stats is not None:
+            FBXConverter.__reportStats(stats, kwargs["stats"])
+        
+    def __actBatch(**kwargs) -> None:
+        sources = FBXBatchConverter.collectSources(kwargs["batch"])
+        converter = FBXBatchConverter(
+            kwargs["outputDirectory"], 
+            kwargs["workers"], 
+            kwargs["overwrite"], 
+            {
+                "include": kwargs["include"], 
+                "exclude": kwargs["exclude"], 
+                "inflateThreads": kwargs["inflateThreads"],
+                "cacheDirectory": kwargs["cacheDirectory"],
+                "cacheBytes": kwargs["cacheBytes"],
+                "format": kwargs["format"],
+                "blobDirectory": kwargs["blobDirectory"],
+                "skipBlobs": kwargs["skipBlobs"]
+            },
+            kwargs["stats"] is not None
+        )
+        
+        start = time.perf_counter()
+        results = converter.convert(sources)
+        print(FBXBatchConverter.summarize(results, time.perf_counter() - start))
+        
+        if kwargs["stats"]:
+            stats = FBXStats()
+            for result in results:
+                if result.stats is not None:
+                    stats.merge(result.stats)
+            FBXConverter.__reportStats(stats, kwargs["stats"])
+        
+        if any(result.status == FBXBatchConverter.STATUS_FAILED for result in results):
+            sys.exit(1)
+        
 
         
     @staticmethod 
@@ -81,7 +176,10 @@ class FBXConverter:
             if not len(kwargs):
                 sys.exit(-1)
             
-            FBXConverter.__act(**kwargs)
+            if "batch" in kwargs:
+                FBXConverter.__actBatch(**kwargs)
+            else:
+                FBXConverter.__act(**kwargs)
 
 
 if __name__ == '__main__': 